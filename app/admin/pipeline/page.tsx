@@ -0,0 +1,169 @@
+'use client'
+
+import { useCallback, useEffect, useState } from 'react'
+import { Card, CardHeader, CardTitle, CardContent } from '@/components/ui/Card'
+import { Button } from '@/components/ui/Button'
+import { RefreshCw, Timer } from 'lucide-react'
+import { supabase } from '@/lib/supabase'
+
+interface StageTiming {
+  pipeline: string
+  stage: string
+  samples: number
+  failures: number
+  p50_ms: number
+  p95_ms: number
+  max_ms: number
+}
+
+const PIPELINE_LABELS: Record<string, string> = {
+  whatsapp_ocr: 'WhatsApp — OCR (fila)',
+  whatsapp_extraction: 'WhatsApp — Extração'
+}
+
+const STAGE_LABELS: Record<string, string> = {
+  account_lookup: 'Busca da conta',
+  media_url: 'URL da mídia',
+  download: 'Download',
+  storage_upload: 'Upload (Storage)',
+  preprocess: 'Pré-processamento',
+  vision: 'Vision (IA)',
+  vision_cached: 'Vision (cache)',
+  encrypt: 'Criptografia',
+  db_ocr_message: 'Banco — ocr_messages',
+  db_extraction: 'Banco — extração',
+  db_extraction_flow: 'Banco — fluxo do bot',
+  whatsapp_send: 'Envio WhatsApp'
+}
+
+const PERIODS = [
+  { days: 1, label: '24h' },
+  { days: 7, label: '7 dias' },
+  { days: 30, label: '30 dias' }
+]
+
+const formatMs = (ms: number) => (ms >= 1000 ? `${(ms / 1000).toFixed(1)} s` : `${Math.round(ms)} ms`)
+
+export default function AdminPipelinePage() {
+  const [timings, setTimings] = useState<StageTiming[]>([])
+  const [days, setDays] = useState(7)
+  const [isLoading, setIsLoading] = useState(true)
+  const [error, setError] = useState<string | null>(null)
+
+  const loadTimings = useCallback(async () => {
+    setIsLoading(true)
+    setError(null)
+    try {
+      const { data: { session } } = await supabase.auth.getSession()
+      if (!session) {
+        setError('Sessão expirada. Faça login novamente.')
+        return
+      }
+
+      const response = await fetch(`/api/admin/pipeline-timings?days=${days}`, {
+        headers: {
+          'Authorization': `Bearer ${session.access_token}`
+        }
+      })
+
+      const result = await response.json()
+      if (!response.ok) {
+        throw new Error(result.error || 'Erro ao carregar tempos')
+      }
+
+      setTimings(result.data || [])
+    } catch (err) {
+      console.error('Erro ao carregar tempos do pipeline:', err)
+      setError(err instanceof Error ? err.message : 'Erro desconhecido')
+    } finally {
+      setIsLoading(false)
+    }
+  }, [days])
+
+  useEffect(() => {
+    loadTimings()
+  }, [loadTimings])
+
+  // Agrupa por pipeline mantendo a ordem da API (maior p95 primeiro)
+  const porPipeline = timings.reduce<Record<string, StageTiming[]>>((acc, row) => {
+    (acc[row.pipeline] ||= []).push(row)
+    return acc
+  }, {})
+
+  return (
+    <div className="container mx-auto px-4 py-8">
+      <div className="flex flex-col md:flex-row md:justify-between md:items-center gap-4 mb-8">
+        <div>
+          <h1 className="text-3xl font-bold text-gray-900 mb-2">Desempenho do OCR</h1>
+          <p className="text-sm text-gray-500">
+            Tempo por etapa dos pipelines do WhatsApp (p50 e p95)
+          </p>
+        </div>
+        <div className="flex items-center gap-2">
+          {PERIODS.map(period => (
+            <Button
+              key={period.days}
+              variant={days === period.days ? 'primary' : 'outline'}
+              onClick={() => setDays(period.days)}
+            >
+              {period.label}
+            </Button>
+          ))}
+          <Button onClick={loadTimings} disabled={isLoading} className="flex items-center gap-2">
+            <RefreshCw className={`w-4 h-4 ${isLoading ? 'animate-spin' : ''}`} />
+            Atualizar
+          </Button>
+        </div>
+      </div>
+
+      {error && <p className="text-red-600 mb-4">{error}</p>}
+
+      {!isLoading && !error && timings.length === 0 && (
+        <p className="text-gray-600">Nenhuma medição no período.</p>
+      )}
+
+      <div className="space-y-6">
+        {Object.entries(porPipeline).map(([pipeline, stages]) => (
+          <Card key={pipeline}>
+            <CardHeader>
+              <CardTitle className="flex items-center gap-2">
+                <Timer className="w-5 h-5 text-blue-500" />
+                {PIPELINE_LABELS[pipeline] || pipeline}
+              </CardTitle>
+            </CardHeader>
+            <CardContent>
+              <div className="overflow-x-auto">
+                <table className="w-full">
+                  <thead>
+                    <tr className="border-b border-gray-200">
+                      <th className="text-left py-3 px-4 text-xs font-semibold text-gray-600 uppercase tracking-wider">Etapa</th>
+                      <th className="text-right py-3 px-4 text-xs font-semibold text-gray-600 uppercase tracking-wider">p50</th>
+                      <th className="text-right py-3 px-4 text-xs font-semibold text-gray-600 uppercase tracking-wider">p95</th>
+                      <th className="text-right py-3 px-4 text-xs font-semibold text-gray-600 uppercase tracking-wider hidden md:table-cell">Máx.</th>
+                      <th className="text-right py-3 px-4 text-xs font-semibold text-gray-600 uppercase tracking-wider">Amostras</th>
+                      <th className="text-right py-3 px-4 text-xs font-semibold text-gray-600 uppercase tracking-wider">Falhas</th>
+                    </tr>
+                  </thead>
+                  <tbody>
+                    {stages.map(row => (
+                      <tr key={row.stage} className="border-b border-gray-100">
+                        <td className="py-3 px-4 text-gray-900">{STAGE_LABELS[row.stage] || row.stage}</td>
+                        <td className="py-3 px-4 text-right text-gray-700">{formatMs(Number(row.p50_ms))}</td>
+                        <td className="py-3 px-4 text-right font-semibold text-gray-900">{formatMs(Number(row.p95_ms))}</td>
+                        <td className="py-3 px-4 text-right text-gray-500 hidden md:table-cell">{formatMs(row.max_ms)}</td>
+                        <td className="py-3 px-4 text-right text-gray-700">{row.samples}</td>
+                        <td className={`py-3 px-4 text-right ${row.failures > 0 ? 'text-red-600 font-semibold' : 'text-gray-500'}`}>
+                          {row.failures}
+                        </td>
+                      </tr>
+                    ))}
+                  </tbody>
+                </table>
+              </div>
+            </CardContent>
+          </Card>
+        ))}
+      </div>
+    </div>
+  )
+}
@@ -1,6 +1,7 @@
 import 'server-only'
 import { NextRequest, NextResponse } from 'next/server'
 import { createClient } from '@supabase/supabase-js'
+import { invalidateSubscriptionAccess } from '@/lib/subscription-access'
 
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || ''
 const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY || ''
@@ -77,6 +78,8 @@ export async function POST(
       return NextResponse.json({ error: updateError.message }, { status: 500 })
     }
 
+    invalidateSubscriptionAccess(clientId)
+
     return NextResponse.json({
       success: true,
       new_trial_ends_at: newTrialEnd.toISOString(),
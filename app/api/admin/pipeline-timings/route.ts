@@ -0,0 +1,60 @@
+import 'server-only'
+import { NextRequest, NextResponse } from 'next/server'
+import { createClient } from '@supabase/supabase-js'
+
+const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || 'https://zmtwwajyhusyrugobxur.supabase.co'
+const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY || ''
+
+// Janelas aceitas (em dias) para o p50/p95 por etapa
+const PERIODS = [1, 7, 30]
+
+export async function GET(request: NextRequest) {
+  try {
+    if (!supabaseServiceKey) {
+      return NextResponse.json({ error: 'Configuração do servidor inválida' }, { status: 500 })
+    }
+
+    const authHeader = request.headers.get('authorization')
+    if (!authHeader) {
+      return NextResponse.json({ error: 'Não autorizado' }, { status: 401 })
+    }
+
+    const token = authHeader.replace('Bearer ', '').trim()
+    const supabase = createClient(supabaseUrl, process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY || '')
+    const { data: { user }, error: userError } = await supabase.auth.getUser(token)
+
+    if (userError || !user) {
+      return NextResponse.json({ error: 'Não autorizado' }, { status: 401 })
+    }
+
+    const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey)
+    const { data: userData } = await supabaseAdmin
+      .from('users')
+      .select('role, is_system_admin')
+      .eq('id', user.id)
+      .maybeSingle()
+
+    if (!userData || userData.role !== 'admin' || !userData.is_system_admin) {
+      return NextResponse.json({ error: 'Acesso negado' }, { status: 403 })
+    }
+
+    const { searchParams } = new URL(request.url)
+    const requested = parseInt(searchParams.get('days') || '7')
+    const days = PERIODS.includes(requested) ? requested : 7
+    const since = new Date(Date.now() - days * 24 * 60 * 60 * 1000)
+
+    const { data, error } = await supabaseAdmin.rpc('pipeline_stage_percentiles', {
+      p_since: since.toISOString()
+    })
+
+    if (error) {
+      console.error('❌ Erro ao buscar tempos do pipeline:', error)
+      return NextResponse.json({ error: error.message }, { status: 500 })
+    }
+
+    return NextResponse.json({ days, data: data || [] })
+  } catch (error: any) {
+    console.error('❌ Erro na API de pipeline-timings:', error)
+    return NextResponse.json({ error: 'Erro interno do servidor' }, { status: 500 })
+  }
+}
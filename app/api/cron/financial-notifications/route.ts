@@ -0,0 +1,38 @@
+import { NextResponse } from 'next/server';
+import { createClient } from '@supabase/supabase-js';
+import { BUSINESS_RULES } from '@/lib/constants';
+
+const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || '';
+const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY || '';
+
+/**
+ * Notificações financeiras inteligentes (pendentes de envio, atrasados e
+ * próximos do vencimento) para todos os usuários de uma vez.
+ *
+ * generate_financial_notifications avalia as regras com uma consulta agrupada
+ * e grava com um único INSERT ... ON CONFLICT, que deduplica por usuário e
+ * tipo em 24h; rodar de hora em hora não gera notificações repetidas.
+ * Protegido por CRON_SECRET.
+ */
+export async function GET(request: Request) {
+  const authHeader = request.headers.get('authorization');
+  if (!process.env.CRON_SECRET || authHeader !== `Bearer ${process.env.CRON_SECRET}`) {
+    return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
+  }
+
+  try {
+    const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey);
+
+    const { data, error } = await supabaseAdmin.rpc('generate_financial_notifications', {
+      p_user_id: null,
+      p_late_days: BUSINESS_RULES.LATE_PAYMENT_THRESHOLD_DAYS,
+      p_near_days: BUSINESS_RULES.NEAR_PAYMENT_DAYS
+    });
+    if (error) throw error;
+
+    return NextResponse.json({ success: true, ...(data as { written: number; expired: number }) });
+  } catch (error: any) {
+    console.error('Financial Notifications Cron Error:', error);
+    return NextResponse.json({ success: false, error: error.message }, { status: 500 });
+  }
+}
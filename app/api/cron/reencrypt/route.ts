@@ -0,0 +1,183 @@
+import { NextResponse } from 'next/server';
+import { createClient } from '@supabase/supabase-js';
+import { encryptionTarget, needsReencryption, reencrypt } from '@/lib/security';
+
+const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || '';
+const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY || '';
+
+const BATCH_SIZE = 200;
+const UPDATE_CONCURRENCY = 10;
+// maxDuration das rotas é 30s (vercel.json); sobra margem para gravar o progresso
+const TIME_BUDGET_MS = 25_000;
+
+type TableSpec = {
+  table: string;
+  // Colunas TEXT: o update só vale se o valor ainda for o lido
+  textFields: string[];
+  // Colunas JSONB que guardam a string criptografada
+  jsonFields: string[];
+  // Coluna de versão da linha, quando existe, para não sobrescrever edições
+  versionColumn: string | null;
+};
+
+// Tabelas e campos gravados com encrypt() (procedure-service.ts,
+// lib/queue/processor.ts, lib/extraction/pipeline.ts e o webhook do WhatsApp)
+const TABLES: TableSpec[] = [
+  {
+    table: 'procedures',
+    textFields: [
+      'procedure_name', 'patient_name', 'patient_id', 'notes', 'patient_phone',
+      'patient_email', 'patient_notes', 'patient_companion', 'patient_companion_phone'
+    ],
+    jsonFields: [],
+    versionColumn: 'updated_at'
+  },
+  { table: 'ocr_messages', textFields: ['raw_text'], jsonFields: ['structured_data'], versionColumn: null },
+  { table: 'whatsapp_extractions', textFields: ['raw_ocr_text'], jsonFields: ['extracted_fields'], versionColumn: 'updated_at' }
+];
+
+type Progress = {
+  table_name: string;
+  target: string;
+  last_id: string | null;
+  rows_scanned: number;
+  rows_updated: number;
+  rows_failed: number;
+  completed_at: string | null;
+};
+
+/**
+ * Job de recriptografia (LGPD): converte valores no formato legado 'enc:' (ou
+ * gravados com uma chave antiga) para o formato e chave atuais de
+ * lib/security.ts.
+ *
+ * Percorre cada tabela por id em lotes e grava o último id em
+ * reencryption_progress, então pode ser chamado repetidamente (cron) até
+ * concluir; cada execução para antes de TIME_BUDGET_MS. Quando a chave ou o
+ * formato mudam, a passada recomeça. Protegido por CRON_SECRET.
+ */
+export async function GET(request: Request) {
+  const authHeader = request.headers.get('authorization');
+  if (!process.env.CRON_SECRET || authHeader !== `Bearer ${process.env.CRON_SECRET}`) {
+    return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
+  }
+
+  const target = encryptionTarget();
+  if (!target) {
+    return NextResponse.json({ error: 'ENCRYPTION_KEY não configurada' }, { status: 500 });
+  }
+
+  try {
+    const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey);
+    const deadline = Date.now() + TIME_BUDGET_MS;
+
+    const { data: saved, error: progressError } = await supabaseAdmin
+      .from('reencryption_progress')
+      .select('*');
+    if (progressError) throw progressError;
+
+    const results: Progress[] = [];
+
+    for (const spec of TABLES) {
+      const previous = (saved || []).find((p: Progress) => p.table_name === spec.table);
+      const progress: Progress = previous && previous.target === target
+        ? previous
+        : {
+            table_name: spec.table,
+            target,
+            last_id: null,
+            rows_scanned: 0,
+            rows_updated: 0,
+            rows_failed: 0,
+            completed_at: null
+          };
+
+      while (!progress.completed_at && Date.now() < deadline) {
+        await processBatch(supabaseAdmin, spec, progress);
+
+        const { error } = await supabaseAdmin
+          .from('reencryption_progress')
+          .upsert({ ...progress, updated_at: new Date().toISOString() });
+        if (error) throw error;
+      }
+
+      results.push(progress);
+    }
+
+    const done = results.every(p => p.completed_at);
+    return NextResponse.json({ success: true, target, done, tables: results });
+  } catch (error: any) {
+    console.error('[CRON-REENCRYPT] Erro:', error);
+    return NextResponse.json({ error: error.message }, { status: 500 });
+  }
+}
+
+async function processBatch(
+  supabaseAdmin: ReturnType<typeof createClient>,
+  spec: TableSpec,
+  progress: Progress
+) {
+  const fields = [...spec.textFields, ...spec.jsonFields];
+  const columns = ['id', ...fields, ...(spec.versionColumn ? [spec.versionColumn] : [])].join(',');
+
+  let query = supabaseAdmin
+    .from(spec.table)
+    .select(columns)
+    .order('id', { ascending: true })
+    .limit(BATCH_SIZE);
+  if (progress.last_id) {
+    query = query.gt('id', progress.last_id);
+  }
+
+  const { data, error } = await query;
+  if (error) throw error;
+
+  const rows = (data || []) as unknown as Record<string, any>[];
+  if (rows.length === 0) {
+    progress.completed_at = new Date().toISOString();
+    return;
+  }
+
+  const updates: { row: Record<string, any>; patch: Record<string, string> }[] = [];
+  for (const row of rows) {
+    const patch: Record<string, string> = {};
+    for (const field of fields) {
+      if (!needsReencryption(row[field])) continue;
+      try {
+        patch[field] = reencrypt(row[field]);
+      } catch {
+        // Chave ausente ou dado corrompido: mantém o valor e segue
+        progress.rows_failed++;
+      }
+    }
+    if (Object.keys(patch).length > 0) updates.push({ row, patch });
+  }
+
+  for (let i = 0; i < updates.length; i += UPDATE_CONCURRENCY) {
+    const counts = await Promise.all(
+      updates.slice(i, i + UPDATE_CONCURRENCY).map(async ({ row, patch }) => {
+        // Só grava se a linha não mudou desde a leitura; se mudou, o valor
+        // novo já foi gravado no formato atual
+        let update = supabaseAdmin
+          .from(spec.table)
+          .update(patch, { count: 'exact' })
+          .eq('id', row.id);
+        for (const field of spec.textFields) {
+          if (field in patch) update = update.eq(field, row[field]);
+        }
+        if (spec.versionColumn) {
+          update = row[spec.versionColumn] === null
+            ? update.is(spec.versionColumn, null)
+            : update.eq(spec.versionColumn, row[spec.versionColumn]);
+        }
+        const { error: updateError, count } = await update;
+        if (updateError) throw updateError;
+        return count || 0;
+      })
+    );
+    progress.rows_updated += counts.reduce((sum, n) => sum + n, 0);
+  }
+
+  progress.rows_scanned += rows.length;
+  progress.last_id = rows[rows.length - 1].id;
+}
@@ -1,50 +1,71 @@
 import { NextResponse } from 'next/server';
-import { supabase } from '@/lib/supabase';
-import { financialService } from '@/lib/financial/service';
-import { notificationService } from '@/lib/notifications/notification-service';
+import { createClient } from '@supabase/supabase-js';
 
+const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || '';
+const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY || '';
+
+// Usuários por chamada de run_weekly_summary_batch (uma consulta agrupada +
+// um INSERT das notificações do lote)
+const BATCH_SIZE = 500;
+// maxDuration das rotas é 30s (vercel.json)
+const TIME_BUDGET_MS = 25_000;
+
+type BatchResult = { notified: number; total: number; done: boolean };
+
+// Segunda-feira (UTC) da semana corrente: chave do checkpoint
+function weekStart(now: Date): string {
+  const monday = new Date(Date.UTC(now.getUTCFullYear(), now.getUTCMonth(), now.getUTCDate()));
+  monday.setUTCDate(monday.getUTCDate() - ((monday.getUTCDay() + 6) % 7));
+  return monday.toISOString().split('T')[0];
+}
+
+/**
+ * Resumo financeiro semanal (produzido / recebido / pendente dos procedimentos
+ * criados nos últimos 7 dias) para cada usuário com assinatura ativa.
+ *
+ * O trabalho é feito em lotes por run_weekly_summary_batch, que grava o último
+ * usuário notificado em weekly_summary_progress na mesma transação das
+ * notificações. Se a execução estourar o tempo, a próxima chamada da mesma
+ * semana continua de onde parou; chamadas após a conclusão não fazem nada.
+ * Protegido por CRON_SECRET.
+ */
 export async function GET(request: Request) {
-  // Verificar se a requisição tem o header de autorização do Cron (ex: Vercel ou Supabase)
-  // No mundo real, você usaria uma variável de ambiente: 
-  // const authHeader = request.headers.get('authorization');
-  // if (authHeader !== `Bearer ${process.env.CRON_SECRET}`) { ... }
+  const authHeader = request.headers.get('authorization');
+  if (!process.env.CRON_SECRET || authHeader !== `Bearer ${process.env.CRON_SECRET}`) {
+    return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
+  }
 
   try {
-    // 1. Buscar todos os usuários ativos (que tiveram procedimentos nas últimas semanas)
-    // Para simplificar, vamos buscar todos os usuários que têm assinatura ativa
-    const { data: users, error: usersError } = await supabase
-      .from('users')
-      .select('id, email')
-      .eq('subscription_status', 'active');
-
-    if (usersError) throw usersError;
-
-    const results = [];
-
-    for (const user of users) {
-      // 2. Calcular resumo semanal
-      const summary = await financialService.getFinancialSummary(user.id, 'weekly');
-
-      // Só notificar se houver movimentação
-      if (summary.procedureCount > 0 || summary.totalPending > 0) {
-        const message = `
-💰 Produzido: R$ ${summary.totalProduced.toFixed(2)}
-💵 Recebido: R$ ${summary.totalReceived.toFixed(2)}
-⚠️ Pendente: R$ ${summary.totalPending.toFixed(2)}
-        `.trim();
-
-        await notificationService.createNotification({
-          user_id: user.id,
-          type: 'weekly_summary',
-          title: 'Resumo Financeiro da Semana',
-          message: message
-        });
-
-        results.push({ user_id: user.id, status: 'notified' });
-      }
+    const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey);
+    const deadline = Date.now() + TIME_BUDGET_MS;
+
+    const now = new Date();
+    const since = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000);
+    const week = weekStart(now);
+
+    let processed = 0;
+    let result: BatchResult = { notified: 0, total: 0, done: false };
+
+    while (!result.done && Date.now() < deadline) {
+      const { data, error } = await supabaseAdmin.rpc('run_weekly_summary_batch', {
+        p_week_start: week,
+        // Só vale na primeira chamada da semana; depois a janela gravada é reutilizada
+        p_since: since.toISOString(),
+        p_limit: BATCH_SIZE
+      });
+      if (error) throw error;
+
+      result = data as BatchResult;
+      processed += result.notified;
     }
 
-    return NextResponse.json({ success: true, processed: results.length });
+    return NextResponse.json({
+      success: true,
+      week,
+      processed,
+      total: result.total,
+      done: result.done
+    });
   } catch (error: any) {
     console.error('Weekly Summary Cron Error:', error);
     return NextResponse.json({ success: false, error: error.message }, { status: 500 });
@@ -0,0 +1,47 @@
+import { NextResponse } from 'next/server';
+import { runWorker } from '@/lib/queue/worker';
+import { pruneVisionCache } from '@/lib/ai/vision-cache';
+import { supabaseAdmin } from '@/lib/supabase-server';
+
+export const runtime = 'nodejs';
+export const maxDuration = 60;
+
+/**
+ * Worker da fila de OCR do WhatsApp (whatsapp_jobs).
+ *
+ * Rede de segurança do webhook: retoma jobs reagendados após falha e jobs
+ * cuja reserva venceu (função encerrada no meio do processamento). Para de
+ * reservar jobs novos com folga antes do maxDuration; a reserva
+ * (visibility timeout) cobre o que ainda estiver em andamento.
+ * Concorrência em WHATSAPP_WORKER_CONCURRENCY. Protegido por CRON_SECRET.
+ * Uma vez por hora também remove medições antigas de pipeline_timings e
+ * aplica o TTL e o limite de tamanho do vision_cache.
+ */
+export async function GET(request: Request) {
+  const authHeader = request.headers.get('authorization');
+  if (!process.env.CRON_SECRET || authHeader !== `Bearer ${process.env.CRON_SECRET}`) {
+    return NextResponse.json({ error: 'Não autorizado' }, { status: 401 });
+  }
+
+  try {
+    // Minuto do disparo: o runWorker pode levar até 40s e cruzar a virada
+    const startedAt = new Date();
+    const result = await runWorker({ maxRuntimeMs: 40_000 });
+
+    if (startedAt.getUTCMinutes() === 0) {
+      const { error: pruneError } = await supabaseAdmin.rpc('prune_pipeline_timings', { p_keep_days: 30 });
+      if (pruneError) console.error('WhatsApp Worker Cron prune error:', pruneError);
+
+      try {
+        await pruneVisionCache();
+      } catch (visionPruneError) {
+        console.error('WhatsApp Worker Cron vision cache prune error:', visionPruneError);
+      }
+    }
+
+    return NextResponse.json({ success: true, ...result });
+  } catch (error: any) {
+    console.error('WhatsApp Worker Cron Error:', error);
+    return NextResponse.json({ success: false, error: error.message }, { status: 500 });
+  }
+}
@@ -1,82 +1,176 @@
 import { NextResponse } from 'next/server'
-import { supabase } from '@/lib/supabase'
+import { createClient } from '@/utils/supabase/server'
+import { createAdminClient } from '@/utils/supabase/admin'
+import { decryptFields } from '@/lib/security'
 
 export const dynamic = 'force-dynamic'
 
+// Linhas por página do keyset (limite padrão de linhas do PostgREST)
+const PAGE_SIZE = 1000
+
+const EXPORT_COLUMNS = 'id, procedure_date, horario, procedure_name, patient_name, hospital_clinic, anesthesiologist_name, procedure_value'
+
+// Campos gravados com encrypt() (ver procedure-service.ts)
+const ENCRYPTED_FIELDS = ['patient_name', 'procedure_name'] as const
+
+const CSV_HEADER = ['Data', 'Horário', 'Procedimento', 'Paciente', 'Hospital/Clínica', 'Anestesista', 'Valor'].join(',')
+
+type ExportRow = {
+  id: string
+  procedure_date: string
+  horario: string | null
+  procedure_name: string | null
+  patient_name: string | null
+  hospital_clinic: string | null
+  anesthesiologist_name: string | null
+  procedure_value: number | null
+}
+
+// Remover aspas e quebras de linha para evitar quebrar o CSV
+const cleanString = (str: any) => {
+  if (!str) return ''
+  return `"${String(str).replace(/"/g, '""').replace(/\n/g, ' ')}"`
+}
+
+function toCsvLine(p: ExportRow): string {
+  // Formatar data
+  let dataFormatada = p.procedure_date || ''
+  if (dataFormatada.includes('-')) {
+    const [ano, mes, dia] = dataFormatada.split('T')[0].split('-')
+    dataFormatada = `${dia}/${mes}/${ano}`
+  }
+
+  return [
+    cleanString(dataFormatada),
+    cleanString(p.horario),
+    cleanString(p.procedure_name),
+    cleanString(p.patient_name),
+    cleanString(p.hospital_clinic),
+    cleanString(p.anesthesiologist_name),
+    p.procedure_value || 0
+  ].join(',')
+}
+
+/**
+ * Uma página de procedimentos do grupo em (procedure_date desc, id desc),
+ * a partir da última linha da página anterior.
+ */
+async function fetchPage(
+  supabase: ReturnType<typeof createAdminClient>,
+  groupId: string,
+  after: ExportRow | null
+): Promise<ExportRow[]> {
+  let query = supabase
+    .from('procedures')
+    .select(EXPORT_COLUMNS)
+    .eq('group_id', groupId)
+    .order('procedure_date', { ascending: false })
+    .order('id', { ascending: false })
+    .limit(PAGE_SIZE)
+
+  if (after) {
+    query = query.or(
+      `procedure_date.lt.${after.procedure_date},and(procedure_date.eq.${after.procedure_date},id.lt.${after.id})`
+    )
+  }
+
+  const { data, error } = await query
+  if (error) throw error
+  return (data || []) as ExportRow[]
+}
+
+/**
+ * Agenda do grupo em CSV, com paciente e procedimento descriptografados.
+ * Disponível apenas para membros ativos do grupo (sessão do Supabase nos cookies).
+ */
 export async function GET(
   request: Request,
-  { params }: { params: { id: string } }
+  { params }: { params: Promise<{ id: string }> }
 ) {
   try {
-    const groupId = params.id
-    
-    // Na prática, em uma versão final, aqui usaríamos um token no formato:
-    // ?token=xxxxxx para autenticar a requisição pública.
-    // Por hora, apenas retornamos os dados abertamente se o grupo existir,
-    // já que é um endpoint read-only exportável via link de compartilhamento.
-    const url = new URL(request.url)
-    const token = url.searchParams.get('token')
-
-    // Validar se o grupo existe e está ativo (token opcional para futuro)
+    const { id: groupId } = await params
+
+    const supabaseUser = await createClient()
+    const { data: { user }, error: authError } = await supabaseUser.auth.getUser()
+    if (authError || !user) {
+      return new NextResponse('Não autorizado', { status: 401 })
+    }
+
+    // Verificar se o usuário é membro ativo do grupo antes de ler com a
+    // service role (convites pendentes não contam)
+    const { data: member, error: memberError } = await supabaseUser
+      .from('group_members')
+      .select('id')
+      .eq('group_id', groupId)
+      .eq('user_id', user.id)
+      .eq('status', 'active')
+      .maybeSingle()
+
+    if (memberError || !member) {
+      return new NextResponse('Você não tem acesso a este grupo', { status: 403 })
+    }
+
+    const supabase = createAdminClient()
+
+    // Validar se o grupo existe e está ativo
     const { data: group, error: groupError } = await supabase
       .from('groups')
       .select('id, name')
       .eq('id', groupId)
       .eq('is_active', true)
-      .single()
+      .maybeSingle()
 
     if (groupError || !group) {
       return new NextResponse('Grupo não encontrado ou inativo', { status: 404 })
     }
 
-    // Buscar procedimentos
-    const { data: procedures, error: procError } = await supabase
-      .from('procedures')
-      .select('id, procedure_date, horario, procedure_name, patient_name, hospital_clinic, anesthesiologist_name, procedure_value')
-      .eq('group_id', groupId)
-      .order('procedure_date', { ascending: false })
-
-    if (procError) {
+    // Primeira página antes de abrir o stream: erro de consulta ainda vira 500
+    let page: ExportRow[]
+    try {
+      page = await fetchPage(supabase, groupId, null)
+    } catch {
       return new NextResponse('Erro ao buscar procedimentos', { status: 500 })
     }
 
-    // Criar CSV
-    // Cabeçalho
-    const headers = ['Data', 'Horário', 'Procedimento', 'Paciente', 'Hospital/Clínica', 'Anestesista', 'Valor']
-    
-    const rows = (procedures || []).map(p => {
-      // Formatar data
-      let dataFormatada = p.procedure_date || ''
-      if (dataFormatada.includes('-')) {
-        const [ano, mes, dia] = dataFormatada.split('T')[0].split('-')
-        dataFormatada = `${dia}/${mes}/${ano}`
-      }
+    // Cada pull descriptografa e escreve uma página e só então busca a
+    // próxima: a memória fica limitada a uma página, e o download começa
+    // com o cabeçalho, sem esperar o histórico inteiro
+    const encoder = new TextEncoder()
+    let started = false
+    const csv = new ReadableStream<Uint8Array>({
+      async pull(controller) {
+        try {
+          if (!started) {
+            started = true
+            controller.enqueue(encoder.encode(CSV_HEADER))
+          }
 
-      // Remover aspas e quebras de linha para evitar quebrar o CSV
-      const cleanString = (str: any) => {
-        if (!str) return ''
-        return `"${String(str).replace(/"/g, '""').replace(/\n/g, ' ')}"`
-      }
+          if (page.length === 0) {
+            controller.close()
+            return
+          }
+
+          const current = page
+          const lines = decryptFields(current, ENCRYPTED_FIELDS).map(toCsvLine)
+          controller.enqueue(encoder.encode('\n' + lines.join('\n')))
 
-      return [
-        cleanString(dataFormatada),
-        cleanString(p.horario),
-        cleanString(p.procedure_name),
-        cleanString(p.patient_name),
-        cleanString(p.hospital_clinic),
-        cleanString(p.anesthesiologist_name),
-        p.procedure_value || 0
-      ].join(',')
+          page = current.length < PAGE_SIZE ? [] : await fetchPage(supabase, groupId, current[current.length - 1])
+        } catch (error) {
+          console.error('Erro na exportação CSV (stream):', error)
+          controller.error(error)
+        }
+      }
     })
 
-    const csvContent = [headers.join(','), ...rows].join('\n')
+    const gzip = /\bgzip\b/.test(request.headers.get('accept-encoding') || '')
 
-    // Retornar como texto/csv para o IMPORTDATA do Sheets
-    return new NextResponse(csvContent, {
+    return new NextResponse(gzip ? csv.pipeThrough(new CompressionStream('gzip')) : csv, {
       headers: {
         'Content-Type': 'text/csv; charset=utf-8',
         'Content-Disposition': `attachment; filename="agenda_grupo_${group.name.replace(/ /g, '_')}.csv"`,
         'Cache-Control': 'no-cache, no-store, max-age=0, must-revalidate',
+        'Vary': 'Accept-Encoding',
+        ...(gzip ? { 'Content-Encoding': 'gzip' } : {}),
       },
     })
   } catch (error) {
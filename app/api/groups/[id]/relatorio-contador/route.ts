@@ -0,0 +1,62 @@
+import { NextResponse } from 'next/server'
+import { createClient } from '@/utils/supabase/server'
+import { obterRelatorioContador } from '@/lib/relatorio-contador'
+
+export const dynamic = 'force-dynamic'
+
+/**
+ * Relatório anual do contador (XLSX) de um grupo. ?ano=AAAA (padrão: ano atual).
+ * Disponível para membros ativos do grupo; anos fechados saem do Storage.
+ */
+export async function GET(
+  request: Request,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  const { id: groupId } = await params
+
+  const supabase = await createClient()
+  const { data: { user }, error: authError } = await supabase.auth.getUser()
+  if (authError || !user) {
+    return NextResponse.json({ error: 'Não autorizado' }, { status: 401 })
+  }
+
+  const { searchParams } = new URL(request.url)
+  const anoAtual = new Date().getFullYear()
+  const ano = parseInt(searchParams.get('ano') || String(anoAtual))
+  if (!Number.isInteger(ano) || ano < 2000 || ano > anoAtual) {
+    return NextResponse.json({ error: 'ano inválido' }, { status: 400 })
+  }
+
+  // Verificar se o usuário é membro ativo do grupo (convites pendentes não contam)
+  const { data: member, error: memberError } = await supabase
+    .from('group_members')
+    .select('id')
+    .eq('group_id', groupId)
+    .eq('user_id', user.id)
+    .eq('status', 'active')
+    .maybeSingle()
+
+  if (memberError || !member) {
+    return NextResponse.json({ error: 'Você não tem acesso a este grupo' }, { status: 403 })
+  }
+
+  try {
+    const relatorio = await obterRelatorioContador(groupId, ano)
+    if (!relatorio) {
+      return NextResponse.json({ error: 'Grupo não encontrado' }, { status: 404 })
+    }
+
+    return new NextResponse(new Uint8Array(relatorio.buffer), {
+      headers: {
+        'Content-Type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'Content-Disposition': `attachment; filename="${relatorio.fileName}"`,
+        'Content-Length': String(relatorio.buffer.length),
+        'Cache-Control': 'private, no-store',
+        'X-Relatorio-Cache': relatorio.cached ? 'HIT' : 'MISS',
+      },
+    })
+  } catch (error: any) {
+    console.error('❌ Erro ao gerar relatório do contador:', error)
+    return NextResponse.json({ error: 'Erro ao gerar relatório do contador' }, { status: 500 })
+  }
+}
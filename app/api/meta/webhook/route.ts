@@ -3,9 +3,11 @@ import { waitUntil } from '@vercel/functions';
 import { logger } from '@/lib/logger';
 import { validateMetaSignature } from '@/lib/providers/whatsapp/meta';
 import { supabaseAdmin } from '@/lib/supabase-server';
-import { processWhatsAppMessage } from '@/lib/queue/processor';
+import { enqueueWhatsAppJob, runWorker } from '@/lib/queue/worker';
 import { MetaWebhookBody } from '@/types/meta';
 
+export const maxDuration = 60; // Worker iniciado após a resposta (waitUntil)
+
 const VERIFY_TOKEN = process.env.META_VERIFY_TOKEN;
 
 /**
@@ -70,9 +72,10 @@ export async function POST(req: NextRequest) {
       status: 'pending'
     });
 
-    // 4. Disparar processamento assíncrono (Queue/Job)
-    // Usamos waitUntil para permitir que o Vercel continue a execução após a resposta
-    waitUntil(processWhatsAppMessage(message));
+    // 4. Enfileirar (Queue/Job) e iniciar um worker após a resposta
+    // Jobs interrompidos voltam para a fila (ver lib/queue/worker.ts)
+    await enqueueWhatsAppJob(message);
+    waitUntil(runWorker({ maxRuntimeMs: 45_000 }).catch(e => logger.error('Error running WhatsApp worker', e)));
 
     // 5. Retornar 200 imediatamente para a Meta
     return NextResponse.json({ status: 'accepted' });
@@ -1,6 +1,7 @@
 import 'server-only'
 import { NextRequest, NextResponse } from "next/server";
 import { parseFichaWithVision } from "@/utils/parseFichaAI";
+import { preprocessImageForVision } from "@/lib/ai/image-preprocess";
 
 export const runtime = 'nodejs';
 export const maxDuration = 60; // Vision pode demorar um pouco mais
@@ -20,13 +21,16 @@ export async function POST(req: NextRequest) {
       return NextResponse.json({ error: "Nenhum arquivo enviado" }, { status: 400 });
     }
 
-    // Converter File para Base64
+    // Normalizar (orientação, recorte, redução, JPEG) e converter para Base64
     const arrayBuffer = await file.arrayBuffer();
-    const buffer = Buffer.from(arrayBuffer);
+    const { buffer, durationMs: preprocessMs, inputBytes, outputBytes } =
+      await preprocessImageForVision(Buffer.from(arrayBuffer));
     const base64Image = buffer.toString('base64');
 
     // Chamar função de visão
+    const visionStart = Date.now();
     const parsed = await parseFichaWithVision(base64Image);
+    console.log(`[AI Vision] Pré-processamento ${preprocessMs}ms (${inputBytes} -> ${outputBytes} bytes), Vision ${Date.now() - visionStart}ms`);
 
     if (!parsed) {
       return NextResponse.json({ error: "Falha ao extrair dados via IA Vision" }, { status: 500 });
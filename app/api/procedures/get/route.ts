@@ -1,6 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { createClient } from '@supabase/supabase-js';
-import { decrypt } from '@/lib/security';
+import { decryptFields } from '@/lib/security';
 
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || '';
 const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY || '';
@@ -28,15 +28,15 @@ export async function GET(req: NextRequest) {
     if (!data) return NextResponse.json({ error: 'Não encontrado' }, { status: 404 });
 
     // Descriptografar
-    const decryptedData = {
-      ...data,
-      patient_name: decrypt(data.patient_name || ''),
-      patient_phone: decrypt(data.patient_phone || ''),
-      patient_email: decrypt(data.patient_email || ''),
-      patient_notes: decrypt(data.patient_notes || ''),
-      patient_companion: decrypt(data.patient_companion || ''),
-      patient_companion_phone: decrypt(data.patient_companion_phone || '')
-    };
+    const [decryptedData] = decryptFields([data], [
+      'procedure_name',
+      'patient_name',
+      'patient_phone',
+      'patient_email',
+      'patient_notes',
+      'patient_companion',
+      'patient_companion_phone'
+    ]);
 
     return NextResponse.json(decryptedData);
   } catch (error: any) {
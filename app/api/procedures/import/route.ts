@@ -0,0 +1,138 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { createClient } from '@/utils/supabase/server'
+import {
+  getImportKeySecret,
+  normalizeImportRow,
+  parseProcedureSpreadsheet,
+  procedureImportKey,
+  type ImportRowError,
+  type ImportedProcedure
+} from '@/lib/procedure-import'
+import { procedureService } from '@/lib/services/procedure-service'
+
+export const maxDuration = 60
+
+const MAX_FILE_BYTES = 10 * 1024 * 1024
+const MAX_ROWS = 50_000
+// Erros de linha devolvidos na resposta (o total vai em "invalid")
+const MAX_REPORTED_ERRORS = 100
+
+/**
+ * Importação em lote do histórico de procedimentos (CSV ou XLSX).
+ *
+ * POST multipart/form-data com o arquivo em "file". A resposta é NDJSON:
+ *   {"type":"parsed","total":1200,"invalid":3,"duplicates":10,"ignoredColumns":[...]}
+ *   {"type":"progress","processed":500,"total":1187,"inserted":500}
+ *   ...
+ *   {"type":"done","inserted":1187,"skipped":0,"invalid":3,"duplicates":10,"errors":[...]}
+ * ou {"type":"error","error":"..."} se a gravação falhar no meio.
+ *
+ * "duplicates" são linhas repetidas dentro do próprio arquivo; "skipped" são
+ * linhas que já tinham sido importadas antes (mesma import_key).
+ */
+export async function POST(req: NextRequest) {
+  const supabaseUser = await createClient()
+  const { data: { user }, error: authError } = await supabaseUser.auth.getUser()
+
+  if (authError || !user) {
+    return NextResponse.json({ error: 'Não autorizado' }, { status: 401 })
+  }
+
+  // Sem o segredo as chaves de deduplicação não podem ser geradas
+  if (!getImportKeySecret()) {
+    console.error('❌ IMPORT_KEY_SECRET não configurada: importação desativada')
+    return NextResponse.json({ error: 'Configuração do servidor incompleta' }, { status: 500 })
+  }
+
+  let file: File | null = null
+  try {
+    const form = await req.formData()
+    const value = form.get('file')
+    file = value instanceof File ? value : null
+  } catch {
+    return NextResponse.json({ error: 'Envie o arquivo como multipart/form-data' }, { status: 400 })
+  }
+
+  if (!file || file.size === 0) {
+    return NextResponse.json({ error: 'Arquivo não enviado' }, { status: 400 })
+  }
+  if (file.size > MAX_FILE_BYTES) {
+    return NextResponse.json({ error: 'Arquivo maior que 10 MB' }, { status: 413 })
+  }
+
+  let parsed: ReturnType<typeof parseProcedureSpreadsheet>
+  try {
+    parsed = parseProcedureSpreadsheet(Buffer.from(await file.arrayBuffer()))
+  } catch (error) {
+    console.error('❌ Erro ao ler planilha de importação:', error)
+    return NextResponse.json({ error: 'Não foi possível ler o arquivo (use CSV ou XLSX)' }, { status: 400 })
+  }
+
+  if (!parsed.columns.includes('procedure_date') || !parsed.columns.includes('patient_name')) {
+    return NextResponse.json({
+      error: 'A planilha precisa ter ao menos as colunas "Data" e "Paciente"',
+      ignoredColumns: parsed.ignoredColumns
+    }, { status: 400 })
+  }
+  if (parsed.rows.length > MAX_ROWS) {
+    return NextResponse.json({ error: `Limite de ${MAX_ROWS} linhas por importação` }, { status: 413 })
+  }
+
+  // Validação e deduplicação antes de abrir o stream: os erros de linha já
+  // saem no primeiro evento
+  const valid: ImportedProcedure[] = []
+  const errors: ImportRowError[] = []
+  const seen = new Set<string>()
+  let invalid = 0
+  let duplicates = 0
+
+  parsed.rows.forEach((row, index) => {
+    const result = normalizeImportRow(row)
+    if ('error' in result) {
+      invalid++
+      if (errors.length < MAX_REPORTED_ERRORS) {
+        errors.push({ row: parsed.lineNumbers[index], message: result.error })
+      }
+      return
+    }
+
+    const importKey = procedureImportKey(user.id, result.data)
+    if (seen.has(importKey)) {
+      duplicates++
+      return
+    }
+    seen.add(importKey)
+    valid.push({ ...result.data, import_key: importKey })
+  })
+
+  const encoder = new TextEncoder()
+  const stream = new ReadableStream<Uint8Array>({
+    async start(controller) {
+      const send = (event: Record<string, unknown>) => {
+        controller.enqueue(encoder.encode(JSON.stringify(event) + '\n'))
+      }
+
+      send({ type: 'parsed', total: valid.length, invalid, duplicates, ignoredColumns: parsed.ignoredColumns })
+
+      try {
+        const { inserted } = await procedureService.importProcedures(valid, user.id, progress => {
+          send({ type: 'progress', total: valid.length, ...progress })
+        })
+        send({ type: 'done', inserted, skipped: valid.length - inserted, invalid, duplicates, errors })
+      } catch (error: any) {
+        console.error('❌ Erro na importação de procedimentos:', error)
+        send({ type: 'error', error: error?.message || 'Erro ao gravar procedimentos' })
+      } finally {
+        controller.close()
+      }
+    }
+  })
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': 'application/x-ndjson; charset=utf-8',
+      'Cache-Control': 'no-store',
+      'X-Content-Type-Options': 'nosniff'
+    }
+  })
+}
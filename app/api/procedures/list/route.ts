@@ -1,13 +1,61 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { createClient } from '@supabase/supabase-js';
-import { decrypt } from '@/lib/security';
+import { decryptFieldsParallel } from '@/lib/security-pool';
 
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || '';
 const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY || '';
 
+const MAX_LIMIT = 1000;
+
+// Campos gravados com encrypt() (ver procedure-service.ts)
+const ENCRYPTED_FIELDS = [
+  'procedure_name',
+  'patient_name',
+  'patient_phone',
+  'patient_email',
+  'patient_notes',
+  'patient_companion',
+  'patient_companion_phone'
+] as const;
+
+// Colunas usadas pela listagem de /procedimentos (cards, filtros e métricas).
+// O modal de detalhes busca o registro completo em /api/procedures/get.
+const LIST_COLUMNS = [
+  'id', 'user_id', 'group_id', 'anesthesiologist_user_id', 'billing_entity_type',
+  'procedure_name', 'procedure_type', 'procedure_date', 'procedure_time', 'procedure_value',
+  'patient_name', 'hospital_clinic', 'nome_cirurgiao', 'convenio',
+  'payment_status', 'payment_method', 'forma_pagamento', 'payment_date', 'expected_payment_date',
+  'numero_parcelas', 'parcelas_recebidas', 'paid_at', 'sent_at', 'show_to_secretary',
+  'created_at', 'updated_at'
+].join(',');
+
+/** Cursor opaco: posição (procedure_date, id) da última linha entregue. */
+function encodeCursor(row: { procedure_date: string; id: string }): string {
+  return Buffer.from(JSON.stringify([row.procedure_date, row.id])).toString('base64url');
+}
+
+function decodeCursor(cursor: string): { date: string; id: string } | null {
+  try {
+    const [date, id] = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+    if (!/^\d{4}-\d{2}-\d{2}$/.test(date) || !/^[0-9a-f-]{36}$/i.test(id)) return null;
+    return { date, id };
+  } catch {
+    return null;
+  }
+}
+
 /**
  * API para listar procedimentos com descriptografia de dados sensíveis (LGPD)
  * Esta rota deve ser chamada pelo frontend para obter dados legíveis.
+ *
+ * Parâmetros:
+ * - userId | groupId: dono da listagem
+ * - limit: tamanho da página (padrão 500, máximo 1000)
+ * - fields=list: retorna apenas as colunas da listagem (LIST_COLUMNS)
+ * - cursor: paginação por cursor em (procedure_date, id). Vazio na primeira
+ *   página; a resposta passa a ser { data, nextCursor } (null na última).
+ * - offset: paginação legada por offset, usada quando não há cursor; a
+ *   resposta é o array de procedimentos.
  */
 export async function GET(req: NextRequest) {
   try {
@@ -18,19 +66,26 @@ export async function GET(req: NextRequest) {
     const { searchParams } = new URL(req.url);
     const userId = searchParams.get('userId');
     const groupId = searchParams.get('groupId');
-    const limit = parseInt(searchParams.get('limit') || '500');
+    const limit = Math.min(Math.max(parseInt(searchParams.get('limit') || '500') || 500, 1), MAX_LIMIT);
     const offset = parseInt(searchParams.get('offset') || '0');
+    const cursorParam = searchParams.get('cursor');
+    const columns = searchParams.get('fields') === 'list' ? LIST_COLUMNS : '*';
 
     if (!userId && !groupId) {
       return NextResponse.json({ error: 'userId ou groupId é obrigatório' }, { status: 400 });
     }
 
+    const cursor = cursorParam ? decodeCursor(cursorParam) : null;
+    if (cursorParam && !cursor) {
+      return NextResponse.json({ error: 'cursor inválido' }, { status: 400 });
+    }
+
     // 3. Buscar procedimentos
     let query = supabaseAdmin
       .from('procedures')
-      .select('*')
+      .select(columns)
       .order('procedure_date', { ascending: false })
-      .range(offset, offset + limit - 1);
+      .order('id', { ascending: false });
 
     if (groupId) {
       query = query.eq('group_id', groupId);
@@ -38,22 +93,38 @@ export async function GET(req: NextRequest) {
       query = query.eq('user_id', userId);
     }
 
+    if (cursorParam !== null) {
+      // Keyset: uma linha a mais indica se existe próxima página
+      if (cursor) {
+        query = query.or(
+          `procedure_date.lt.${cursor.date},and(procedure_date.eq.${cursor.date},id.lt.${cursor.id})`
+        );
+      }
+      query = query.limit(limit + 1);
+    } else {
+      query = query.range(offset, offset + limit - 1);
+    }
+
     const { data, error } = await query;
 
     if (error) throw error;
 
-    // 4. Descriptografar nomes dos pacientes
-    const decryptedData = (data || []).map(proc => ({
-      ...proc,
-      patient_name: decrypt(proc.patient_name || ''),
-      patient_phone: decrypt(proc.patient_phone || ''),
-      patient_email: decrypt(proc.patient_email || ''),
-      patient_notes: decrypt(proc.patient_notes || ''),
-      patient_companion: decrypt(proc.patient_companion || ''),
-      patient_companion_phone: decrypt(proc.patient_companion_phone || '')
-    }));
-
-    return NextResponse.json(decryptedData);
+    let rows = (data || []) as unknown as Record<string, any>[];
+    const hasMore = cursorParam !== null && rows.length > limit;
+    if (hasMore) rows = rows.slice(0, limit);
+
+    // 4. Descriptografar em lote (chave importada uma vez; páginas grandes
+    // são divididas entre worker threads). Campos fora da projeção são ignorados.
+    const decryptedData = await decryptFieldsParallel(rows, ENCRYPTED_FIELDS);
+
+    if (cursorParam === null) {
+      return NextResponse.json(decryptedData);
+    }
+
+    return NextResponse.json({
+      data: decryptedData,
+      nextCursor: hasMore ? encodeCursor(rows[rows.length - 1] as { procedure_date: string; id: string }) : null
+    });
   } catch (error: any) {
     console.error('[API-PROCEDURES-LIST] Erro:', error);
     return NextResponse.json({ error: error.message }, { status: 500 });
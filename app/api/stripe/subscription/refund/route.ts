@@ -2,6 +2,7 @@ import 'server-only'
 import { NextRequest, NextResponse } from 'next/server'
 import { createClient } from '@supabase/supabase-js'
 import { stripe } from '@/lib/stripe'
+import { invalidateSubscriptionAccess } from '@/lib/subscription-access'
 
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || ''
 const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY || ''
@@ -127,6 +128,8 @@ export async function POST(request: NextRequest) {
         })
         .eq('id', user.id)
 
+      invalidateSubscriptionAccess(user.id)
+
       return NextResponse.json({
         success: true,
         message: 'Reembolso processado com sucesso',
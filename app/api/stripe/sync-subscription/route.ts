@@ -2,6 +2,7 @@ import 'server-only'
 import { NextRequest, NextResponse } from 'next/server'
 import { createClient } from '@supabase/supabase-js'
 import { stripe } from '@/lib/stripe'
+import { invalidateSubscriptionAccess } from '@/lib/subscription-access'
 
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || ''
 const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY || ''
@@ -139,6 +140,8 @@ export async function POST(request: NextRequest) {
         })
         .eq('id', user.id)
 
+      invalidateSubscriptionAccess(user.id)
+
       return NextResponse.json({
         success: true,
         message: 'Assinatura sincronizada com sucesso',
@@ -177,6 +180,8 @@ export async function POST(request: NextRequest) {
         })
         .eq('id', user.id)
 
+      invalidateSubscriptionAccess(user.id)
+
       return NextResponse.json({
         success: true,
         message: 'Assinatura criada e sincronizada com sucesso',
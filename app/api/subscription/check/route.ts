@@ -1,6 +1,7 @@
 import 'server-only'
 import { NextRequest, NextResponse } from 'next/server'
 import { createClient } from '@supabase/supabase-js'
+import { createAccessDecisionCache } from '@/lib/subscription-access'
 
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || ''
 const supabaseAnonKey = process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY || ''
@@ -8,6 +9,10 @@ const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY || ''
 
 const TRIAL_DAYS = 7
 
+// Respostas por usuário; invalidadas pelos handlers de cobrança
+// (ver lib/subscription-access.ts)
+const accessCache = createAccessDecisionCache<Record<string, unknown>>()
+
 export async function GET(request: NextRequest) {
   try {
     const authHeader = request.headers.get('authorization')
@@ -25,6 +30,16 @@ export async function GET(request: NextRequest) {
       return NextResponse.json({ hasAccess: false, error: 'Não autorizado' }, { status: 401 })
     }
 
+    const cached = accessCache.get(user.id)
+    if (cached) {
+      return NextResponse.json(cached)
+    }
+
+    const respond = (body: Record<string, unknown>, validUntil?: string | Date | null) => {
+      accessCache.set(user.id, body, { hasAccess: body.hasAccess === true, validUntil })
+      return NextResponse.json(body)
+    }
+
     // Admin client para bypass de RLS
     const adminClient = supabaseUrl && supabaseServiceKey
       ? createClient(supabaseUrl, supabaseServiceKey, { auth: { autoRefreshToken: false, persistSession: false } })
@@ -47,14 +62,14 @@ export async function GET(request: NextRequest) {
     const now = new Date()
 
     if (sub && sub.status === 'active' && new Date(sub.current_period_end) > now) {
-      return NextResponse.json({
+      return respond({
         hasAccess: true,
         has_access: true,
         status: 'active',
         trial_days_left: 0,
         plan_type: sub.plan_type,
         trialInfo: null
-      })
+      }, sub.current_period_end)
     }
 
     // 2. Verificar trial — tentar buscar trial_ends_at do usuário
@@ -106,7 +121,7 @@ export async function GET(request: NextRequest) {
     const isInTrial = trialDaysLeft > 0
 
     if (isInTrial) {
-      return NextResponse.json({
+      return respond({
         hasAccess: true,
         has_access: true,
         status: 'trial',
@@ -118,11 +133,11 @@ export async function GET(request: NextRequest) {
           isInTrial: true,
           daysRemaining: trialDaysLeft
         }
-      })
+      }, trialEndDate)
     }
 
     // Sem acesso
-    return NextResponse.json({
+    return respond({
       hasAccess: false,
       has_access: false,
       status: 'inactive',
@@ -3,13 +3,13 @@ import { waitUntil } from '@vercel/functions';
 import { logger } from '@/lib/logger';
 import { validateMetaSignature, sendWhatsAppMessage, sendWhatsAppButtons, markMessageAsRead } from '@/lib/providers/whatsapp/meta';
 import { supabaseAdmin } from '@/lib/supabase-server';
-import { processWhatsAppMessage } from '@/lib/queue/processor';
+import { enqueueWhatsAppJob, runWorker } from '@/lib/queue/worker';
 import { MetaWebhookBody } from '@/types/meta';
 import { decrypt, encrypt } from '@/lib/security';
 import { adminNotifier } from '@/lib/notifications/admin-service';
 
 export const runtime = 'nodejs';
-export const maxDuration = 60; // Aumentar para suportar processamento inicial se necessário
+export const maxDuration = 60; // Worker iniciado após a resposta (waitUntil)
 
 const VERIFY_TOKEN = process.env.META_VERIFY_TOKEN || process.env.WHATSAPP_VERIFY_TOKEN;
 
@@ -557,8 +557,11 @@ export async function POST(req: NextRequest) {
         return NextResponse.json({ status: 'unlinked_media_handled' });
       }
 
-      // Disparar processamento assíncrono profissional
-      waitUntil(processWhatsAppMessage(message));
+      // Enfileirar (fila durável, lib/queue/worker.ts) e já iniciar um worker
+      // após a resposta; se esta função for encerrada antes do fim, o job volta
+      // para a fila e o cron /api/cron/whatsapp-worker o retoma
+      await enqueueWhatsAppJob(message);
+      waitUntil(runWorker({ maxRuntimeMs: 45_000 }).catch(e => logger.error('Error running WhatsApp worker', e)));
       
       // Feedback imediato
       await sendWhatsAppMessage(from, "📸 *Recebi sua ficha!*\n\nJá estou analisando os dados com IA. Isso pode levar alguns segundos...🩺🚀");
@@ -322,6 +322,11 @@ const EditField = memo(({
 
 EditField.displayName = 'EditField'
 
+// Tamanho das páginas de /api/procedures/list: a primeira cobre a tela
+// inicial, as seguintes trazem o restante do histórico em segundo plano
+const FIRST_PAGE_SIZE = 50
+const STREAM_PAGE_SIZE = 250
+
 function ProcedimentosContent() {
   const router = useRouter()
   const { addToast } = useToast()
@@ -515,8 +520,8 @@ const [visibleProceduresCount, setVisibleProceduresCount] = useState(10)
       if (procedureId && procedures.length > 0) {
         const procedure = procedures.find(p => p.id === procedureId)
         if (procedure) {
-          setSelectedProcedure(procedure)
-          setShowDetailsModal(true)
+          // A lista tem só as colunas da listagem; o modal precisa do registro completo
+          handleProcedureClick(procedure)
           // Limpar os parâmetros da URL para evitar re-abertura ao recarregar
           const newUrl = window.location.pathname
           window.history.replaceState({}, '', newUrl)
@@ -639,63 +644,83 @@ const [visibleProceduresCount, setVisibleProceduresCount] = useState(10)
     setVisibleProceduresCount(10)
   }, [debouncedSearchTerm, statusFilter, dateFilter, valueFilter, procedures, specialFilter, groupFilter])
 
+  // Status de feedback e existência de anexos para uma página de procedimentos
+  const loadListStatuses = async (procedureIds: string[]) => {
+    if (procedureIds.length === 0) return
+
+    // OTIMIZAÇÃO: Batch queries para status de feedback e contagem de anexos
+    const [{ data: feedbackLinks }, { data: attachmentsCount }] = await Promise.all([
+      supabase
+        .from('feedback_links')
+        .select('procedure_id, responded_at')
+        .in('procedure_id', procedureIds),
+      // Apenas verificar se existem anexos, sem carregá-los
+      supabase
+        .from('procedure_attachments')
+        .select('procedure_id')
+        .in('procedure_id', procedureIds)
+    ])
+
+    const feedbackByProcedure = new Map((feedbackLinks || []).map(fl => [fl.procedure_id, fl] as const))
+    const withAttachments = new Set((attachmentsCount || []).map(ac => ac.procedure_id))
+
+    const feedbackStatusesMap: Record<string, {linkCriado: boolean, respondido: boolean}> = {}
+    const hasAttachmentsMap: Record<string, boolean> = {}
+    procedureIds.forEach(procedureId => {
+      const feedbackLink = feedbackByProcedure.get(procedureId)
+      feedbackStatusesMap[procedureId] = {
+        linkCriado: !!feedbackLink,
+        respondido: !!feedbackLink?.responded_at
+      }
+      hasAttachmentsMap[procedureId] = withAttachments.has(procedureId)
+    })
+
+    setFeedbackStatuses(prev => ({ ...prev, ...feedbackStatusesMap }))
+    setHasAttachments(prev => ({ ...prev, ...hasAttachmentsMap }))
+  }
+
+  // Incrementado a cada carga para interromper o streaming de uma carga anterior
+  const loadGenerationRef = useRef(0)
+
   const loadProcedures = async () => {
     if (!user?.id) return
-    
+
+    const generation = ++loadGenerationRef.current
     setLoading(true)
     try {
-      // Limitar quantidade inicial para evitar travamentos em contas com muitos anos de uso
-      const data = await procedureService.getProcedures(user.id, { limit: 500 })
-      setProcedures(data)
-      
+      // Primeira tela em uma requisição pequena, só com as colunas da listagem;
+      // o registro completo é buscado ao abrir o modal de detalhes
+      const first = await procedureService.getProceduresPage(user.id, { limit: FIRST_PAGE_SIZE })
+      if (generation !== loadGenerationRef.current) return
+      setProcedures(first.data)
+
       // OTIMIZAÇÃO: Lazy loading - não carregar anexos automaticamente
       // Os anexos serão carregados apenas quando o usuário expandir um procedimento
-      const attachmentsMap: Record<string, ProcedureAttachment[]> = {}
-      
-      // OTIMIZAÇÃO: Batch queries para status de feedback e contagem de anexos
-      // Buscar status de feedback e contagem de anexos para todos os procedimentos de uma vez
-      const procedureIds = data.map(p => p.id)
-      const feedbackStatusesMap: Record<string, {linkCriado: boolean, respondido: boolean}> = {}
-      const hasAttachmentsMap: Record<string, boolean> = {}
-      
-      if (procedureIds.length > 0) {
-        // Buscar todos os feedbacks de uma vez
-        const { data: feedbackLinks } = await supabase
-          .from('feedback_links')
-          .select('procedure_id, responded_at')
-          .in('procedure_id', procedureIds)
-        
-        // Buscar contagem de anexos (apenas verificar se existem, não carregar todos)
-        const { data: attachmentsCount } = await supabase
-          .from('procedure_attachments')
-          .select('procedure_id')
-          .in('procedure_id', procedureIds)
-        
-        // Processar resultados
-        procedureIds.forEach(procedureId => {
-          const feedbackLink = feedbackLinks?.find(fl => fl.procedure_id === procedureId)
-          feedbackStatusesMap[procedureId] = {
-            linkCriado: !!feedbackLink,
-            respondido: !!feedbackLink?.responded_at
-          }
-          
-          // Verificar se tem anexos (sem carregar os anexos)
-          hasAttachmentsMap[procedureId] = !!attachmentsCount?.find(ac => ac.procedure_id === procedureId)
-        })
+      setProcedureAttachments({})
+      setFeedbackStatuses({})
+      setHasAttachments({})
+      setLoading(false)
+      await loadListStatuses(first.data.map(p => p.id))
+
+      // Restante do histórico em segundo plano, página a página
+      let cursor = first.nextCursor
+      while (cursor && generation === loadGenerationRef.current) {
+        const page = await procedureService.getProceduresPage(user.id, { cursor, limit: STREAM_PAGE_SIZE })
+        if (generation !== loadGenerationRef.current) return
+        setProcedures(prev => [...prev, ...page.data])
+        await loadListStatuses(page.data.map(p => p.id))
+        cursor = page.nextCursor
       }
-      
-      setProcedureAttachments(attachmentsMap)
-      setFeedbackStatuses(feedbackStatusesMap)
-      
-      // Salvar informações sobre quais procedimentos têm anexos (para mostrar ícone)
-      setHasAttachments(hasAttachmentsMap)
     } catch (error) {
       
     } finally {
-      setLoading(false)
+      if (generation === loadGenerationRef.current) setLoading(false)
     }
   }
 
+  // Interromper o streaming ao sair da página
+  useEffect(() => () => { loadGenerationRef.current++ }, [])
+
   // Função para carregar anexos sob demanda (lazy loading)
   const loadAttachmentsForProcedure = async (procedureId: string) => {
     // Verificar se já está carregado
@@ -39,11 +39,13 @@ function RelatoriosContent() {
     if (!user?.id) return
     setFetchingData(true)
     try {
+      // Só os agregados: as linhas de procedimentos ficam para a exportação
       const data = await reportService.generateReportData(
         user.id,
         dateRange.start,
         dateRange.end,
-        selectedGroupId === 'particular' ? undefined : selectedGroupId
+        selectedGroupId === 'particular' ? undefined : selectedGroupId,
+        { includeProcedures: false }
       )
       setReportData(data)
     } catch (error) {
@@ -78,14 +80,40 @@ function RelatoriosContent() {
     loadReportData()
   }, [user?.id, dateRange.start, dateRange.end, selectedGroupId])
 
+  // Relatório completo (com as linhas de procedimentos) para exportar
+  const loadFullReport = async (): Promise<ReportData | null> => {
+    if (!user?.id || !reportData) return null
+    setLoading(true)
+    try {
+      return await reportService.generateReportData(
+        user.id,
+        dateRange.start,
+        dateRange.end,
+        selectedGroupId === 'particular' ? undefined : selectedGroupId
+      )
+    } catch (error) {
+      console.error('Erro ao carregar dados do relatório:', error)
+      addToast({
+        title: 'Erro ao exportar',
+        description: 'Não foi possível carregar os procedimentos do período.',
+        variant: 'error'
+      })
+      return null
+    } finally {
+      setLoading(false)
+    }
+  }
+
   const handleExportCSV = async () => {
-    if (!reportData) return
-    reportService.exportToCSV(reportData)
+    const fullReport = await loadFullReport()
+    if (!fullReport) return
+    reportService.exportToCSV(fullReport)
   }
 
   const handleExportPDF = async () => {
-    if (!reportData) return
-    reportService.exportToPDF(reportData)
+    const fullReport = await loadFullReport()
+    if (!fullReport) return
+    reportService.exportToPDF(fullReport)
   }
 
   const comparisonAndStats = useMemo(() => {
@@ -183,7 +211,7 @@ function RelatoriosContent() {
             <Button
               variant="outline"
               onClick={handleExportCSV}
-              disabled={fetchingData || !reportData}
+              disabled={fetchingData || loading || !reportData}
               className="hidden sm:flex"
             >
               <FileSpreadsheet className="w-4 h-4 mr-2" />
@@ -191,7 +219,7 @@ function RelatoriosContent() {
             </Button>
             <Button 
               onClick={handleExportPDF} 
-              disabled={fetchingData || !reportData}
+              disabled={fetchingData || loading || !reportData}
               className="bg-teal-600 hover:bg-teal-700 shadow-md"
             >
               <FileText className="w-4 h-4 mr-2" />
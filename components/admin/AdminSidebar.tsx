@@ -14,7 +14,8 @@ import {
   ChevronRight,
   Menu,
   X,
-  Sparkles
+  Sparkles,
+  Timer
 } from 'lucide-react'
 import { supabase } from '@/lib/supabase'
 import { Logo } from '@/components/ui/Logo'
@@ -26,6 +27,7 @@ const navItems = [
   { href: '/admin/mensagens', label: 'Campanhas', icon: Sparkles },
   { href: '/admin/stats', label: 'Estatísticas', icon: BarChart3 },
   { href: '/admin/error-logs', label: 'Logs de Erro', icon: Bug },
+  { href: '/admin/pipeline', label: 'Desempenho OCR', icon: Timer },
 ]
 
 export function AdminSidebar() {
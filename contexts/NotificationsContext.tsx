@@ -26,72 +26,115 @@ interface NotificationsContextType {
 
 const NotificationsContext = createContext<NotificationsContextType | undefined>(undefined)
 
-// Cache de notificações com TTL de 30 segundos
-const NOTIFICATIONS_CACHE_TTL = 30000
-let notificationsCache: {
-  data: Notification[]
-  timestamp: number
+/**
+ * Cache local das notificações não lidas, por usuário (sobrevive a remontagens
+ * do provider). Sincronização incremental: o Realtime entrega inserts e
+ * updates; ao (re)conectar o canal buscamos só as linhas com updated_at a
+ * partir do cursor (maior updated_at já visto). Não há polling, então uma aba
+ * ociosa não faz consultas.
+ */
+type NotificationsCache = {
   userId: string
-} | null = null
+  byId: Map<string, Notification>
+  cursor: number | null // ms do maior updated_at aplicado
+}
+
+let notificationsCache: NotificationsCache | null = null
+
+function getCache(userId: string): NotificationsCache {
+  if (!notificationsCache || notificationsCache.userId !== userId) {
+    notificationsCache = { userId, byId: new Map(), cursor: null }
+  }
+  return notificationsCache
+}
+
+// Aplica linhas novas ou alteradas: lidas saem do cache, não lidas entram ou
+// são substituídas. Idempotente, então a mesma linha pode chegar pelo
+// Realtime e pela busca incremental.
+function applyChanges(cache: NotificationsCache, rows: Notification[]) {
+  for (const row of rows) {
+    const stamp = Date.parse(row.updated_at || row.created_at)
+    if (!isNaN(stamp) && (cache.cursor === null || stamp > cache.cursor)) {
+      cache.cursor = stamp
+    }
+    if (row.is_read) {
+      cache.byId.delete(row.id)
+    } else {
+      cache.byId.set(row.id, row)
+    }
+  }
+}
+
+function unreadList(cache: NotificationsCache): Notification[] {
+  return Array.from(cache.byId.values()).sort((a, b) => b.created_at.localeCompare(a.created_at))
+}
 
 export function NotificationsProvider({ children }: { children: ReactNode }) {
   const { user } = useAuth()
   const [notifications, setNotifications] = useState<Notification[]>([])
   const [isLoading, setIsLoading] = useState(true)
 
-  const unreadNotifications = notifications.filter(n => !n.is_read).length
+  // A lista só contém não lidas: o contador acompanha o cache sem consulta
+  const unreadNotifications = notifications.length
 
-  // Carregar notificações com cache
-  const loadNotifications = async (forceRefresh = false) => {
-    if (!user) {
-      setNotifications([])
-      setIsLoading(false)
-      return
-    }
+  const publish = React.useCallback((cache: NotificationsCache) => {
+    setNotifications(unreadList(cache))
+  }, [])
 
+  // Carga completa das não lidas (primeira vez ou refresh explícito)
+  const loadNotifications = React.useCallback(async (userId: string) => {
     try {
-      const now = Date.now()
-
-      // Verificar cache se não for refresh forçado
-      if (
-        !forceRefresh &&
-        notificationsCache &&
-        notificationsCache.userId === user.id &&
-        now - notificationsCache.timestamp < NOTIFICATIONS_CACHE_TTL
-      ) {
-        setNotifications(notificationsCache.data)
-        setIsLoading(false)
-        return
-      }
-
       const { data, error } = await supabase
         .from('notifications')
         .select('*')
-        .eq('user_id', user.id)
+        .eq('user_id', userId)
         .eq('is_read', false)
         .order('created_at', { ascending: false })
 
       if (error) {
         console.error('Erro ao carregar notificações:', error)
-        setNotifications([])
-      } else {
-        const notificationsData = data || []
-        setNotifications(notificationsData)
-
-        // Atualizar cache
-        notificationsCache = {
-          data: notificationsData,
-          timestamp: now,
-          userId: user.id,
-        }
+        return
       }
+
+      notificationsCache = { userId, byId: new Map(), cursor: null }
+      applyChanges(notificationsCache, (data || []) as Notification[])
+      publish(notificationsCache)
     } catch (error) {
       console.error('Erro ao carregar notificações:', error)
-      setNotifications([])
     } finally {
       setIsLoading(false)
     }
-  }
+  }, [publish])
+
+  // Busca incremental: tudo (lidas inclusive) que mudou desde o cursor
+  const syncSinceCursor = React.useCallback(async (userId: string) => {
+    const cache = getCache(userId)
+    if (cache.cursor === null) {
+      await loadNotifications(userId)
+      return
+    }
+
+    try {
+      const { data, error } = await supabase
+        .from('notifications')
+        .select('*')
+        .eq('user_id', userId)
+        .gte('updated_at', new Date(cache.cursor).toISOString())
+        .order('updated_at', { ascending: true })
+
+      if (error) {
+        console.error('Erro ao sincronizar notificações:', error)
+        return
+      }
+
+      if (data && data.length > 0) {
+        applyChanges(cache, data as Notification[])
+        publish(cache)
+      }
+    } catch (error) {
+      console.error('Erro ao sincronizar notificações:', error)
+    }
+  }, [loadNotifications, publish])
 
   // Marcar notificação como lida (remove da lista, pois lista só exibe não lidas)
   const markNotificationAsRead = React.useCallback(async (notificationId: string): Promise<void> => {
@@ -101,21 +144,20 @@ export function NotificationsProvider({ children }: { children: ReactNode }) {
         .update({ is_read: true })
         .eq('id', notificationId)
 
-      if (!error) {
-        // Remover da lista local imediatamente
-        setNotifications(prev => prev.filter(n => n.id !== notificationId))
-        // Invalidar cache para o próximo refresh buscar dados frescos
-        notificationsCache = null
+      if (!error && notificationsCache) {
+        // Remover da lista local imediatamente (o update do Realtime é idempotente)
+        notificationsCache.byId.delete(notificationId)
+        publish(notificationsCache)
       }
     } catch (error) {
       console.error('Erro ao marcar notificação como lida:', error)
     }
-  }, [])
+  }, [publish])
 
   // Marcar todas como lidas (limpa a lista inteira)
   const markAllNotificationsAsRead = React.useCallback(async (): Promise<void> => {
     try {
-      const unreadIds = notifications.filter(n => !n.is_read).map(n => n.id)
+      const unreadIds = notifications.map(n => n.id)
       if (unreadIds.length === 0) return
 
       const { error } = await supabase
@@ -123,37 +165,44 @@ export function NotificationsProvider({ children }: { children: ReactNode }) {
         .update({ is_read: true })
         .in('id', unreadIds)
 
-      if (!error) {
+      if (!error && notificationsCache) {
         // Limpar lista local imediatamente
-        setNotifications([])
-        // Invalidar cache
-        notificationsCache = null
+        for (const id of unreadIds) notificationsCache.byId.delete(id)
+        publish(notificationsCache)
       }
     } catch (error) {
       console.error('Erro ao marcar todas notificações como lidas:', error)
     }
-  }, [notifications])
+  }, [notifications, publish])
 
-  // Atualizar notificações (forçar refresh)
+  // Atualizar notificações (forçar carga completa)
   const refreshNotifications = React.useCallback(async (): Promise<void> => {
-    await loadNotifications(true)
-  }, [user])
+    if (user) await loadNotifications(user.id)
+  }, [user, loadNotifications])
 
-  // Carregar dados iniciais
+  // Carregar dados iniciais: do cache local quando já existe para o usuário
+  // (a busca incremental roda quando o canal conectar)
   useEffect(() => {
-    if (user) {
-      loadNotifications()
-    } else {
+    if (!user) {
       setNotifications([])
       setIsLoading(false)
+      return
+    }
+
+    if (notificationsCache && notificationsCache.userId === user.id && notificationsCache.cursor !== null) {
+      publish(notificationsCache)
+      setIsLoading(false)
+    } else {
+      loadNotifications(user.id)
     }
-  }, [user])
+  }, [user, loadNotifications, publish])
 
-  // Atualizar notificações a cada 30 segundos
+  // Realtime: inserts e updates do usuário; a cada (re)conexão, busca o que
+  // mudou enquanto o canal estava fora
   useEffect(() => {
     if (!user) return
-    
-    // Configurar assinatura em tempo real para novas notificações
+    const userId = user.id
+
     const channel = supabase
       .channel('notifications_changes')
       .on(
@@ -162,13 +211,13 @@ export function NotificationsProvider({ children }: { children: ReactNode }) {
           event: 'INSERT',
           schema: 'public',
           table: 'notifications',
-          filter: `user_id=eq.${user.id}`
+          filter: `user_id=eq.${userId}`
         },
         (payload) => {
-          // Adicionar nova notificação ao início da lista
-          const newNotification = payload.new as Notification
-          setNotifications(prev => [newNotification, ...prev])
-          
+          const cache = getCache(userId)
+          applyChanges(cache, [payload.new as Notification])
+          publish(cache)
+
           // Tocar som de notificação (opcional)
           try {
             const audio = new Audio('/notification.mp3')
@@ -176,17 +225,30 @@ export function NotificationsProvider({ children }: { children: ReactNode }) {
           } catch (e) {}
         }
       )
-      .subscribe()
-
-    const interval = setInterval(() => {
-      loadNotifications()
-    }, 30000)
+      .on(
+        'postgres_changes',
+        {
+          event: 'UPDATE',
+          schema: 'public',
+          table: 'notifications',
+          filter: `user_id=eq.${userId}`
+        },
+        (payload) => {
+          const cache = getCache(userId)
+          applyChanges(cache, [payload.new as Notification])
+          publish(cache)
+        }
+      )
+      .subscribe((status) => {
+        if (status === 'SUBSCRIBED') {
+          syncSinceCursor(userId)
+        }
+      })
 
     return () => {
-      clearInterval(interval)
       supabase.removeChannel(channel)
     }
-  }, [user])
+  }, [user, publish, syncSinceCursor])
 
   const value = React.useMemo(() => ({
     notifications,
@@ -2,8 +2,7 @@
 
 import { useState, useEffect, useCallback } from 'react'
 import { supabase } from '@/lib/supabase'
-import { despesaService } from '@/lib/despesas'
-import type { DadosFinanceirosGrupo } from '@/lib/exportarRelatorioContador'
+import { consolidarAnual, type DadosFinanceirosGrupo } from '@/lib/exportarRelatorioContador'
 
 const MESES_PT = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
 
@@ -37,136 +36,68 @@ export function useFinanceiroDashboard({ groupId, groupName, groupMembers, curre
 
       const anoAtual = new Date().getFullYear()
       const mesAtual = new Date().getMonth() // 0-based
-      const mesAnterior = mesAtual === 0 ? 11 : mesAtual - 1
-      const anoMesAnterior = mesAtual === 0 ? anoAtual - 1 : anoAtual
-
-      // Buscar todos os procedimentos do grupo no ano
-      const { data: procs, error } = await supabase
-        .from('procedures')
-        .select('*')
-        .eq('group_id', groupId)
-        .gte('procedure_date', `${anoAtual}-01-01`)
-        .lte('procedure_date', `${anoAtual}-12-31`)
-        .order('procedure_date', { ascending: true })
-
-      if (error) throw error
-
-      const procedures = procs || []
+      const chaveMes = (ano: number, mes: number) => `${ano}-${String(mes + 1).padStart(2, '0')}`
+
+      // Consolidação mensal (group_financial_monthly, mantida por triggers em
+      // procedures/despesas): uma linha por mês em vez de todos os procedimentos.
+      // O intervalo começa antes de janeiro quando os últimos 6 meses ou o mês
+      // anterior caem no ano passado.
+      const inicio = mesAtual >= 5 ? `${anoAtual}-01-01` : `${chaveMes(anoAtual - 1, mesAtual + 7)}-01`
+
+      const [mesesRes, membrosRes] = await Promise.all([
+        supabase
+          .from('group_financial_monthly')
+          .select('month, procedures_count, revenue, receivable, revenue_cnpj, revenue_cpf, payment_methods, despesas_total, despesas_grupo')
+          .eq('group_id', groupId)
+          .gte('month', inicio)
+          .lte('month', `${anoAtual}-12-01`),
+        supabase
+          .from('group_member_financial_monthly')
+          .select('month, user_id, revenue, revenue_cnpj, revenue_cpf, despesas')
+          .eq('group_id', groupId)
+          .gte('month', `${anoAtual}-01-01`)
+          .lte('month', `${anoAtual}-12-01`)
+      ])
+
+      if (mesesRes.error) throw mesesRes.error
+      if (membrosRes.error) throw membrosRes.error
+
+      const porMes = new Map((mesesRes.data || []).map(r => [r.month.slice(0, 7), r]))
+      const linhasMembros = membrosRes.data || []
 
       // =============== CÁLCULOS ANUAIS ===============
-      const faturamentoBruto = procedures.reduce((s, p) => s + (p.procedure_value || 0), 0)
-      const aReceberAnual = procedures
-        .filter(p => p.payment_status !== 'paid')
-        .reduce((s, p) => s + (p.procedure_value || 0), 0)
-      const procedimentosTotal = procedures.length
-      const ticketMedio = procedimentosTotal > 0 ? Math.round(faturamentoBruto / procedimentosTotal) : 0
-
-      // Faturamento mensal
-      const faturamentoMensal = MESES_PT.map((mes, idx) => {
-        const procsDoMes = procedures.filter(p => {
-          const d = new Date(p.procedure_date + 'T00:00:00')
-          return d.getMonth() === idx
-        })
-        return { mes, valor: procsDoMes.reduce((s, p) => s + (p.procedure_value || 0), 0) }
-      })
-
-      // Distribuição CNPJ vs CPF
-      let totalCnpj = 0
-      let totalCpf = 0
-      for (const p of procedures) {
-        if (p.billing_entity_type === 'cnpj_grupo') {
-          totalCnpj += p.procedure_value || 0
-        } else {
-          totalCpf += p.procedure_value || 0
-        }
-      }
-
-      // Buscar despesas do grupo no ano
-      const despesas = await despesaService.getTotalByGroup(groupId, anoAtual)
-
-      // Buscar todas as despesas detalhadas para calcular as mensais
-      const { data: todasDespesasGroup } = await supabase
-        .from('despesas')
-        .select('*')
-        .eq('group_id', groupId)
-        .gte('data_despesa', `${anoAtual}-01-01`)
-        .lte('data_despesa', `${anoAtual}-12-31`)
-      const todasDespesas = todasDespesasGroup || []
-
-      // Cotistas
+      // Mesma consolidação do relatório do contador gerado no servidor
+      const anual = consolidarAnual(anoAtual, mesesRes.data || [], linhasMembros, groupMembers, currentUserId)
       const totalCotistas = groupMembers.length
-      const liquidoDistribuivel = faturamentoBruto - despesas
-      const cotaIndividual = totalCotistas > 0 ? Math.round(liquidoDistribuivel / totalCotistas) : 0
-
-      let minhaCotaPercentual = 0
-      let minhaCotaAnual = 0
-
-      const cotistas = groupMembers.map(m => {
-        const userId = m.users?.id || ''
-        const procsDoMembro = procedures.filter(p =>
-          p.anesthesiologist_user_id === userId || p.user_id === userId
-        )
-        const recebidoCnpj = procsDoMembro
-          .filter(p => p.billing_entity_type === 'cnpj_grupo')
-          .reduce((s, p) => s + (p.procedure_value || 0), 0)
-        const recebidoCpf = procsDoMembro
-          .filter(p => p.billing_entity_type !== 'cnpj_grupo')
-          .reduce((s, p) => s + (p.procedure_value || 0), 0)
-
-        const userQuota = m.quota_percent || Math.round(100 / totalCotistas)
-        
-        if (currentUserId && userId === currentUserId) {
-          minhaCotaPercentual = userQuota
-          minhaCotaAnual = (liquidoDistribuivel * userQuota) / 100
+      const minhaCotaPercentual = anual.minhaCotaPercentual || 0
+
+      // Totais por membro no mês atual
+      const chaveMesAtual = chaveMes(anoAtual, mesAtual)
+      const membroMes = new Map<string, { producao: number; despesas: number }>()
+      for (const r of linhasMembros) {
+        if (r.month.slice(0, 7) === chaveMesAtual) {
+          membroMes.set(r.user_id, { producao: Number(r.revenue), despesas: Number(r.despesas) })
         }
-
-        return {
-          nome: m.users?.name || 'Membro',
-          crm: m.users?.crm || '',
-          cota: userQuota,
-          valorCota: (liquidoDistribuivel * userQuota) / 100,
-          recebidoCnpj,
-          recebidoCpf
-        }
-      })
+      }
 
       // =============== CÁLCULOS MENSAIS ===============
-      const procsDoMesAtual = procedures.filter(p => {
-        const d = new Date(p.procedure_date + 'T00:00:00')
-        return d.getMonth() === mesAtual
-      })
+      const mesDados = porMes.get(chaveMesAtual)
+      const faturamentoMes = mesDados ? Number(mesDados.revenue) : 0
+      const aReceberMes = mesDados ? Number(mesDados.receivable) : 0
 
-      const faturamentoMes = procsDoMesAtual.reduce((s, p) => s + (p.procedure_value || 0), 0)
-      const aReceberMes = procsDoMesAtual
-        .filter(p => p.payment_status !== 'paid')
-        .reduce((s, p) => s + (p.procedure_value || 0), 0)
-
-      // Mês anterior (pode ser do ano anterior, mas buscamos só do ano atual acima, então pode ser 0)
-      let faturamentoMesAnterior = 0
-      if (mesAnterior >= 0) {
-        const procsMesAnterior = procedures.filter(p => {
-          const d = new Date(p.procedure_date + 'T00:00:00')
-          return d.getMonth() === mesAnterior && d.getFullYear() === anoMesAnterior
-        })
-        faturamentoMesAnterior = procsMesAnterior.reduce((s, p) => s + (p.procedure_value || 0), 0)
-      }
+      // Mês anterior (dezembro do ano passado quando estamos em janeiro)
+      const mesAnteriorDados = mesAtual === 0
+        ? porMes.get(chaveMes(anoAtual - 1, 11))
+        : porMes.get(chaveMes(anoAtual, mesAtual - 1))
+      const faturamentoMesAnterior = mesAnteriorDados ? Number(mesAnteriorDados.revenue) : 0
 
       const variacaoPct = faturamentoMesAnterior > 0
         ? ((faturamentoMes - faturamentoMesAnterior) / faturamentoMesAnterior) * 100
         : 0
 
-      // Despesas do mês
-      const despesasDoMes = todasDespesas.filter(d => {
-        const date = new Date(d.data_despesa + 'T00:00:00')
-        return date.getMonth() === mesAtual && date.getFullYear() === anoAtual
-      })
       // Despesas vinculadas ao grupo (sem anesthesiologist_id) vs receita via CNPJ do grupo
-      const despesasGrupoMes = despesasDoMes
-        .filter(d => !d.anesthesiologist_id)
-        .reduce((s, d) => s + (d.valor || 0), 0)
-      const receitaCnpjGrupoMes = procsDoMesAtual
-        .filter(p => p.billing_entity_type === 'cnpj_grupo')
-        .reduce((s, p) => s + (p.procedure_value || 0), 0)
+      const despesasGrupoMes = mesDados ? Number(mesDados.despesas_grupo) : 0
+      const receitaCnpjGrupoMes = mesDados ? Number(mesDados.revenue_cnpj) : 0
 
       const liquidoDistribuivelMes = faturamentoMes - despesasGrupoMes
 
@@ -176,18 +107,15 @@ export function useFinanceiroDashboard({ groupId, groupName, groupMembers, curre
       // Calcular detalhamento de membros no mês atual
       const detalhamentoMembros = groupMembers.map(m => {
         const userId = m.users?.id || ''
-        const procsDoMembroMes = procsDoMesAtual.filter(p =>
-          p.anesthesiologist_user_id === userId || p.user_id === userId
-        )
-        const producaoOriginal = procsDoMembroMes.reduce((s, p) => s + (p.procedure_value || 0), 0)
+        const doMes = membroMes.get(userId)
+        const producaoOriginal = doMes?.producao || 0
         
         const cotaPercentual = m.quota_percent || (totalCotistas > 0 ? (100 / totalCotistas) : 0)
         const producaoOuCota = isQuotaGroup 
           ? (liquidoDistribuivelMes * cotaPercentual) / 100 
           : producaoOriginal
 
-        const despesasMembroMes = despesasDoMes.filter(d => d.anesthesiologist_id === userId)
-        const despesas = despesasMembroMes.reduce((s, d) => s + (d.valor || 0), 0)
+        const despesas = doMes?.despesas || 0
 
         const aReceber = producaoOuCota - despesas
 
@@ -208,24 +136,17 @@ export function useFinanceiroDashboard({ groupId, groupName, groupMembers, curre
         let m = mesAtual - i
         let y = anoAtual
         if (m < 0) { m += 12; y -= 1 }
-        const procsM = procedures.filter(p => {
-          const d = new Date(p.procedure_date + 'T00:00:00')
-          return d.getMonth() === m && d.getFullYear() === y
-        })
+        const r = porMes.get(chaveMes(y, m))
         ultimos6Meses.push({
           mes: getMesNome(m),
-          valor: procsM.reduce((s, p) => s + (p.procedure_value || 0), 0)
+          valor: r ? Number(r.revenue) : 0
         })
       }
 
       // Recebimentos por meio de pagamento
-      const meioMap = new Map<string, number>()
-      for (const p of procsDoMesAtual) {
-        const meio = p.payment_method || p.forma_pagamento || 'Não informado'
-        meioMap.set(meio, (meioMap.get(meio) || 0) + (p.procedure_value || 0))
-      }
-      const recebimentosPorMeio = Array.from(meioMap.entries())
-        .map(([meio, valor]) => ({ meio, valor }))
+      const meios = (mesDados?.payment_methods || {}) as Record<string, number>
+      const recebimentosPorMeio = Object.entries(meios)
+        .map(([meio, valor]) => ({ meio, valor: Number(valor) }))
         .sort((a, b) => b.valor - a.valor)
 
       const mesRef = `${MESES_PT[mesAtual]} ${anoAtual}`
@@ -237,26 +158,7 @@ export function useFinanceiroDashboard({ groupId, groupName, groupMembers, curre
           totalCotistas,
           isQuotaGroup
         },
-        anual: {
-          ano: anoAtual,
-          faturamentoBruto,
-          despesas,
-          liquidoDistribuivel,
-          cotaIndividual,
-          minhaCotaPercentual,
-          minhaCotaAnual,
-          procedimentos: procedimentosTotal,
-          ticketMedio,
-          glosado: 0,
-          glosaRecuperada: 0,
-          glosaEmAberto: 0,
-          parcelamentosAVencer: 0,
-          aReceber: aReceberAnual,
-          faturamentoMensal,
-          distribuicao: { cnpj: totalCnpj, cpf: totalCpf },
-          cpfPorFonte: { fontePJ: totalCpf, fontePF: 0, irrfRetido: 0, inssRetido: 0 },
-          cotistas
-        },
+        anual,
         mensal: {
           mesReferencia: mesRef,
           faturamento: faturamentoMes,
@@ -264,7 +166,7 @@ export function useFinanceiroDashboard({ groupId, groupName, groupMembers, curre
           variacaoPct,
           cotaDoMes,
           minhaCotaMensal,
-          procedimentos: procsDoMesAtual.length,
+          procedimentos: mesDados?.procedures_count || 0,
           ultimos6Meses,
           recebimentosPorMeio,
           glosado: 0,
@@ -0,0 +1,98 @@
+import { logger } from '@/lib/logger';
+
+/**
+ * Normalização das fotos de ficha antes do Vision.
+ *
+ * Fotos de celular chegam com 3–12 MP, rotação só no EXIF e bordas inúteis.
+ * O modelo reduz a imagem para ~768px no menor lado de qualquer forma, então
+ * mandar o original só custa upload, base64 e latência. Aqui:
+ *   1. aplica a orientação do EXIF (rotate) e descarta os metadados;
+ *   2. recorta bordas uniformes em volta do documento (trim);
+ *   3. reduz para 768px no menor lado, sem ampliar;
+ *   4. recodifica em JPEG (o data URL enviado à OpenAI já diz image/jpeg).
+ *
+ * O resultado é determinístico, então o hash do cache de Vision
+ * (lib/ai/vision-cache.ts) continua estável para a mesma foto. Sem o sharp
+ * (binário indisponível na plataforma) ou se a imagem não decodificar, segue
+ * com o buffer original.
+ */
+
+const TARGET_SHORT_SIDE = 768;
+const JPEG_QUALITY = 80;
+// Tolerância do trim: diferença de cor em relação ao pixel do canto
+const TRIM_THRESHOLD = 20;
+
+export interface PreprocessedImage {
+  buffer: Buffer;
+  processed: boolean;
+  inputBytes: number;
+  outputBytes: number;
+  width?: number;
+  height?: number;
+  durationMs: number;
+}
+
+type Sharp = typeof import('sharp');
+
+let sharpModule: Promise<Sharp | null> | undefined;
+
+function loadSharp(): Promise<Sharp | null> {
+  if (!sharpModule) {
+    sharpModule = import('sharp')
+      .then(mod => ((mod as any).default ?? mod) as Sharp)
+      .catch(error => {
+        logger.warn('sharp unavailable, images will be sent without preprocessing', { message: error?.message });
+        return null;
+      });
+  }
+  return sharpModule;
+}
+
+export async function preprocessImageForVision(input: Buffer): Promise<PreprocessedImage> {
+  const startedAt = Date.now();
+  const passthrough = (): PreprocessedImage => ({
+    buffer: input,
+    processed: false,
+    inputBytes: input.length,
+    outputBytes: input.length,
+    durationMs: Date.now() - startedAt
+  });
+
+  const sharp = await loadSharp();
+  if (!sharp) return passthrough();
+
+  try {
+    const { data, info } = await sharp(input, { failOn: 'error' })
+      .rotate()
+      .trim({ threshold: TRIM_THRESHOLD })
+      .resize({
+        width: TARGET_SHORT_SIDE,
+        height: TARGET_SHORT_SIDE,
+        fit: 'outside',
+        withoutEnlargement: true
+      })
+      .jpeg({ quality: JPEG_QUALITY })
+      .toBuffer({ resolveWithObject: true });
+
+    const result: PreprocessedImage = {
+      buffer: data,
+      processed: true,
+      inputBytes: input.length,
+      outputBytes: data.length,
+      width: info.width,
+      height: info.height,
+      durationMs: Date.now() - startedAt
+    };
+
+    logger.info('Image preprocessed for Vision', {
+      inputBytes: result.inputBytes,
+      outputBytes: result.outputBytes,
+      size: `${info.width}x${info.height}`,
+      durationMs: result.durationMs
+    });
+    return result;
+  } catch (error: any) {
+    logger.warn('Image preprocessing failed, using original', { message: error?.message });
+    return passthrough();
+  }
+}
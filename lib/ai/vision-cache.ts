@@ -0,0 +1,119 @@
+import { createHash } from 'crypto';
+import { logger } from '@/lib/logger';
+import { supabaseAdmin } from '@/lib/supabase-server';
+import { decrypt, encrypt, isEncrypted } from '@/lib/security';
+
+/**
+ * Cache das extrações por Vision (tabela vision_cache).
+ *
+ * Chave: SHA-256 de (extrator, modelo, hash do prompt, SHA-256 da imagem).
+ * Qualquer mudança de prompt ou modelo gera chaves novas, então não há versão
+ * para lembrar de incrementar. O resultado é gravado com encrypt(); sem
+ * ENCRYPTION_KEY o cache não grava (não guardamos dados de paciente em
+ * claro). Erros do cache nunca impedem a extração: viram um miss. O limite
+ * de tamanho é aplicado por pruneVisionCache, chamado pelo cron do worker.
+ */
+
+// Custo estimado de uma chamada Vision (o mesmo usado em ocr_messages.cost_llm)
+export const VISION_CALL_COST = 0.01;
+
+const TTL_DAYS = parseInt(process.env.VISION_CACHE_TTL_DAYS || '30');
+const MAX_ENTRIES = parseInt(process.env.VISION_CACHE_MAX_ENTRIES || '5000');
+// Resultados maiores que isso não são guardados
+const MAX_RESULT_BYTES = 64 * 1024;
+
+export interface VisionCacheScope {
+  extractor: string;
+  model: string;
+  // Texto completo enviado junto com a imagem (system + user)
+  prompt: string;
+}
+
+export interface CachedResult<T> {
+  value: T;
+  cached: boolean;
+}
+
+const sha256 = (data: string | Buffer) => createHash('sha256').update(data).digest('hex');
+
+// Hash do prompt calculado uma vez por escopo
+const promptHashes = new WeakMap<VisionCacheScope, string>();
+
+export function visionCacheKey(scope: VisionCacheScope, image: Buffer): string {
+  let promptHash = promptHashes.get(scope);
+  if (!promptHash) {
+    promptHash = sha256(scope.prompt);
+    promptHashes.set(scope, promptHash);
+  }
+  return sha256(`${scope.extractor}:${scope.model}:${promptHash}:${sha256(image)}`);
+}
+
+async function readEntry<T>(key: string): Promise<T | undefined> {
+  const { data, error } = await supabaseAdmin.rpc('vision_cache_get', { p_key: key });
+  if (error) {
+    logger.warn('Vision cache read failed', { message: error.message });
+    return undefined;
+  }
+  if (!data || !isEncrypted(data)) return undefined;
+
+  try {
+    return JSON.parse(decrypt(data)) as T;
+  } catch {
+    // Chave de criptografia rotacionada sem a anterior: trata como miss
+    return undefined;
+  }
+}
+
+async function writeEntry(key: string, extractor: string, value: unknown) {
+  const json = JSON.stringify(value);
+  if (Buffer.byteLength(json) > MAX_RESULT_BYTES) return;
+
+  const result = encrypt(json);
+  if (!isEncrypted(result)) return;
+
+  const { error } = await supabaseAdmin.from('vision_cache').upsert({
+    cache_key: key,
+    extractor,
+    result,
+    size_bytes: Buffer.byteLength(result),
+    expires_at: new Date(Date.now() + TTL_DAYS * 24 * 60 * 60 * 1000).toISOString()
+  });
+  if (error) {
+    logger.warn('Vision cache write failed', { message: error.message });
+  }
+}
+
+/**
+ * Remove entradas expiradas e, acima de VISION_CACHE_MAX_ENTRIES, as menos
+ * usadas. Roda no cron do worker (uma vez por hora), fora do caminho da
+ * extração: entre duas execuções o cache pode passar um pouco do limite.
+ */
+export async function pruneVisionCache(): Promise<number> {
+  const { data, error } = await supabaseAdmin.rpc('prune_vision_cache', { p_max_entries: MAX_ENTRIES });
+  if (error) throw error;
+  return data ?? 0;
+}
+
+/**
+ * Retorna a extração em cache para esta imagem/prompt ou executa `extract`
+ * e guarda o resultado. Resultados null/undefined (falha) não são guardados.
+ */
+export async function withVisionCache<T>(
+  scope: VisionCacheScope,
+  image: Buffer,
+  extract: () => Promise<T>
+): Promise<CachedResult<T>> {
+  const key = visionCacheKey(scope, image);
+
+  const hit = await readEntry<T>(key);
+  if (hit !== undefined) {
+    logger.info(`Vision cache hit (${scope.extractor})`);
+    return { value: hit, cached: true };
+  }
+
+  const value = await extract();
+  if (value !== null && value !== undefined) {
+    await writeEntry(key, scope.extractor, value);
+  }
+  return { value, cached: false };
+}
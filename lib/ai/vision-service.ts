@@ -1,25 +1,40 @@
 import OpenAI from 'openai';
+import { withVisionCache, type VisionCacheScope } from './vision-cache';
 
 const openai = new OpenAI({
   apiKey: process.env.OPENAI_API_KEY,
 });
 
+const RECORD_PROMPT = "Extraia os dados desta ficha de anestesia e retorne APENAS um JSON puro com os campos: paciente_nome, data, hospital, cirurgiao, procedimento, tipo_anestesia.";
+
+const RECORD_CACHE_SCOPE: VisionCacheScope = {
+  extractor: 'anesthesia_record',
+  model: "gpt-4o-mini",
+  prompt: RECORD_PROMPT
+};
+
 /**
  * Analisa uma imagem de ficha anestésica usando GPT-4o Vision
+ * (resultados guardados em lib/ai/vision-cache.ts por hash da imagem)
  */
 export async function analyzeAnesthesiaRecordImage(imageBuffer: Buffer) {
+  const { value } = await withVisionCache(RECORD_CACHE_SCOPE, imageBuffer, () => callRecordVision(imageBuffer));
+  return value;
+}
+
+async function callRecordVision(imageBuffer: Buffer) {
   try {
     const base64Image = imageBuffer.toString('base64');
 
     const response = await openai.chat.completions.create({
-      model: "gpt-4o-mini", // Modelo robusto, rápido e com visão
+      model: RECORD_CACHE_SCOPE.model, // Modelo robusto, rápido e com visão
       messages: [
         {
           role: "user",
           content: [
             { 
               type: "text", 
-              text: "Extraia os dados desta ficha de anestesia e retorne APENAS um JSON puro com os campos: paciente_nome, data, hospital, cirurgiao, procedimento, tipo_anestesia." 
+              text: RECORD_PROMPT 
             },
             {
               type: "image_url",
@@ -1,5 +1,3 @@
-import * as XLSX from 'xlsx';
-
 // ---------------------------------------------------------------------------
 // Types
 // ---------------------------------------------------------------------------
@@ -66,172 +64,161 @@ export interface DadosFinanceirosGrupo {
 }
 
 // ---------------------------------------------------------------------------
-// Helpers
+// Consolidação anual
 // ---------------------------------------------------------------------------
 
-function slugify(text: string): string {
-  return text
-    .normalize('NFD')
-    .replace(/[\u0300-\u036f]/g, '')
-    .toLowerCase()
-    .replace(/\s+/g, '-')
-    .replace(/[^a-z0-9-]/g, '');
+const MESES_PT = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez'];
+
+/** Linha de group_financial_monthly (valores NUMERIC podem vir como string). */
+export interface LinhaFinanceiraGrupo {
+  month: string;
+  procedures_count: number;
+  revenue: number | string;
+  receivable: number | string;
+  revenue_cnpj: number | string;
+  revenue_cpf: number | string;
+  despesas_total: number | string;
 }
 
-// ---------------------------------------------------------------------------
-// Sheet builders
-// ---------------------------------------------------------------------------
-
-function buildResumo(
-  grupo: DadosFinanceirosGrupo['grupo'],
-  anual: DadosFinanceirosGrupo['anual'],
-): XLSX.WorkSheet {
-  const rows: (string | number)[][] = [
-    ['Resumo Financeiro Anual', anual.ano],
-    ['Grupo', grupo.nome],
-    [],
-    ['Indicador', 'Valor'],
-    ['Faturamento Bruto', anual.faturamentoBruto],
-    ['Despesas', anual.despesas],
-    ['Líquido Distribuível', anual.liquidoDistribuivel],
-    ['Cota Individual', anual.cotaIndividual],
-    ['Nº de Cotistas', grupo.totalCotistas],
-    ['Procedimentos', anual.procedimentos],
-    ['Ticket Médio', anual.ticketMedio],
-    ['A Receber (Pendente)', anual.aReceber],
-    [],
-    [
-      'O AnestEasy organiza e consolida os dados. Nao calcula nem recolhe tributos. A apuracao fiscal e a declaracao sao responsabilidade do contador.',
-    ],
-  ];
-
-  const ws = XLSX.utils.aoa_to_sheet(rows);
-  ws['!cols'] = [{ wch: 22 }, { wch: 20 }];
-  return ws;
+/** Linha de group_member_financial_monthly. */
+export interface LinhaFinanceiraMembro {
+  month: string;
+  user_id: string;
+  revenue_cnpj: number | string;
+  revenue_cpf: number | string;
 }
 
-function buildFaturamentoMensal(
-  anual: DadosFinanceirosGrupo['anual'],
-): XLSX.WorkSheet {
-  const rows: (string | number)[][] = [['Mês', 'Valor']];
-
-  let total = 0;
-  for (const item of anual.faturamentoMensal) {
-    rows.push([item.mes, item.valor]);
-    total += item.valor;
-  }
-
-  rows.push(['Total', total]);
-
-  const ws = XLSX.utils.aoa_to_sheet(rows);
-  ws['!cols'] = [{ wch: 18 }, { wch: 18 }];
-  return ws;
+export interface MembroCotista {
+  users?: { id: string; name: string; crm?: string | null };
+  quota_percent?: number | null;
 }
 
-function buildDistribuicaoCotas(
-  anual: DadosFinanceirosGrupo['anual'],
-): XLSX.WorkSheet {
-  const rows: (string | number)[][] = [
-    ['Nome', 'CRM', 'Cota (%)', 'Recebido CNPJ', 'Recebido CPF'],
-  ];
-
-  let totalCota = 0;
+/**
+ * Consolida o ano a partir das linhas mensais do grupo e dos membros.
+ * Usada pelo dashboard (useFinanceiroDashboard) e pela geração do relatório
+ * do contador no servidor, para que os dois mostrem os mesmos números.
+ */
+export function consolidarAnual(
+  ano: number,
+  meses: LinhaFinanceiraGrupo[],
+  membros: LinhaFinanceiraMembro[],
+  groupMembers: MembroCotista[],
+  currentUserId?: string,
+): DadosFinanceirosGrupo['anual'] {
+  const porMes = new Map(meses.map(r => [r.month.slice(0, 7), r]));
+  const prefixoAno = `${ano}-`;
+
+  let faturamentoBruto = 0;
+  let aReceber = 0;
+  let procedimentos = 0;
   let totalCnpj = 0;
   let totalCpf = 0;
-
-  for (const c of anual.cotistas) {
-    rows.push([c.nome, c.crm, c.cota, c.recebidoCnpj, c.recebidoCpf]);
-    totalCota += c.cota;
-    totalCnpj += c.recebidoCnpj;
-    totalCpf += c.recebidoCpf;
+  let despesas = 0;
+
+  const faturamentoMensal = MESES_PT.map((mes, idx) => {
+    const r = porMes.get(`${ano}-${String(idx + 1).padStart(2, '0')}`);
+    if (r) {
+      faturamentoBruto += Number(r.revenue);
+      aReceber += Number(r.receivable);
+      procedimentos += r.procedures_count;
+      totalCnpj += Number(r.revenue_cnpj);
+      totalCpf += Number(r.revenue_cpf);
+      despesas += Number(r.despesas_total);
+    }
+    return { mes, valor: r ? Number(r.revenue) : 0 };
+  });
+  const ticketMedio = procedimentos > 0 ? Math.round(faturamentoBruto / procedimentos) : 0;
+
+  // Totais recebidos por membro no ano
+  const membroAno = new Map<string, { cnpj: number; cpf: number }>();
+  for (const r of membros) {
+    if (!r.month.startsWith(prefixoAno)) continue;
+    const total = membroAno.get(r.user_id) || { cnpj: 0, cpf: 0 };
+    total.cnpj += Number(r.revenue_cnpj);
+    total.cpf += Number(r.revenue_cpf);
+    membroAno.set(r.user_id, total);
   }
 
-  rows.push(['Total', '', totalCota, totalCnpj, totalCpf]);
-
-  const ws = XLSX.utils.aoa_to_sheet(rows);
-  ws['!cols'] = [
-    { wch: 30 },
-    { wch: 12 },
-    { wch: 12 },
-    { wch: 18 },
-    { wch: 18 },
-  ];
-  return ws;
-}
-
-function buildPorTitularidade(
-  anual: DadosFinanceirosGrupo['anual'],
-): XLSX.WorkSheet {
-  const rows: (string | number)[][] = [
-    ['Titularidade', 'Valor'],
-    [],
-    ['Recebido via CNPJ', anual.distribuicao.cnpj],
-    ['Recebido via CPF', anual.distribuicao.cpf],
-    [],
-    ['Detalhamento CPF', ''],
-    [
-      'Recebido de Fonte PJ',
-      anual.cpfPorFonte.fontePJ,
-    ],
-    ['  IRRF Retido', anual.cpfPorFonte.irrfRetido],
-    ['  INSS Retido', anual.cpfPorFonte.inssRetido],
-    [
-      'Recebido de Fonte PF (sujeito a carnê-leão)',
-      anual.cpfPorFonte.fontePF,
-    ],
-  ];
-
-  const ws = XLSX.utils.aoa_to_sheet(rows);
-  ws['!cols'] = [{ wch: 44 }, { wch: 20 }];
-  return ws;
-}
-
-function buildGlosas(
-  anual: DadosFinanceirosGrupo['anual'],
-): XLSX.WorkSheet {
-  const rows: (string | number)[][] = [
-    ['Glosas', 'Valor'],
-    ['Glosado no Ano', anual.glosado],
-    ['Glosa Recuperada', anual.glosaRecuperada],
-    ['Glosa em Aberto', anual.glosaEmAberto],
-    ['Parcelamentos a Vencer', anual.parcelamentosAVencer],
-  ];
-
-  const ws = XLSX.utils.aoa_to_sheet(rows);
-  ws['!cols'] = [{ wch: 26 }, { wch: 20 }];
-  return ws;
+  const totalCotistas = groupMembers.length;
+  const liquidoDistribuivel = faturamentoBruto - despesas;
+  const cotaIndividual = totalCotistas > 0 ? Math.round(liquidoDistribuivel / totalCotistas) : 0;
+
+  let minhaCotaPercentual = 0;
+  let minhaCotaAnual = 0;
+
+  const cotistas = groupMembers.map(m => {
+    const userId = m.users?.id || '';
+    const recebido = membroAno.get(userId);
+    const userQuota = m.quota_percent || Math.round(100 / totalCotistas);
+
+    if (currentUserId && userId === currentUserId) {
+      minhaCotaPercentual = userQuota;
+      minhaCotaAnual = (liquidoDistribuivel * userQuota) / 100;
+    }
+
+    return {
+      nome: m.users?.name || 'Membro',
+      crm: m.users?.crm || '',
+      cota: userQuota,
+      valorCota: (liquidoDistribuivel * userQuota) / 100,
+      recebidoCnpj: recebido?.cnpj || 0,
+      recebidoCpf: recebido?.cpf || 0,
+    };
+  });
+
+  return {
+    ano,
+    faturamentoBruto,
+    despesas,
+    liquidoDistribuivel,
+    cotaIndividual,
+    minhaCotaPercentual,
+    minhaCotaAnual,
+    procedimentos,
+    ticketMedio,
+    glosado: 0,
+    glosaRecuperada: 0,
+    glosaEmAberto: 0,
+    parcelamentosAVencer: 0,
+    aReceber,
+    faturamentoMensal,
+    distribuicao: { cnpj: totalCnpj, cpf: totalCpf },
+    cpfPorFonte: { fontePJ: totalCpf, fontePF: 0, irrfRetido: 0, inssRetido: 0 },
+    cotistas,
+  };
 }
 
 // ---------------------------------------------------------------------------
 // Main export
 // ---------------------------------------------------------------------------
 
+/**
+ * Baixa o relatório do contador. A planilha é gerada (e, para anos fechados,
+ * guardada) no servidor por /api/groups/[id]/relatorio-contador, sem levar a
+ * biblioteca xlsx para o navegador.
+ */
 export async function exportarRelatorioContador(
   grupo: DadosFinanceirosGrupo['grupo'],
   anual: DadosFinanceirosGrupo['anual'],
 ): Promise<void> {
-  const wb = XLSX.utils.book_new();
-
-  XLSX.utils.book_append_sheet(wb, buildResumo(grupo, anual), 'Resumo');
-  XLSX.utils.book_append_sheet(
-    wb,
-    buildFaturamentoMensal(anual),
-    'Faturamento Mensal',
+  const response = await fetch(
+    `/api/groups/${encodeURIComponent(grupo.id)}/relatorio-contador?ano=${anual.ano}`,
   );
-  XLSX.utils.book_append_sheet(
-    wb,
-    buildDistribuicaoCotas(anual),
-    'Distribuicao Cotas',
-  );
-  XLSX.utils.book_append_sheet(
-    wb,
-    buildPorTitularidade(anual),
-    'Por Titularidade',
-  );
-  XLSX.utils.book_append_sheet(wb, buildGlosas(anual), 'Glosas');
 
-  const slug = slugify(grupo.nome);
-  const fileName = `relatorio-contador-${slug}-${anual.ano}.xlsx`;
+  if (!response.ok) {
+    const body = await response.json().catch(() => null);
+    throw new Error(body?.error || 'Erro ao gerar relatório do contador');
+  }
 
-  XLSX.writeFile(wb, fileName);
+  const disposition = response.headers.get('Content-Disposition') || '';
+  const fileName = disposition.match(/filename="([^"]+)"/)?.[1] || `relatorio-contador-${anual.ano}.xlsx`;
+
+  const url = URL.createObjectURL(await response.blob());
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = fileName;
+  document.body.appendChild(link);
+  link.click();
+  link.remove();
+  URL.revokeObjectURL(url);
 }
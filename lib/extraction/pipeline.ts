@@ -2,13 +2,34 @@ import { WhatsAppClient } from "@/lib/whatsapp/client";
 import { extractTextFromImage } from "./ocr";
 import { parseFichaWithAI } from "@/utils/parseFichaAI";
 import { createClient } from "@supabase/supabase-js";
+import { preprocessImageForVision } from "@/lib/ai/image-preprocess";
+import { createPipelineTimer } from "@/lib/pipeline-timings";
 
 const supabaseAdmin = createClient(
   process.env.NEXT_PUBLIC_SUPABASE_URL!,
   process.env.SUPABASE_SERVICE_ROLE_KEY!
 );
 
+// Mensagens de progresso: enviadas em ordem, sem bloquear o processamento.
+// Falhas de envio só são registradas.
+function createProgressNotifier(phoneNumber: string) {
+  let chain: Promise<unknown> = Promise.resolve();
+  return {
+    send(text: string) {
+      chain = chain
+        .then(() => WhatsAppClient.sendTextMessage(phoneNumber, text))
+        .catch(err => console.error('Failed to send progress message:', err));
+    },
+    // Aguarda as mensagens pendentes (antes de responder/encerrar)
+    flush: () => chain
+  };
+}
+
 export async function processWhatsAppMedia(messageId: string, mediaId: string, userId: string, phoneNumber: string) {
+  const progress = createProgressNotifier(phoneNumber);
+  // Tempo por etapa em pipeline_timings; upload e Vision se sobrepõem
+  const timer = createPipelineTimer('whatsapp_extraction', messageId);
+
   try {
     // 1. Atualizar status da mensagem para processing
     await supabaseAdmin
@@ -16,35 +37,54 @@ export async function processWhatsAppMedia(messageId: string, mediaId: string, u
       .update({ status: 'processing' })
       .eq('id', messageId);
 
-    // 2. Obter URL de download e baixar imagem
+    // 2. Obter URL de download e abrir o stream da imagem
     console.log('Step 2: Getting media URL...');
-    const mediaUrl = await WhatsAppClient.getMediaUrl(mediaId);
-    console.log('Step 2.1: Downloading media from:', mediaUrl);
-    const imageBuffer = await WhatsAppClient.downloadMedia(mediaUrl);
-    console.log('Step 2.2: Media downloaded, size:', imageBuffer.length);
+    const mediaUrl = await timer.time('media_url', () => WhatsAppClient.getMediaUrl(mediaId));
+    console.log('Step 2.1: Streaming media from:', mediaUrl);
+    const media = await WhatsAppClient.openMediaStream(mediaUrl);
+    progress.send("🤖 *Agente pessoal - AnestEasy*:\n👁️ Analisando imagem da ficha com IA...");
 
-    // 3. Upload para Supabase Storage (Privado)
+    // O mesmo stream alimenta o Storage e o Vision em paralelo
+    const [uploadStream, visionStream] = media.body.tee();
+
+    // 3. Upload para Supabase Storage (Privado), sem esperar o download terminar
     console.log('Step 3: Uploading to Supabase Storage...');
     const fileName = `${userId}/${messageId}.jpg`;
-    const { data: storageData, error: storageError } = await supabaseAdmin.storage
-      .from('whatsapp-media')
-      .upload(fileName, imageBuffer, {
-        contentType: 'image/jpeg',
-        upsert: true
-      });
-
-    if (storageError) {
-      console.error('Storage Error:', storageError);
-      throw storageError;
-    }
-    console.log('Step 3.1: Upload successful');
+    const upload = timer.time('storage_upload', async () => {
+      const { error: storageError } = await supabaseAdmin.storage
+        .from('whatsapp-media')
+        .upload(fileName, uploadStream, {
+          contentType: 'image/jpeg',
+          upsert: true,
+          duplex: 'half'
+        });
+      if (storageError) {
+        console.error('Storage Error:', storageError);
+        throw storageError;
+      }
+      console.log('Step 3.1: Upload successful');
+    });
+
+    // 4. Inteligência Artificial Vision (OCR + Extração em um só passo).
+    // O Vision recebe a imagem inteira em base64, então aqui o stream é lido
+    // até o fim enquanto o upload segue.
+    const vision = (async () => {
+      const imageBuffer = await timer.time('download', async () =>
+        Buffer.from(await new Response(visionStream).arrayBuffer())
+      );
+      console.log('Step 2.2: Media downloaded, size:', imageBuffer.length);
+
+      console.log('Step 4: Starting AI Vision Analysis...');
+      const { analyzeAnesthesiaRecordImage } = await import('@/lib/ai/vision-service');
+      const visionImage = await timer.time('preprocess', () => preprocessImageForVision(imageBuffer));
+      console.log('Step 4.1: Image preprocessed, size:', visionImage.outputBytes);
+      const result = await timer.time('vision', () => analyzeAnesthesiaRecordImage(visionImage.buffer));
+      console.log('Step 4.2: AI Vision finished');
+      return result;
+    })();
 
-    // 4. Inteligência Artificial Vision (OCR + Extração em um só passo)
-    await WhatsAppClient.sendTextMessage(phoneNumber, "🤖 *Agente pessoal - AnestEasy*:\n👁️ Analisando imagem da ficha com IA...");
-    console.log('Step 4: Starting AI Vision Analysis...');
-    const { analyzeAnesthesiaRecordImage } = await import('@/lib/ai/vision-service');
-    const extractedData = await analyzeAnesthesiaRecordImage(imageBuffer);
-    console.log('Step 4.1: AI Vision finished');
+    // A extração referencia image_storage_path: os dois precisam concluir
+    const [, extractedData] = await Promise.all([upload, vision]);
 
     if (!extractedData) {
       throw new Error('AI Vision failed to extract data');
@@ -57,29 +97,31 @@ export async function processWhatsAppMedia(messageId: string, mediaId: string, u
     const { encrypt } = await import('@/lib/security');
 
     // 6. Salvar na whatsapp_extractions
-    await WhatsAppClient.sendTextMessage(phoneNumber, "🤖 *Agente pessoal - AnestEasy*:\n💾 Finalizando cadastro...");
+    progress.send("🤖 *Agente pessoal - AnestEasy*:\n💾 Finalizando cadastro...");
     console.log('Step 6: Saving extraction to DB...');
     
     // Garantir que não quebre por causa do user_id inexistente
-    const insertData: any = {
+    const insertData: any = await timer.time('encrypt', () => ({
       message_id: messageId,
       raw_ocr_text: encrypt(ocrText),
       ocr_confidence: ocrConfidence,
       extracted_fields: encrypt(extractedData),
       image_storage_path: fileName,
       status: 'awaiting_confirmation'
-    };
+    }));
 
     if (userId) {
       insertData.user_id = userId;
     }
 
     let extraction = null;
-    let { data: firstTry, error: extractionError } = await supabaseAdmin
-      .from('whatsapp_extractions')
-      .insert(insertData)
-      .select()
-      .single();
+    let { data: firstTry, error: extractionError } = await timer.time('db_extraction', () =>
+      supabaseAdmin
+        .from('whatsapp_extractions')
+        .insert(insertData)
+        .select()
+        .single()
+    );
 
     extraction = firstTry;
 
@@ -107,7 +149,10 @@ export async function processWhatsAppMedia(messageId: string, mediaId: string, u
 
     // 7. Enviar Confirmação SIMPLES via WhatsApp
     console.log('Step 7: Sending simplified confirmation...');
-    await WhatsAppClient.sendTextMessage(phoneNumber, "🤖 *Agente pessoal - AnestEasy*:\n✅ Cadastro Realizado com Sucesso!");
+    await progress.flush();
+    await timer.time('whatsapp_send', () =>
+      WhatsAppClient.sendTextMessage(phoneNumber, "🤖 *Agente pessoal - AnestEasy*:\n✅ Cadastro Realizado com Sucesso!")
+    );
     console.log('Step 7.1: Confirmation sent');
 
     // 8. Finalizar status da mensagem
@@ -120,7 +165,8 @@ export async function processWhatsAppMedia(messageId: string, mediaId: string, u
   } catch (error: any) {
     console.error("Pipeline processing failed:", error);
     
-    // Notificar erro SIMPLES ao usuário
+    // Notificar erro SIMPLES ao usuário (depois das mensagens de progresso)
+    await progress.flush();
     try {
       const { WhatsAppClient } = await import('@/lib/whatsapp/client');
       await WhatsAppClient.sendTextMessage(
@@ -162,6 +208,8 @@ export async function processWhatsAppMedia(messageId: string, mediaId: string, u
     }
 
     throw error;
+  } finally {
+    await timer.flush();
   }
 }
 
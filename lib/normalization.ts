@@ -61,21 +61,48 @@ const PROCEDURE_ALIASES: Record<string, string[]> = {
   'Outros': ['anestesia', 'anestesia geral', 'raquianestesia', 'raqui', 'sedacao', 'bloqueio', 'anestesia local']
 }
 
+// Regexes das aliases compiladas uma única vez, na ordem do dicionário
+const PROCEDURE_ALIAS_PATTERNS: [string, RegExp[]][] = Object.entries(PROCEDURE_ALIASES).map(
+  ([canonicalName, aliases]) => [canonicalName, aliases.map(alias => new RegExp(`\\b${alias}\\b`))]
+)
+
+/**
+ * Relatórios normalizam o mesmo punhado de nomes para cada procedimento;
+ * o resultado de cada nome bruto é guardado (limitado a MEMO_LIMIT entradas
+ * por função, o cache é esvaziado ao encher).
+ */
+const MEMO_LIMIT = 5000
+const procedureNameCache = new Map<string, string>()
+const hospitalNameCache = new Map<string, string>()
+const surgeonNameCache = new Map<string, string>()
+
+function memoized(cache: Map<string, string>, value: string, compute: (value: string) => string): string {
+  let result = cache.get(value)
+  if (result === undefined) {
+    if (cache.size >= MEMO_LIMIT) cache.clear()
+    result = compute(value)
+    cache.set(value, result)
+  }
+  return result
+}
+
 /**
  * Agrupa o nome do procedimento usando o dicionário. Se não achar, usa Title Case.
  */
 export function normalizeProcedureName(originalName: string): string {
   if (!originalName) return 'Outros'
+  return memoized(procedureNameCache, originalName, computeProcedureName)
+}
 
+function computeProcedureName(originalName: string): string {
   const normalized = normalizeBasic(originalName)
 
-  for (const [canonicalName, aliases] of Object.entries(PROCEDURE_ALIASES)) {
+  for (const [canonicalName, patterns] of PROCEDURE_ALIAS_PATTERNS) {
     // Busca exata nas aliases ou verificação se a frase normalizada inclui uma das aliases.
     // Ex: "colecistectomia c/ colangiografia" -> cai em "colecistectomia"
-    for (const alias of aliases) {
-      // Se a string contiver a palavra exata usando limites de palavra (para não confundir "colon" com "colonoscopia" se houver)
-      const regex = new RegExp(`\\b${alias}\\b`)
-      if (regex.test(normalized)) {
+    // (limites de palavra para não confundir "colon" com "colonoscopia")
+    for (const pattern of patterns) {
+      if (pattern.test(normalized)) {
         return canonicalName
       }
     }
@@ -89,6 +116,10 @@ export function normalizeProcedureName(originalName: string): string {
  * Normaliza Hospitais ou Clínicas (mantendo em Title Case para agrupar variações de caixa e espaços)
  */
 export function normalizeHospitalName(originalName: string): string {
+  return memoized(hospitalNameCache, originalName, computeHospitalName)
+}
+
+function computeHospitalName(originalName: string): string {
   const normalized = normalizeBasic(originalName)
   if (!normalized || normalized === 'nao informado' || normalized === 'nenhum') {
     return 'Não informado'
@@ -100,6 +131,10 @@ export function normalizeHospitalName(originalName: string): string {
  * Normaliza Cirurgiões (removendo "Dr", "Dra" soltos ou deixando uniforme e em Title Case)
  */
 export function normalizeSurgeonName(originalName: string): string {
+  return memoized(surgeonNameCache, originalName, computeSurgeonName)
+}
+
+function computeSurgeonName(originalName: string): string {
   let normalized = normalizeBasic(originalName)
   if (!normalized || normalized === 'nao informado' || normalized === 'nenhum') {
     return 'Não informado'
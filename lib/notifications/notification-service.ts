@@ -1,6 +1,6 @@
 import { supabase } from '../supabase';
 import { NotificationType, AppNotification } from '../financial/types';
-import { financialService } from '../financial/service';
+import { BUSINESS_RULES } from '../constants';
 
 export const notificationService = {
   /**
@@ -33,69 +33,25 @@ export const notificationService = {
 
   /**
    * Gera notificações inteligentes baseadas nas regras financeiras
+   * (pendentes de envio, atrasados e próximos do vencimento).
+   *
+   * As regras e a deduplicação de 24h (atualiza a não lida do mesmo tipo,
+   * ignora se já foi lida) rodam em generate_financial_notifications, com
+   * uma consulta agrupada e um INSERT ... ON CONFLICT. O modo em lote (todos
+   * os usuários) roda em /api/cron/financial-notifications.
    */
   async generateIntelligentNotifications(userId: string) {
-    // 1. Procedimentos não enviados há > 7 dias
-    const pendingProcedures = await financialService.getPendingProcedures(userId);
-    if (pendingProcedures.length > 0) {
-      await this.upsertFinancialNotification(userId, 'pending_send', 
-        'Procedimentos Pendentes de Envio', 
-        `Você possui ${pendingProcedures.length} procedimentos aguardando envio para cobrança há mais de uma semana.`
-      );
-    }
-
-    // 2. Pagamentos em atraso
-    const latePayments = await financialService.getLatePayments(userId);
-    if (latePayments.length > 0) {
-      const totalLate = latePayments.reduce((acc, p) => acc + (p.procedure_value || 0), 0);
-      await this.upsertFinancialNotification(userId, 'late_payment', 
-        'Atraso no Recebimento', 
-        `Existem ${latePayments.length} procedimentos com pagamento atrasado, totalizando R$ ${totalLate.toFixed(2)}.`
-      );
-    }
-
-    // 3. Próximos do vencimento
-    const nearPayments = await financialService.getNearPayments(userId);
-    if (nearPayments.length > 0) {
-      await this.upsertFinancialNotification(userId, 'near_payment', 
-        'Recebimentos Próximos', 
-        `${nearPayments.length} procedimentos devem ser pagos nos próximos 5 dias.`
-      );
-    }
-  },
+    const { error } = await supabase.rpc('generate_financial_notifications', {
+      p_user_id: userId,
+      p_late_days: BUSINESS_RULES.LATE_PAYMENT_THRESHOLD_DAYS,
+      p_near_days: BUSINESS_RULES.NEAR_PAYMENT_DAYS
+    });
 
-  /**
-   * Helper para evitar notificações duplicadas (atualiza se já existe uma não lida do mesmo tipo)
-   */
-  async upsertFinancialNotification(userId: string, type: NotificationType, title: string, message: string) {
-    // Verificar se já existe qualquer notificação deste tipo nas últimas 24h (lida ou não)
-    const twentyFourHoursAgo = new Date();
-    twentyFourHoursAgo.setHours(twentyFourHoursAgo.getHours() - 24);
-
-    const { data: existing } = await supabase
-      .from('notifications')
-      .select('id, is_read')
-      .eq('user_id', userId)
-      .eq('type', type)
-      .gt('created_at', twentyFourHoursAgo.toISOString())
-      .order('created_at', { ascending: false })
-      .limit(1);
-
-    if (existing && existing.length > 0) {
-      // Já existe uma notificação recente deste tipo
-      if (existing[0].is_read) {
-        // Usuário já leu → não incomodar até amanhã
-        return;
-      }
-      // Ainda não lida → atualizar a mensagem com os dados mais recentes
-      await supabase
-        .from('notifications')
-        .update({ message, updated_at: new Date().toISOString() })
-        .eq('id', existing[0].id);
-    } else {
-      // Não existe notificação recente → criar nova
-      await this.createNotification({ user_id: userId, type, title, message });
+    if (error) {
+      console.error('Error generating financial notifications:', error);
+      return false;
     }
+    return true;
   },
 
   async markAsRead(id: string) {
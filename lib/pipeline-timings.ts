@@ -0,0 +1,71 @@
+import { logger } from '@/lib/logger';
+import { supabaseAdmin } from '@/lib/supabase-server';
+
+/**
+ * Medição de tempo por etapa dos pipelines de OCR/extração (tabela
+ * pipeline_timings, agregada em /admin/pipeline).
+ *
+ *   const timer = createPipelineTimer('whatsapp_ocr', message.id);
+ *   const url = await timer.time('media_url', () => getMediaUrl(id));
+ *   ...
+ *   await timer.flush(); // em finally: grava todas as etapas em um insert
+ *
+ * Etapas que lançam erro são gravadas com ok = false. Falhas ao gravar só
+ * geram log: a medição nunca derruba o processamento.
+ */
+
+export type PipelineName = 'whatsapp_ocr' | 'whatsapp_extraction';
+
+export interface PipelineSpan {
+  stage: string;
+  durationMs: number;
+  ok: boolean;
+}
+
+export interface PipelineTimer {
+  time<T>(stage: string, fn: () => T | PromiseLike<T>): Promise<T>;
+  record(stage: string, durationMs: number, ok?: boolean): void;
+  flush(): Promise<void>;
+}
+
+export function createPipelineTimer(pipeline: PipelineName, messageId: string): PipelineTimer {
+  const recorded: PipelineSpan[] = [];
+
+  const record = (stage: string, durationMs: number, ok = true) => {
+    recorded.push({ stage, durationMs: Math.max(0, Math.round(durationMs)), ok });
+  };
+
+  return {
+    async time(stage, fn) {
+      const startedAt = performance.now();
+      try {
+        const result = await fn();
+        record(stage, performance.now() - startedAt);
+        return result;
+      } catch (error) {
+        record(stage, performance.now() - startedAt, false);
+        throw error;
+      }
+    },
+
+    record,
+
+    async flush() {
+      if (recorded.length === 0) return;
+      const rows = recorded.splice(0).map(span => ({
+        pipeline,
+        message_id: messageId,
+        stage: span.stage,
+        duration_ms: span.durationMs,
+        ok: span.ok
+      }));
+
+      logger.debug(`Pipeline ${pipeline} timings for ${messageId}`, rows.map(r => `${r.stage}=${r.duration_ms}ms`).join(' '));
+
+      const { error } = await supabaseAdmin.from('pipeline_timings').insert(rows);
+      if (error) {
+        logger.warn('Failed to record pipeline timings', { message: error.message });
+      }
+    }
+  };
+}
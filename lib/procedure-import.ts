@@ -0,0 +1,220 @@
+import { createHmac } from 'crypto'
+import * as XLSX from 'xlsx'
+import { normalizeBasic, normalizeHospitalName } from '@/lib/normalization'
+import { normalizarConvenio } from '@/lib/convenios'
+import { procedureSchema } from '@/lib/validations/procedure'
+import type { z } from 'zod'
+
+/**
+ * Leitura de planilhas (CSV/XLSX) de histórico de procedimentos para a
+ * importação em lote (/api/procedures/import).
+ *
+ * As colunas são reconhecidas pelo cabeçalho, sem acento e sem caixa
+ * ("Data", "Paciente", "Convênio", ...). Cada linha é normalizada, validada
+ * com o mesmo procedureSchema do cadastro manual e recebe uma chave de
+ * importação: a mesma planilha importada de novo não duplica procedimentos.
+ */
+
+export type ImportedProcedure = z.infer<typeof procedureSchema> & { import_key: string }
+
+export interface ImportRowError {
+  row: number // linha da planilha (1 = cabeçalho)
+  message: string
+}
+
+// Cabeçalho (comparado via normalizeBasic) -> campo de procedures
+const COLUMN_ALIASES: Record<string, string[]> = {
+  procedure_date: ['data', 'data do procedimento', 'data da cirurgia', 'data procedimento', 'procedure_date'],
+  horario: ['horario', 'hora', 'hora inicio', 'horario inicio'],
+  patient_name: ['paciente', 'nome do paciente', 'nome paciente', 'patient_name'],
+  procedure_name: ['procedimento', 'cirurgia', 'nome do procedimento', 'procedure_name'],
+  procedure_type: ['tipo', 'tipo de procedimento', 'procedure_type'],
+  procedure_value: ['valor', 'valor do procedimento', 'honorario', 'honorarios', 'procedure_value'],
+  convenio: ['convenio', 'plano', 'plano de saude'],
+  carteirinha: ['carteirinha', 'numero da carteirinha'],
+  hospital_clinic: ['hospital', 'clinica', 'hospitalclinica', 'hospital clinica', 'local', 'hospital_clinic'],
+  nome_cirurgiao: ['cirurgiao', 'nome do cirurgiao', 'medico cirurgiao', 'nome_cirurgiao'],
+  tecnica_anestesica: ['tecnica', 'tecnica anestesica', 'anestesia'],
+  patient_age: ['idade', 'idade do paciente'],
+  payment_status: ['status', 'status pagamento', 'status do pagamento', 'pagamento', 'payment_status'],
+  payment_date: ['data do pagamento', 'data pagamento', 'pago em', 'payment_date'],
+  forma_pagamento: ['forma de pagamento', 'forma pagamento'],
+  observacoes_procedimento: ['observacoes', 'observacao', 'obs'],
+}
+
+const headerKey = (header: string) => normalizeBasic(header).replace(/-/g, ' ')
+
+const HEADER_TO_FIELD = new Map<string, string>(
+  Object.entries(COLUMN_ALIASES).flatMap(([field, aliases]) => aliases.map(alias => [headerKey(alias), field] as const))
+)
+
+const PAYMENT_STATUS: Record<string, 'pending' | 'paid' | 'cancelled' | 'sent'> = {
+  pago: 'paid', paga: 'paid', recebido: 'paid', paid: 'paid',
+  pendente: 'pending', 'a receber': 'pending', aberto: 'pending', pending: 'pending',
+  enviado: 'sent', faturado: 'sent', sent: 'sent',
+  cancelado: 'cancelled', glosado: 'cancelled', cancelled: 'cancelled',
+}
+
+export interface ParsedSpreadsheet {
+  rows: Record<string, unknown>[]
+  // Linha da planilha de cada item de rows
+  lineNumbers: number[]
+  columns: string[]
+  ignoredColumns: string[]
+}
+
+/**
+ * Lê a primeira aba (ou o CSV) e devolve as linhas já com os nomes de campo
+ * de procedures. Linhas totalmente vazias são descartadas.
+ *
+ * raw: CSV fica como texto. Sem ele o SheetJS interpreta "03/04/2025" como
+ * data americana (4 de março); aqui as datas em texto passam pelo parser
+ * dd/mm de toIsoDate. Em XLSX as células de data continuam vindo como Date.
+ */
+export function parseProcedureSpreadsheet(file: Buffer): ParsedSpreadsheet {
+  const workbook = XLSX.read(file, { type: 'buffer', cellDates: true, dense: true, raw: true })
+  const sheet = workbook.Sheets[workbook.SheetNames[0]]
+  if (!sheet) return { rows: [], lineNumbers: [], columns: [], ignoredColumns: [] }
+
+  const matrix = XLSX.utils.sheet_to_json<unknown[]>(sheet, { header: 1, raw: true, defval: null, blankrows: false })
+  const [header = [], ...body] = matrix
+
+  const fields = header.map(cell => HEADER_TO_FIELD.get(headerKey(String(cell ?? ''))) ?? null)
+  const columns = fields.filter((f): f is string => f !== null)
+  const ignoredColumns = header.filter((_, i) => fields[i] === null).map(cell => String(cell ?? '')).filter(Boolean)
+
+  const rows: Record<string, unknown>[] = []
+  const lineNumbers: number[] = []
+  body.forEach((cells, index) => {
+    const row: Record<string, unknown> = {}
+    let filled = false
+    fields.forEach((field, col) => {
+      if (!field || row[field] != null) return
+      const value = cells[col]
+      if (value === null || value === undefined || value === '') return
+      row[field] = value
+      filled = true
+    })
+    if (filled) {
+      rows.push(row)
+      lineNumbers.push(index + 2)
+    }
+  })
+
+  return { rows, lineNumbers, columns, ignoredColumns }
+}
+
+const text = (value: unknown): string => (value instanceof Date ? value.toISOString() : String(value ?? '')).trim()
+
+// "dd/mm/aaaa", "aaaa-mm-dd", Date do Excel -> "aaaa-mm-dd"
+function toIsoDate(value: unknown): string | null {
+  if (value instanceof Date) {
+    return Number.isNaN(value.getTime()) ? null : value.toISOString().slice(0, 10)
+  }
+  const raw = text(value)
+  let match = raw.match(/^(\d{4})-(\d{1,2})-(\d{1,2})/)
+  if (match) return `${match[1]}-${match[2].padStart(2, '0')}-${match[3].padStart(2, '0')}`
+  match = raw.match(/^(\d{1,2})[/.-](\d{1,2})[/.-](\d{2,4})$/)
+  if (match) {
+    const year = match[3].length === 2 ? `20${match[3]}` : match[3]
+    return `${year}-${match[2].padStart(2, '0')}-${match[1].padStart(2, '0')}`
+  }
+  return null
+}
+
+function toTime(value: unknown): string | null {
+  if (value instanceof Date) return value.toISOString().slice(11, 16)
+  if (typeof value === 'number' && value >= 0 && value < 1) {
+    // Fração do dia (hora do Excel sem data)
+    const minutes = Math.round(value * 24 * 60)
+    return `${String(Math.floor(minutes / 60)).padStart(2, '0')}:${String(minutes % 60).padStart(2, '0')}`
+  }
+  const match = text(value).match(/^(\d{1,2})[:h](\d{2})/)
+  return match ? `${match[1].padStart(2, '0')}:${match[2]}` : null
+}
+
+// 1500 | "1.500" | "1.500,00" | "R$ 1500.5" -> número
+function toNumber(value: unknown): number | undefined {
+  if (typeof value === 'number') return value
+  let raw = text(value).replace(/[^\d,.-]/g, '')
+  if (!raw) return undefined
+  if (raw.includes(',') || /^-?\d{1,3}(\.\d{3})+$/.test(raw)) {
+    // Ponto como separador de milhar
+    raw = raw.replace(/\./g, '').replace(',', '.')
+  }
+  const parsed = Number(raw)
+  return Number.isFinite(parsed) ? parsed : undefined
+}
+
+/**
+ * Converte uma linha da planilha em dados de procedimento validados.
+ */
+export function normalizeImportRow(
+  row: Record<string, unknown>
+): { data: z.infer<typeof procedureSchema> } | { error: string } {
+  const procedureDate = toIsoDate(row.procedure_date)
+  if (!procedureDate) return { error: 'Data inválida ou ausente' }
+
+  const procedureName = text(row.procedure_name)
+  const status = row.payment_status ? normalizeBasic(text(row.payment_status)) : ''
+  const paymentDate = row.payment_date ? toIsoDate(row.payment_date) : null
+  const age = toNumber(row.patient_age)
+
+  const candidate = {
+    procedure_date: procedureDate,
+    horario: row.horario ? toTime(row.horario) : null,
+    patient_name: text(row.patient_name),
+    procedure_name: procedureName,
+    procedure_type: text(row.procedure_type) || 'Outro',
+    procedure_value: toNumber(row.procedure_value) ?? 0,
+    convenio: normalizarConvenio(text(row.convenio)) || 'Particular',
+    carteirinha: text(row.carteirinha) || null,
+    hospital_clinic: text(row.hospital_clinic) || 'Não informado',
+    nome_cirurgiao: text(row.nome_cirurgiao) || null,
+    tecnica_anestesica: text(row.tecnica_anestesica) || null,
+    patient_age: age !== undefined ? Math.round(age) : null,
+    payment_status: (status && PAYMENT_STATUS[status]) || (paymentDate ? 'paid' : 'pending'),
+    payment_date: paymentDate,
+    forma_pagamento: text(row.forma_pagamento) || null,
+    observacoes_procedimento: text(row.observacoes_procedimento) || null,
+  }
+
+  const parsed = procedureSchema.safeParse(candidate)
+  if (!parsed.success) {
+    return { error: parsed.error.issues.map(issue => `${issue.path.join('.')}: ${issue.message}`).join(', ') }
+  }
+  return { data: parsed.data }
+}
+
+/**
+ * Segredo do HMAC da chave de importação. Separado de ENCRYPTION_KEY, que é
+ * trocada na rotação de chaves: as chaves de importação precisam continuar
+ * as mesmas para que reimportações sejam reconhecidas.
+ */
+export function getImportKeySecret(): string | null {
+  return process.env.IMPORT_KEY_SECRET || null
+}
+
+/**
+ * Chave de deduplicação da importação: mesmo usuário, data, horário,
+ * paciente, procedimento e hospital (comparados já normalizados).
+ * HMAC com IMPORT_KEY_SECRET, para que a chave gravada não permita adivinhar
+ * o nome do paciente; sem o segredo a importação não roda.
+ */
+export function procedureImportKey(userId: string, data: z.infer<typeof procedureSchema>): string {
+  const secret = getImportKeySecret()
+  if (!secret) {
+    throw new Error('IMPORT_KEY_SECRET não configurada')
+  }
+
+  const identity = [
+    userId,
+    data.procedure_date,
+    data.horario || '',
+    normalizeBasic(data.patient_name),
+    normalizeBasic(data.procedure_name),
+    normalizeHospitalName(data.hospital_clinic || ''),
+  ].join('|')
+
+  return createHmac('sha256', secret).update(identity).digest('hex')
+}
@@ -1,5 +1,6 @@
 import { supabase } from './supabase'
 import type { ProcedureInsert } from './types'
+import { aggregateStatusTotals } from './report-stats'
 
 export type Procedure = ProcedureInsert & {
   id: string
@@ -77,6 +78,32 @@ export const procedureService = {
     }
   },
 
+  // Buscar uma página de procedimentos por cursor (procedure_date, id).
+  // fields: 'list' traz só as colunas da listagem; o registro completo vem de getProcedureById.
+  async getProceduresPage(
+    userId: string,
+    options?: { cursor?: string | null; limit?: number; groupId?: string; fields?: 'list' | 'all' }
+  ): Promise<{ data: Procedure[]; nextCursor: string | null }> {
+    const limit = options?.limit ?? 100;
+    const params = new URLSearchParams({ userId, limit: String(limit), cursor: options?.cursor ?? '' });
+    if (options?.groupId) params.set('groupId', options.groupId);
+    if (options?.fields !== 'all') params.set('fields', 'list');
+
+    try {
+      const response = await fetch(`/api/procedures/list?${params}`);
+      if (response.ok) {
+        return await response.json();
+      }
+    } catch (error) {
+      // segue para o fallback
+    }
+
+    // Fallback sem cursor: apenas a primeira página, direto do Supabase
+    if (options?.cursor) return { data: [], nextCursor: null };
+    const data = await this.getProcedures(userId, { limit, groupId: options?.groupId });
+    return { data, nextCursor: null };
+  },
+
   // Buscar procedimento por ID
   async getProcedureById(id: string): Promise<Procedure | null> {
     try {
@@ -279,87 +306,31 @@ export const procedureService = {
         }
       }
 
-      const stats = {
-        total: data.length,
-        completed: 0,
-        pending: 0,
-        cancelled: 0,
-        sent: 0,
-        totalValue: 0,
-        completedValue: 0,
-        pendingValue: 0
-      }
+      // OTIMIZAÇÃO: uma única query com as parcelas já recebidas, somadas por procedimento
+      const receivedByProcedure = new Map<string, number>()
+      const parceladoIds = data
+        .filter(p => p.payment_method === 'Parcelado' || p.forma_pagamento === 'Parcelado')
+        .map(p => p.id)
 
-      // OTIMIZAÇÃO: Buscar todas as parcelas de uma vez (batch query)
-      const procedureIds = data.map(p => p.id)
-      const parcelasMap: Record<string, Parcela[]> = {}
-      
-      if (procedureIds.length > 0) {
-        // Buscar todas as parcelas de todos os procedimentos em uma única query
-        const { data: allParcelas, error: parcelasError } = await supabase
+      if (parceladoIds.length > 0) {
+        const { data: receivedParcelas, error: parcelasError } = await supabase
           .from('parcelas')
-          .select('*')
-          .in('procedure_id', procedureIds)
-        
-        if (!parcelasError && allParcelas) {
-          // Agrupar parcelas por procedure_id
-          allParcelas.forEach(parcela => {
-            if (!parcelasMap[parcela.procedure_id]) {
-              parcelasMap[parcela.procedure_id] = []
-            }
-            parcelasMap[parcela.procedure_id].push(parcela)
-          })
-        }
-      }
-
-      // Processar cada procedimento
-      for (const procedure of data) {
-        stats.totalValue += procedure.procedure_value || 0
-        
-        // Verificar se é procedimento parcelado
-        const isParcelado = procedure.payment_method === 'Parcelado' || procedure.forma_pagamento === 'Parcelado'
-        
-        if (isParcelado) {
-          // Para procedimentos parcelados, calcular baseado nas parcelas (usando cache)
-          const parcelas = parcelasMap[procedure.id] || []
-          const parcelasRecebidas = parcelas.filter(p => p.recebida)
-          const valorRecebido = parcelasRecebidas.reduce((sum, p) => sum + (p.valor_parcela || 0), 0)
-          const valorPendente = (procedure.procedure_value || 0) - valorRecebido
-          
-          if (valorRecebido > 0) {
-            stats.completed++
-            stats.completedValue += valorRecebido
-          }
-          
-          if (valorPendente > 0) {
-            stats.pending++
-            stats.pendingValue += valorPendente
-          }
-        } else {
-          // Para procedimentos não parcelados, usar lógica original
-          switch (procedure.payment_status) {
-            case 'paid':
-              stats.completed++
-              stats.completedValue += procedure.procedure_value || 0
-              break
-            case 'pending':
-              stats.pending++
-              stats.pendingValue += procedure.procedure_value || 0
-              break
-            case 'cancelled':
-              stats.cancelled++
-              // Incluir cancelled no pendingValue (não recebido)
-              stats.pendingValue += procedure.procedure_value || 0
-              break
-            case 'sent':
-              stats.sent++
-              // Enviado ainda é pendente de pagamento
-              stats.pendingValue += procedure.procedure_value || 0
-              break
+          .select('procedure_id, valor_parcela')
+          .in('procedure_id', parceladoIds)
+          .eq('recebida', true)
+
+        if (!parcelasError && receivedParcelas) {
+          for (const parcela of receivedParcelas) {
+            receivedByProcedure.set(
+              parcela.procedure_id,
+              (receivedByProcedure.get(parcela.procedure_id) || 0) + (parcela.valor_parcela || 0)
+            )
           }
         }
       }
 
+      const stats = aggregateStatusTotals(data, receivedByProcedure)
+
       return stats
     } catch (error) {
       
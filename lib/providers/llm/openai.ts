@@ -2,6 +2,7 @@ import OpenAI from 'openai';
 import { logger } from '@/lib/logger';
 import { OpenAIError } from '@/utils/errors';
 import { DocumentType } from '@/types/ocr';
+import { withVisionCache, type VisionCacheScope } from '@/lib/ai/vision-cache';
 
 let _openai: OpenAI | null = null;
 
@@ -84,28 +85,9 @@ export async function structureOCRData(text: string, type: DocumentType): Promis
   }
 }
 
-/**
- * Processa uma imagem diretamente com OpenAI Vision (OCR + Estruturação)
- */
-export async function processImageWithOpenAI(buffer: Buffer): Promise<{ rawText: string, structuredData: any, docType: string }> {
-  try {
-    const apiKey = process.env.OPENAI_API_KEY;
-    const base64Image = buffer.toString('base64');
-    
-    logger.info(`Sending image to OpenAI via Fetch. Size: ${(buffer.length / 1024).toFixed(1)} KB`);
-
-    const response = await fetch('https://api.openai.com/v1/chat/completions', {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        'Authorization': `Bearer ${apiKey}`,
-      },
-      body: JSON.stringify({
-        model: 'gpt-4o-mini',
-        messages: [
-          {
-            role: 'system',
-            content: `Você é um perito em faturamento médico e OCR de fichas anestésicas. 
+const VISION_MODEL = 'gpt-4o-mini';
+
+const VISION_SYSTEM_PROMPT = `Você é um perito em faturamento médico e OCR de fichas anestésicas. 
 Sua tarefa é extrair dados de etiquetas hospitalares e fichas de anestesia com precisão de 100%.
 
 REGRAS DE VALIDAÇÃO:
@@ -132,47 +114,85 @@ RETORNE APENAS UM JSON COM ESTAS CHAVES:
  
 REGRAS ADICIONAIS:
 - Se não tiver certeza absoluta de um campo, deixe vazio.
-- O campo confidence_score deve refletir a qualidade da imagem e clareza dos dados.`
-          },
-          {
-            role: 'user',
-            content: [
-              { type: 'text', text: 'Analise esta imagem médica com rigor. Se um campo não for encontrado, deixe-o vazio. Verifique se os dados fazem sentido semanticamente.' },
-              {
-                type: 'image_url',
-                image_url: {
-                  url: `data:image/jpeg;base64,${base64Image}`,
-                },
-              },
-            ],
-          },
-        ],
-        response_format: { type: 'json_object' },
-        temperature: 0,
-      }),
-    });
+- O campo confidence_score deve refletir a qualidade da imagem e clareza dos dados.`;
 
-    if (!response.ok) {
-      const errorData = await response.json().catch(() => ({}));
-      const errorMsg = errorData.error?.message || response.statusText;
-      logger.error(`OpenAI Fetch Error: ${response.status}`, errorData);
-      throw new Error(`OpenAI API returned ${response.status}: ${errorMsg}`);
-    }
+const VISION_USER_PROMPT = 'Analise esta imagem médica com rigor. Se um campo não for encontrado, deixe-o vazio. Verifique se os dados fazem sentido semanticamente.';
 
-    const data = await response.json();
-    const structuredData = JSON.parse(data.choices[0].message.content || '{}');
-    const rawText = data.choices[0].message.content || '';
-    
-    let docType = 'medical_order';
-    if (rawText.toLowerCase().includes('recibo')) docType = 'receipt';
+const VISION_CACHE_SCOPE: VisionCacheScope = {
+  extractor: 'whatsapp_ocr',
+  model: VISION_MODEL,
+  prompt: `${VISION_SYSTEM_PROMPT}\n${VISION_USER_PROMPT}`
+};
 
-    return { rawText, structuredData, docType };
+/**
+ * Processa uma imagem diretamente com OpenAI Vision (OCR + Estruturação)
+ * Imagens já processadas com o mesmo prompt saem do cache (cached = true),
+ * sem custo de LLM.
+ */
+export async function processImageWithOpenAI(buffer: Buffer): Promise<{ rawText: string, structuredData: any, docType: string, cached: boolean }> {
+  try {
+    const { value, cached } = await withVisionCache(VISION_CACHE_SCOPE, buffer, () => callVision(buffer));
+    return { ...value, cached };
   } catch (error: any) {
     logger.error('Error processing image with OpenAI Fetch', error);
     throw new OpenAIError(`OpenAI Vision Fetch Error: ${error.message}`);
   }
 }
 
+async function callVision(buffer: Buffer): Promise<{ rawText: string, structuredData: any, docType: string }> {
+  const apiKey = process.env.OPENAI_API_KEY;
+  const base64Image = buffer.toString('base64');
+  
+  logger.info(`Sending image to OpenAI via Fetch. Size: ${(buffer.length / 1024).toFixed(1)} KB`);
+
+  const response = await fetch('https://api.openai.com/v1/chat/completions', {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      'Authorization': `Bearer ${apiKey}`,
+    },
+    body: JSON.stringify({
+      model: VISION_MODEL,
+      messages: [
+        {
+          role: 'system',
+          content: VISION_SYSTEM_PROMPT
+        },
+        {
+          role: 'user',
+          content: [
+            { type: 'text', text: VISION_USER_PROMPT },
+            {
+              type: 'image_url',
+              image_url: {
+                url: `data:image/jpeg;base64,${base64Image}`,
+              },
+            },
+          ],
+        },
+      ],
+      response_format: { type: 'json_object' },
+      temperature: 0,
+    }),
+  });
+
+  if (!response.ok) {
+    const errorData = await response.json().catch(() => ({}));
+    const errorMsg = errorData.error?.message || response.statusText;
+    logger.error(`OpenAI Fetch Error: ${response.status}`, errorData);
+    throw new Error(`OpenAI API returned ${response.status}: ${errorMsg}`);
+  }
+
+  const data = await response.json();
+  const structuredData = JSON.parse(data.choices[0].message.content || '{}');
+  const rawText = data.choices[0].message.content || '';
+  
+  let docType = 'medical_order';
+  if (rawText.toLowerCase().includes('recibo')) docType = 'receipt';
+
+  return { rawText, structuredData, docType };
+}
+
 /**
  * Extrai campos de um procedimento médico a partir de um texto (transcrição de voz)
  */
@@ -6,174 +6,268 @@ import { isValidImage } from '@/utils/base64';
 import { MetaMessage } from '@/types/meta';
 import { encrypt } from '@/lib/security';
 import { adminNotifier } from '@/lib/notifications/admin-service';
+import { VISION_CALL_COST } from '@/lib/ai/vision-cache';
+import { preprocessImageForVision } from '@/lib/ai/image-preprocess';
+import { createPipelineTimer, type PipelineTimer } from '@/lib/pipeline-timings';
 
 /**
  * Processador principal (Worker) para mensagens do WhatsApp
  * Fluxo: Download -> OpenAI Vision Extraction -> Database Persistence
+ *
+ * Executado pelos workers da fila (lib/queue/worker.ts). Erros são propagados
+ * para que o job seja reagendado; quando as tentativas acabam o worker chama
+ * handleWhatsAppMessageFailure.
+ *
+ * O tempo de cada etapa vai para pipeline_timings (lib/pipeline-timings.ts),
+ * inclusive em execuções que falham.
+ *
+ * Uma nova tentativa roda tudo de novo (o Vision sai do cache), mas os efeitos
+ * colaterais já registrados em `steps` (gravações e envio ao WhatsApp) são
+ * pulados: reprocessar não duplica extrações nem reenvia o card ao médico.
  */
-export async function processWhatsAppMessage(message: MetaMessage) {
+export async function processWhatsAppMessage(message: MetaMessage, steps: JobSteps = NO_STEPS) {
+  const timer = createPipelineTimer('whatsapp_ocr', message.id);
+  try {
+    await runWhatsAppOcr(message, timer, steps);
+  } finally {
+    await timer.flush();
+  }
+}
+
+/**
+ * Etapas já concluídas do job (whatsapp_jobs.completed_steps).
+ */
+export interface JobSteps {
+  done(step: string): boolean;
+  mark(step: string): Promise<void>;
+}
+
+// Fora da fila (sem job): nada registrado
+const NO_STEPS: JobSteps = {
+  done: () => false,
+  mark: async () => {}
+};
+
+// Executa o efeito colateral uma única vez por job
+async function once(steps: JobSteps, step: string, fn: () => Promise<void>) {
+  if (steps.done(step)) {
+    logger.info(`Skipping step ${step}: already completed in a previous attempt`);
+    return;
+  }
+  await fn();
+  await steps.mark(step);
+}
+
+async function runWhatsAppOcr(message: MetaMessage, timer: PipelineTimer, steps: JobSteps) {
   const messageId = message.id;
   const phone = message.from;
   
   logger.info(`Starting professional processing for message ${messageId} from ${phone}`);
 
-  try {
-    // 1. Buscar usuário vinculado a este número
-    const { data: account } = await supabaseAdmin
+  // 1. Buscar usuário vinculado a este número
+  const { data: account } = await timer.time('account_lookup', () =>
+    supabaseAdmin
       .from('whatsapp_accounts')
       .select('user_id')
       .eq('phone_number', phone)
       .eq('verified', true)
-      .maybeSingle();
+      .maybeSingle()
+  );
+
+  if (!account) {
+    logger.warn(`Phone ${phone} not linked to any user. Aborting OCR.`);
+    return;
+  }
+
+  // 2. Atualizar status para 'processing'
+  await supabaseAdmin
+    .from('processed_webhooks')
+    .update({ status: 'processing' })
+    .eq('event_id', messageId);
 
-    if (!account) {
-      logger.warn(`Phone ${phone} not linked to any user. Aborting OCR.`);
-      return;
+  let rawText = '';
+  let docType = 'unknown';
+  let structuredData = null;
+  let costLlm = 0;
+  let llmCacheHit = false;
+
+  // 3. Processamento de Imagem
+  if (message.type === 'image' && message.image) {
+    const mediaId = message.image.id;
+    
+    // Download em memória
+    const mediaInfo = await timer.time('media_url', () => getMediaUrl(mediaId));
+    const original = await timer.time('download', () => downloadMedia(mediaInfo.url));
+    
+    if (!isValidImage(original)) {
+      throw new Error('Formato de imagem inválido');
     }
 
-    // 2. Atualizar status para 'processing'
-    await supabaseAdmin
-      .from('processed_webhooks')
-      .update({ status: 'processing' })
-      .eq('event_id', messageId);
+    // Orientação, recorte, redução e JPEG antes do base64
+    const { buffer } = await timer.time('preprocess', () => preprocessImageForVision(original));
 
-    let rawText = '';
-    let docType = 'unknown';
-    let structuredData = null;
-    let costLlm = 0;
+    logger.info(`Starting OpenAI Vision processing for ${mediaId}`);
+    // Acertos do cache de Vision ficam separados para não distorcer o p95
+    const visionStart = performance.now();
+    const visionResult = await processImageWithOpenAI(buffer);
+    timer.record(visionResult.cached ? 'vision_cached' : 'vision', performance.now() - visionStart);
+    
+    rawText = visionResult.rawText;
+    structuredData = visionResult.structuredData;
+    docType = visionResult.docType;
+    // Acerto no cache de Vision: sem custo, registra o custo evitado
+    llmCacheHit = visionResult.cached;
+    costLlm = llmCacheHit ? 0 : VISION_CALL_COST;
+  }
 
-    // 3. Processamento de Imagem
-    if (message.type === 'image' && message.image) {
-      const mediaId = message.image.id;
-      
-      // Download em memória
-      const mediaInfo = await getMediaUrl(mediaId);
-      const buffer = await downloadMedia(mediaInfo.url);
-      
-      if (!isValidImage(buffer)) {
-        throw new Error('Formato de imagem inválido');
-      }
+  // 4. Salvar resultados (Criptografado para LGPD)
+  const { encryptedText, encryptedData } = await timer.time('encrypt', () => ({
+    encryptedText: encrypt(rawText),
+    encryptedData: encrypt(JSON.stringify(structuredData)) as any
+  }));
 
-      logger.info(`Starting OpenAI Vision processing for ${mediaId}`);
-      const visionResult = await processImageWithOpenAI(buffer);
-      
-      rawText = visionResult.rawText;
-      structuredData = visionResult.structuredData;
-      docType = visionResult.docType;
-      costLlm = 0.01; // Custo estimado Vision
-    }
+  await once(steps, 'ocr_message', async () => {
+    const { error: ocrError } = await timer.time('db_ocr_message', () =>
+      supabaseAdmin.from('ocr_messages').insert({
+        phone,
+        media_id: message.type === 'image' ? message.image?.id : null,
+        raw_text: encryptedText,
+        structured_data: encryptedData,
+        doc_type: docType,
+        status: 'completed',
+        cost_llm: costLlm,
+        llm_cache_hit: llmCacheHit,
+        cost_llm_saved: llmCacheHit ? VISION_CALL_COST : 0
+      })
+    );
 
-    // 4. Salvar resultados (Criptografado para LGPD)
-    await supabaseAdmin.from('ocr_messages').insert({
-      phone,
-      media_id: message.type === 'image' ? message.image?.id : null,
-      raw_text: encrypt(rawText),
-      structured_data: encrypt(JSON.stringify(structuredData)) as any,
-      doc_type: docType,
-      status: 'completed',
-      cost_llm: costLlm
-    });
+    if (ocrError) {
+      logger.error('Error saving to ocr_messages', ocrError);
+      throw ocrError;
+    }
+  });
 
-    // 5. Salvar na tabela de extrações para confirmação (Criptografado)
-    if (rawText && structuredData) {
+  // 5. Salvar na tabela de extrações para confirmação (Criptografado)
+  if (rawText && structuredData) {
+    await once(steps, 'extraction', async () => {
       // Limpar extrações pendentes anteriores deste usuário
-      await supabaseAdmin
-        .from('whatsapp_extractions')
-        .update({ status: 'cancelled' })
-        .eq('user_id', account.user_id)
-        .eq('status', 'awaiting_confirmation');
-
-      const { error: extError } = await supabaseAdmin.from('whatsapp_extractions').insert({
-        user_id: account.user_id,
-        raw_ocr_text: encrypt(rawText),
-        extracted_fields: encrypt(JSON.stringify(structuredData)) as any,
-        status: 'awaiting_name',
-        overall_confidence: 0.95
+      const { error: extError } = await timer.time('db_extraction', async () => {
+        await supabaseAdmin
+          .from('whatsapp_extractions')
+          .update({ status: 'cancelled' })
+          .eq('user_id', account.user_id)
+          .eq('status', 'awaiting_confirmation');
+
+        return supabaseAdmin.from('whatsapp_extractions').insert({
+          user_id: account.user_id,
+          raw_ocr_text: encryptedText,
+          extracted_fields: encryptedData,
+          status: 'awaiting_name',
+          overall_confidence: 0.95
+        });
       });
 
       if (extError) {
         logger.error('Error saving to whatsapp_extractions', extError);
         throw extError;
       }
+    });
 
-      // 6. Inteligência de Fluxo (BOT 2.0)
-      const nomePaciente = structuredData.nome_do_paciente || structuredData.paciente || structuredData.nome || '';
-      const tecnica = structuredData.tecnica_anestesica || structuredData.tecnica || '';
-      const procedimento = structuredData.procedimento || structuredData.cirurgia || '';
-      const hospital = structuredData.hospital || structuredData.local || '';
-      const dataCirurgia = structuredData.data_da_cirurgia || structuredData.data || '';
-      const confidence = Number(structuredData.confidence_score) || 0;
+    // 6. Inteligência de Fluxo (BOT 2.0)
+    const nomePaciente = structuredData.nome_do_paciente || structuredData.paciente || structuredData.nome || '';
+    const tecnica = structuredData.tecnica_anestesica || structuredData.tecnica || '';
+    const procedimento = structuredData.procedimento || structuredData.cirurgia || '';
+    const hospital = structuredData.hospital || structuredData.local || '';
+    const dataCirurgia = structuredData.data_da_cirurgia || structuredData.data || '';
+    const confidence = Number(structuredData.confidence_score) || 0;
 
-      // Critérios para "Fluxo Rápido" (Single Card)
-      const hasAllKeyFields = nomePaciente && tecnica && procedimento && hospital && dataCirurgia;
-      const isHighConfidence = confidence >= 0.85;
+    // Critérios para "Fluxo Rápido" (Single Card)
+    const hasAllKeyFields = nomePaciente && tecnica && procedimento && hospital && dataCirurgia;
+    const isHighConfidence = confidence >= 0.85;
+    const fastFlow = hasAllKeyFields && isHighConfidence;
 
-      if (hasAllKeyFields && isHighConfidence) {
-        await supabaseAdmin.from('whatsapp_extractions').insert({
+    await once(steps, 'extraction_flow', async () => {
+      const { error: flowError } = await timer.time('db_extraction_flow', () =>
+        supabaseAdmin.from('whatsapp_extractions').insert({
           user_id: account.user_id,
-          raw_ocr_text: encrypt(rawText),
-          extracted_fields: encrypt(JSON.stringify(structuredData)) as any,
-          status: 'awaiting_full_confirmation',
-          overall_confidence: confidence
-        });
+          raw_ocr_text: encryptedText,
+          extracted_fields: encryptedData,
+          status: fastFlow ? 'awaiting_full_confirmation' : 'awaiting_name',
+          overall_confidence: fastFlow ? confidence : (confidence || 0.5)
+        })
+      );
+
+      if (flowError) {
+        logger.error('Error saving extraction flow state', flowError);
+        throw flowError;
+      }
+    });
 
-        const resumo = `📋 *Ficha Analisada com Sucesso!* 🚀\n\n` +
-                       `👤 *Paciente:* ${nomePaciente}\n` +
-                       `💉 *Anestesia:* ${tecnica}\n` +
-                       `📝 *Cirurgia:* ${procedimento}\n` +
-                       `🏥 *Local:* ${hospital}\n` +
-                       `📅 *Data:* ${dataCirurgia}\n\n` +
-                       `Tudo correto?`;
-        
-        await sendWhatsAppButtons(phone, resumo, [
+    if (fastFlow) {
+      const resumo = `📋 *Ficha Analisada com Sucesso!* 🚀\n\n` +
+                     `👤 *Paciente:* ${nomePaciente}\n` +
+                     `💉 *Anestesia:* ${tecnica}\n` +
+                     `📝 *Cirurgia:* ${procedimento}\n` +
+                     `🏥 *Local:* ${hospital}\n` +
+                     `📅 *Data:* ${dataCirurgia}\n\n` +
+                     `Tudo correto?`;
+      
+      await once(steps, 'whatsapp_send', async () => {
+        await timer.time('whatsapp_send', () => sendWhatsAppButtons(phone, resumo, [
           { id: 'confirm_all', title: '✅ Confirmar tudo' },
           { id: 'adjust_fields', title: '✏️ Ajustar campos' },
           { id: 'new_flow', title: '❌ Cancelar' }
-        ]);
-      } else {
-        // Fluxo Guiado (Step-by-Step)
-        await supabaseAdmin.from('whatsapp_extractions').insert({
-          user_id: account.user_id,
-          raw_ocr_text: encrypt(rawText),
-          extracted_fields: encrypt(JSON.stringify(structuredData)) as any,
-          status: 'awaiting_name',
-          overall_confidence: confidence || 0.5
-        });
-
-        const msg = `📋 *Ficha Analisada!*\n\n*Paciente:* ${nomePaciente || 'Não identificado'}\n\nConfirma o nome do paciente ou deseja alterar?`;
-        
-        await sendWhatsAppButtons(phone, msg, [
+        ]));
+      });
+    } else {
+      // Fluxo Guiado (Step-by-Step)
+      const msg = `📋 *Ficha Analisada!*\n\n*Paciente:* ${nomePaciente || 'Não identificado'}\n\nConfirma o nome do paciente ou deseja alterar?`;
+      
+      await once(steps, 'whatsapp_send', async () => {
+        await timer.time('whatsapp_send', () => sendWhatsAppButtons(phone, msg, [
           { id: 'confirm_name', title: '✅ Sim, confirmar' },
           { id: 'change_name', title: '✏️ Alterar nome' }
-        ]);
-      }
-    } else {
-      await sendWhatsAppMessage(phone, "❌ Não consegui ler os dados desta imagem. Por favor, tente enviar uma foto mais nítida.");
+        ]));
+      });
     }
+  } else {
+    await once(steps, 'whatsapp_send', async () => {
+      await timer.time('whatsapp_send', () =>
+        sendWhatsAppMessage(phone, "❌ Não consegui ler os dados desta imagem. Por favor, tente enviar uma foto mais nítida.")
+      );
+    });
+  }
 
-    // 7. Marcar como concluído
-    await supabaseAdmin
-      .from('processed_webhooks')
-      .update({ status: 'completed' })
-      .eq('event_id', messageId);
+  // 7. Marcar como concluído
+  await supabaseAdmin
+    .from('processed_webhooks')
+    .update({ status: 'completed' })
+    .eq('event_id', messageId);
+}
 
-  } catch (error: any) {
-    logger.error(`Error processing message ${messageId}`, error);
-    
-    await supabaseAdmin
-      .from('processed_webhooks')
-      .update({ status: 'failed' })
-      .eq('event_id', messageId);
-
-    // Salvar erro detalhado
-    await supabaseAdmin.from('ocr_messages').insert({
-      phone,
-      status: 'failed',
-      error_log: error.message || String(error)
-    });
+/**
+ * Falha definitiva (job em dead-letter): registra o erro e avisa o usuário
+ */
+export async function handleWhatsAppMessageFailure(message: MetaMessage, error: unknown) {
+  const messageId = message.id;
+  const phone = message.from;
+  const errorMessage = error instanceof Error ? error.message : String(error);
 
-    await adminNotifier.notifyError(phone, error, 'Processador OCR (IA)');
+  logger.error(`Error processing message ${messageId}`, error);
 
-    await sendWhatsAppMessage(phone, "⚠️ Tive um problema ao processar sua imagem. Por favor, tente novamente em instantes.");
-  }
+  await supabaseAdmin
+    .from('processed_webhooks')
+    .update({ status: 'failed' })
+    .eq('event_id', messageId);
+
+  // Salvar erro detalhado
+  await supabaseAdmin.from('ocr_messages').insert({
+    phone,
+    status: 'failed',
+    error_log: errorMessage
+  });
+
+  await adminNotifier.notifyError(phone, error instanceof Error ? error : errorMessage, 'Processador OCR (IA)');
+
+  await sendWhatsAppMessage(phone, "⚠️ Tive um problema ao processar sua imagem. Por favor, tente novamente em instantes.");
 }
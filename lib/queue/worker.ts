@@ -0,0 +1,172 @@
+import { randomUUID } from 'crypto';
+import { logger } from '@/lib/logger';
+import { supabaseAdmin } from '@/lib/supabase-server';
+import { MetaMessage } from '@/types/meta';
+import { processWhatsAppMessage, handleWhatsAppMessageFailure, type JobSteps } from './processor';
+
+/**
+ * Fila durável do OCR do WhatsApp (tabela whatsapp_jobs).
+ *
+ * O webhook chama enqueueWhatsAppJob e responde; runWorker reserva jobs com
+ * claim_whatsapp_jobs (FOR UPDATE SKIP LOCKED) e os processa com até
+ * `concurrency` em paralelo. Cada reserva vale por `visibilityTimeoutSeconds`:
+ * se o processo morrer no meio (timeout da função), o job volta para a fila
+ * quando o prazo vence. Falhas são reagendadas com espera exponencial até
+ * max_attempts; depois o job fica em dead-letter ('dead').
+ *
+ * Cada efeito colateral concluído fica em completed_steps
+ * (mark_whatsapp_job_step), e uma nova tentativa o pula: reprocessar um job
+ * não duplica gravações nem reenvia mensagens.
+ */
+
+export interface WorkerOptions {
+  concurrency?: number;
+  // Deve cobrir o pior caso de um job (download + Vision + envio)
+  visibilityTimeoutSeconds?: number;
+  // Espera da 1ª nova tentativa; dobra a cada falha
+  retryBaseSeconds?: number;
+  // Para de reservar jobs novos depois disso (os em andamento terminam)
+  maxRuntimeMs?: number;
+  workerId?: string;
+}
+
+export interface WorkerResult {
+  workerId: string;
+  completed: number;
+  retried: number;
+  dead: number;
+}
+
+type WhatsAppJob = {
+  id: string;
+  event_id: string;
+  payload: MetaMessage;
+  attempts: number;
+  max_attempts: number;
+  completed_steps: string[] | null;
+};
+
+const DEFAULT_CONCURRENCY = parseInt(process.env.WHATSAPP_WORKER_CONCURRENCY || '3');
+const DEFAULT_VISIBILITY_TIMEOUT_SECONDS = 120;
+const DEFAULT_RETRY_BASE_SECONDS = 15;
+
+/**
+ * Enfileira uma mensagem de mídia. Idempotente por id da mensagem (a Meta
+ * reenvia webhooks).
+ */
+export async function enqueueWhatsAppJob(message: MetaMessage) {
+  const { error } = await supabaseAdmin
+    .from('whatsapp_jobs')
+    .upsert(
+      { event_id: message.id, payload: message as any },
+      { onConflict: 'event_id', ignoreDuplicates: true }
+    );
+  if (error) throw error;
+}
+
+/**
+ * Etapas do job: as já gravadas vêm da reserva; cada nova é registrada antes
+ * de seguir para a próxima. Sem a reserva o job não pode continuar (outro
+ * worker pode tê-lo reservado).
+ */
+function createJobSteps(job: WhatsAppJob, workerId: string): JobSteps {
+  const completed = new Set(job.completed_steps || []);
+  return {
+    done: step => completed.has(step),
+    async mark(step) {
+      const { data: held, error } = await supabaseAdmin.rpc('mark_whatsapp_job_step', {
+        p_id: job.id,
+        p_worker: workerId,
+        p_step: step
+      });
+      if (error) throw error;
+      if (!held) throw new Error(`Lost claim on job ${job.id}`);
+      completed.add(step);
+    }
+  };
+}
+
+/**
+ * Processa jobs até a fila esvaziar ou maxRuntimeMs acabar.
+ */
+export async function runWorker(options: WorkerOptions = {}): Promise<WorkerResult> {
+  const concurrency = Math.max(1, options.concurrency ?? DEFAULT_CONCURRENCY);
+  const visibility = options.visibilityTimeoutSeconds ?? DEFAULT_VISIBILITY_TIMEOUT_SECONDS;
+  const retryBase = options.retryBaseSeconds ?? DEFAULT_RETRY_BASE_SECONDS;
+  const deadline = Date.now() + (options.maxRuntimeMs ?? 50_000);
+  const workerId = options.workerId || `worker-${randomUUID()}`;
+
+  const result: WorkerResult = { workerId, completed: 0, retried: 0, dead: 0 };
+
+  async function runJob(job: WhatsAppJob) {
+    try {
+      await processWhatsAppMessage(job.payload, createJobSteps(job, workerId));
+    } catch (error: any) {
+      const { data: status, error: failError } = await supabaseAdmin.rpc('fail_whatsapp_job', {
+        p_id: job.id,
+        p_worker: workerId,
+        p_error: error?.message || String(error),
+        p_base_seconds: retryBase
+      });
+      if (failError) {
+        // Sem registrar a falha o job volta sozinho quando a reserva vencer
+        logger.error(`Error recording failure of job ${job.id}`, failError);
+        return;
+      }
+      if (!status) {
+        // A reserva venceu e outro worker assumiu o job
+        logger.warn(`Job ${job.id} failed after its claim was lost`, { error: error?.message });
+        return;
+      }
+
+      if (status === 'dead') {
+        result.dead++;
+        await handleWhatsAppMessageFailure(job.payload, error).catch(e =>
+          logger.error(`Error handling dead job ${job.id}`, e)
+        );
+      } else {
+        result.retried++;
+        logger.warn(`Job ${job.id} failed (attempt ${job.attempts}/${job.max_attempts}), retry scheduled`, {
+          error: error?.message
+        });
+      }
+      return;
+    }
+
+    const { data: completed, error: completeError } = await supabaseAdmin.rpc('complete_whatsapp_job', {
+      p_id: job.id,
+      p_worker: workerId
+    });
+    if (completeError) {
+      // O job volta quando a reserva vencer; as etapas registradas não se repetem
+      logger.error(`Error completing job ${job.id}`, completeError);
+    } else if (!completed) {
+      logger.warn(`Job ${job.id} finished after its claim was lost`);
+    } else {
+      result.completed++;
+    }
+  }
+
+  // Cada "pista" reserva um job por vez: no máximo `concurrency` em paralelo
+  async function lane() {
+    while (Date.now() < deadline) {
+      const { data, error } = await supabaseAdmin.rpc('claim_whatsapp_jobs', {
+        p_worker: workerId,
+        p_limit: 1,
+        p_visibility_seconds: visibility
+      });
+      if (error) {
+        logger.error('Error claiming WhatsApp jobs', error);
+        return;
+      }
+
+      const job = (data as unknown as WhatsAppJob[] | null)?.[0];
+      if (!job) return; // fila vazia
+
+      await runJob(job);
+    }
+  }
+
+  await Promise.all(Array.from({ length: concurrency }, lane));
+  return result;
+}
@@ -0,0 +1,329 @@
+import 'server-only';
+import { createHash } from 'crypto';
+import * as XLSX from 'xlsx';
+import { createAdminClient } from '@/utils/supabase/admin';
+import { logger } from '@/lib/logger';
+import {
+  consolidarAnual,
+  type DadosFinanceirosGrupo,
+  type MembroCotista,
+} from '@/lib/exportarRelatorioContador';
+
+/**
+ * Relatório anual do contador (XLSX), gerado no servidor.
+ *
+ * Anos encerrados, em que todo mês com movimento tem fechamento 'fechado',
+ * são gravados no bucket relatorios-contador como
+ * <grupo>/<ano>-<versão>.xlsx. A versão é um hash dos fechamentos do ano e
+ * da composição de cotas: reabrir um mês ou mudar um cotista gera outro
+ * arquivo. Anos em aberto são gerados a cada download.
+ */
+
+const BUCKET = 'relatorios-contador';
+
+const FECHAMENTO_FINAL = 'fechado';
+
+export interface RelatorioContador {
+  buffer: Buffer;
+  fileName: string;
+  cached: boolean;
+}
+
+// ---------------------------------------------------------------------------
+// Helpers
+// ---------------------------------------------------------------------------
+
+function slugify(text: string): string {
+  return text
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .replace(/\s+/g, '-')
+    .replace(/[^a-z0-9-]/g, '');
+}
+
+// ---------------------------------------------------------------------------
+// Sheet builders
+// ---------------------------------------------------------------------------
+
+function buildResumo(
+  grupo: DadosFinanceirosGrupo['grupo'],
+  anual: DadosFinanceirosGrupo['anual'],
+): XLSX.WorkSheet {
+  const rows: (string | number)[][] = [
+    ['Resumo Financeiro Anual', anual.ano],
+    ['Grupo', grupo.nome],
+    [],
+    ['Indicador', 'Valor'],
+    ['Faturamento Bruto', anual.faturamentoBruto],
+    ['Despesas', anual.despesas],
+    ['Líquido Distribuível', anual.liquidoDistribuivel],
+    ['Cota Individual', anual.cotaIndividual],
+    ['Nº de Cotistas', grupo.totalCotistas],
+    ['Procedimentos', anual.procedimentos],
+    ['Ticket Médio', anual.ticketMedio],
+    ['A Receber (Pendente)', anual.aReceber],
+    [],
+    [
+      'O AnestEasy organiza e consolida os dados. Nao calcula nem recolhe tributos. A apuracao fiscal e a declaracao sao responsabilidade do contador.',
+    ],
+  ];
+
+  const ws = XLSX.utils.aoa_to_sheet(rows);
+  ws['!cols'] = [{ wch: 22 }, { wch: 20 }];
+  return ws;
+}
+
+function buildFaturamentoMensal(
+  anual: DadosFinanceirosGrupo['anual'],
+): XLSX.WorkSheet {
+  const rows: (string | number)[][] = [['Mês', 'Valor']];
+
+  let total = 0;
+  for (const item of anual.faturamentoMensal) {
+    rows.push([item.mes, item.valor]);
+    total += item.valor;
+  }
+
+  rows.push(['Total', total]);
+
+  const ws = XLSX.utils.aoa_to_sheet(rows);
+  ws['!cols'] = [{ wch: 18 }, { wch: 18 }];
+  return ws;
+}
+
+function buildDistribuicaoCotas(
+  anual: DadosFinanceirosGrupo['anual'],
+): XLSX.WorkSheet {
+  const rows: (string | number)[][] = [
+    ['Nome', 'CRM', 'Cota (%)', 'Recebido CNPJ', 'Recebido CPF'],
+  ];
+
+  let totalCota = 0;
+  let totalCnpj = 0;
+  let totalCpf = 0;
+
+  for (const c of anual.cotistas) {
+    rows.push([c.nome, c.crm, c.cota, c.recebidoCnpj, c.recebidoCpf]);
+    totalCota += c.cota;
+    totalCnpj += c.recebidoCnpj;
+    totalCpf += c.recebidoCpf;
+  }
+
+  rows.push(['Total', '', totalCota, totalCnpj, totalCpf]);
+
+  const ws = XLSX.utils.aoa_to_sheet(rows);
+  ws['!cols'] = [
+    { wch: 30 },
+    { wch: 12 },
+    { wch: 12 },
+    { wch: 18 },
+    { wch: 18 },
+  ];
+  return ws;
+}
+
+function buildPorTitularidade(
+  anual: DadosFinanceirosGrupo['anual'],
+): XLSX.WorkSheet {
+  const rows: (string | number)[][] = [
+    ['Titularidade', 'Valor'],
+    [],
+    ['Recebido via CNPJ', anual.distribuicao.cnpj],
+    ['Recebido via CPF', anual.distribuicao.cpf],
+    [],
+    ['Detalhamento CPF', ''],
+    [
+      'Recebido de Fonte PJ',
+      anual.cpfPorFonte.fontePJ,
+    ],
+    ['  IRRF Retido', anual.cpfPorFonte.irrfRetido],
+    ['  INSS Retido', anual.cpfPorFonte.inssRetido],
+    [
+      'Recebido de Fonte PF (sujeito a carnê-leão)',
+      anual.cpfPorFonte.fontePF,
+    ],
+  ];
+
+  const ws = XLSX.utils.aoa_to_sheet(rows);
+  ws['!cols'] = [{ wch: 44 }, { wch: 20 }];
+  return ws;
+}
+
+function buildGlosas(
+  anual: DadosFinanceirosGrupo['anual'],
+): XLSX.WorkSheet {
+  const rows: (string | number)[][] = [
+    ['Glosas', 'Valor'],
+    ['Glosado no Ano', anual.glosado],
+    ['Glosa Recuperada', anual.glosaRecuperada],
+    ['Glosa em Aberto', anual.glosaEmAberto],
+    ['Parcelamentos a Vencer', anual.parcelamentosAVencer],
+  ];
+
+  const ws = XLSX.utils.aoa_to_sheet(rows);
+  ws['!cols'] = [{ wch: 26 }, { wch: 20 }];
+  return ws;
+}
+
+// ---------------------------------------------------------------------------
+// Workbook
+// ---------------------------------------------------------------------------
+
+export function montarRelatorioContador(
+  grupo: DadosFinanceirosGrupo['grupo'],
+  anual: DadosFinanceirosGrupo['anual'],
+): Buffer {
+  const wb = XLSX.utils.book_new();
+
+  XLSX.utils.book_append_sheet(wb, buildResumo(grupo, anual), 'Resumo');
+  XLSX.utils.book_append_sheet(
+    wb,
+    buildFaturamentoMensal(anual),
+    'Faturamento Mensal',
+  );
+  XLSX.utils.book_append_sheet(
+    wb,
+    buildDistribuicaoCotas(anual),
+    'Distribuicao Cotas',
+  );
+  XLSX.utils.book_append_sheet(
+    wb,
+    buildPorTitularidade(anual),
+    'Por Titularidade',
+  );
+  XLSX.utils.book_append_sheet(wb, buildGlosas(anual), 'Glosas');
+
+  return XLSX.write(wb, { type: 'buffer', bookType: 'xlsx', compression: true });
+}
+
+export function nomeArquivoRelatorioContador(nomeGrupo: string, ano: number): string {
+  return `relatorio-contador-${slugify(nomeGrupo)}-${ano}.xlsx`;
+}
+
+// ---------------------------------------------------------------------------
+// Dados + cache
+// ---------------------------------------------------------------------------
+
+/**
+ * Gera (ou lê do Storage) o relatório do contador do grupo no ano.
+ * Retorna null se o grupo não existir.
+ */
+export async function obterRelatorioContador(groupId: string, ano: number): Promise<RelatorioContador | null> {
+  const supabase = createAdminClient();
+
+  const [grupoRes, mesesRes, membrosRes, fechamentosRes] = await Promise.all([
+    supabase
+      .from('groups')
+      .select('id, name, type, group_members ( quota_percent, users:user_id ( id, name, crm ) )')
+      .eq('id', groupId)
+      .is('deleted_at', null)
+      .maybeSingle(),
+    supabase
+      .from('group_financial_monthly')
+      .select('month, procedures_count, revenue, receivable, revenue_cnpj, revenue_cpf, despesas_total')
+      .eq('group_id', groupId)
+      .gte('month', `${ano}-01-01`)
+      .lte('month', `${ano}-12-01`),
+    supabase
+      .from('group_member_financial_monthly')
+      .select('month, user_id, revenue_cnpj, revenue_cpf')
+      .eq('group_id', groupId)
+      .gte('month', `${ano}-01-01`)
+      .lte('month', `${ano}-12-01`),
+    supabase
+      .from('group_monthly_closings')
+      .select('id, reference_month, status, total_revenue, updated_at')
+      .eq('group_id', groupId)
+      .gte('reference_month', `${ano}-01-01`)
+      .lte('reference_month', `${ano}-12-31`)
+      .order('reference_month', { ascending: true }),
+  ]);
+
+  if (grupoRes.error) throw grupoRes.error;
+  if (mesesRes.error) throw mesesRes.error;
+  if (membrosRes.error) throw membrosRes.error;
+  if (fechamentosRes.error) throw fechamentosRes.error;
+  if (!grupoRes.data) return null;
+
+  const group = grupoRes.data as {
+    id: string;
+    name: string;
+    type: string | null;
+    group_members: MembroCotista[] | null;
+  };
+  const groupMembers = group.group_members || [];
+  const meses = mesesRes.data || [];
+  const fechamentos = fechamentosRes.data || [];
+
+  const grupo: DadosFinanceirosGrupo['grupo'] = {
+    id: group.id,
+    nome: group.name,
+    totalCotistas: groupMembers.length,
+    isQuotaGroup: group.type === 'com_cotas',
+  };
+  const fileName = nomeArquivoRelatorioContador(group.name, ano);
+
+  // Ano encerrado e todo mês com movimento já fechado
+  const mesesFechados = new Set(
+    fechamentos.filter(f => f.status === FECHAMENTO_FINAL).map(f => String(f.reference_month).slice(0, 7)),
+  );
+  const anoFechado = ano < new Date().getFullYear()
+    && fechamentos.length > 0
+    && meses.every(m => mesesFechados.has(m.month.slice(0, 7)));
+
+  const versao = createHash('sha256')
+    .update(JSON.stringify([
+      group.name,
+      fechamentos.map(f => [f.id, f.status, f.total_revenue, f.updated_at]),
+      groupMembers.map(m => [m.users?.id, m.users?.name, m.users?.crm, m.quota_percent]),
+    ]))
+    .digest('hex')
+    .slice(0, 16);
+  const path = `${groupId}/${ano}-${versao}.xlsx`;
+
+  if (anoFechado) {
+    const { data: stored } = await supabase.storage.from(BUCKET).download(path);
+    if (stored) {
+      return { buffer: Buffer.from(await stored.arrayBuffer()), fileName, cached: true };
+    }
+  }
+
+  const anual = consolidarAnual(ano, meses, membrosRes.data || [], groupMembers);
+  const buffer = montarRelatorioContador(grupo, anual);
+
+  if (anoFechado) {
+    await guardarRelatorio(supabase, groupId, ano, path, buffer);
+  }
+
+  return { buffer, fileName, cached: false };
+}
+
+/**
+ * Grava a versão atual e remove as versões anteriores do mesmo ano.
+ * Falhas só geram log: o download não depende do cache.
+ */
+async function guardarRelatorio(
+  supabase: ReturnType<typeof createAdminClient>,
+  groupId: string,
+  ano: number,
+  path: string,
+  buffer: Buffer,
+): Promise<void> {
+  const { error } = await supabase.storage.from(BUCKET).upload(path, buffer, {
+    contentType: 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    upsert: true,
+  });
+  if (error) {
+    logger.warn('Failed to store accountant report', { groupId, ano, message: error.message });
+    return;
+  }
+
+  const { data: anteriores } = await supabase.storage.from(BUCKET).list(groupId, { search: `${ano}-` });
+  const obsoletos = (anteriores || [])
+    .map(file => `${groupId}/${file.name}`)
+    .filter(name => name !== path && name.startsWith(`${groupId}/${ano}-`));
+  if (obsoletos.length > 0) {
+    await supabase.storage.from(BUCKET).remove(obsoletos);
+  }
+}
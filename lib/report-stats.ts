@@ -0,0 +1,237 @@
+import type { Procedure } from './procedures'
+import { normalizeProcedureName, normalizeHospitalName, normalizeSurgeonName } from './normalization'
+
+/**
+ * Estatísticas de procedimentos usadas em relatórios e dashboards,
+ * calculadas em uma única passada sobre as linhas.
+ */
+
+export interface ObstetricStats {
+  vaginalCount: number
+  vaginalAvgDurationMinutes: number
+  overallAvgDurationMinutes: number
+}
+
+export interface ConvenioStat {
+  convenio: string
+  count: number
+  percentage: number
+  avgDurationMinutes: number
+  avgDurationExcludingMinutes: number
+}
+
+export interface HospitalStat {
+  hospital: string
+  count: number
+  totalValue: number
+}
+
+export interface ProcedureTypeStat {
+  type: string
+  count: number
+  totalValue: number
+}
+
+export interface SurgeonStat {
+  surgeon: string
+  count: number
+  totalValue: number
+}
+
+export interface MonthlyStat {
+  month: string // format 'YYYY-MM'
+  count: number
+  totalValue: number
+}
+
+export interface ProcedureStatBlocks {
+  obstetricStats: ObstetricStats
+  convenioStats: ConvenioStat[]
+  hospitalStats: HospitalStat[]
+  procedureTypeStats: ProcedureTypeStat[]
+  surgeonStats: SurgeonStat[]
+  monthlyStats: MonthlyStat[]
+}
+
+export interface ProcedureStatusTotals {
+  total: number
+  completed: number
+  pending: number
+  cancelled: number
+  sent: number
+  totalValue: number
+  completedValue: number
+  pendingValue: number
+}
+
+const NO_CONVENIO = 'Particular / Não informado'
+
+type Bucket = { count: number; totalValue: number }
+type ConvenioBucket = { count: number; totalDuration: number; durationCount: number }
+
+function addToBucket(map: Map<string, Bucket>, key: string, value: number) {
+  const bucket = map.get(key)
+  if (bucket) {
+    bucket.count++
+    bucket.totalValue += value
+  } else {
+    map.set(key, { count: 1, totalValue: value })
+  }
+}
+
+// 'YYYY-MM-DD' (coluna DATE) vira 'YYYY-MM' direto, sem new Date() — que
+// interpreta a data como UTC e, no fuso do Brasil, jogaria o dia 1º no mês
+// anterior. Outros formatos caem no parse de Date.
+function monthKeyOf(procedureDate: string): string | null {
+  if (/^\d{4}-\d{2}/.test(procedureDate)) return procedureDate.slice(0, 7)
+  const date = new Date(procedureDate)
+  if (isNaN(date.getTime())) return null
+  return `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`
+}
+
+/**
+ * Calcula todos os blocos de estatística de ReportData (hospital, tipo,
+ * cirurgião, mês, convênio/duração e partos vaginais) em uma única passada.
+ * As chaves são normalizadas pelas funções memoizadas de lib/normalization.ts,
+ * então cada nome distinto é normalizado uma vez só.
+ */
+export function aggregateProcedureStats(procedures: Procedure[]): ProcedureStatBlocks {
+  const hospitalMap = new Map<string, Bucket>()
+  const typeMap = new Map<string, Bucket>()
+  const surgeonMap = new Map<string, Bucket>()
+  const monthMap = new Map<string, Bucket>()
+  const convenioMap = new Map<string, ConvenioBucket>()
+
+  let vaginalCount = 0
+  let vaginalDuration = 0
+  let overallDurationTotal = 0
+  let overallDurationCount = 0
+
+  for (const p of procedures) {
+    const value = p.procedure_value || 0
+    const duration = p.duracao_minutos && p.duracao_minutos > 0 ? p.duracao_minutos : 0
+
+    addToBucket(hospitalMap, normalizeHospitalName(p.hospital_clinic || ''), value)
+    addToBucket(typeMap, normalizeProcedureName(p.procedure_type || ''), value)
+    addToBucket(surgeonMap, normalizeSurgeonName(p.surgeon_name || p.nome_cirurgiao || ''), value)
+
+    if (p.procedure_date) {
+      const month = monthKeyOf(p.procedure_date)
+      if (month) addToBucket(monthMap, month, value)
+    }
+
+    const rawConvenio = (p.convenio || '').trim()
+    const convenio = rawConvenio.length > 0 ? rawConvenio : NO_CONVENIO
+    let convenioBucket = convenioMap.get(convenio)
+    if (!convenioBucket) {
+      convenioBucket = { count: 0, totalDuration: 0, durationCount: 0 }
+      convenioMap.set(convenio, convenioBucket)
+    }
+    convenioBucket.count++
+
+    if (duration > 0) {
+      convenioBucket.totalDuration += duration
+      convenioBucket.durationCount++
+      overallDurationTotal += duration
+      overallDurationCount++
+      if (p.tipo_parto === 'Vaginal') {
+        vaginalCount++
+        vaginalDuration += duration
+      }
+    }
+  }
+
+  const byCount = <T extends { count: number }>(a: T, b: T) => b.count - a.count
+  const totalProcedures = procedures.length
+
+  const convenioStats: ConvenioStat[] = Array.from(convenioMap, ([convenio, c]) => {
+    const otherDurationCount = overallDurationCount - c.durationCount
+    return {
+      convenio,
+      count: c.count,
+      percentage: totalProcedures > 0 ? Math.round((c.count / totalProcedures) * 100) : 0,
+      avgDurationMinutes: c.durationCount > 0 ? c.totalDuration / c.durationCount : 0,
+      avgDurationExcludingMinutes:
+        otherDurationCount > 0 ? (overallDurationTotal - c.totalDuration) / otherDurationCount : 0
+    }
+  }).sort(byCount)
+
+  return {
+    obstetricStats: {
+      vaginalCount,
+      vaginalAvgDurationMinutes: vaginalCount > 0 ? vaginalDuration / vaginalCount : 0,
+      overallAvgDurationMinutes: overallDurationCount > 0 ? overallDurationTotal / overallDurationCount : 0
+    },
+    convenioStats,
+    hospitalStats: Array.from(hospitalMap, ([hospital, b]) => ({ hospital, ...b })).sort(byCount),
+    procedureTypeStats: Array.from(typeMap, ([type, b]) => ({ type, ...b })).sort(byCount),
+    surgeonStats: Array.from(surgeonMap, ([surgeon, b]) => ({ surgeon, ...b })).sort(byCount),
+    monthlyStats: Array.from(monthMap, ([month, b]) => ({ month, ...b })).sort((a, b) => a.month.localeCompare(b.month))
+  }
+}
+
+type StatusRow = Pick<Procedure, 'id' | 'payment_status' | 'procedure_value' | 'payment_method' | 'forma_pagamento'>
+
+/**
+ * Totais por situação de pagamento (regras de procedureService.getProcedureStats)
+ * em uma passada. receivedByProcedure traz o valor já recebido das parcelas
+ * de cada procedimento parcelado.
+ */
+export function aggregateStatusTotals(
+  procedures: StatusRow[],
+  receivedByProcedure: Map<string, number>
+): ProcedureStatusTotals {
+  const stats: ProcedureStatusTotals = {
+    total: procedures.length,
+    completed: 0,
+    pending: 0,
+    cancelled: 0,
+    sent: 0,
+    totalValue: 0,
+    completedValue: 0,
+    pendingValue: 0
+  }
+
+  for (const procedure of procedures) {
+    const value = procedure.procedure_value || 0
+    stats.totalValue += value
+
+    if (procedure.payment_method === 'Parcelado' || procedure.forma_pagamento === 'Parcelado') {
+      // Parcelado: recebido e pendente saem das parcelas
+      const received = receivedByProcedure.get(procedure.id) || 0
+      const pending = value - received
+      if (received > 0) {
+        stats.completed++
+        stats.completedValue += received
+      }
+      if (pending > 0) {
+        stats.pending++
+        stats.pendingValue += pending
+      }
+      continue
+    }
+
+    switch (procedure.payment_status) {
+      case 'paid':
+        stats.completed++
+        stats.completedValue += value
+        break
+      case 'pending':
+        stats.pending++
+        stats.pendingValue += value
+        break
+      case 'cancelled':
+        stats.cancelled++
+        // Incluir cancelled no pendingValue (não recebido)
+        stats.pendingValue += value
+        break
+      case 'sent':
+        stats.sent++
+        // Enviado ainda é pendente de pagamento
+        stats.pendingValue += value
+        break
+    }
+  }
+
+  return stats
+}
@@ -3,6 +3,16 @@ import { shiftService, Shift } from './shifts'
 import { formatCurrency, formatDate, formatDateTime } from './utils'
 import { normalizeProcedureName, normalizeHospitalName, normalizeSurgeonName } from './normalization'
 import { supabase } from './supabase'
+import {
+  aggregateProcedureStats,
+  ConvenioStat,
+  HospitalStat,
+  MonthlyStat,
+  ObstetricStats,
+  ProcedureStatusTotals,
+  ProcedureTypeStat,
+  SurgeonStat
+} from './report-stats'
 
 interface FeedbackStats {
   totalLinks: number
@@ -14,44 +24,6 @@ interface FeedbackStats {
   anemiaTransfusaoRate: number
 }
 
-interface ObstetricStats {
-  vaginalCount: number
-  vaginalAvgDurationMinutes: number
-  overallAvgDurationMinutes: number
-}
-
-interface ConvenioStat {
-  convenio: string
-  count: number
-  percentage: number
-  avgDurationMinutes: number
-  avgDurationExcludingMinutes: number
-}
-
-interface HospitalStat {
-  hospital: string
-  count: number
-  totalValue: number
-}
-
-interface ProcedureTypeStat {
-  type: string
-  count: number
-  totalValue: number
-}
-
-interface SurgeonStat {
-  surgeon: string
-  count: number
-  totalValue: number
-}
-
-interface MonthlyStat {
-  month: string // format 'YYYY-MM'
-  count: number
-  totalValue: number
-}
-
 export interface ReportData {
   procedures: Procedure[]
   shifts?: Shift[]
@@ -71,6 +43,7 @@ export interface ReportData {
   convenioStats: ConvenioStat[]
   hospitalStats: HospitalStat[]
   procedureTypeStats: ProcedureTypeStat[]
+  surgeonStats: SurgeonStat[]
   monthlyStats: MonthlyStat[]
   isFinancialHidden?: boolean
   groupName?: string
@@ -80,6 +53,9 @@ export interface ReportData {
   }
 }
 
+const safeRate = (count: number, total: number) =>
+  total > 0 ? Math.round((count / total) * 100) : 0
+
 async function computeFeedbackStats(procedures: Procedure[]): Promise<FeedbackStats> {
   if (!procedures.length) {
     return {
@@ -144,9 +120,6 @@ async function computeFeedbackStats(procedures: Procedure[]): Promise<FeedbackSt
     }
   }
 
-  const safeRate = (count: number, total: number) =>
-    total > 0 ? Math.round((count / total) * 100) : 0
-
   return {
     totalLinks,
     totalResponses,
@@ -158,158 +131,164 @@ async function computeFeedbackStats(procedures: Procedure[]): Promise<FeedbackSt
   }
 }
 
-function computeObstetricAndConvenioStats(procedures: Procedure[]): {
-  obstetricStats: ObstetricStats
-  convenioStats: ConvenioStat[]
-} {
-  // Tempo médio de partos vaginais
-  const vaginalProcedures = procedures.filter(
-    (p) => p.tipo_parto === 'Vaginal' && (p.duracao_minutos || 0) > 0
-  )
-
-  const vaginalCount = vaginalProcedures.length
-  const totalVaginalDuration = vaginalProcedures.reduce(
-    (sum, p) => sum + (p.duracao_minutos || 0),
-    0
-  )
-
-  const vaginalAvgDurationMinutes =
-    vaginalCount > 0 ? totalVaginalDuration / vaginalCount : 0
-
-  // Distribuição por convênio + duração média
-  const totalProcedures = procedures.length
-  type ConvenioAgg = { count: number; totalDuration: number; durationCount: number }
-  const convenioMap = new Map<string, ConvenioAgg>()
-  let overallDurationTotal = 0
-  let overallDurationCount = 0
+// Formato retornado pela RPC get_report_aggregates (agregados calculados no banco)
+interface AggregateRow {
+  key: string
+  count: number
+  total_value: number
+}
 
-  for (const p of procedures) {
-    const raw = (p.convenio || '').trim()
-    const convenio =
-      raw.length > 0 ? raw : 'Particular / Não informado'
+interface ReportAggregates {
+  stats: ProcedureStatusTotals
+  hospitals: AggregateRow[]
+  procedure_types: AggregateRow[]
+  surgeons: AggregateRow[]
+  months: AggregateRow[]
+  convenios: { key: string; count: number; duration_total: number; duration_count: number }[]
+  vaginal: { count: number; duration_total: number }
+  feedback: {
+    links: number
+    responses: number
+    nausea: number
+    cefaleia: number
+    dor_lombar: number
+    anemia_transfusao: number
+  }
+}
 
-    const current = convenioMap.get(convenio) || {
-      count: 0,
-      totalDuration: 0,
-      durationCount: 0
-    }
+async function fetchReportAggregates(
+  userId: string,
+  startDate?: string,
+  endDate?: string,
+  groupId?: string
+): Promise<ReportAggregates | null> {
+  const { data, error } = await supabase.rpc('get_report_aggregates', {
+    p_user_id: userId,
+    p_group_id: groupId || null,
+    p_start: startDate || null,
+    p_end: endDate || null
+  })
 
-    current.count += 1
+  if (error || !data) {
+    console.warn('RPC get_report_aggregates indisponível, calculando a partir dos procedimentos:', error)
+    return null
+  }
+  return data as unknown as ReportAggregates
+}
 
-    if (p.duracao_minutos && p.duracao_minutos > 0) {
-      current.totalDuration += p.duracao_minutos
-      current.durationCount += 1
-      overallDurationTotal += p.duracao_minutos
-      overallDurationCount += 1
-    }
+// Junta as chaves brutas do banco que normalizam para o mesmo nome
+function mergeAggregateRows(
+  rows: AggregateRow[],
+  normalize: (raw: string) => string,
+  hideValues: boolean
+): Map<string, { count: number; totalValue: number }> {
+  const merged = new Map<string, { count: number; totalValue: number }>()
+  for (const row of rows) {
+    const key = normalize(row.key)
+    const stat = merged.get(key) || { count: 0, totalValue: 0 }
+    stat.count += row.count
+    stat.totalValue += hideValues ? 0 : Number(row.total_value) || 0
+    merged.set(key, stat)
+  }
+  return merged
+}
 
+/**
+ * Converte os agregados da RPC nas mesmas estruturas de
+ * computeFeedbackStats e aggregateProcedureStats.
+ */
+function statsFromAggregates(agg: ReportAggregates, hideValues: boolean) {
+  const byCount = <T extends { count: number }>(a: T, b: T) => b.count - a.count
+
+  const hospitalStats: HospitalStat[] = Array.from(mergeAggregateRows(agg.hospitals, normalizeHospitalName, hideValues))
+    .map(([hospital, stat]) => ({ hospital, ...stat }))
+    .sort(byCount)
+  const procedureTypeStats: ProcedureTypeStat[] = Array.from(mergeAggregateRows(agg.procedure_types, normalizeProcedureName, hideValues))
+    .map(([type, stat]) => ({ type, ...stat }))
+    .sort(byCount)
+  const surgeonStats: SurgeonStat[] = Array.from(mergeAggregateRows(agg.surgeons, normalizeSurgeonName, hideValues))
+    .map(([surgeon, stat]) => ({ surgeon, ...stat }))
+    .sort(byCount)
+  const monthlyStats: MonthlyStat[] = agg.months.map(row => ({
+    month: row.key,
+    count: row.count,
+    totalValue: hideValues ? 0 : Number(row.total_value) || 0
+  }))
+
+  // Convênio: mesma regra de rótulo e de média "excluindo" do cálculo em JS
+  const convenioMap = new Map<string, { count: number; totalDuration: number; durationCount: number }>()
+  let totalProcedures = 0
+  let overallDurationTotal = 0
+  let overallDurationCount = 0
+  for (const row of agg.convenios) {
+    const raw = row.key.trim()
+    const convenio = raw.length > 0 ? raw : 'Particular / Não informado'
+    const current = convenioMap.get(convenio) || { count: 0, totalDuration: 0, durationCount: 0 }
+    current.count += row.count
+    current.totalDuration += row.duration_total
+    current.durationCount += row.duration_count
     convenioMap.set(convenio, current)
+    totalProcedures += row.count
+    overallDurationTotal += row.duration_total
+    overallDurationCount += row.duration_count
   }
 
-  const overallAvgDurationMinutes =
-    overallDurationCount > 0 ? overallDurationTotal / overallDurationCount : 0
-
   const convenioStats: ConvenioStat[] = Array.from(convenioMap.entries())
-    .map(([convenio, agg]) => {
-      const avgDurationMinutes =
-        agg.durationCount > 0 ? agg.totalDuration / agg.durationCount : 0
-
-      const otherDurationTotal = overallDurationTotal - agg.totalDuration
-      const otherDurationCount = overallDurationCount - agg.durationCount
-      const avgDurationExcludingMinutes =
-        otherDurationCount > 0 ? otherDurationTotal / otherDurationCount : 0
-
+    .map(([convenio, c]) => {
+      const otherDurationCount = overallDurationCount - c.durationCount
       return {
         convenio,
-        count: agg.count,
-        percentage:
-          totalProcedures > 0
-            ? Math.round((agg.count / totalProcedures) * 100)
-            : 0,
-        avgDurationMinutes,
-        avgDurationExcludingMinutes
+        count: c.count,
+        percentage: totalProcedures > 0 ? Math.round((c.count / totalProcedures) * 100) : 0,
+        avgDurationMinutes: c.durationCount > 0 ? c.totalDuration / c.durationCount : 0,
+        avgDurationExcludingMinutes:
+          otherDurationCount > 0 ? (overallDurationTotal - c.totalDuration) / otherDurationCount : 0
       }
     })
-    .sort((a, b) => b.count - a.count)
+    .sort(byCount)
 
+  const { feedback, vaginal } = agg
   return {
+    procedureStats: agg.stats,
+    feedbackStats: {
+      totalLinks: feedback.links,
+      totalResponses: feedback.responses,
+      responseRate: safeRate(feedback.responses, feedback.links),
+      nauseaRate: safeRate(feedback.nausea, feedback.responses),
+      cefaleiaRate: safeRate(feedback.cefaleia, feedback.responses),
+      dorLombarRate: safeRate(feedback.dor_lombar, feedback.responses),
+      anemiaTransfusaoRate: safeRate(feedback.anemia_transfusao, feedback.responses)
+    },
     obstetricStats: {
-      vaginalCount,
-      vaginalAvgDurationMinutes,
-      overallAvgDurationMinutes
+      vaginalCount: vaginal.count,
+      vaginalAvgDurationMinutes: vaginal.count > 0 ? vaginal.duration_total / vaginal.count : 0,
+      overallAvgDurationMinutes: overallDurationCount > 0 ? overallDurationTotal / overallDurationCount : 0
     },
-    convenioStats
-  }
-}
-
-function computeAdvancedStats(procedures: Procedure[]): {
-  hospitalStats: HospitalStat[]
-  procedureTypeStats: ProcedureTypeStat[]
-  surgeonStats: SurgeonStat[]
-  monthlyStats: MonthlyStat[]
-} {
-  const hospitalMap = new Map<string, { count: number; totalValue: number }>()
-  const typeMap = new Map<string, { count: number; totalValue: number }>()
-  const surgeonMap = new Map<string, { count: number; totalValue: number }>()
-  const monthMap = new Map<string, { count: number; totalValue: number }>()
-
-  for (const p of procedures) {
-    // Hospital
-    const hospital = normalizeHospitalName(p.hospital_clinic || '')
-    const hStat = hospitalMap.get(hospital) || { count: 0, totalValue: 0 }
-    hStat.count += 1
-    hStat.totalValue += p.procedure_value || 0
-    hospitalMap.set(hospital, hStat)
-
-    // Tipo de Procedimento
-    const type = normalizeProcedureName(p.procedure_type || '')
-    const tStat = typeMap.get(type) || { count: 0, totalValue: 0 }
-    tStat.count += 1
-    tStat.totalValue += p.procedure_value || 0
-    typeMap.set(type, tStat)
-
-    // Cirurgião
-    const surgeon = normalizeSurgeonName(p.surgeon_name || p.nome_cirurgiao || '')
-    const sStat = surgeonMap.get(surgeon) || { count: 0, totalValue: 0 }
-    sStat.count += 1
-    sStat.totalValue += p.procedure_value || 0
-    surgeonMap.set(surgeon, sStat)
-
-    // Mensal
-    if (p.procedure_date) {
-      const date = new Date(p.procedure_date)
-      if (!isNaN(date.getTime())) {
-        const monthKey = `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`
-        const mStat = monthMap.get(monthKey) || { count: 0, totalValue: 0 }
-        mStat.count += 1
-        mStat.totalValue += p.procedure_value || 0
-        monthMap.set(monthKey, mStat)
-      }
-    }
+    convenioStats,
+    hospitalStats,
+    procedureTypeStats,
+    surgeonStats,
+    monthlyStats
   }
-
-  const hospitalStats: HospitalStat[] = Array.from(hospitalMap.entries())
-    .map(([hospital, agg]) => ({ hospital, ...agg }))
-    .sort((a, b) => b.count - a.count)
-
-  const procedureTypeStats: ProcedureTypeStat[] = Array.from(typeMap.entries())
-    .map(([type, agg]) => ({ type, ...agg }))
-    .sort((a, b) => b.count - a.count)
-
-  const surgeonStats: SurgeonStat[] = Array.from(surgeonMap.entries())
-    .map(([surgeon, agg]) => ({ surgeon, ...agg }))
-    .sort((a, b) => b.count - a.count)
-
-  const monthlyStats: MonthlyStat[] = Array.from(monthMap.entries())
-    .map(([month, agg]) => ({ month, ...agg }))
-    .sort((a, b) => a.month.localeCompare(b.month))
-
-  return { hospitalStats, procedureTypeStats, surgeonStats, monthlyStats }
 }
 
 export const reportService = {
   // Gerar dados do relatório
-  async generateReportData(userId: string, startDate?: string, endDate?: string, groupId?: string): Promise<ReportData> {
+  // Os agregados vêm da RPC get_report_aggregates; as linhas de procedimentos
+  // só são buscadas com includeProcedures (exportações) ou se a RPC falhar.
+  async generateReportData(
+    userId: string,
+    startDate?: string,
+    endDate?: string,
+    groupId?: string,
+    options: { includeProcedures?: boolean } = {}
+  ): Promise<ReportData> {
+    const includeProcedures = options.includeProcedures ?? true
+    const fetchProcedures = () =>
+      startDate && endDate
+        ? procedureService.getProceduresByDateRange(userId, startDate, endDate, groupId)
+        : procedureService.getProcedures(userId)
+
     try {
       // 1. Verificar se é um relatório de grupo e as permissões financeiras
       let isFinancialHidden = false
@@ -342,11 +321,9 @@ export const reportService = {
         }
       }
 
-      const [procedures, procedureStats, shifts, shiftStats, userResult] = await Promise.all([
-        startDate && endDate 
-          ? procedureService.getProceduresByDateRange(userId, startDate, endDate, groupId)
-          : procedureService.getProcedures(userId),
-        procedureService.getProcedureStats(userId, groupId),
+      const [aggregates, fetchedProcedures, shifts, shiftStats, userResult] = await Promise.all([
+        fetchReportAggregates(userId, startDate, endDate, groupId),
+        includeProcedures ? fetchProcedures() : Promise.resolve(null),
         startDate && endDate && !groupId // Plantões ainda não estão vinculados a grupos
           ? shiftService.getShiftsWithValuesByPeriod(userId, startDate, endDate)
           : Promise.resolve([]),
@@ -360,11 +337,24 @@ export const reportService = {
           .maybeSingle()
       ])
 
+      // Sem a RPC (migração não aplicada), calcula a partir das linhas
+      const procedures = fetchedProcedures ?? (aggregates ? [] : await fetchProcedures())
+
       // Se financeiro estiver escondido, zerar os valores para os cálculos de stats
       const processedProcedures = isFinancialHidden 
         ? procedures.map(p => ({ ...p, procedure_value: 0 }))
         : procedures
 
+      const computed = aggregates
+        ? statsFromAggregates(aggregates, isFinancialHidden)
+        : {
+            procedureStats: await procedureService.getProcedureStats(userId, groupId),
+            feedbackStats: await computeFeedbackStats(processedProcedures),
+            ...aggregateProcedureStats(processedProcedures)
+          }
+      const { procedureStats, feedbackStats, obstetricStats, convenioStats } = computed
+      const { hospitalStats, procedureTypeStats, surgeonStats, monthlyStats } = computed
+
       const processedProcedureStats = isFinancialHidden
         ? { ...procedureStats, totalValue: 0, completedValue: 0, pendingValue: 0 }
         : procedureStats
@@ -380,10 +370,6 @@ export const reportService = {
         pendingValue: processedProcedureStats.pendingValue + shiftStats.pendingValue
       }
 
-      const feedbackStats = await computeFeedbackStats(processedProcedures)
-      const { obstetricStats, convenioStats } = computeObstetricAndConvenioStats(processedProcedures)
-      const { hospitalStats, procedureTypeStats, surgeonStats, monthlyStats } = computeAdvancedStats(processedProcedures)
-
       return {
         procedures: processedProcedures,
         shifts,
@@ -0,0 +1,173 @@
+import os from 'os';
+import { Worker } from 'worker_threads';
+import { decryptFields, getKeyMaterial, isEncrypted } from './security';
+
+/**
+ * Pool de worker threads para descriptografar páginas grandes (LGPD).
+ *
+ * Abaixo de PARALLEL_MIN_VALUES campos criptografados o custo de copiar as
+ * strings para os workers supera o ganho, e decryptFields roda na própria
+ * thread. Os workers são criados sob demanda, não seguram o processo vivo
+ * (unref) e importam as chaves uma única vez cada.
+ */
+
+const PARALLEL_MIN_VALUES = 5000;
+const MAX_THREADS = 4;
+const ERROR_MARKER = '[ERRO NA DESCRIPTOGRAFIA]';
+
+// Código do worker (CommonJS, avaliado com eval: true para não depender do
+// bundler resolver um arquivo separado). Mesmos formatos de lib/security.ts:
+// 'e2:' escolhe a chave pelo id gravado; 'enc:' tenta a atual e depois as antigas.
+const WORKER_SOURCE = `
+const { parentPort, workerData } = require('worker_threads');
+const crypto = require('crypto');
+const keys = new Map(workerData.keys.map(([id, key]) => [id, crypto.createSecretKey(Buffer.from(key))]));
+
+function open(key, iv, tag, data) {
+  try {
+    const decipher = crypto.createDecipheriv('aes-256-gcm', key, iv);
+    decipher.setAuthTag(tag);
+    const head = decipher.update(data);
+    const tail = decipher.final();
+    return (tail.length ? Buffer.concat([head, tail]) : head).toString('utf8');
+  } catch (e) {
+    return null;
+  }
+}
+
+function decrypt(text) {
+  if (text.startsWith('e2:')) {
+    const raw = Buffer.from(text.slice(3), 'base64url');
+    const key = raw.length >= 29 && keys.get(raw[0]);
+    return key ? open(key, raw.subarray(1, 13), raw.subarray(13, 29), raw.subarray(29)) : null;
+  }
+  const tagStart = 4 + 12 * 2 + 1;
+  const dataStart = tagStart + 16 * 2 + 1;
+  if (text.length < dataStart || text.charCodeAt(tagStart - 1) !== 58 || text.charCodeAt(dataStart - 1) !== 58) {
+    return null;
+  }
+  const iv = Buffer.from(text.slice(4, tagStart - 1), 'hex');
+  const tag = Buffer.from(text.slice(tagStart, dataStart - 1), 'hex');
+  const data = Buffer.from(text.slice(dataStart), 'hex');
+  for (const key of keys.values()) {
+    const out = open(key, iv, tag, data);
+    if (out !== null) return out;
+  }
+  return null;
+}
+
+parentPort.on('message', ({ id, values }) => {
+  const out = new Array(values.length);
+  for (let i = 0; i < values.length; i++) out[i] = decrypt(values[i]);
+  parentPort.postMessage({ id, values: out });
+});
+`;
+
+type Pending = { resolve: (values: (string | null)[]) => void; reject: (error: Error) => void };
+
+class DecryptPool {
+  private workers: Worker[] = [];
+  private pending = new Map<number, Pending>();
+  private nextId = 0;
+
+  constructor(private keys: [number, string][], private size: number) {}
+
+  private worker(index: number): Worker {
+    if (!this.workers[index]) {
+      const worker = new Worker(WORKER_SOURCE, { eval: true, workerData: { keys: this.keys } });
+      worker.unref();
+      worker.on('message', ({ id, values }: { id: number; values: (string | null)[] }) => {
+        this.pending.get(id)?.resolve(values);
+        this.pending.delete(id);
+      });
+      worker.on('error', (error) => this.failAll(error));
+      worker.on('exit', () => {
+        if (this.workers[index] === worker) delete this.workers[index];
+      });
+      this.workers[index] = worker;
+    }
+    return this.workers[index];
+  }
+
+  private failAll(error: Error) {
+    for (const { reject } of this.pending.values()) reject(error);
+    this.pending.clear();
+  }
+
+  run(values: string[]): Promise<(string | null)[]> {
+    const chunkSize = Math.ceil(values.length / this.size);
+    const chunks: Promise<(string | null)[]>[] = [];
+    for (let i = 0, w = 0; i < values.length; i += chunkSize, w++) {
+      const id = this.nextId++;
+      const worker = this.worker(w % this.size);
+      chunks.push(new Promise((resolve, reject) => {
+        this.pending.set(id, { resolve, reject });
+        worker.postMessage({ id, values: values.slice(i, i + chunkSize) });
+      }));
+    }
+    return Promise.all(chunks).then(parts => parts.flat());
+  }
+}
+
+// undefined = ainda não decidido; null = sem pool (sem chave ou sem núcleos livres)
+let pool: DecryptPool | null | undefined;
+
+function getPool(): DecryptPool | null {
+  if (pool === undefined) {
+    const material = getKeyMaterial();
+    const cpus = typeof os.availableParallelism === 'function' ? os.availableParallelism() : os.cpus().length;
+    // Deixa um núcleo para a thread principal; com menos de 2 workers não compensa
+    const size = Math.min(MAX_THREADS, cpus - 1);
+    pool = material && size >= 2 ? new DecryptPool(material.keys, size) : null;
+  }
+  return pool;
+}
+
+/**
+ * Mesmo contrato de decryptFields, dividindo o trabalho entre worker threads
+ * quando a página é grande o bastante para compensar.
+ */
+export async function decryptFieldsParallel<T extends Record<string, any>>(
+  rows: T[],
+  fields: readonly string[],
+  options?: { minValues?: number }
+): Promise<T[]> {
+  // Posições (linha, campo) dos valores criptografados, na ordem enviada aos workers
+  const positions: [number, string][] = [];
+  const values: string[] = [];
+  for (let i = 0; i < rows.length; i++) {
+    for (const field of fields) {
+      const value = rows[i][field];
+      if (isEncrypted(value)) {
+        positions.push([i, field]);
+        values.push(value);
+      }
+    }
+  }
+
+  const workers = getPool();
+  if (!workers || values.length < (options?.minValues ?? PARALLEL_MIN_VALUES)) {
+    return decryptFields(rows, fields);
+  }
+
+  let decrypted: (string | null)[];
+  try {
+    decrypted = await workers.run(values);
+  } catch (error) {
+    console.error('[SECURITY-POOL] Worker falhou, descriptografando na thread principal:', error);
+    return decryptFields(rows, fields);
+  }
+
+  const out = rows.map(row => ({ ...row })) as Record<string, any>[];
+  let failures = 0;
+  for (let n = 0; n < positions.length; n++) {
+    const [i, field] = positions[n];
+    const value = decrypted[n];
+    if (value === null) failures++;
+    out[i][field] = value ?? ERROR_MARKER;
+  }
+  if (failures > 0) {
+    console.error(`Erro na descriptografia: ${failures} campo(s) inválido(s) no lote`);
+  }
+  return out as T[];
+}
@@ -3,34 +3,53 @@ import crypto from 'crypto';
 /**
  * Utilitário de Segurança para conformidade com LGPD
  * Implementa criptografia AES-256-GCM para dados sensíveis em repouso.
+ *
+ * Formatos gravados:
+ * - 'e2:<base64url>' (atual): bytes [id da chave 1B][iv 12B][tag 16B][dados].
+ *   O id permite rotacionar a chave sem perder a leitura do que já existe.
+ * - 'enc:<iv hex>:<tag hex>:<dados hex>' (legado): sem id de chave; ainda é
+ *   lido, e é convertido pelo job /api/cron/reencrypt.
+ *
+ * Variáveis de ambiente:
+ * - ENCRYPTION_KEY: chave atual (32 caracteres)
+ * - ENCRYPTION_KEY_ID: id da chave atual, 1-255 (padrão 1)
+ * - ENCRYPTION_PREVIOUS_KEYS: chaves antigas, só para leitura, no formato
+ *   "id:chave,id:chave"
+ * - ENCRYPTION_FORMAT=legacy: continua gravando 'enc:' (útil enquanto houver
+ *   instância antiga no ar que só lê o formato legado)
  */
 
 const ALGORITHM = 'aes-256-gcm';
 const IV_LENGTH = 12;
 const AUTH_TAG_LENGTH = 16;
 const ENCRYPTION_KEY = process.env.ENCRYPTION_KEY; // Deve ter 32 caracteres
+const WRITE_LEGACY = process.env.ENCRYPTION_FORMAT === 'legacy';
+
+const LEGACY_PREFIX = 'enc:';
+const V2_PREFIX = 'e2:';
+const V2_HEADER_LENGTH = 1 + IV_LENGTH + AUTH_TAG_LENGTH;
+
+/**
+ * Indica se o valor foi gravado por encrypt() (qualquer formato).
+ */
+export function isEncrypted(value: unknown): value is string {
+  return typeof value === 'string' && (value.startsWith(V2_PREFIX) || value.startsWith(LEGACY_PREFIX));
+}
 
 /**
  * Criptografa um texto usando AES-256-GCM
- * Retorna o formato: iv:authTag:encryptedData
+ * Retorna 'e2:<base64url>' (ou 'enc:iv:authTag:encryptedData' com
+ * ENCRYPTION_FORMAT=legacy)
  */
 export function encrypt(text: string): string {
-  if (!ENCRYPTION_KEY || ENCRYPTION_KEY.length !== 32) {
+  const keyring = getKeyring();
+  if (!keyring) {
     console.warn('ENCRYPTION_KEY não configurada corretamente. Retornando texto original.');
     return text;
   }
 
   try {
-    const iv = crypto.randomBytes(IV_LENGTH);
-    const cipher = crypto.createCipheriv(ALGORITHM, Buffer.from(ENCRYPTION_KEY), iv);
-    
-    let encrypted = cipher.update(text, 'utf8', 'hex');
-    encrypted += cipher.final('hex');
-    
-    const authTag = cipher.getAuthTag().toString('hex');
-    
-    // Prefixo 'enc:' para identificar dados criptografados
-    return `enc:${iv.toString('hex')}:${authTag}:${encrypted}`;
+    return encryptWithKeyring(text, keyring);
   } catch (error) {
     console.error('Erro na criptografia:', error);
     return text;
@@ -41,34 +60,257 @@ export function encrypt(text: string): string {
  * Descriptografa um texto criptografado pelo método acima
  */
 export function decrypt(encryptedText: string): string {
-  if (!encryptedText.startsWith('enc:')) {
+  if (!isEncrypted(encryptedText)) {
     return encryptedText; // Retorna original se não tiver o prefixo
   }
 
-  if (!ENCRYPTION_KEY || ENCRYPTION_KEY.length !== 32) {
+  const keyring = getKeyring();
+  if (!keyring) {
     console.error('Tentativa de descriptografia sem ENCRYPTION_KEY configurada.');
     return '[ERRO: DADO CRIPTOGRAFADO]';
   }
 
   try {
-    const parts = encryptedText.split(':');
-    const iv = Buffer.from(parts[1], 'hex');
-    const authTag = Buffer.from(parts[2], 'hex');
-    const encryptedData = parts[3];
-    
-    const decipher = crypto.createDecipheriv(ALGORITHM, Buffer.from(ENCRYPTION_KEY), iv);
-    decipher.setAuthTag(authTag);
-    
-    let decrypted = decipher.update(encryptedData, 'hex', 'utf8');
-    decrypted += decipher.final('utf8');
-    
-    return decrypted;
+    return decryptWithKeyring(encryptedText, keyring);
   } catch (error) {
     console.error('Erro na descriptografia:', error);
     return '[ERRO NA DESCRIPTOGRAFIA]';
   }
 }
 
+/**
+ * Criptografa os campos indicados de várias linhas de uma vez (importações
+ * em lote). Retorna cópias rasas; valores vazios, não-texto ou já
+ * criptografados passam inalterados. Os IVs do lote saem de uma única
+ * leitura de randomBytes. Sem chave configurada devolve as linhas como
+ * estão, igual a encrypt().
+ */
+export function encryptFields<T extends Record<string, any>>(rows: T[], fields: readonly string[]): T[] {
+  const keyring = getKeyring();
+  if (!keyring) {
+    if (rows.length > 0) console.warn('ENCRYPTION_KEY não configurada corretamente. Retornando texto original.');
+    return rows.map(row => ({ ...row }));
+  }
+
+  let count = 0;
+  for (const row of rows) {
+    for (const field of fields) {
+      const value = row[field];
+      if (typeof value === 'string' && value && !isEncrypted(value)) count++;
+    }
+  }
+  const ivs = crypto.randomBytes(count * IV_LENGTH);
+
+  let n = 0;
+  return rows.map(source => {
+    const row: Record<string, any> = { ...source };
+    for (const field of fields) {
+      const value = row[field];
+      if (typeof value !== 'string' || !value || isEncrypted(value)) continue;
+      const iv = ivs.subarray(n * IV_LENGTH, ++n * IV_LENGTH);
+      row[field] = encryptWithKeyring(value, keyring, iv);
+    }
+    return row as T;
+  });
+}
+
+/**
+ * Descriptografa os campos indicados de várias linhas de uma vez.
+ * Retorna cópias rasas das linhas; valores não criptografados (ou
+ * null/undefined) passam inalterados e falhas viram o mesmo marcador de
+ * decrypt(). Para páginas grandes, ver decryptFieldsParallel em
+ * lib/security-pool.ts.
+ */
+export function decryptFields<T extends Record<string, any>>(rows: T[], fields: readonly string[]): T[] {
+  const keyring = getKeyring();
+  const out = new Array<T>(rows.length);
+  let failures = 0;
+
+  for (let i = 0; i < rows.length; i++) {
+    const row: Record<string, any> = { ...rows[i] };
+    for (const field of fields) {
+      const value = row[field];
+      if (!isEncrypted(value)) continue;
+      if (!keyring) {
+        row[field] = '[ERRO: DADO CRIPTOGRAFADO]';
+        continue;
+      }
+      try {
+        row[field] = decryptWithKeyring(value, keyring);
+      } catch {
+        failures++;
+        row[field] = '[ERRO NA DESCRIPTOGRAFIA]';
+      }
+    }
+    out[i] = row as T;
+  }
+
+  if (!keyring && rows.length > 0) {
+    console.error('Tentativa de descriptografia sem ENCRYPTION_KEY configurada.');
+  }
+  if (failures > 0) {
+    console.error(`Erro na descriptografia: ${failures} campo(s) inválido(s) no lote`);
+  }
+  return out;
+}
+
+/**
+ * Indica se o valor criptografado não está no formato de gravação atual
+ * (legado, ou 'e2:' com uma chave que não é a atual). Usado pelo job de
+ * recriptografia.
+ */
+export function needsReencryption(value: unknown): boolean {
+  if (!isEncrypted(value)) return false;
+  const keyring = getKeyring();
+  if (!keyring) return false;
+  if (value.startsWith(LEGACY_PREFIX)) return !WRITE_LEGACY;
+  if (WRITE_LEGACY) return true;
+  // Os 4 primeiros caracteres base64url decodificam os 3 primeiros bytes
+  const keyId = Buffer.from(value.slice(V2_PREFIX.length, V2_PREFIX.length + 4), 'base64url')[0];
+  return keyId !== keyring.currentId;
+}
+
+/**
+ * Descriptografa e grava de novo no formato e chave atuais. Diferente de
+ * encrypt()/decrypt(), lança erro em vez de devolver marcador ou texto
+ * original, para que o chamador nunca sobrescreva o dado com lixo.
+ */
+export function reencrypt(value: string): string {
+  const keyring = getKeyring();
+  if (!keyring) throw new Error('ENCRYPTION_KEY não configurada');
+  return encryptWithKeyring(decryptWithKeyring(value, keyring), keyring);
+}
+
+/**
+ * Identifica o formato/chave de gravação atual ('e2:<id>' ou 'enc'), ou null
+ * sem chave configurada. Muda quando a chave é rotacionada.
+ */
+export function encryptionTarget(): string | null {
+  const keyring = getKeyring();
+  if (!keyring) return null;
+  return WRITE_LEGACY ? 'enc' : `e2:${keyring.currentId}`;
+}
+
+type KeyMaterial ={ currentId: number; keys: [number, string][] };
+type Keyring = { currentId: number; keys: Map<number, crypto.KeyObject> };
+
+/**
+ * Chaves configuradas (a atual primeiro), em texto, para quem precisa
+ * importá-las em outra thread (lib/security-pool.ts).
+ */
+export function getKeyMaterial(): KeyMaterial | null {
+  if (!ENCRYPTION_KEY || ENCRYPTION_KEY.length !== 32) return null;
+
+  const currentId = parseInt(process.env.ENCRYPTION_KEY_ID || '1');
+  if (!(currentId >= 1 && currentId <= 255)) {
+    console.error('ENCRYPTION_KEY_ID inválido (esperado 1-255).');
+    return null;
+  }
+
+  const keys: [number, string][] = [[currentId, ENCRYPTION_KEY]];
+  for (const entry of (process.env.ENCRYPTION_PREVIOUS_KEYS || '').split(',')) {
+    if (!entry.trim()) continue;
+    const sep = entry.indexOf(':');
+    const id = parseInt(entry.slice(0, sep));
+    const key = entry.slice(sep + 1).trim();
+    if (sep > 0 && id >= 1 && id <= 255 && id !== currentId && key.length === 32) {
+      keys.push([id, key]);
+    } else {
+      console.warn('ENCRYPTION_PREVIOUS_KEYS: entrada ignorada (esperado "id:chave" com 32 caracteres).');
+    }
+  }
+  return { currentId, keys };
+}
+
+// Chaves importadas uma única vez por processo (em vez de um Buffer por campo)
+let cachedKeyring: Keyring | null | undefined;
+
+function getKeyring(): Keyring | null {
+  if (cachedKeyring === undefined) {
+    const material = getKeyMaterial();
+    cachedKeyring = material && {
+      currentId: material.currentId,
+      keys: new Map(material.keys.map(([id, key]) => [id, crypto.createSecretKey(Buffer.from(key))] as const))
+    };
+  }
+  return cachedKeyring;
+}
+
+function encryptWithKeyring(text: string, keyring: Keyring, iv: Buffer = crypto.randomBytes(IV_LENGTH)): string {
+  const cipher = crypto.createCipheriv(ALGORITHM, keyring.keys.get(keyring.currentId)!, iv);
+
+  if (WRITE_LEGACY) {
+    let encrypted = cipher.update(text, 'utf8', 'hex');
+    encrypted += cipher.final('hex');
+    const authTag = cipher.getAuthTag().toString('hex');
+    return `${LEGACY_PREFIX}${iv.toString('hex')}:${authTag}:${encrypted}`;
+  }
+
+  const head = cipher.update(text, 'utf8');
+  const tail = cipher.final();
+  const header = Buffer.allocUnsafe(V2_HEADER_LENGTH);
+  header[0] = keyring.currentId;
+  iv.copy(header, 1);
+  cipher.getAuthTag().copy(header, 1 + IV_LENGTH);
+  return V2_PREFIX + Buffer.concat([header, head, tail]).toString('base64url');
+}
+
+/**
+ * Descriptografa qualquer um dos dois formatos. No 'e2:' a chave vem do
+ * id gravado; no legado tenta a chave atual e depois as antigas. Lança erro
+ * se o formato, a chave ou a tag de autenticação forem inválidos.
+ */
+function decryptWithKeyring(encryptedText: string, keyring: Keyring): string {
+  if (encryptedText.startsWith(V2_PREFIX)) {
+    const raw = Buffer.from(encryptedText.slice(V2_PREFIX.length), 'base64url');
+    if (raw.length < V2_HEADER_LENGTH) {
+      throw new Error('Formato de dado criptografado inválido');
+    }
+    const key = keyring.keys.get(raw[0]);
+    if (!key) {
+      throw new Error(`Chave de criptografia ${raw[0]} não configurada`);
+    }
+    return open(
+      key,
+      raw.subarray(1, 1 + IV_LENGTH),
+      raw.subarray(1 + IV_LENGTH, V2_HEADER_LENGTH),
+      raw.subarray(V2_HEADER_LENGTH)
+    );
+  }
+
+  // Legado: posições de iv e tag fixas, sem split() nem array intermediário
+  const tagStart = LEGACY_PREFIX.length + IV_LENGTH * 2 + 1; // depois de 'enc:<iv>:'
+  const dataStart = tagStart + AUTH_TAG_LENGTH * 2 + 1;
+  if (
+    encryptedText.length < dataStart ||
+    encryptedText.charCodeAt(tagStart - 1) !== 58 || // ':'
+    encryptedText.charCodeAt(dataStart - 1) !== 58
+  ) {
+    throw new Error('Formato de dado criptografado inválido');
+  }
+
+  const iv = Buffer.from(encryptedText.slice(LEGACY_PREFIX.length, tagStart - 1), 'hex');
+  const tag = Buffer.from(encryptedText.slice(tagStart, dataStart - 1), 'hex');
+  const data = Buffer.from(encryptedText.slice(dataStart), 'hex');
+  let lastError: unknown;
+  for (const key of keyring.keys.values()) {
+    try {
+      return open(key, iv, tag, data);
+    } catch (error) {
+      lastError = error;
+    }
+  }
+  throw lastError;
+}
+
+function open(key: crypto.KeyObject, iv: Buffer, tag: Buffer, data: Buffer): string {
+  const decipher = crypto.createDecipheriv(ALGORITHM, key, iv);
+  decipher.setAuthTag(tag);
+  const head = decipher.update(data);
+  const tail = decipher.final();
+  return (tail.length ? Buffer.concat([head, tail]) : head).toString('utf8');
+}
+
 /**
  * Hashes a password securely using Node.js native scrypt.
  * Returns formatted string: salt:hash
@@ -1,6 +1,7 @@
 import { createClient } from '@supabase/supabase-js';
 import Stripe from 'stripe';
 import { stripe } from '@/lib/stripe';
+import { invalidateSubscriptionAccess } from '@/lib/subscription-access';
 
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || '';
 const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY || '';
@@ -191,6 +192,8 @@ export const billingService = {
       })
       .eq('id', userId);
 
+    invalidateSubscriptionAccess(userId);
+
     await sendPaymentConfirmationEmail(
       userId,
       planType,
@@ -276,6 +279,8 @@ export const billingService = {
       .from('users')
       .update({ subscription_status: 'active' })
       .eq('id', userId);
+
+    invalidateSubscriptionAccess(userId);
   },
 
   /**
@@ -308,6 +313,8 @@ export const billingService = {
       await supabaseAdmin.from('subscriptions').update({ status: 'active' }).eq('id', dbSub.id);
       await supabaseAdmin.from('users').update({ subscription_status: 'active' }).eq('id', dbSub.user_id);
     }
+
+    invalidateSubscriptionAccess(dbSub.user_id);
   },
 
   /**
@@ -373,6 +380,8 @@ export const billingService = {
         .from('users')
         .update({ subscription_status: 'inactive' })
         .eq('id', dbSub.user_id);
+
+      invalidateSubscriptionAccess(dbSub.user_id);
     }
   }
 };
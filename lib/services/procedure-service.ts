@@ -1,5 +1,6 @@
 import { createClient } from '@supabase/supabase-js';
-import { encrypt } from '../security';
+import { encrypt, encryptFields } from '../security';
+import type { ImportedProcedure } from '../procedure-import';
 import { procedureSchema } from '../validations/procedure';
 
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || '';
@@ -9,6 +10,18 @@ const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey, {
   auth: { autoRefreshToken: false, persistSession: false }
 });
 
+// Campos criptografados antes de gravar (LGPD)
+export const PROCEDURE_SENSITIVE_FIELDS = ['patient_name', 'patient_id', 'notes', 'procedure_name', 'patient_phone', 'patient_email', 'patient_notes', 'patient_companion', 'patient_companion_phone'];
+
+// Importação em lote: linhas por upsert e upserts simultâneos
+const IMPORT_CHUNK_SIZE = 500;
+const IMPORT_MAX_IN_FLIGHT = 3;
+
+export interface ImportProgress {
+  processed: number;
+  inserted: number;
+}
+
 /**
  * Serviço responsável pela lógica de negócio de procedimentos médicos.
  * Centraliza a criação, validação e criptografia de dados sensíveis (LGPD).
@@ -46,10 +59,9 @@ export const procedureService = {
     }
 
     // 2. Campos para criptografar (LGPD)
-    const sensitiveFields = ['patient_name', 'patient_id', 'notes', 'procedure_name', 'patient_phone', 'patient_email', 'patient_notes', 'patient_companion', 'patient_companion_phone'];
     const encryptedData = { ...dbData };
 
-    for (const field of sensitiveFields) {
+    for (const field of PROCEDURE_SENSITIVE_FIELDS) {
       if ((encryptedData as any)[field]) {
         (encryptedData as any)[field] = encrypt((encryptedData as any)[field]);
       }
@@ -67,5 +79,68 @@ export const procedureService = {
 
     if (error) throw error;
     return data;
+  },
+
+  /**
+   * Importa procedimentos já validados (ver lib/procedure-import.ts) em lotes.
+   * Cada lote é criptografado e gravado com upsert em (user_id, import_key),
+   * ignorando linhas já importadas; enquanto um lote está no banco o próximo
+   * já é criptografado (até IMPORT_MAX_IN_FLIGHT lotes em paralelo).
+   *
+   * @param rows Procedimentos validados, cada um com sua import_key
+   * @param userId ID do médico anestesista proprietário dos registros
+   * @param onProgress Chamado ao fim de cada lote gravado
+   * @returns Quantidade de procedimentos efetivamente inseridos
+   */
+  async importProcedures(
+    rows: ImportedProcedure[],
+    userId: string,
+    onProgress?: (progress: ImportProgress) => void
+  ): Promise<{ inserted: number }> {
+    if (!supabaseUrl || !supabaseServiceKey) {
+      throw new Error('Configuração do servidor incompleta (Supabase URL/Key)');
+    }
+
+    const createdAt = new Date().toISOString();
+    const inFlight = new Set<Promise<void>>();
+    let processed = 0;
+    let inserted = 0;
+    let failure: unknown = null;
+
+    for (let start = 0; start < rows.length && !failure; start += IMPORT_CHUNK_SIZE) {
+      const chunk = rows.slice(start, start + IMPORT_CHUNK_SIZE).map(row => {
+        const dbRow = { ...row } as Record<string, any>;
+        for (const key of Object.keys(dbRow)) {
+          if (dbRow[key] === '') dbRow[key] = null;
+        }
+        dbRow.user_id = userId;
+        dbRow.created_at = createdAt;
+        return dbRow;
+      });
+      const encrypted = encryptFields(chunk, PROCEDURE_SENSITIVE_FIELDS);
+
+      const task = (async () => {
+        const { data, error } = await supabaseAdmin
+          .from('procedures')
+          .upsert(encrypted, { onConflict: 'user_id,import_key', ignoreDuplicates: true })
+          .select('id');
+
+        if (error) throw error;
+        processed += chunk.length;
+        inserted += data?.length ?? 0;
+        onProgress?.({ processed, inserted });
+      })()
+        .catch(error => { failure ??= error; })
+        .finally(() => { inFlight.delete(task); });
+
+      inFlight.add(task);
+      if (inFlight.size >= IMPORT_MAX_IN_FLIGHT) {
+        await Promise.race(inFlight);
+      }
+    }
+
+    await Promise.all(inFlight);
+    if (failure) throw failure;
+    return { inserted };
   }
 };
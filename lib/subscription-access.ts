@@ -25,6 +25,80 @@ export interface SubscriptionAccess {
   daysRemaining?: number
 }
 
+/**
+ * Cache em memória das decisões de acesso, por usuário.
+ *
+ * A decisão só muda quando o período pago/de teste termina ou quando chega
+ * um evento de cobrança. Por isso cada entrada vale até o fim do período
+ * (current_period_end / trial_ends_at), limitado a ACCESS_CACHE_TTL_MS, e os
+ * handlers do billingService (e rotas que alteram assinatura/teste) chamam
+ * invalidateSubscriptionAccess. O cache é por instância: o limite de TTL
+ * cobre eventos processados em outra instância. Decisões negativas ficam só
+ * DENIED_CACHE_TTL_MS, para quem acabou de pagar não esperar.
+ */
+const ACCESS_CACHE_TTL_MS = parseInt(process.env.SUBSCRIPTION_ACCESS_CACHE_TTL_MS || '300000')
+const DENIED_CACHE_TTL_MS = 30_000
+const ACCESS_CACHE_MAX_ENTRIES = 10_000
+
+export interface AccessDecisionCache<T> {
+  get(userId: string): T | undefined
+  set(userId: string, value: T, decision: { hasAccess: boolean; validUntil?: string | Date | null }): void
+  delete(userId: string): void
+}
+
+const accessCaches: AccessDecisionCache<unknown>[] = []
+
+export function createAccessDecisionCache<T>(): AccessDecisionCache<T> {
+  const entries = new Map<string, { value: T; expiresAt: number }>()
+
+  const cache: AccessDecisionCache<T> = {
+    get(userId) {
+      const entry = entries.get(userId)
+      if (!entry) return undefined
+      if (entry.expiresAt <= Date.now()) {
+        entries.delete(userId)
+        return undefined
+      }
+      return entry.value
+    },
+
+    set(userId, value, { hasAccess, validUntil }) {
+      const now = Date.now()
+      let expiresAt = now + (hasAccess ? ACCESS_CACHE_TTL_MS : DENIED_CACHE_TTL_MS)
+      if (hasAccess && validUntil) {
+        const until = new Date(validUntil).getTime()
+        if (!Number.isNaN(until)) expiresAt = Math.min(expiresAt, until)
+      }
+      if (expiresAt <= now) return
+
+      // Map mantém a ordem de inserção: descarta as entradas mais antigas
+      entries.delete(userId)
+      if (entries.size >= ACCESS_CACHE_MAX_ENTRIES) {
+        entries.delete(entries.keys().next().value as string)
+      }
+      entries.set(userId, { value, expiresAt })
+    },
+
+    delete(userId) {
+      entries.delete(userId)
+    }
+  }
+
+  accessCaches.push(cache as AccessDecisionCache<unknown>)
+  return cache
+}
+
+/**
+ * Descarta as decisões de acesso em cache do usuário (após eventos de
+ * cobrança, cancelamento, reembolso ou extensão de teste)
+ */
+export function invalidateSubscriptionAccess(userId: string | null | undefined) {
+  if (!userId) return
+  for (const cache of accessCaches) cache.delete(userId)
+}
+
+const subscriptionAccessCache = createAccessDecisionCache<SubscriptionAccess>()
+
 /**
  * Verifica se o usuário tem acesso à plataforma
  * Regras:
@@ -39,6 +113,26 @@ export async function checkSubscriptionAccess(userId: string): Promise<Subscript
     return { hasAccess: false, reason: 'Sistema de verificação não configurado' }
   }
 
+  const cached = subscriptionAccessCache.get(userId)
+  if (cached) return cached
+
+  const access = await resolveSubscriptionAccess(userId)
+  // Acesso provisório por timeout não é uma decisão: não entra no cache
+  if (access.subscriptionStatus !== 'checking') {
+    subscriptionAccessCache.set(userId, access, {
+      hasAccess: access.hasAccess,
+      // Pendente pode ser confirmado a qualquer momento: só o TTL
+      validUntil: access.subscriptionStatus === 'pending' ? null : access.expiresAt
+    })
+  }
+  return access
+}
+
+async function resolveSubscriptionAccess(userId: string): Promise<SubscriptionAccess> {
+  if (!supabaseAdmin) {
+    return { hasAccess: false, reason: 'Sistema de verificação não configurado' }
+  }
+
   try {
     // PRIMEIRO: Verificar período de teste gratuito (com timeout)
     const userQuery = supabaseAdmin
@@ -357,6 +357,97 @@ export type Database = {
           },
         ]
       }
+      group_financial_monthly: {
+        Row: {
+          group_id: string
+          month: string
+          procedures_count: number
+          revenue: number
+          receivable: number
+          revenue_cnpj: number
+          revenue_cpf: number
+          payment_methods: Json
+          despesas_total: number
+          despesas_grupo: number
+          updated_at: string
+        }
+        Insert: {
+          group_id: string
+          month: string
+          procedures_count?: number
+          revenue?: number
+          receivable?: number
+          revenue_cnpj?: number
+          revenue_cpf?: number
+          payment_methods?: Json
+          despesas_total?: number
+          despesas_grupo?: number
+          updated_at?: string
+        }
+        Update: {
+          group_id?: string
+          month?: string
+          procedures_count?: number
+          revenue?: number
+          receivable?: number
+          revenue_cnpj?: number
+          revenue_cpf?: number
+          payment_methods?: Json
+          despesas_total?: number
+          despesas_grupo?: number
+          updated_at?: string
+        }
+        Relationships: [
+          {
+            foreignKeyName: "group_financial_monthly_group_id_fkey"
+            columns: ["group_id"]
+            isOneToOne: false
+            referencedRelation: "groups"
+            referencedColumns: ["id"]
+          }
+        ]
+      }
+      group_member_financial_monthly: {
+        Row: {
+          group_id: string
+          month: string
+          user_id: string
+          procedures_count: number
+          revenue: number
+          revenue_cnpj: number
+          revenue_cpf: number
+          despesas: number
+        }
+        Insert: {
+          group_id: string
+          month: string
+          user_id: string
+          procedures_count?: number
+          revenue?: number
+          revenue_cnpj?: number
+          revenue_cpf?: number
+          despesas?: number
+        }
+        Update: {
+          group_id?: string
+          month?: string
+          user_id?: string
+          procedures_count?: number
+          revenue?: number
+          revenue_cnpj?: number
+          revenue_cpf?: number
+          despesas?: number
+        }
+        Relationships: [
+          {
+            foreignKeyName: "group_member_financial_monthly_group_id_fkey"
+            columns: ["group_id"]
+            isOneToOne: false
+            referencedRelation: "groups"
+            referencedColumns: ["id"]
+          }
+        ]
+      }
       group_members: {
         Row: {
           group_id: string
@@ -580,32 +671,38 @@ export type Database = {
       notifications: {
         Row: {
           created_at: string | null
+          dedupe_key: string | null
           id: string
           is_read: boolean | null
           message: string
           procedure_id: string | null
           title: string
           type: string | null
+          updated_at: string | null
           user_id: string
         }
         Insert: {
           created_at?: string | null
+          dedupe_key?: string | null
           id?: string
           is_read?: boolean | null
           message: string
           procedure_id?: string | null
           title: string
           type?: string | null
+          updated_at?: string | null
           user_id: string
         }
         Update: {
           created_at?: string | null
+          dedupe_key?: string | null
           id?: string
           is_read?: boolean | null
           message?: string
           procedure_id?: string | null
           title?: string
           type?: string | null
+          updated_at?: string | null
           user_id?: string
         }
         Relationships: [
@@ -663,11 +760,13 @@ export type Database = {
       ocr_messages: {
         Row: {
           cost_llm: number | null
+          cost_llm_saved: number
           cost_ocr: number | null
           created_at: string | null
           doc_type: string | null
           error_log: string | null
           id: string
+          llm_cache_hit: boolean
           media_id: string | null
           phone: string
           raw_text: string | null
@@ -676,11 +775,13 @@ export type Database = {
         }
         Insert: {
           cost_llm?: number | null
+          cost_llm_saved?: number
           cost_ocr?: number | null
           created_at?: string | null
           doc_type?: string | null
           error_log?: string | null
           id?: string
+          llm_cache_hit?: boolean
           media_id?: string | null
           phone: string
           raw_text?: string | null
@@ -689,11 +790,13 @@ export type Database = {
         }
         Update: {
           cost_llm?: number | null
+          cost_llm_saved?: number
           cost_ocr?: number | null
           created_at?: string | null
           doc_type?: string | null
           error_log?: string | null
           id?: string
+          llm_cache_hit?: boolean
           media_id?: string | null
           phone?: string
           raw_text?: string | null
@@ -923,6 +1026,36 @@ export type Database = {
           },
         ]
       }
+      pipeline_timings: {
+        Row: {
+          created_at: string
+          duration_ms: number
+          id: number
+          message_id: string
+          ok: boolean
+          pipeline: string
+          stage: string
+        }
+        Insert: {
+          created_at?: string
+          duration_ms: number
+          id?: number
+          message_id: string
+          ok?: boolean
+          pipeline: string
+          stage: string
+        }
+        Update: {
+          created_at?: string
+          duration_ms?: number
+          id?: number
+          message_id?: string
+          ok?: boolean
+          pipeline?: string
+          stage?: string
+        }
+        Relationships: []
+      }
       procedure_attachments: {
         Row: {
           created_at: string | null
@@ -1040,6 +1173,7 @@ export type Database = {
           horario: string | null
           hospital_clinic: string | null
           id: string
+          import_key: string | null
           indicacao_cesariana: string | null
           laceracao_presente: string | null
           nausea_vomito: string | null
@@ -1107,6 +1241,7 @@ export type Database = {
           horario?: string | null
           hospital_clinic?: string | null
           id?: string
+          import_key?: string | null
           indicacao_cesariana?: string | null
           laceracao_presente?: string | null
           nausea_vomito?: string | null
@@ -1174,6 +1309,7 @@ export type Database = {
           horario?: string | null
           hospital_clinic?: string | null
           id?: string
+          import_key?: string | null
           indicacao_cesariana?: string | null
           laceracao_presente?: string | null
           nausea_vomito?: string | null
@@ -1907,6 +2043,39 @@ export type Database = {
         }
         Relationships: []
       }
+      vision_cache: {
+        Row: {
+          cache_key: string
+          created_at: string
+          expires_at: string
+          extractor: string
+          hits: number
+          last_hit_at: string | null
+          result: string
+          size_bytes: number
+        }
+        Insert: {
+          cache_key: string
+          created_at?: string
+          expires_at: string
+          extractor: string
+          hits?: number
+          last_hit_at?: string | null
+          result: string
+          size_bytes: number
+        }
+        Update: {
+          cache_key?: string
+          created_at?: string
+          expires_at?: string
+          extractor?: string
+          hits?: number
+          last_hit_at?: string | null
+          result?: string
+          size_bytes?: number
+        }
+        Relationships: []
+      }
       webhook_logs: {
         Row: {
           created_at: string | null
@@ -2034,6 +2203,57 @@ export type Database = {
           },
         ]
       }
+      whatsapp_jobs: {
+        Row: {
+          attempts: number
+          completed_at: string | null
+          completed_steps: string[]
+          created_at: string
+          event_id: string
+          id: string
+          last_error: string | null
+          locked_by: string | null
+          locked_until: string | null
+          max_attempts: number
+          payload: Json
+          run_at: string
+          status: string
+          updated_at: string
+        }
+        Insert: {
+          attempts?: number
+          completed_at?: string | null
+          completed_steps?: string[]
+          created_at?: string
+          event_id: string
+          id?: string
+          last_error?: string | null
+          locked_by?: string | null
+          locked_until?: string | null
+          max_attempts?: number
+          payload: Json
+          run_at?: string
+          status?: string
+          updated_at?: string
+        }
+        Update: {
+          attempts?: number
+          completed_at?: string | null
+          completed_steps?: string[]
+          created_at?: string
+          event_id?: string
+          id?: string
+          last_error?: string | null
+          locked_by?: string | null
+          locked_until?: string | null
+          max_attempts?: number
+          payload?: Json
+          run_at?: string
+          status?: string
+          updated_at?: string
+        }
+        Relationships: []
+      }
       whatsapp_messages: {
         Row: {
           created_at: string | null
@@ -2093,10 +2313,50 @@ export type Database = {
     }
     Functions: {
       calculate_system_stats: { Args: never; Returns: undefined }
+      claim_whatsapp_jobs: {
+        Args: { p_limit?: number; p_visibility_seconds?: number; p_worker: string }
+        Returns: {
+          attempts: number
+          completed_at: string | null
+          completed_steps: string[]
+          created_at: string
+          event_id: string
+          id: string
+          last_error: string | null
+          locked_by: string | null
+          locked_until: string | null
+          max_attempts: number
+          payload: Json
+          run_at: string
+          status: string
+          updated_at: string
+        }[]
+      }
+      complete_whatsapp_job: {
+        Args: { p_id: string; p_worker: string }
+        Returns: boolean
+      }
+      fail_whatsapp_job: {
+        Args: { p_base_seconds?: number; p_error: string; p_id: string; p_worker: string }
+        Returns: string
+      }
+      generate_financial_notifications: {
+        Args: { p_late_days?: number; p_near_days?: number; p_user_id?: string | null }
+        Returns: Json
+      }
       generate_monthly_report: {
         Args: { report_month: string; user_uuid: string }
         Returns: Json
       }
+      get_report_aggregates: {
+        Args: {
+          p_end?: string | null
+          p_group_id?: string | null
+          p_start?: string | null
+          p_user_id: string
+        }
+        Returns: Json
+      }
       get_secretaria_id_by_email: {
         Args: { check_email: string }
         Returns: string
@@ -2125,6 +2385,30 @@ export type Database = {
         Args: { p_email: string; p_password: string }
         Returns: Json
       }
+      mark_whatsapp_job_step: {
+        Args: { p_id: string; p_step: string; p_worker: string }
+        Returns: boolean
+      }
+      pipeline_stage_percentiles: {
+        Args: { p_since: string }
+        Returns: {
+          failures: number
+          max_ms: number
+          p50_ms: number
+          p95_ms: number
+          pipeline: string
+          samples: number
+          stage: string
+        }[]
+      }
+      prune_pipeline_timings: {
+        Args: { p_keep_days?: number }
+        Returns: number
+      }
+      prune_vision_cache: {
+        Args: { p_max_entries: number }
+        Returns: number
+      }
       register_user: {
         Args: {
           p_crm?: string
@@ -2135,6 +2419,10 @@ export type Database = {
         }
         Returns: Json
       }
+      run_weekly_summary_batch: {
+        Args: { p_limit?: number; p_since: string; p_week_start: string }
+        Returns: Json
+      }
       send_feedback_email: {
         Args: {
           anesthesiologist_name: string
@@ -2144,6 +2432,10 @@ export type Database = {
         }
         Returns: undefined
       }
+      vision_cache_get: {
+        Args: { p_key: string }
+        Returns: string
+      }
     }
     Enums: {
       [_ in never]: never
@@ -107,9 +107,10 @@ export class WhatsAppClient {
   }
 
   /**
-   * Faz o download binário da mídia
+   * Abre o download da mídia como stream (para encaminhar ao Storage e ao
+   * Vision sem esperar o arquivo inteiro)
    */
-  static async downloadMedia(mediaUrl: string): Promise<Buffer> {
+  static async openMediaStream(mediaUrl: string): Promise<{ body: ReadableStream<Uint8Array>; contentType: string | null }> {
     if (!ACCESS_TOKEN) throw new Error('WhatsApp API credentials not configured');
 
     console.log('Starting binary download from Meta...');
@@ -128,15 +129,13 @@ export class WhatsAppClient {
 
       clearTimeout(timeoutId);
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         const errorText = await response.text();
         console.error('Download Media Failed. Status:', response.status, 'Error:', errorText);
         throw new Error(`Failed to download media file: ${response.status} ${errorText}`);
       }
 
-      const arrayBuffer = await response.arrayBuffer();
-      console.log('Download complete, buffer size:', arrayBuffer.byteLength);
-      return Buffer.from(arrayBuffer);
+      return { body: response.body, contentType: response.headers.get('content-type') };
     } catch (err: any) {
       if (err.name === 'AbortError') {
         console.error('Download Media TIMEOUT after 15s');
@@ -146,4 +145,14 @@ export class WhatsAppClient {
       throw err;
     }
   }
+
+  /**
+   * Faz o download binário da mídia
+   */
+  static async downloadMedia(mediaUrl: string): Promise<Buffer> {
+    const { body } = await this.openMediaStream(mediaUrl);
+    const arrayBuffer = await new Response(body).arrayBuffer();
+    console.log('Download complete, buffer size:', arrayBuffer.byteLength);
+    return Buffer.from(arrayBuffer);
+  }
 }
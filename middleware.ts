@@ -1,6 +1,16 @@
 import { type NextRequest, NextResponse } from 'next/server'
 
 const JWT_SECRET = process.env.SUPABASE_JWT_SECRET
+const SUPABASE_URL = process.env.NEXT_PUBLIC_SUPABASE_URL || ''
+
+// Chaves assimétricas (ES256/RS256) publicadas pelo Supabase Auth
+const JWKS_URL = SUPABASE_URL ? `${SUPABASE_URL.replace(/\/$/, '')}/auth/v1/.well-known/jwks.json` : ''
+const JWKS_TTL_MS = 10 * 60 * 1000
+// Intervalo mínimo entre buscas forçadas por um `kid` desconhecido
+const JWKS_REFETCH_MIN_MS = 60 * 1000
+
+const textEncoder = new TextEncoder()
+const textDecoder = new TextDecoder()
 
 function base64UrlToUint8Array(input: string): Uint8Array {
   const pad = input.length % 4
@@ -16,28 +26,107 @@ function base64UrlToUint8Array(input: string): Uint8Array {
   return out
 }
 
-async function verifyHs256Jwt(
-  token: string,
-  secret: string
-): Promise<Record<string, unknown> | null> {
+// ============================================
+// Chaves de verificação (cache por isolate)
+// ============================================
+
+let hmacKey: Promise<CryptoKey> | null = null
+
+function getHmacKey(secret: string): Promise<CryptoKey> {
+  if (!hmacKey) {
+    hmacKey = crypto.subtle.importKey(
+      'raw',
+      textEncoder.encode(secret),
+      { name: 'HMAC', hash: 'SHA-256' },
+      false,
+      ['verify']
+    )
+    hmacKey.catch(() => { hmacKey = null })
+  }
+  return hmacKey
+}
+
+type JwtAlg = 'ES256' | 'RS256'
+
+const JWK_IMPORT: Record<JwtAlg, EcKeyImportParams | RsaHashedImportParams> = {
+  ES256: { name: 'ECDSA', namedCurve: 'P-256' },
+  RS256: { name: 'RSASSA-PKCS1-v1_5', hash: 'SHA-256' },
+}
+
+const JWS_VERIFY: Record<JwtAlg, AlgorithmIdentifier | EcdsaParams> = {
+  ES256: { name: 'ECDSA', hash: 'SHA-256' },
+  RS256: { name: 'RSASSA-PKCS1-v1_5' },
+}
+
+type JwksEntry = { alg: JwtAlg; key: CryptoKey }
+
+let jwks: { keys: Map<string, JwksEntry>; fetchedAt: number } | null = null
+let jwksLoading: Promise<void> | null = null
+
+async function loadJwks(): Promise<void> {
+  if (!JWKS_URL) return
+  if (jwksLoading) return jwksLoading
+
+  jwksLoading = (async () => {
+    try {
+      const res = await fetch(JWKS_URL)
+      if (!res.ok) return
+      const body = (await res.json()) as { keys?: Array<JsonWebKey & { kid?: string; alg?: string }> }
+      const keys = new Map<string, JwksEntry>()
+      for (const jwk of body.keys || []) {
+        const alg = (jwk.alg || (jwk.kty === 'EC' ? 'ES256' : jwk.kty === 'RSA' ? 'RS256' : '')) as JwtAlg
+        if (!jwk.kid || !(alg in JWK_IMPORT)) continue
+        try {
+          const key = await crypto.subtle.importKey('jwk', jwk, JWK_IMPORT[alg], false, ['verify'])
+          keys.set(jwk.kid, { alg, key })
+        } catch {
+          /* chave em formato não suportado */
+        }
+      }
+      jwks = { keys, fetchedAt: Date.now() }
+    } catch {
+      /* sem rede: mantém o conjunto anterior */
+    } finally {
+      jwksLoading = null
+    }
+  })()
+  return jwksLoading
+}
+
+async function getJwksKey(kid: string): Promise<JwksEntry | null> {
+  const age = jwks ? Date.now() - jwks.fetchedAt : Infinity
+  if (age > JWKS_TTL_MS || (!jwks?.keys.has(kid) && age > JWKS_REFETCH_MIN_MS)) {
+    await loadJwks()
+  }
+  return jwks?.keys.get(kid) ?? null
+}
+
+// ============================================
+// Verificação do access token
+// ============================================
+
+async function verifyJwt(token: string): Promise<Record<string, unknown> | null> {
   const parts = token.split('.')
   if (parts.length !== 3) return null
   const [h, p, s] = parts
-  const enc = new TextEncoder()
-  const data = enc.encode(`${h}.${p}`)
-  const key = await crypto.subtle.importKey(
-    'raw',
-    enc.encode(secret),
-    { name: 'HMAC', hash: 'SHA-256' },
-    false,
-    ['verify']
-  )
-  const sig = base64UrlToUint8Array(s)
-  const ok = await crypto.subtle.verify('HMAC', key, sig, data)
-  if (!ok) return null
+
   try {
-    const payloadJson = new TextDecoder().decode(base64UrlToUint8Array(p))
-    const payload = JSON.parse(payloadJson) as Record<string, unknown>
+    const header = JSON.parse(textDecoder.decode(base64UrlToUint8Array(h))) as { alg?: string; kid?: string }
+    const data = textEncoder.encode(`${h}.${p}`)
+    const sig = base64UrlToUint8Array(s)
+
+    let ok = false
+    if (header.alg === 'HS256') {
+      if (!JWT_SECRET) return null
+      ok = await crypto.subtle.verify('HMAC', await getHmacKey(JWT_SECRET), sig, data)
+    } else if ((header.alg === 'ES256' || header.alg === 'RS256') && header.kid) {
+      const entry = await getJwksKey(header.kid)
+      if (!entry || entry.alg !== header.alg) return null
+      ok = await crypto.subtle.verify(JWS_VERIFY[entry.alg], entry.key, sig, data)
+    }
+    if (!ok) return null
+
+    const payload = JSON.parse(textDecoder.decode(base64UrlToUint8Array(p))) as Record<string, unknown>
     if (typeof payload.exp === 'number' && payload.exp * 1000 < Date.now()) {
       return null
     }
@@ -47,69 +136,62 @@ async function verifyHs256Jwt(
   }
 }
 
-function getSupabaseProjectRef(): string {
-  const url = process.env.NEXT_PUBLIC_SUPABASE_URL
-  if (!url) return ''
+// ============================================
+// Sessão nos cookies do @supabase/ssr
+// ============================================
+
+const SESSION_COOKIE = (() => {
+  if (!SUPABASE_URL) return ''
   try {
-    return new URL(url).hostname.split('.')[0] || ''
+    const ref = new URL(SUPABASE_URL).hostname.split('.')[0]
+    return ref ? `sb-${ref}-auth-token` : ''
   } catch {
     return ''
   }
-}
+})()
 
-function readSupabaseSessionFromCookies(request: NextRequest): { access_token: string } | null {
-  const ref = getSupabaseProjectRef()
-  if (!ref) return null
-  const base = `sb-${ref}-auth-token`
-  const all = request.cookies.getAll()
-
-  const single = all.find((c) => c.name === base)
-  if (single?.value) {
-    for (const raw of [single.value, decodeURIComponent(single.value)]) {
-      try {
-        const parsed = JSON.parse(raw) as { access_token?: string }
-        if (parsed?.access_token) return parsed as { access_token: string }
-      } catch {
-        /* tentar próximo formato */
-      }
-    }
-  }
-
-  const chunks = all
-    .filter((c) => c.name.startsWith(`${base}.`))
-    .sort((a, b) => {
-      const ai = parseInt(a.name.split('.').pop() || '0', 10)
-      const bi = parseInt(b.name.split('.').pop() || '0', 10)
-      return ai - bi
-    })
+function parseSessionValue(value: string): { access_token: string } | null {
+  // @supabase/ssr grava "base64-<json em base64url>"; versões antigas, JSON
+  const candidates = value.startsWith('base64-')
+    ? [() => textDecoder.decode(base64UrlToUint8Array(value.slice(7)))]
+    : [() => value, () => decodeURIComponent(value)]
 
-  if (chunks.length === 0) return null
-
-  const joined = chunks.map((c) => c.value).join('')
-  for (const raw of [joined, decodeURIComponent(joined)]) {
+  for (const raw of candidates) {
     try {
-      const parsed = JSON.parse(raw) as { access_token?: string }
+      const parsed = JSON.parse(raw()) as { access_token?: string }
       if (parsed?.access_token) return parsed as { access_token: string }
     } catch {
-      /* ignore */
+      /* tentar próximo formato */
     }
   }
   return null
 }
 
+function readSessionCookie(request: NextRequest): string | null {
+  if (!SESSION_COOKIE) return null
+
+  const single = request.cookies.get(SESSION_COOKIE)?.value
+  if (single) return single
+
+  // Sessão grande: dividida em <nome>.0, <nome>.1, ...
+  let joined = ''
+  for (let i = 0; ; i++) {
+    const chunk = request.cookies.get(`${SESSION_COOKIE}.${i}`)?.value
+    if (!chunk) break
+    joined += chunk
+  }
+  return joined || null
+}
+
 type MiddlewareUser = { role?: string } | null
 
-async function getUserFromJwt(request: NextRequest): Promise<MiddlewareUser> {
-  if (!JWT_SECRET) return null
-  const session = readSupabaseSessionFromCookies(request)
-  if (!session?.access_token) return null
-  const payload = await verifyHs256Jwt(session.access_token, JWT_SECRET)
-  if (!payload) return null
-  const um = payload.user_metadata as { role?: string } | undefined
-  return { role: um?.role }
+// Arquivos e rotas internas: não há sessão para verificar
+function isStaticLike(pathname: string): boolean {
+  if (pathname.startsWith('/_next/') || pathname.startsWith('/.well-known/')) return true
+  return /\.[a-z0-9]{2,8}$/i.test(pathname) && !pathname.startsWith('/api/') && !isGuardedRoute(pathname)
 }
 
-function routeGuards(request: NextRequest, pathname: string, user: MiddlewareUser): NextResponse | null {
+function isGuardedRoute(pathname: string): boolean {
   const isAdminRoute =
     pathname.startsWith('/admin/')
 
@@ -121,7 +203,11 @@ function routeGuards(request: NextRequest, pathname: string, user: MiddlewareUse
     pathname.startsWith('/relatorios') ||
     pathname.startsWith('/configuracoes')
 
-  if ((isProtectedRoute || isAdminRoute) && !user) {
+  return isProtectedRoute || isAdminRoute
+}
+
+function routeGuards(request: NextRequest, pathname: string, user: MiddlewareUser): NextResponse | null {
+  if (isGuardedRoute(pathname) && !user) {
     const redirectUrl = request.nextUrl.clone()
     redirectUrl.pathname = '/login'
     return NextResponse.redirect(redirectUrl)
@@ -157,21 +243,33 @@ async function createMutableSupabaseResponse(request: NextRequest) {
 export async function middleware(request: NextRequest) {
   const { pathname } = request.nextUrl
 
-  // Pular middleware para o Webhook do WhatsApp (acesso público)
-  if (pathname.startsWith('/api/whatsapp/webhook')) {
+  // Pular middleware para o Webhook do WhatsApp (acesso público) e arquivos
+  if (pathname.startsWith('/api/whatsapp/webhook') || isStaticLike(pathname)) {
     return NextResponse.next()
   }
 
-  let user: MiddlewareUser = null
-  let response: NextResponse
+  const cookie = readSessionCookie(request)
 
-  if (JWT_SECRET) {
-    user = await getUserFromJwt(request)
+  // Sem cookie de sessão não há o que verificar nem renovar
+  if (!cookie) {
+    return routeGuards(request, pathname, null) ?? NextResponse.next()
   }
 
-  if (user) {
+  // Caminho rápido: token verificado localmente (HS256 com o segredo ou
+  // ES256/RS256 pelo JWKS em cache), sem ida ao Supabase
+  const session = parseSessionValue(cookie)
+  const payload = session ? await verifyJwt(session.access_token) : null
+
+  let user: MiddlewareUser = null
+  let response: NextResponse
+
+  if (payload) {
+    const um = payload.user_metadata as { role?: string } | undefined
+    user = { role: um?.role }
     response = NextResponse.next()
   } else {
+    // Token expirado ou sem chave para verificar: o cliente do Supabase
+    // valida e, se preciso, renova a sessão (regrava os cookies)
     const { supabase, getResponse } = await createMutableSupabaseResponse(request)
     const {
       data: { user: supaUser },
@@ -188,6 +286,6 @@ export async function middleware(request: NextRequest) {
 
 export const config = {
   matcher: [
-    '/((?!api/whatsapp/webhook|api/healthz|monitoring|_next/static|_next/image|favicon.ico|robots\\.txt|.*\\.(?:svg|png|jpg|jpeg|gif|webp)$).*)',
+    '/((?!api/whatsapp/webhook|api/healthz|monitoring|_next/static|_next/image|favicon.ico|robots\\.txt|.*\\.(?:svg|png|jpg|jpeg|gif|webp|ico|css|js|map|txt|xml|json|webmanifest|woff2?)$).*)',
   ],
 }
@@ -0,0 +1,93 @@
+/**
+ * Benchmark: decrypt() campo a campo vs. decryptFields / decryptFieldsParallel.
+ *
+ * Uso:
+ *   ENCRYPTION_KEY=<32 caracteres> npx tsx scripts/bench-decrypt.ts [linhas] [rodadas]
+ *
+ * Gera `linhas` procedimentos (padrão 10000) com os 7 campos sensíveis
+ * criptografados, como /api/procedures/list recebe do banco, e mede cada
+ * caminho em `rodadas` repetições (padrão 5) após um aquecimento.
+ */
+import { performance } from 'perf_hooks';
+import { decrypt, decryptFields, encrypt } from '../lib/security';
+import { decryptFieldsParallel } from '../lib/security-pool';
+
+const FIELDS = [
+  'procedure_name',
+  'patient_name',
+  'patient_phone',
+  'patient_email',
+  'patient_notes',
+  'patient_companion',
+  'patient_companion_phone'
+] as const;
+
+const rowCount = parseInt(process.argv[2] || '10000');
+const rounds = parseInt(process.argv[3] || '5');
+
+if (!process.env.ENCRYPTION_KEY || process.env.ENCRYPTION_KEY.length !== 32) {
+  console.error('Defina ENCRYPTION_KEY com 32 caracteres.');
+  process.exit(1);
+}
+
+function buildRows() {
+  const rows: Record<string, any>[] = [];
+  for (let i = 0; i < rowCount; i++) {
+    rows.push({
+      id: `proc-${i}`,
+      procedure_date: '2026-01-01',
+      procedure_value: 1500,
+      procedure_name: encrypt('Colecistectomia videolaparoscópica'),
+      patient_name: encrypt(`Maria Oliveira da Silva ${i}`),
+      patient_phone: encrypt('11999990000'),
+      patient_email: encrypt(`paciente${i}@example.com`),
+      patient_notes: i % 3 === 0 ? encrypt('Alergia a dipirona. Jejum de 8 horas confirmado.') : null,
+      patient_companion: i % 4 === 0 ? encrypt('João Oliveira') : null,
+      patient_companion_phone: i % 4 === 0 ? encrypt('11988887777') : null
+    });
+  }
+  return rows;
+}
+
+function perField(rows: Record<string, any>[]) {
+  // Caminho anterior de /api/procedures/list
+  return rows.map(proc => {
+    const out: Record<string, any> = { ...proc };
+    for (const field of FIELDS) out[field] = decrypt(proc[field] || '');
+    return out;
+  });
+}
+
+async function measure(name: string, fn: () => unknown) {
+  await fn(); // aquecimento
+  const times: number[] = [];
+  for (let r = 0; r < rounds; r++) {
+    const start = performance.now();
+    await fn();
+    times.push(performance.now() - start);
+  }
+  times.sort((a, b) => a - b);
+  const median = times[Math.floor(times.length / 2)];
+  console.log(`${name.padEnd(28)} mediana ${median.toFixed(1).padStart(8)} ms   min ${times[0].toFixed(1).padStart(8)} ms`);
+  return median;
+}
+
+async function main() {
+  const rows = buildRows();
+  const values = rows.reduce((n, row) => n + FIELDS.filter(f => row[f]).length, 0);
+  console.log(`${rowCount} linhas, ${values} campos criptografados, ${rounds} rodadas\n`);
+
+  const base = await measure('decrypt() por campo', () => perField(rows));
+  const batch = await measure('decryptFields', () => decryptFields(rows, FIELDS));
+  const parallel = await measure('decryptFieldsParallel', () => decryptFieldsParallel(rows, FIELDS, { minValues: 0 }));
+
+  console.log(`\ndecryptFields: ${(base / batch).toFixed(2)}x   decryptFieldsParallel: ${(base / parallel).toFixed(2)}x`);
+
+  const check = decryptFields(rows.slice(0, 1), FIELDS)[0];
+  if (check.patient_name !== 'Maria Oliveira da Silva 0') {
+    console.error('Resultado divergente:', check.patient_name);
+    process.exit(1);
+  }
+}
+
+main();
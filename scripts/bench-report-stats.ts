@@ -0,0 +1,126 @@
+/**
+ * Benchmark: estatísticas de relatório em várias passadas (implementação
+ * anterior de lib/reports.ts) vs. aggregateProcedureStats (passada única).
+ *
+ * Uso:
+ *   npx tsx scripts/bench-report-stats.ts [procedimentos] [rodadas]
+ *
+ * Gera `procedimentos` linhas (padrão 50000) com nomes de hospital, cirurgião
+ * e tipo repetidos com variações de caixa/acentos, como no banco, e mede cada
+ * caminho em `rodadas` repetições (padrão 10) após um aquecimento. Também
+ * mede o efeito da memoização da normalização de nomes.
+ */
+import { performance } from 'perf_hooks'
+import type { Procedure } from '../lib/procedures'
+import { normalizeHospitalName, normalizeProcedureName, normalizeSurgeonName } from '../lib/normalization'
+import { aggregateProcedureStats } from '../lib/report-stats'
+
+const count = parseInt(process.argv[2] || '50000')
+const rounds = parseInt(process.argv[3] || '10')
+
+const HOSPITALS = ['Hospital São Luiz', 'hospital sao luiz', 'Maternidade Santa Joana', 'Hospital Albert Einstein', 'HOSPITAL SIRIO LIBANES', 'Clínica Vida', '']
+const SURGEONS = ['Dr. Paulo Mendes', 'paulo mendes', 'Dra. Helena Prado', 'Dr Ricardo Alves', 'Dra Ana Souza', 'nenhum']
+const TYPES = ['Anestesia Geral', 'Raquianestesia', 'Cesariana', 'cesárea', 'Colecistectomia videolaparoscópica', 'Sedação', 'Bloqueio Periférico']
+const CONVENIOS = ['Unimed', 'Bradesco Saúde', 'SulAmérica', 'Amil', 'Particular', '', ' Unimed ']
+
+function buildProcedures(): Procedure[] {
+  const procedures: Procedure[] = []
+  for (let i = 0; i < count; i++) {
+    const day = new Date(Date.UTC(2023, 0, 1) + (i % 1095) * 86400000)
+    procedures.push({
+      id: `proc-${i}`,
+      procedure_date: day.toISOString().slice(0, 10),
+      procedure_value: 800 + (i % 17) * 100,
+      // Sufixo numérico em parte dos nomes: ~2% de chaves distintas
+      hospital_clinic: HOSPITALS[i % HOSPITALS.length] + (i % 50 === 0 ? ` ${i % 900}` : ''),
+      nome_cirurgiao: SURGEONS[i % SURGEONS.length] + (i % 50 === 1 ? ` ${i % 900}` : ''),
+      procedure_type: TYPES[i % TYPES.length],
+      convenio: CONVENIOS[i % CONVENIOS.length],
+      duracao_minutos: i % 5 === 0 ? null : 30 + (i % 120),
+      tipo_parto: i % 11 === 0 ? 'Vaginal' : null
+    } as unknown as Procedure)
+  }
+  return procedures
+}
+
+// Implementação anterior: duas funções, cada uma percorrendo as linhas,
+// com filter/reduce separados e new Date() por linha
+function multiPass(procedures: Procedure[]) {
+  const vaginal = procedures.filter(p => p.tipo_parto === 'Vaginal' && (p.duracao_minutos || 0) > 0)
+  const vaginalDuration = vaginal.reduce((sum, p) => sum + (p.duracao_minutos || 0), 0)
+
+  const convenioMap = new Map<string, { count: number; totalDuration: number; durationCount: number }>()
+  for (const p of procedures) {
+    const raw = (p.convenio || '').trim()
+    const convenio = raw.length > 0 ? raw : 'Particular / Não informado'
+    const current = convenioMap.get(convenio) || { count: 0, totalDuration: 0, durationCount: 0 }
+    current.count += 1
+    if (p.duracao_minutos && p.duracao_minutos > 0) {
+      current.totalDuration += p.duracao_minutos
+      current.durationCount += 1
+    }
+    convenioMap.set(convenio, current)
+  }
+
+  const maps = [new Map(), new Map(), new Map(), new Map()] as Map<string, { count: number; totalValue: number }>[]
+  for (const p of procedures) {
+    const keys = [
+      normalizeHospitalName(p.hospital_clinic || ''),
+      normalizeProcedureName(p.procedure_type || ''),
+      normalizeSurgeonName(p.surgeon_name || p.nome_cirurgiao || '')
+    ]
+    const date = new Date(p.procedure_date)
+    if (!isNaN(date.getTime())) {
+      keys.push(`${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`)
+    }
+    keys.forEach((key, k) => {
+      const stat = maps[k].get(key) || { count: 0, totalValue: 0 }
+      stat.count += 1
+      stat.totalValue += p.procedure_value || 0
+      maps[k].set(key, stat)
+    })
+  }
+  return { vaginalCount: vaginal.length, vaginalDuration, convenioMap, maps }
+}
+
+function measure(name: string, fn: () => unknown) {
+  fn() // aquecimento
+  const times: number[] = []
+  for (let r = 0; r < rounds; r++) {
+    const start = performance.now()
+    fn()
+    times.push(performance.now() - start)
+  }
+  times.sort((a, b) => a - b)
+  const median = times[Math.floor(times.length / 2)]
+  console.log(`${name.padEnd(34)} mediana ${median.toFixed(1).padStart(8)} ms   min ${times[0].toFixed(1).padStart(8)} ms`)
+  return median
+}
+
+function main() {
+  const procedures = buildProcedures()
+  console.log(`${count} procedimentos, ${rounds} rodadas\n`)
+
+  const before = measure('várias passadas', () => multiPass(procedures))
+  const after = measure('aggregateProcedureStats', () => aggregateProcedureStats(procedures))
+  console.log(`\npassada única: ${(before / after).toFixed(2)}x\n`)
+
+  // Memoização: nomes sempre novos (cache nunca acerta) vs. nomes repetidos
+  let n = 0
+  const cold = measure('normalizeProcedureName (sem cache)', () => {
+    for (let i = 0; i < count; i++) normalizeProcedureName(`Colecistectomia ${n++}`)
+  })
+  const warm = measure('normalizeProcedureName (com cache)', () => {
+    for (let i = 0; i < count; i++) normalizeProcedureName(TYPES[i % TYPES.length])
+  })
+  console.log(`\nmemoização: ${(cold / warm).toFixed(0)}x`)
+
+  const stats = aggregateProcedureStats(procedures)
+  const total = stats.hospitalStats.reduce((sum, h) => sum + h.count, 0)
+  if (total !== count) {
+    console.error('Resultado divergente:', total)
+    process.exit(1)
+  }
+}
+
+main()
@@ -0,0 +1,10 @@
+-- Índices para paginação por cursor (keyset) em /api/procedures/list
+-- A ordenação é (procedure_date DESC, id DESC); o id desempata procedimentos
+-- do mesmo dia para que nenhuma linha seja pulada ou repetida entre páginas.
+
+CREATE INDEX IF NOT EXISTS idx_procedures_user_date_id
+ON procedures(user_id, procedure_date DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_procedures_group_date_id
+ON procedures(group_id, procedure_date DESC, id DESC)
+WHERE group_id IS NOT NULL;
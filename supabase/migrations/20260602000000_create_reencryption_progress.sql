@@ -0,0 +1,19 @@
+-- Progresso do job de recriptografia (/api/cron/reencrypt)
+-- Uma linha por tabela com dados criptografados. O job percorre a tabela por
+-- id (keyset) e grava aqui o último id processado, então cada execução
+-- continua de onde a anterior parou. Quando o alvo muda (rotação de chave ou
+-- ENCRYPTION_FORMAT), a passada recomeça do início.
+
+CREATE TABLE IF NOT EXISTS reencryption_progress (
+    table_name TEXT PRIMARY KEY,
+    target TEXT NOT NULL,              -- formato/chave de destino, ex.: 'e2:1'
+    last_id TEXT,                      -- último id processado (NULL = início)
+    rows_scanned BIGINT NOT NULL DEFAULT 0,
+    rows_updated BIGINT NOT NULL DEFAULT 0,
+    rows_failed BIGINT NOT NULL DEFAULT 0,
+    completed_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Sem políticas: acessível apenas pela service role
+ALTER TABLE reencryption_progress ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,158 @@
+-- ============================================
+-- FUNÇÃO: get_report_aggregates
+-- Agregados da página /relatorios calculados no banco, em vez de trazer
+-- todas as linhas de procedures para o navegador (reportService.generateReportData).
+--
+-- Retorna um JSON pequeno com:
+--   stats            mesmos totais de procedureService.getProcedureStats
+--                    (histórico completo, considerando parcelas recebidas)
+--   hospitals        por hospital_clinic (nome bruto)
+--   procedure_types  por procedure_type (nome bruto)
+--   surgeons         por surgeon_name / nome_cirurgiao (nome bruto)
+--   months           por mês 'YYYY-MM'
+--   convenios        por convênio bruto, com soma e contagem de duração
+--   vaginal          partos vaginais com duração informada
+--   feedback         links de feedback e respostas por sintoma
+--
+-- Os nomes saem sem normalização: normalizeHospitalName etc. rodam no
+-- cliente sobre as poucas chaves distintas. Todos os agregados, exceto stats,
+-- respeitam o período. SECURITY INVOKER: as políticas de RLS de quem chama
+-- continuam valendo.
+-- ============================================
+
+CREATE OR REPLACE FUNCTION get_report_aggregates(
+  p_user_id UUID,
+  p_group_id UUID DEFAULT NULL,
+  p_start DATE DEFAULT NULL,
+  p_end DATE DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+SET search_path = public
+AS $$
+  WITH escopo AS (
+    SELECT id, procedure_date, procedure_value, payment_status, payment_method, forma_pagamento,
+           hospital_clinic, procedure_type, surgeon_name, nome_cirurgiao, convenio,
+           duracao_minutos, tipo_parto
+    FROM procedures
+    WHERE (p_group_id IS NOT NULL AND group_id = p_group_id)
+       OR (p_group_id IS NULL AND user_id = p_user_id)
+  ),
+  periodo AS (
+    SELECT *
+    FROM escopo
+    WHERE (p_start IS NULL OR procedure_date >= p_start)
+      AND (p_end IS NULL OR procedure_date <= p_end)
+  ),
+  recebido AS (
+    SELECT pa.procedure_id, SUM(pa.valor_parcela) FILTER (WHERE pa.recebida) AS valor
+    FROM parcelas pa
+    JOIN escopo e ON e.id = pa.procedure_id
+    GROUP BY pa.procedure_id
+  ),
+  situacao AS (
+    SELECT e.payment_status,
+           COALESCE(e.procedure_value, 0) AS valor,
+           COALESCE(e.payment_method = 'Parcelado' OR e.forma_pagamento = 'Parcelado', false) AS parcelado,
+           COALESCE(r.valor, 0) AS recebido
+    FROM escopo e
+    LEFT JOIN recebido r ON r.procedure_id = e.id
+  ),
+  feedback AS (
+    SELECT r.id IS NOT NULL AS respondido, r.nausea_vomito, r.cefaleia, r.dor_lombar, r.anemia_transfusao
+    FROM feedback_links fl
+    JOIN periodo p ON p.id = fl.procedure_id
+    LEFT JOIN LATERAL (
+      SELECT fr.id, fr.nausea_vomito, fr.cefaleia, fr.dor_lombar, fr.anemia_transfusao
+      FROM feedback_responses fr
+      WHERE fr.feedback_link_id = fl.id
+      ORDER BY fr.created_at
+      LIMIT 1
+    ) r ON true
+  )
+  SELECT jsonb_build_object(
+    'stats', (
+      SELECT jsonb_build_object(
+        'total', COUNT(*),
+        'completed', COUNT(*) FILTER (WHERE (parcelado AND recebido > 0) OR (NOT parcelado AND payment_status = 'paid')),
+        'pending', COUNT(*) FILTER (WHERE (parcelado AND valor - recebido > 0) OR (NOT parcelado AND payment_status = 'pending')),
+        'cancelled', COUNT(*) FILTER (WHERE NOT parcelado AND payment_status = 'cancelled'),
+        'sent', COUNT(*) FILTER (WHERE NOT parcelado AND payment_status = 'sent'),
+        'totalValue', COALESCE(SUM(valor), 0),
+        'completedValue', COALESCE(SUM(CASE
+          WHEN parcelado THEN recebido
+          WHEN payment_status = 'paid' THEN valor
+          ELSE 0 END), 0),
+        -- Cancelado e enviado contam como não recebido (pendingValue)
+        'pendingValue', COALESCE(SUM(CASE
+          WHEN parcelado THEN GREATEST(valor - recebido, 0)
+          WHEN payment_status IN ('pending', 'cancelled', 'sent') THEN valor
+          ELSE 0 END), 0)
+      )
+      FROM situacao
+    ),
+    'hospitals', COALESCE((
+      SELECT jsonb_agg(jsonb_build_object('key', chave, 'count', total, 'total_value', valor))
+      FROM (
+        SELECT COALESCE(hospital_clinic, '') AS chave, COUNT(*) AS total, SUM(COALESCE(procedure_value, 0)) AS valor
+        FROM periodo GROUP BY 1
+      ) t
+    ), '[]'::jsonb),
+    'procedure_types', COALESCE((
+      SELECT jsonb_agg(jsonb_build_object('key', chave, 'count', total, 'total_value', valor))
+      FROM (
+        SELECT COALESCE(procedure_type, '') AS chave, COUNT(*) AS total, SUM(COALESCE(procedure_value, 0)) AS valor
+        FROM periodo GROUP BY 1
+      ) t
+    ), '[]'::jsonb),
+    'surgeons', COALESCE((
+      SELECT jsonb_agg(jsonb_build_object('key', chave, 'count', total, 'total_value', valor))
+      FROM (
+        SELECT COALESCE(NULLIF(surgeon_name, ''), nome_cirurgiao, '') AS chave,
+               COUNT(*) AS total, SUM(COALESCE(procedure_value, 0)) AS valor
+        FROM periodo GROUP BY 1
+      ) t
+    ), '[]'::jsonb),
+    'months', COALESCE((
+      SELECT jsonb_agg(jsonb_build_object('key', chave, 'count', total, 'total_value', valor) ORDER BY chave)
+      FROM (
+        SELECT to_char(procedure_date, 'YYYY-MM') AS chave, COUNT(*) AS total, SUM(COALESCE(procedure_value, 0)) AS valor
+        FROM periodo WHERE procedure_date IS NOT NULL GROUP BY 1
+      ) t
+    ), '[]'::jsonb),
+    'convenios', COALESCE((
+      SELECT jsonb_agg(jsonb_build_object(
+        'key', chave, 'count', total, 'duration_total', duracao_total, 'duration_count', duracao_count
+      ))
+      FROM (
+        SELECT COALESCE(convenio, '') AS chave, COUNT(*) AS total,
+               COALESCE(SUM(duracao_minutos) FILTER (WHERE duracao_minutos > 0), 0) AS duracao_total,
+               COUNT(*) FILTER (WHERE duracao_minutos > 0) AS duracao_count
+        FROM periodo GROUP BY 1
+      ) t
+    ), '[]'::jsonb),
+    'vaginal', (
+      SELECT jsonb_build_object('count', COUNT(*), 'duration_total', COALESCE(SUM(duracao_minutos), 0))
+      FROM periodo
+      WHERE tipo_parto = 'Vaginal' AND duracao_minutos > 0
+    ),
+    'feedback', (
+      SELECT jsonb_build_object(
+        'links', COUNT(*),
+        'responses', COUNT(*) FILTER (WHERE respondido),
+        'nausea', COUNT(*) FILTER (WHERE nausea_vomito),
+        'cefaleia', COUNT(*) FILTER (WHERE cefaleia),
+        'dor_lombar', COUNT(*) FILTER (WHERE dor_lombar),
+        'anemia_transfusao', COUNT(*) FILTER (WHERE anemia_transfusao)
+      )
+      FROM feedback
+    )
+  );
+$$;
+
+GRANT EXECUTE ON FUNCTION get_report_aggregates(UUID, UUID, DATE, DATE) TO authenticated;
+
+COMMENT ON FUNCTION get_report_aggregates(UUID, UUID, DATE, DATE) IS
+  'Agregados de /relatorios por usuário ou grupo e período (ver reportService.generateReportData)';
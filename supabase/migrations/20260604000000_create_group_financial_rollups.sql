@@ -0,0 +1,312 @@
+-- ============================================
+-- Consolidação mensal do financeiro de grupos
+-- Lida por hooks/useFinanceiroDashboard: 12 linhas por ano em vez de todos os
+-- procedimentos e despesas do grupo.
+--
+-- group_financial_monthly         uma linha por (grupo, mês)
+-- group_member_financial_monthly  uma linha por (grupo, mês, membro)
+--
+-- Mantidas por triggers de instrução (com tabelas de transição) em
+-- procedures e despesas: cada (grupo, mês) afetado é recalculado a partir
+-- das linhas de origem, então não há acúmulo de diferenças, e uma importação
+-- em lote recalcula cada mês uma única vez.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS public.group_financial_monthly (
+  group_id UUID NOT NULL REFERENCES public.groups(id) ON DELETE CASCADE,
+  month DATE NOT NULL,                                  -- primeiro dia do mês
+  procedures_count INTEGER NOT NULL DEFAULT 0,
+  revenue NUMERIC(14,2) NOT NULL DEFAULT 0,             -- soma de procedure_value
+  receivable NUMERIC(14,2) NOT NULL DEFAULT 0,          -- payment_status <> 'paid'
+  revenue_cnpj NUMERIC(14,2) NOT NULL DEFAULT 0,        -- billing_entity_type = 'cnpj_grupo'
+  revenue_cpf NUMERIC(14,2) NOT NULL DEFAULT 0,         -- demais
+  payment_methods JSONB NOT NULL DEFAULT '{}'::jsonb,   -- { meio: valor }
+  despesas_total NUMERIC(14,2) NOT NULL DEFAULT 0,
+  despesas_grupo NUMERIC(14,2) NOT NULL DEFAULT 0,      -- despesas sem anesthesiologist_id
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (group_id, month)
+);
+
+CREATE TABLE IF NOT EXISTS public.group_member_financial_monthly (
+  group_id UUID NOT NULL REFERENCES public.groups(id) ON DELETE CASCADE,
+  month DATE NOT NULL,
+  user_id UUID NOT NULL,                                -- user_id ou anesthesiologist_user_id
+  procedures_count INTEGER NOT NULL DEFAULT 0,
+  revenue NUMERIC(14,2) NOT NULL DEFAULT 0,
+  revenue_cnpj NUMERIC(14,2) NOT NULL DEFAULT 0,
+  revenue_cpf NUMERIC(14,2) NOT NULL DEFAULT 0,
+  despesas NUMERIC(14,2) NOT NULL DEFAULT 0,            -- despesas com anesthesiologist_id = membro
+  PRIMARY KEY (group_id, month, user_id)
+);
+
+ALTER TABLE public.group_financial_monthly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.group_member_financial_monthly ENABLE ROW LEVEL SECURITY;
+
+-- Somente leitura para membros do grupo; a escrita é feita pelas funções abaixo
+CREATE POLICY "Users can view financial rollups of their groups"
+ON public.group_financial_monthly FOR SELECT TO authenticated
+USING (
+  group_id IN (SELECT group_id FROM public.group_members WHERE user_id = auth.uid())
+);
+
+CREATE POLICY "Users can view member rollups of their groups"
+ON public.group_member_financial_monthly FOR SELECT TO authenticated
+USING (
+  group_id IN (SELECT group_id FROM public.group_members WHERE user_id = auth.uid())
+);
+
+-- Índice de apoio para o recálculo por (grupo, mês) nas despesas
+CREATE INDEX IF NOT EXISTS despesas_group_data_idx ON public.despesas(group_id, data_despesa);
+
+-- ============================================
+-- FUNÇÃO: recalcula um (grupo, mês) a partir de procedures e despesas
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.refresh_group_financial_month(p_group_id UUID, p_month DATE)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_inicio DATE;
+  v_fim DATE;
+BEGIN
+  IF p_group_id IS NULL OR p_month IS NULL THEN
+    RETURN;
+  END IF;
+
+  v_inicio := date_trunc('month', p_month)::date;
+  v_fim := (v_inicio + INTERVAL '1 month')::date;
+
+  -- Serializa recálculos do mesmo (grupo, mês) entre transações concorrentes:
+  -- quem espera enxerga as linhas já confirmadas pela outra
+  PERFORM pg_advisory_xact_lock(hashtextextended(p_group_id::text || v_inicio::text, 0));
+
+  INSERT INTO group_financial_monthly AS g (
+    group_id, month, procedures_count, revenue, receivable, revenue_cnpj, revenue_cpf,
+    payment_methods, despesas_total, despesas_grupo, updated_at
+  )
+  SELECT p_group_id, v_inicio, pr.qtd, pr.receita, pr.a_receber, pr.cnpj, pr.cpf,
+         COALESCE(pm.meios, '{}'::jsonb), d.total, d.grupo, now()
+  FROM (
+    SELECT COUNT(*)::int AS qtd,
+           COALESCE(SUM(procedure_value), 0) AS receita,
+           COALESCE(SUM(procedure_value) FILTER (WHERE payment_status IS DISTINCT FROM 'paid'), 0) AS a_receber,
+           COALESCE(SUM(procedure_value) FILTER (WHERE billing_entity_type = 'cnpj_grupo'), 0) AS cnpj,
+           COALESCE(SUM(procedure_value) FILTER (WHERE billing_entity_type IS DISTINCT FROM 'cnpj_grupo'), 0) AS cpf
+    FROM procedures
+    WHERE group_id = p_group_id AND procedure_date >= v_inicio AND procedure_date < v_fim
+  ) pr,
+  (
+    SELECT jsonb_object_agg(meio, valor) AS meios
+    FROM (
+      SELECT COALESCE(NULLIF(payment_method, ''), NULLIF(forma_pagamento, ''), 'Não informado') AS meio,
+             COALESCE(SUM(procedure_value), 0) AS valor
+      FROM procedures
+      WHERE group_id = p_group_id AND procedure_date >= v_inicio AND procedure_date < v_fim
+      GROUP BY 1
+    ) m
+  ) pm,
+  (
+    SELECT COALESCE(SUM(valor), 0) AS total,
+           COALESCE(SUM(valor) FILTER (WHERE anesthesiologist_id IS NULL), 0) AS grupo,
+           COUNT(*) AS qtd
+    FROM despesas
+    WHERE group_id = p_group_id AND data_despesa >= v_inicio AND data_despesa < v_fim
+  ) d
+  WHERE pr.qtd > 0 OR d.qtd > 0
+  ON CONFLICT (group_id, month) DO UPDATE SET
+    procedures_count = EXCLUDED.procedures_count,
+    revenue = EXCLUDED.revenue,
+    receivable = EXCLUDED.receivable,
+    revenue_cnpj = EXCLUDED.revenue_cnpj,
+    revenue_cpf = EXCLUDED.revenue_cpf,
+    payment_methods = EXCLUDED.payment_methods,
+    despesas_total = EXCLUDED.despesas_total,
+    despesas_grupo = EXCLUDED.despesas_grupo,
+    updated_at = EXCLUDED.updated_at;
+
+  -- Mês que ficou vazio: remove a linha
+  IF NOT FOUND THEN
+    DELETE FROM group_financial_monthly WHERE group_id = p_group_id AND month = v_inicio;
+  END IF;
+
+  -- Membros: o procedimento conta para o dono e para o anestesista (uma vez
+  -- se forem a mesma pessoa), como no dashboard
+  DELETE FROM group_member_financial_monthly WHERE group_id = p_group_id AND month = v_inicio;
+
+  INSERT INTO group_member_financial_monthly (
+    group_id, month, user_id, procedures_count, revenue, revenue_cnpj, revenue_cpf, despesas
+  )
+  SELECT p_group_id, v_inicio, membro,
+         SUM(qtd)::int, SUM(receita), SUM(cnpj), SUM(cpf), SUM(despesa)
+  FROM (
+    SELECT m.membro, 1 AS qtd,
+           COALESCE(p.procedure_value, 0) AS receita,
+           CASE WHEN p.billing_entity_type = 'cnpj_grupo' THEN COALESCE(p.procedure_value, 0) ELSE 0 END AS cnpj,
+           CASE WHEN p.billing_entity_type IS DISTINCT FROM 'cnpj_grupo' THEN COALESCE(p.procedure_value, 0) ELSE 0 END AS cpf,
+           0 AS despesa
+    FROM procedures p
+    CROSS JOIN LATERAL (
+      SELECT DISTINCT u AS membro FROM unnest(ARRAY[p.user_id, p.anesthesiologist_user_id]) AS u WHERE u IS NOT NULL
+    ) m
+    WHERE p.group_id = p_group_id AND p.procedure_date >= v_inicio AND p.procedure_date < v_fim
+    UNION ALL
+    SELECT anesthesiologist_id, 0, 0, 0, 0, valor
+    FROM despesas
+    WHERE group_id = p_group_id AND anesthesiologist_id IS NOT NULL
+      AND data_despesa >= v_inicio AND data_despesa < v_fim
+  ) x
+  GROUP BY membro
+  ON CONFLICT (group_id, month, user_id) DO UPDATE SET
+    procedures_count = EXCLUDED.procedures_count,
+    revenue = EXCLUDED.revenue,
+    revenue_cnpj = EXCLUDED.revenue_cnpj,
+    revenue_cpf = EXCLUDED.revenue_cpf,
+    despesas = EXCLUDED.despesas;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION public.refresh_group_financial_month(UUID, DATE) FROM PUBLIC, anon, authenticated;
+
+-- ============================================
+-- TRIGGERS: um recálculo por (grupo, mês) afetado em cada instrução
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.refresh_group_financial_from_procedures()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  r RECORD;
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    FOR r IN SELECT DISTINCT group_id, date_trunc('month', procedure_date)::date AS mes
+             FROM novas WHERE group_id IS NOT NULL LOOP
+      PERFORM refresh_group_financial_month(r.group_id, r.mes);
+    END LOOP;
+  ELSIF TG_OP = 'UPDATE' THEN
+    -- Só linhas em que alguma coluna usada na consolidação mudou (edições de
+    -- paciente, recriptografia etc. não recalculam nada)
+    FOR r IN WITH mudadas AS (
+               SELECT o.group_id AS grupo_antigo, o.procedure_date AS data_antiga,
+                      n.group_id AS grupo_novo, n.procedure_date AS data_nova
+               FROM novas n JOIN antigas o ON o.id = n.id
+               WHERE (n.group_id, n.procedure_date, n.procedure_value, n.payment_status, n.billing_entity_type,
+                      n.payment_method, n.forma_pagamento, n.user_id, n.anesthesiologist_user_id)
+                     IS DISTINCT FROM
+                     (o.group_id, o.procedure_date, o.procedure_value, o.payment_status, o.billing_entity_type,
+                      o.payment_method, o.forma_pagamento, o.user_id, o.anesthesiologist_user_id)
+             )
+             SELECT grupo_novo AS group_id, date_trunc('month', data_nova)::date AS mes FROM mudadas WHERE grupo_novo IS NOT NULL
+             UNION
+             SELECT grupo_antigo, date_trunc('month', data_antiga)::date FROM mudadas WHERE grupo_antigo IS NOT NULL LOOP
+      PERFORM refresh_group_financial_month(r.group_id, r.mes);
+    END LOOP;
+  ELSE
+    FOR r IN SELECT DISTINCT group_id, date_trunc('month', procedure_date)::date AS mes
+             FROM antigas WHERE group_id IS NOT NULL LOOP
+      PERFORM refresh_group_financial_month(r.group_id, r.mes);
+    END LOOP;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.refresh_group_financial_from_despesas()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  r RECORD;
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    FOR r IN SELECT DISTINCT group_id, date_trunc('month', data_despesa)::date AS mes
+             FROM novas WHERE group_id IS NOT NULL LOOP
+      PERFORM refresh_group_financial_month(r.group_id, r.mes);
+    END LOOP;
+  ELSIF TG_OP = 'UPDATE' THEN
+    FOR r IN WITH mudadas AS (
+               SELECT o.group_id AS grupo_antigo, o.data_despesa AS data_antiga,
+                      n.group_id AS grupo_novo, n.data_despesa AS data_nova
+               FROM novas n JOIN antigas o ON o.id = n.id
+               WHERE (n.group_id, n.data_despesa, n.valor, n.anesthesiologist_id)
+                     IS DISTINCT FROM (o.group_id, o.data_despesa, o.valor, o.anesthesiologist_id)
+             )
+             SELECT grupo_novo AS group_id, date_trunc('month', data_nova)::date AS mes FROM mudadas WHERE grupo_novo IS NOT NULL
+             UNION
+             SELECT grupo_antigo, date_trunc('month', data_antiga)::date FROM mudadas WHERE grupo_antigo IS NOT NULL LOOP
+      PERFORM refresh_group_financial_month(r.group_id, r.mes);
+    END LOOP;
+  ELSE
+    FOR r IN SELECT DISTINCT group_id, date_trunc('month', data_despesa)::date AS mes
+             FROM antigas WHERE group_id IS NOT NULL LOOP
+      PERFORM refresh_group_financial_month(r.group_id, r.mes);
+    END LOOP;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- Tabelas de transição exigem um trigger por evento
+DROP TRIGGER IF EXISTS procedures_financial_rollup_insert ON public.procedures;
+CREATE TRIGGER procedures_financial_rollup_insert
+  AFTER INSERT ON public.procedures
+  REFERENCING NEW TABLE AS novas
+  FOR EACH STATEMENT EXECUTE FUNCTION public.refresh_group_financial_from_procedures();
+
+DROP TRIGGER IF EXISTS procedures_financial_rollup_update ON public.procedures;
+CREATE TRIGGER procedures_financial_rollup_update
+  AFTER UPDATE ON public.procedures
+  REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+  FOR EACH STATEMENT EXECUTE FUNCTION public.refresh_group_financial_from_procedures();
+
+DROP TRIGGER IF EXISTS procedures_financial_rollup_delete ON public.procedures;
+CREATE TRIGGER procedures_financial_rollup_delete
+  AFTER DELETE ON public.procedures
+  REFERENCING OLD TABLE AS antigas
+  FOR EACH STATEMENT EXECUTE FUNCTION public.refresh_group_financial_from_procedures();
+
+DROP TRIGGER IF EXISTS despesas_financial_rollup_insert ON public.despesas;
+CREATE TRIGGER despesas_financial_rollup_insert
+  AFTER INSERT ON public.despesas
+  REFERENCING NEW TABLE AS novas
+  FOR EACH STATEMENT EXECUTE FUNCTION public.refresh_group_financial_from_despesas();
+
+DROP TRIGGER IF EXISTS despesas_financial_rollup_update ON public.despesas;
+CREATE TRIGGER despesas_financial_rollup_update
+  AFTER UPDATE ON public.despesas
+  REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+  FOR EACH STATEMENT EXECUTE FUNCTION public.refresh_group_financial_from_despesas();
+
+DROP TRIGGER IF EXISTS despesas_financial_rollup_delete ON public.despesas;
+CREATE TRIGGER despesas_financial_rollup_delete
+  AFTER DELETE ON public.despesas
+  REFERENCING OLD TABLE AS antigas
+  FOR EACH STATEMENT EXECUTE FUNCTION public.refresh_group_financial_from_despesas();
+
+-- ============================================
+-- Carga inicial a partir dos dados existentes
+-- ============================================
+
+DO $$
+DECLARE
+  r RECORD;
+BEGIN
+  FOR r IN
+    SELECT group_id, date_trunc('month', procedure_date)::date AS mes FROM public.procedures WHERE group_id IS NOT NULL
+    UNION
+    SELECT group_id, date_trunc('month', data_despesa)::date FROM public.despesas WHERE group_id IS NOT NULL
+  LOOP
+    PERFORM public.refresh_group_financial_month(r.group_id, r.mes);
+  END LOOP;
+END;
+$$;
+
+COMMENT ON TABLE public.group_financial_monthly IS 'Consolidação mensal do financeiro por grupo (mantida por triggers em procedures/despesas)';
+COMMENT ON TABLE public.group_member_financial_monthly IS 'Consolidação mensal do financeiro por membro do grupo (mantida por triggers em procedures/despesas)';
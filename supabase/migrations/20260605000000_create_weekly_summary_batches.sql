@@ -0,0 +1,106 @@
+-- ============================================
+-- Resumo financeiro semanal em lote (/api/cron/weekly-summary)
+--
+-- O cron chamava getFinancialSummary + createNotification para cada usuário
+-- ativo, um de cada vez. Agora cada chamada de run_weekly_summary_batch
+-- calcula os totais de um lote de usuários com uma única consulta agrupada,
+-- insere as notificações do lote com um INSERT ... SELECT e avança o
+-- checkpoint na mesma transação: uma execução interrompida (timeout) continua
+-- do próximo usuário, sem perder nem repetir notificações.
+-- ============================================
+
+-- Checkpoint: uma linha por semana (segunda-feira)
+CREATE TABLE IF NOT EXISTS public.weekly_summary_progress (
+  week_start DATE PRIMARY KEY,
+  since TIMESTAMPTZ NOT NULL,            -- início da janela de 7 dias, fixado na primeira execução
+  last_user_id UUID,                     -- último usuário notificado (NULL = início)
+  users_notified INTEGER NOT NULL DEFAULT 0,
+  completed_at TIMESTAMPTZ,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Sem políticas: acessível apenas pela service role
+ALTER TABLE public.weekly_summary_progress ENABLE ROW LEVEL SECURITY;
+
+-- ============================================
+-- FUNÇÃO: processa o próximo lote de até p_limit usuários
+-- Regras de financialService.getFinancialSummary(userId, 'weekly'):
+-- procedimentos do usuário criados na janela; recebido = 'paid',
+-- pendente = demais. Só usuários com assinatura ativa e movimentação.
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.run_weekly_summary_batch(
+  p_week_start DATE,
+  p_since TIMESTAMPTZ,
+  p_limit INTEGER DEFAULT 500
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_progresso weekly_summary_progress%ROWTYPE;
+  v_qtd INTEGER;
+  v_ultimo UUID;
+BEGIN
+  INSERT INTO weekly_summary_progress (week_start, since)
+  VALUES (p_week_start, p_since)
+  ON CONFLICT (week_start) DO NOTHING;
+
+  -- Trava o checkpoint: duas execuções simultâneas não pegam o mesmo lote
+  SELECT * INTO v_progresso FROM weekly_summary_progress WHERE week_start = p_week_start FOR UPDATE;
+
+  IF v_progresso.completed_at IS NOT NULL THEN
+    RETURN jsonb_build_object('notified', 0, 'total', v_progresso.users_notified, 'done', true);
+  END IF;
+
+  WITH lote AS (
+    SELECT p.user_id,
+           COUNT(*) AS qtd,
+           COALESCE(SUM(p.procedure_value), 0) AS produzido,
+           COALESCE(SUM(p.procedure_value) FILTER (WHERE p.payment_status = 'paid'), 0) AS recebido,
+           COALESCE(SUM(p.procedure_value) FILTER (WHERE p.payment_status IS DISTINCT FROM 'paid'), 0) AS pendente
+    FROM procedures p
+    JOIN users u ON u.id = p.user_id AND u.subscription_status = 'active'
+    WHERE p.created_at >= v_progresso.since
+      AND (v_progresso.last_user_id IS NULL OR p.user_id > v_progresso.last_user_id)
+    GROUP BY p.user_id
+    ORDER BY p.user_id
+    LIMIT p_limit
+  ),
+  inseridas AS (
+    INSERT INTO notifications (user_id, type, title, message, is_read)
+    SELECT user_id,
+           'weekly_summary',
+           'Resumo Financeiro da Semana',
+           format(E'💰 Produzido: R$ %s\n💵 Recebido: R$ %s\n⚠️ Pendente: R$ %s',
+                  to_char(produzido, 'FM999999999990.00'),
+                  to_char(recebido, 'FM999999999990.00'),
+                  to_char(pendente, 'FM999999999990.00')),
+           false
+    FROM lote
+    RETURNING user_id
+  )
+  SELECT COUNT(*)::int, (array_agg(user_id ORDER BY user_id DESC))[1]
+  INTO v_qtd, v_ultimo
+  FROM inseridas;
+
+  UPDATE weekly_summary_progress SET
+    last_user_id = COALESCE(v_ultimo, last_user_id),
+    users_notified = users_notified + v_qtd,
+    completed_at = CASE WHEN v_qtd < p_limit THEN now() END,
+    updated_at = now()
+  WHERE week_start = p_week_start;
+
+  RETURN jsonb_build_object(
+    'notified', v_qtd,
+    'total', v_progresso.users_notified + v_qtd,
+    'done', v_qtd < p_limit
+  );
+END;
+$$;
+
+REVOKE ALL ON FUNCTION public.run_weekly_summary_batch(DATE, TIMESTAMPTZ, INTEGER) FROM PUBLIC, anon, authenticated;
+
+COMMENT ON TABLE public.weekly_summary_progress IS 'Checkpoint do cron de resumo semanal (um registro por semana)';
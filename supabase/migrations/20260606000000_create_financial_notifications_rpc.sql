@@ -0,0 +1,109 @@
+-- ============================================
+-- Notificações financeiras inteligentes em lote
+--
+-- generateIntelligentNotifications fazia, por usuário, três select('*')
+-- (pendentes, atrasados, próximos do vencimento) e até três buscas +
+-- insert/update para evitar duplicatas. generate_financial_notifications
+-- avalia as três regras com uma consulta agrupada (um usuário ou todos) e
+-- aplica a deduplicação de 24h com um único INSERT ... ON CONFLICT.
+--
+-- Deduplicação: a notificação financeira mais recente de cada (usuário, tipo)
+-- guarda o tipo em dedupe_key, único por usuário. Depois de 24h a chave é
+-- liberada e o próximo alerta daquele tipo vira uma notificação nova; antes
+-- disso o conflito atualiza a mensagem se ainda não foi lida, ou não faz nada
+-- se já foi.
+-- ============================================
+
+ALTER TABLE public.notifications ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT now();
+ALTER TABLE public.notifications ADD COLUMN IF NOT EXISTS dedupe_key TEXT;
+
+-- Notificações financeiras das últimas 24h já criadas pelo caminho antigo
+UPDATE public.notifications SET dedupe_key = type
+WHERE id IN (
+  SELECT DISTINCT ON (user_id, type) id
+  FROM public.notifications
+  WHERE type IN ('pending_send', 'late_payment', 'near_payment')
+    AND created_at > now() - INTERVAL '24 hours'
+  ORDER BY user_id, type, created_at DESC
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS notifications_user_dedupe_key_idx
+ON public.notifications(user_id, dedupe_key)
+WHERE dedupe_key IS NOT NULL;
+
+-- ============================================
+-- FUNÇÃO: gera/atualiza as notificações financeiras
+-- p_user_id NULL = todos os usuários (cron com service role); usuários
+-- autenticados só podem gerar as próprias.
+-- Regras de lib/financial/service.ts (limites de BUSINESS_RULES):
+--   pending_send  pendentes criados há menos de p_late_days dias
+--   late_payment  pendentes criados há p_late_days dias ou mais
+--   near_payment  não pagos com expected_payment_date nos próximos p_near_days dias
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.generate_financial_notifications(
+  p_user_id UUID DEFAULT NULL,
+  p_late_days INTEGER DEFAULT 90,
+  p_near_days INTEGER DEFAULT 5
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_limite TIMESTAMPTZ := now() - make_interval(days => p_late_days);
+  v_liberadas INTEGER;
+  v_gravadas INTEGER;
+BEGIN
+  IF auth.uid() IS NOT NULL AND p_user_id IS DISTINCT FROM auth.uid() THEN
+    RAISE EXCEPTION 'Sem permissão para gerar notificações de outro usuário' USING ERRCODE = '42501';
+  END IF;
+
+  -- Libera as chaves de notificações com mais de 24h
+  UPDATE notifications SET dedupe_key = NULL
+  WHERE dedupe_key IS NOT NULL
+    AND created_at <= now() - INTERVAL '24 hours'
+    AND (p_user_id IS NULL OR user_id = p_user_id);
+  GET DIAGNOSTICS v_liberadas = ROW_COUNT;
+
+  WITH contagens AS (
+    SELECT user_id,
+           COUNT(*) FILTER (WHERE payment_status = 'pending' AND created_at >= v_limite) AS pendentes,
+           COUNT(*) FILTER (WHERE payment_status = 'pending' AND created_at < v_limite) AS atrasados,
+           COALESCE(SUM(procedure_value) FILTER (WHERE payment_status = 'pending' AND created_at < v_limite), 0) AS valor_atrasado,
+           COUNT(*) FILTER (WHERE expected_payment_date BETWEEN current_date AND current_date + p_near_days) AS proximos
+    FROM procedures
+    WHERE payment_status <> 'paid'
+      AND (p_user_id IS NULL OR user_id = p_user_id)
+    GROUP BY user_id
+  ),
+  candidatas AS (
+    SELECT user_id, 'pending_send' AS type, 'Procedimentos Pendentes de Envio' AS title,
+           format('Você possui %s procedimentos aguardando envio para cobrança há mais de uma semana.', pendentes) AS message
+    FROM contagens WHERE pendentes > 0
+    UNION ALL
+    SELECT user_id, 'late_payment', 'Atraso no Recebimento',
+           format('Existem %s procedimentos com pagamento atrasado, totalizando R$ %s.',
+                  atrasados, to_char(valor_atrasado, 'FM999999999990.00'))
+    FROM contagens WHERE atrasados > 0
+    UNION ALL
+    SELECT user_id, 'near_payment', 'Recebimentos Próximos',
+           format('%s procedimentos devem ser pagos nos próximos %s dias.', proximos, p_near_days)
+    FROM contagens WHERE proximos > 0
+  )
+  INSERT INTO notifications (user_id, type, title, message, is_read, dedupe_key)
+  SELECT user_id, type, title, message, false, type FROM candidatas
+  ON CONFLICT (user_id, dedupe_key) WHERE dedupe_key IS NOT NULL
+  DO UPDATE SET message = EXCLUDED.message, updated_at = now()
+  -- Já lida: não incomodar até a chave expirar; mensagem igual: nada a gravar
+  WHERE notifications.is_read IS NOT TRUE
+    AND notifications.message IS DISTINCT FROM EXCLUDED.message;
+  GET DIAGNOSTICS v_gravadas = ROW_COUNT;
+
+  RETURN jsonb_build_object('written', v_gravadas, 'expired', v_liberadas);
+END;
+$$;
+
+REVOKE ALL ON FUNCTION public.generate_financial_notifications(UUID, INTEGER, INTEGER) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION public.generate_financial_notifications(UUID, INTEGER, INTEGER) TO authenticated;
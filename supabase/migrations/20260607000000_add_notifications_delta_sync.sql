@@ -0,0 +1,42 @@
+-- ============================================
+-- Sincronização incremental de notificações (contexts/NotificationsContext)
+--
+-- O cliente mantém um cache local e recebe inserts/updates pelo Realtime;
+-- ao reconectar busca só o que mudou desde o último updated_at visto. Para
+-- isso todo UPDATE precisa avançar updated_at (marcar como lida inclusive).
+-- ============================================
+
+-- Antes do trigger, que sobrescreveria com now()
+UPDATE public.notifications SET updated_at = created_at WHERE updated_at IS NULL;
+
+CREATE OR REPLACE FUNCTION public.touch_notifications_updated_at()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  NEW.updated_at := now();
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS notifications_touch_updated_at ON public.notifications;
+CREATE TRIGGER notifications_touch_updated_at
+  BEFORE UPDATE ON public.notifications
+  FOR EACH ROW EXECUTE FUNCTION public.touch_notifications_updated_at();
+
+-- Busca "desde o cursor" ao reconectar
+CREATE INDEX IF NOT EXISTS idx_notifications_user_updated
+ON public.notifications(user_id, updated_at);
+
+-- Inserts e updates chegam ao cliente pelo Realtime
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime')
+     AND NOT EXISTS (
+       SELECT 1 FROM pg_publication_tables
+       WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = 'notifications'
+     ) THEN
+    ALTER PUBLICATION supabase_realtime ADD TABLE public.notifications;
+  END IF;
+END;
+$$;
@@ -0,0 +1,153 @@
+-- ============================================
+-- Fila durável para o OCR de mídias do WhatsApp
+--
+-- O webhook só enfileira (uma linha por mensagem, como processed_webhooks) e
+-- responde à Meta; workers (lib/queue/worker.ts) reservam jobs com
+-- FOR UPDATE SKIP LOCKED, então vários podem rodar em paralelo sem pegar o
+-- mesmo job.
+--
+-- Ciclo de vida:
+--   queued      aguardando run_at
+--   processing  reservado por um worker até locked_until (visibility timeout);
+--               se o worker morrer, o job volta a ser reservável quando o
+--               prazo vence
+--   completed   concluído
+--   dead        falhou max_attempts vezes (dead-letter, last_error guarda o motivo)
+-- Falhas antes do limite voltam para queued com espera exponencial.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS public.whatsapp_jobs (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  event_id TEXT NOT NULL UNIQUE,                 -- id da mensagem na Meta
+  payload JSONB NOT NULL,                        -- MetaMessage
+  status TEXT NOT NULL DEFAULT 'queued'
+    CHECK (status IN ('queued', 'processing', 'completed', 'dead')),
+  attempts INTEGER NOT NULL DEFAULT 0,
+  max_attempts INTEGER NOT NULL DEFAULT 5,
+  run_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  locked_by TEXT,
+  locked_until TIMESTAMPTZ,
+  last_error TEXT,
+  completed_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Reserva: jobs prontos e jobs com prazo de reserva vencido
+CREATE INDEX IF NOT EXISTS idx_whatsapp_jobs_queued
+ON public.whatsapp_jobs(run_at) WHERE status = 'queued';
+
+CREATE INDEX IF NOT EXISTS idx_whatsapp_jobs_processing
+ON public.whatsapp_jobs(locked_until) WHERE status = 'processing';
+
+-- Sem políticas: acessível apenas pela service role
+ALTER TABLE public.whatsapp_jobs ENABLE ROW LEVEL SECURITY;
+
+-- ============================================
+-- FUNÇÃO: reserva até p_limit jobs para p_worker por p_visibility_seconds
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.claim_whatsapp_jobs(
+  p_worker TEXT,
+  p_limit INTEGER DEFAULT 1,
+  p_visibility_seconds INTEGER DEFAULT 120
+)
+RETURNS SETOF public.whatsapp_jobs
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  -- Reservas vencidas de jobs que já esgotaram as tentativas vão para dead-letter
+  UPDATE whatsapp_jobs SET
+    status = 'dead',
+    last_error = COALESCE(last_error, 'Tempo de processamento esgotado'),
+    locked_by = NULL,
+    locked_until = NULL,
+    updated_at = now()
+  WHERE status = 'processing' AND locked_until < now() AND attempts >= max_attempts;
+
+  RETURN QUERY
+  WITH candidatos AS (
+    SELECT id FROM whatsapp_jobs
+    WHERE (status = 'queued' AND run_at <= now())
+       OR (status = 'processing' AND locked_until < now())
+    ORDER BY run_at
+    LIMIT p_limit
+    FOR UPDATE SKIP LOCKED
+  )
+  UPDATE whatsapp_jobs j SET
+    status = 'processing',
+    attempts = j.attempts + 1,
+    locked_by = p_worker,
+    locked_until = now() + make_interval(secs => p_visibility_seconds),
+    updated_at = now()
+  FROM candidatos c
+  WHERE j.id = c.id
+  RETURNING j.*;
+END;
+$$;
+
+-- ============================================
+-- FUNÇÃO: conclui um job (só vale para quem ainda detém a reserva)
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.complete_whatsapp_job(p_id UUID, p_worker TEXT)
+RETURNS BOOLEAN
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  UPDATE whatsapp_jobs SET
+    status = 'completed',
+    completed_at = now(),
+    locked_by = NULL,
+    locked_until = NULL,
+    updated_at = now()
+  WHERE id = p_id AND status = 'processing' AND locked_by = p_worker;
+  RETURN FOUND;
+END;
+$$;
+
+-- ============================================
+-- FUNÇÃO: registra uma falha; reagenda com espera exponencial
+-- (p_base_seconds * 2^(tentativa-1), com até 20% de variação) ou manda para
+-- dead-letter quando as tentativas acabaram. Retorna o novo status.
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.fail_whatsapp_job(
+  p_id UUID,
+  p_worker TEXT,
+  p_error TEXT,
+  p_base_seconds INTEGER DEFAULT 15
+)
+RETURNS TEXT
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_status TEXT;
+BEGIN
+  UPDATE whatsapp_jobs SET
+    status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END,
+    run_at = CASE WHEN attempts >= max_attempts THEN run_at
+                  ELSE now() + make_interval(secs => p_base_seconds * power(2, attempts - 1) * (1 + random() * 0.2))
+             END,
+    last_error = left(p_error, 2000),
+    locked_by = NULL,
+    locked_until = NULL,
+    updated_at = now()
+  WHERE id = p_id AND status = 'processing' AND locked_by = p_worker
+  RETURNING status INTO v_status;
+
+  RETURN v_status;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION public.claim_whatsapp_jobs(TEXT, INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE ALL ON FUNCTION public.complete_whatsapp_job(UUID, TEXT) FROM PUBLIC, anon, authenticated;
+REVOKE ALL ON FUNCTION public.fail_whatsapp_job(UUID, TEXT, TEXT, INTEGER) FROM PUBLIC, anon, authenticated;
+
+COMMENT ON TABLE public.whatsapp_jobs IS 'Fila de processamento (OCR) das mídias recebidas pelo webhook do WhatsApp';
@@ -0,0 +1,81 @@
+-- ============================================
+-- Cache de extrações por Vision (gpt-4o-mini)
+--
+-- A mesma foto de ficha costuma ser reenviada (WhatsApp e web). A chave é o
+-- SHA-256 de (extrator, modelo, hash do prompt, SHA-256 da imagem): mudar o
+-- prompt invalida as entradas antigas. O resultado fica criptografado
+-- (lib/security.ts) porque contém dados de pacientes. Ver lib/ai/vision-cache.ts.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS public.vision_cache (
+  cache_key TEXT PRIMARY KEY,
+  extractor TEXT NOT NULL,                 -- 'whatsapp_ocr', 'anesthesia_record', 'ficha_web'
+  result TEXT NOT NULL,                    -- JSON criptografado
+  size_bytes INTEGER NOT NULL,
+  hits INTEGER NOT NULL DEFAULT 0,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  last_hit_at TIMESTAMPTZ,
+  expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_vision_cache_expires ON public.vision_cache(expires_at);
+CREATE INDEX IF NOT EXISTS idx_vision_cache_recency ON public.vision_cache(COALESCE(last_hit_at, created_at));
+
+-- Sem políticas: acessível apenas pela service role
+ALTER TABLE public.vision_cache ENABLE ROW LEVEL SECURITY;
+
+-- ============================================
+-- FUNÇÃO: leitura com contagem de acerto (uma ida ao banco)
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.vision_cache_get(p_key TEXT)
+RETURNS TEXT
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  UPDATE vision_cache
+  SET hits = hits + 1, last_hit_at = now()
+  WHERE cache_key = p_key AND expires_at > now()
+  RETURNING result;
+$$;
+
+-- ============================================
+-- FUNÇÃO: limite de tamanho — remove expiradas e, acima de p_max_entries,
+-- as menos usadas recentemente
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.prune_vision_cache(p_max_entries INTEGER)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_expiradas INTEGER;
+  v_excedentes INTEGER;
+BEGIN
+  DELETE FROM vision_cache WHERE expires_at <= now();
+  GET DIAGNOSTICS v_expiradas = ROW_COUNT;
+
+  DELETE FROM vision_cache
+  WHERE cache_key IN (
+    SELECT cache_key FROM vision_cache
+    ORDER BY COALESCE(last_hit_at, created_at) DESC
+    OFFSET p_max_entries
+  );
+  GET DIAGNOSTICS v_excedentes = ROW_COUNT;
+
+  RETURN v_expiradas + v_excedentes;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION public.vision_cache_get(TEXT) FROM PUBLIC, anon, authenticated;
+REVOKE ALL ON FUNCTION public.prune_vision_cache(INTEGER) FROM PUBLIC, anon, authenticated;
+
+-- Acertos e economia por mensagem do WhatsApp: cost_llm fica 0 no acerto e
+-- cost_llm_saved guarda o custo evitado
+ALTER TABLE IF EXISTS public.ocr_messages ADD COLUMN IF NOT EXISTS llm_cache_hit BOOLEAN NOT NULL DEFAULT false;
+ALTER TABLE IF EXISTS public.ocr_messages ADD COLUMN IF NOT EXISTS cost_llm_saved NUMERIC(10,4) NOT NULL DEFAULT 0;
+
+COMMENT ON TABLE public.vision_cache IS 'Cache criptografado de extrações por Vision, por hash da imagem e do prompt';
@@ -0,0 +1,84 @@
+-- ============================================
+-- Tempos por etapa dos pipelines de OCR/extração do WhatsApp
+--
+-- Cada execução grava uma linha por etapa (URL da mídia, download, upload,
+-- pré-processamento, Vision, criptografia, inserts, envio ao WhatsApp),
+-- correlacionadas pelo id da mensagem. Ver lib/pipeline-timings.ts e
+-- /admin/pipeline (p50/p95 por etapa).
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS public.pipeline_timings (
+  id BIGSERIAL PRIMARY KEY,
+  pipeline TEXT NOT NULL,                  -- 'whatsapp_ocr', 'whatsapp_extraction'
+  message_id TEXT NOT NULL,                -- id da mensagem (Meta ou whatsapp_messages)
+  stage TEXT NOT NULL,
+  duration_ms INTEGER NOT NULL CHECK (duration_ms >= 0),
+  ok BOOLEAN NOT NULL DEFAULT true,        -- false quando a etapa lançou erro
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_timings_created
+ON public.pipeline_timings(created_at);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_timings_message
+ON public.pipeline_timings(message_id);
+
+-- Sem políticas: acessível apenas pela service role
+ALTER TABLE public.pipeline_timings ENABLE ROW LEVEL SECURITY;
+
+-- ============================================
+-- FUNÇÃO: p50/p95 por pipeline e etapa desde p_since
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.pipeline_stage_percentiles(p_since TIMESTAMPTZ)
+RETURNS TABLE (
+  pipeline TEXT,
+  stage TEXT,
+  samples BIGINT,
+  failures BIGINT,
+  p50_ms NUMERIC,
+  p95_ms NUMERIC,
+  max_ms INTEGER
+)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  SELECT
+    t.pipeline,
+    t.stage,
+    count(*) AS samples,
+    count(*) FILTER (WHERE NOT t.ok) AS failures,
+    round(percentile_cont(0.5) WITHIN GROUP (ORDER BY t.duration_ms)::numeric) AS p50_ms,
+    round(percentile_cont(0.95) WITHIN GROUP (ORDER BY t.duration_ms)::numeric) AS p95_ms,
+    max(t.duration_ms) AS max_ms
+  FROM pipeline_timings t
+  WHERE t.created_at >= p_since
+  GROUP BY t.pipeline, t.stage
+  ORDER BY t.pipeline, p95_ms DESC;
+$$;
+
+-- ============================================
+-- FUNÇÃO: remove medições antigas (chamada pelo cron do worker do WhatsApp)
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.prune_pipeline_timings(p_keep_days INTEGER DEFAULT 30)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_removidas INTEGER;
+BEGIN
+  DELETE FROM pipeline_timings WHERE created_at < now() - make_interval(days => p_keep_days);
+  GET DIAGNOSTICS v_removidas = ROW_COUNT;
+  RETURN v_removidas;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION public.pipeline_stage_percentiles(TIMESTAMPTZ) FROM PUBLIC, anon, authenticated;
+REVOKE ALL ON FUNCTION public.prune_pipeline_timings(INTEGER) FROM PUBLIC, anon, authenticated;
+
+COMMENT ON TABLE public.pipeline_timings IS 'Duração de cada etapa dos pipelines de OCR/extração do WhatsApp';
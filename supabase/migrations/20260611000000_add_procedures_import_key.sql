@@ -0,0 +1,18 @@
+-- ============================================
+-- Chave de importação em lote de procedimentos
+--
+-- /api/procedures/import grava em import_key um hash (HMAC) de usuário,
+-- data, horário, paciente, procedimento e hospital normalizados. O índice
+-- único permite o upsert com ignoreDuplicates: reimportar a mesma planilha
+-- não duplica procedimentos. Procedimentos cadastrados manualmente ficam
+-- com import_key NULL (NULLs não conflitam no índice único).
+-- ============================================
+
+ALTER TABLE public.procedures
+ADD COLUMN IF NOT EXISTS import_key TEXT;
+
+-- Índice completo (não parcial) para servir de alvo do ON CONFLICT do PostgREST
+CREATE UNIQUE INDEX IF NOT EXISTS idx_procedures_user_import_key
+ON public.procedures(user_id, import_key);
+
+COMMENT ON COLUMN public.procedures.import_key IS 'Hash de deduplicação da importação em lote (NULL para cadastros manuais)';
@@ -0,0 +1,12 @@
+-- ============================================
+-- Bucket privado dos relatórios do contador (XLSX) já gerados
+--
+-- lib/relatorio-contador.ts grava <grupo>/<ano>-<versão>.xlsx quando todos os
+-- meses com movimento do ano estão fechados; a versão muda se um fechamento
+-- for reaberto ou a composição de cotas mudar. Sem políticas em
+-- storage.objects: leitura e escrita só pela service role.
+-- ============================================
+
+INSERT INTO storage.buckets (id, name, public)
+VALUES ('relatorios-contador', 'relatorios-contador', false)
+ON CONFLICT (id) DO NOTHING;
@@ -0,0 +1,35 @@
+-- ============================================
+-- Etapas concluídas dos jobs do WhatsApp
+--
+-- Um job reagendado (falha ou reserva vencida) roda o processador de novo
+-- desde o início. Cada efeito colateral (ocr_messages, whatsapp_extractions,
+-- envio do card ao médico) fica registrado em completed_steps assim que
+-- termina; na nova tentativa as etapas já registradas são puladas, sem
+-- duplicar linhas nem reenviar mensagens. Ver lib/queue/processor.ts.
+-- ============================================
+
+ALTER TABLE public.whatsapp_jobs
+ADD COLUMN IF NOT EXISTS completed_steps TEXT[] NOT NULL DEFAULT '{}';
+
+-- ============================================
+-- FUNÇÃO: registra uma etapa concluída (só para quem detém a reserva).
+-- Retorna false se a reserva foi perdida.
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.mark_whatsapp_job_step(p_id UUID, p_worker TEXT, p_step TEXT)
+RETURNS BOOLEAN
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  UPDATE whatsapp_jobs SET
+    completed_steps = CASE WHEN p_step = ANY(completed_steps) THEN completed_steps
+                           ELSE array_append(completed_steps, p_step) END,
+    updated_at = now()
+  WHERE id = p_id AND status = 'processing' AND locked_by = p_worker;
+  RETURN FOUND;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION public.mark_whatsapp_job_step(UUID, TEXT, TEXT) FROM PUBLIC, anon, authenticated;
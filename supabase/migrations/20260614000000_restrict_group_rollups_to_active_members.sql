@@ -0,0 +1,22 @@
+-- ============================================
+-- Consolidação mensal do financeiro de grupos: só membros ativos
+--
+-- As políticas de 20260604000000 aceitavam qualquer linha de group_members,
+-- inclusive convites pendentes. As consolidações expõem despesas_total e a
+-- receita por membro, e não podem ser mais permissivas que as tabelas de
+-- origem: a RLS de despesas já exige gm.status = 'active'.
+-- ============================================
+
+DROP POLICY IF EXISTS "Users can view financial rollups of their groups" ON public.group_financial_monthly;
+CREATE POLICY "Users can view financial rollups of their groups"
+ON public.group_financial_monthly FOR SELECT TO authenticated
+USING (
+  group_id IN (SELECT group_id FROM public.group_members WHERE user_id = auth.uid() AND status = 'active')
+);
+
+DROP POLICY IF EXISTS "Users can view member rollups of their groups" ON public.group_member_financial_monthly;
+CREATE POLICY "Users can view member rollups of their groups"
+ON public.group_member_financial_monthly FOR SELECT TO authenticated
+USING (
+  group_id IN (SELECT group_id FROM public.group_members WHERE user_id = auth.uid() AND status = 'active')
+);
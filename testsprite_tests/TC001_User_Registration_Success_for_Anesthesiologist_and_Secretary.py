@@ -1,204 +1,178 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from support.browser import StandaloneSession
+from support.waits import click, fill, goto
+
+async def run_test(context=None):
+    session = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Reuse the runner's browser context, or start a standalone session
+        if context is None:
+            session = await StandaloneSession.start()
+            context = session.context
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Navigate to the app and wait for it to settle
+        await goto(page, "http://localhost:3000")
         
         # Interact with the page elements to simulate user flow
         # -> Click on 'Começar Grátis' button to navigate to registration page
         frame = context.pages[-1]
         # Click on 'Começar Grátis' button to go to registration page
         elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Fill registration form with valid anesthesiologist details
         frame = context.pages[-1]
         # Fill full name
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Dr. João Silva')
+        await fill(elem, 'Dr. João Silva')
         
 
         frame = context.pages[-1]
         # Fill email
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('joao.silva@example.com')
+        await fill(elem, 'joao.silva@example.com')
         
 
         frame = context.pages[-1]
         # Fill CPF
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123.456.789-00')
+        await fill(elem, '123.456.789-00')
         
 
         frame = context.pages[-1]
         # Fill specialty
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[4]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Anestesiologia')
+        await fill(elem, 'Anestesiologia')
         
 
         frame = context.pages[-1]
         # Fill CRM
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[4]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Fill phone number
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[5]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('(11) 99999-9999')
+        await fill(elem, '(11) 99999-9999')
         
 
         frame = context.pages[-1]
         # Fill password
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[6]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('senha123')
+        await fill(elem, 'senha123')
         
 
         frame = context.pages[-1]
         # Fill confirm password
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[7]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('senha123')
+        await fill(elem, 'senha123')
         
 
         frame = context.pages[-1]
         # Check terms and conditions checkbox
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[8]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Submit the registration form for anesthesiologist
         frame = context.pages[-1]
         # Click on 'Criar conta de Anestesista' button to submit registration form
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Clear the CPF field and input a valid CPF number to retry registration
         frame = context.pages[-1]
         # Clear the invalid CPF field
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await fill(elem, '')
         
 
         frame = context.pages[-1]
         # Input a valid CPF number
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('111.444.777-35')
+        await fill(elem, '111.444.777-35')
         
 
         # -> Clear CPF field again and re-enter valid CPF, then submit the form
         frame = context.pages[-1]
         # Clear CPF field to retry
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await fill(elem, '')
         
 
         frame = context.pages[-1]
         # Re-enter valid CPF without formatting
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('11144477735')
+        await fill(elem, '11144477735')
         
 
         frame = context.pages[-1]
         # Click 'Criar conta de Anestesista' to submit form
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Change CRM to a unique value and resubmit the registration form for anesthesiologist
         frame = context.pages[-1]
         # Clear CRM field to input a unique CRM
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[5]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await fill(elem, '')
         
 
         frame = context.pages[-1]
         # Input a unique CRM number
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[5]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('654321')
+        await fill(elem, '654321')
         
 
         frame = context.pages[-1]
         # Click 'Criar conta de Anestesista' to submit form with unique CRM
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click 'Verificar Confirmação' button to check if email confirmation is complete
         frame = context.pages[-1]
         # Click 'Verificar Confirmação' button to check email confirmation status
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Wait for a short period then click 'Verificar Confirmação' button again to check if email confirmation is complete
         frame = context.pages[-1]
         # Click 'Verificar Confirmação' button again to check email confirmation status
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Since email confirmation is not yet detected, click 'Reenviar Email' to resend confirmation email
         frame = context.pages[-1]
         # Click 'Reenviar Email' button to resend confirmation email
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Wait for user to confirm email externally, then click 'Verificar Confirmação' to check confirmation status
         frame = context.pages[-1]
         # Click 'Verificar Confirmação' button to check if email is confirmed after waiting
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click 'Verificar Confirmação' button to check if email confirmation is complete
         frame = context.pages[-1]
         # Click 'Verificar Confirmação' button to check email confirmation status
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # --> Assertions to verify final state
@@ -207,15 +181,10 @@ async def run_test():
             await expect(frame.locator('text=Registration Successful! Welcome Anesthesiologist').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The registration process for new users as anesthesiologist or secretary did not complete successfully, confirmation email was not sent or confirmed, or profile setup prompt did not appear as expected.")
-        await asyncio.sleep(5)
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        if session:
+            await session.close()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
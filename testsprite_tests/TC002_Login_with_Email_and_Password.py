@@ -1,90 +1,64 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from support.browser import StandaloneSession
+from support.waits import click, fill, goto
+
+async def run_test(context=None):
+    session = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Reuse the runner's browser context, or start a standalone session
+        if context is None:
+            session = await StandaloneSession.start()
+            context = session.context
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Navigate to the app and wait for it to settle
+        await goto(page, "http://localhost:3000")
         
         # Interact with the page elements to simulate user flow
         # -> Navigate to login page by clicking the 'Entrar' button.
         frame = context.pages[-1]
         # Click the 'Entrar' button to navigate to login page
         elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Enter valid email and password into the login form.
         frame = context.pages[-1]
         # Enter valid email into email input field
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+        await fill(elem, 'felipemakermoney@gmail.com')
         
 
         frame = context.pages[-1]
         # Enter valid password into password input field
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await fill(elem, '123456')
         
 
         # -> Click the login button to attempt login with valid credentials.
         frame = context.pages[-1]
         # Click the 'Entrar' button to submit login form with valid credentials
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Navigate back to the login page to test invalid login credentials.
         frame = context.pages[-1]
         # Click 'AnestEasy' logo or home link to navigate back to the homepage or login page
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Find and click a logout button or link to return to the login page for invalid login testing.
         frame = context.pages[-1]
         # Click logout button to return to login page
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # --> Assertions to verify final state
@@ -93,15 +67,10 @@ async def run_test():
             await expect(frame.locator('text=Login Successful! Welcome to your dashboard').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError("Test plan execution failed: Login functionality did not work correctly with valid and invalid credentials as expected. User was not redirected to the appropriate dashboard or error message was not shown indicating login failure.")
-        await asyncio.sleep(5)
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        if session:
+            await session.close()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
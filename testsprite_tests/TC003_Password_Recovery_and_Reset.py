@@ -1,163 +1,134 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from support.browser import StandaloneSession
+from support.waits import click, fill, goto
+
+async def run_test(context=None):
+    session = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Reuse the runner's browser context, or start a standalone session
+        if context is None:
+            session = await StandaloneSession.start()
+            context = session.context
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Navigate to the app and wait for it to settle
+        await goto(page, "http://localhost:3000")
         
         # Interact with the page elements to simulate user flow
         # -> Click on the 'Entrar Login' button to go to the login page.
         frame = context.pages[-1]
         # Click on the 'Entrar Login' button to navigate to the login page.
         elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click on the 'Esqueceu a senha?' link to navigate to the forgot password page.
         frame = context.pages[-1]
         # Click on the 'Esqueceu a senha?' link to navigate to the forgot password page.
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Input the registered email 'felipemakermoney@gmail.com' and submit the recovery link request.
         frame = context.pages[-1]
         # Input the registered email for password recovery.
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+        await fill(elem, 'felipemakermoney@gmail.com')
         
 
         frame = context.pages[-1]
         # Click the 'Enviar link de recuperação' button to submit the recovery request.
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Simulate or navigate to the reset password page using the reset link from the email.
-        await page.goto('http://localhost:3000/reset-password?token=valid-reset-token', timeout=10000)
-        await asyncio.sleep(3)
+        await goto(page, 'http://localhost:3000/reset-password?token=valid-reset-token')
         
 
         # -> Test invalid or expired reset token by navigating to reset password page with an invalid token.
-        await page.goto('http://localhost:3000/reset-password?token=invalid-or-expired-token', timeout=10000)
-        await asyncio.sleep(3)
+        await goto(page, 'http://localhost:3000/reset-password?token=invalid-or-expired-token')
         
 
         # -> Navigate back to the forgot password page to retry the password reset with a valid token.
         frame = context.pages[-1]
         # Click on 'Voltar ao login' link to navigate back to the login page.
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Navigate to the reset password page with a valid token to submit a new password.
-        await page.goto('http://localhost:3000/reset-password?token=valid-reset-token', timeout=10000)
-        await asyncio.sleep(3)
+        await goto(page, 'http://localhost:3000/reset-password?token=valid-reset-token')
         
 
         # -> Input new password and confirm it, then submit the form to update the password.
         frame = context.pages[-1]
         # Input new password in the 'Nova Senha' field.
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('newStrongPassword123!')
+        await fill(elem, 'newStrongPassword123!')
         
 
         frame = context.pages[-1]
         # Confirm new password in the 'Confirmar Nova Senha' field.
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('newStrongPassword123!')
+        await fill(elem, 'newStrongPassword123!')
         
 
         frame = context.pages[-1]
         # Click the 'Alterar senha' button to submit the new password.
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Navigate back to the login page and request a new password recovery link to restart the reset process.
         frame = context.pages[-1]
         # Click on 'Voltar ao login' link to return to the login page.
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Input the registered email and the new password, then click the 'Entrar' button to attempt login.
         frame = context.pages[-1]
         # Input registered email for login.
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+        await fill(elem, 'felipemakermoney@gmail.com')
         
 
         frame = context.pages[-1]
         # Input new password for login.
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('newStrongPassword123!')
+        await fill(elem, 'newStrongPassword123!')
         
 
         frame = context.pages[-1]
         # Click the 'Entrar' button to submit login form.
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Request a new password recovery link again to retry the password reset process and verify password update.
         frame = context.pages[-1]
         # Click on 'Esqueceu a senha?' link to start the password recovery process again.
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[4]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Input the registered email 'felipemakermoney@gmail.com' and submit the recovery link request.
         frame = context.pages[-1]
         # Input the registered email for password recovery.
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+        await fill(elem, 'felipemakermoney@gmail.com')
         
 
         frame = context.pages[-1]
         # Click the 'Enviar link de recuperação' button to submit the recovery request.
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # --> Assertions to verify final state
@@ -167,15 +138,10 @@ async def run_test():
         await expect(frame.locator('text=Verifique sua caixa de entrada e siga as instruções para redefinir sua senha.').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Voltar ao Login').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Tentar outro email').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        if session:
+            await session.close()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
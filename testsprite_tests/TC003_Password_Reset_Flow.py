@@ -1,103 +1,77 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from support.browser import StandaloneSession
+from support.waits import click, fill, goto
+
+async def run_test(context=None):
+    session = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Reuse the runner's browser context, or start a standalone session
+        if context is None:
+            session = await StandaloneSession.start()
+            context = session.context
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Navigate to the app and wait for it to settle
+        await goto(page, "http://localhost:3000")
         
         # Interact with the page elements to simulate user flow
         # -> Click on 'Entrar' button to go to login page where forgot password option is likely available.
         frame = context.pages[-1]
         # Click on 'Entrar' button to navigate to login page
         elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click on 'Esqueceu a senha?' link to go to forgot password page.
         frame = context.pages[-1]
         # Click on 'Esqueceu a senha?' link to navigate to forgot password page
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Input registered email and submit to request password reset link.
         frame = context.pages[-1]
         # Input registered email address for password reset
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+        await fill(elem, 'felipemakermoney@gmail.com')
         
 
         frame = context.pages[-1]
         # Click 'Enviar link de recuperação' button to submit password reset request
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Simulate or access the password reset email to click the reset link and proceed to reset password page.
         frame = context.pages[-1]
         # Click 'Voltar ao Login' button to return to login page and prepare for next steps
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/div[2]/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Test reset password flow with unregistered email to verify error message.
         frame = context.pages[-1]
         # Click 'Esqueceu a senha?' link to go to forgot password page again
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Input unregistered email and submit to verify error message.
         frame = context.pages[-1]
         # Input unregistered email address for password reset
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('unregistered@example.com')
+        await fill(elem, 'unregistered@example.com')
         
 
         frame = context.pages[-1]
         # Click 'Enviar link de recuperação' button to submit unregistered email for password reset
         elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # --> Assertions to verify final state
@@ -106,15 +80,10 @@ async def run_test():
             await expect(frame.locator('text=Password Reset Successful! Your password has been updated.')).to_be_visible(timeout=30000)
         except AssertionError:
             raise AssertionError("Test case failed: Password reset functionality did not complete successfully as expected. The password reset email might not have been sent or the password update verification failed.")
-        await asyncio.sleep(5)
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        if session:
+            await session.close()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
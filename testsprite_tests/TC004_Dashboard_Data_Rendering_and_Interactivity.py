@@ -1,96 +1,74 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from support.browser import StandaloneSession, resume_session
+from support.waits import click, fill, goto
+
+REUSE_SESSION = True
+
+async def run_test(context=None):
+    session = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Reuse the runner's browser context, or start a standalone session
+        if context is None:
+            session = await StandaloneSession.start()
+            context = session.context
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Navigate to the app and wait for it to settle
+        await goto(page, "http://localhost:3000")
         
         # Interact with the page elements to simulate user flow
-        # -> Click on 'Entrar' button to go to login page.
-        frame = context.pages[-1]
-        # Click on 'Entrar' button to navigate to login page
-        elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Reuse the runner's signed-in session; otherwise log in through the UI
+        if not await resume_session(page):
+            # -> Click on 'Entrar' button to go to login page.
+            frame = context.pages[-1]
+            # Click on 'Entrar' button to navigate to login page
+            elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a/button').nth(0)
+            await click(elem)
         
 
-        # -> Input email and password, then click 'Entrar' to login.
-        frame = context.pages[-1]
-        # Input anesthesiologist email
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+            # -> Input email and password, then click 'Entrar' to login.
+            frame = context.pages[-1]
+            # Input anesthesiologist email
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
+            await fill(elem, 'felipemakermoney@gmail.com')
         
 
-        frame = context.pages[-1]
-        # Input anesthesiologist password
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+            frame = context.pages[-1]
+            # Input anesthesiologist password
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/input').nth(0)
+            await fill(elem, '123456')
         
 
-        frame = context.pages[-1]
-        # Click 'Entrar' button to submit login form
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+            frame = context.pages[-1]
+            # Click 'Entrar' button to submit login form
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
+            await click(elem)
         
 
         # -> Click on the 'Novo Procedimento' button to test action button functionality and navigation.
         frame = context.pages[-1]
         # Click on 'Novo Procedimento' button to test action button functionality and navigation
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/div[2]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click the 'Voltar' button to test navigation back to the dashboard or previous page.
         frame = context.pages[-1]
         # Click 'Voltar' button to navigate back from new procedure form
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Test dashboard responsiveness on mobile and desktop screen sizes by resizing or switching views and verify UI adapts correctly with no loss of functionality.
         frame = context.pages[-1]
         # Click on 'Dashboard' link to navigate back to main dashboard for responsiveness testing
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Test dashboard responsiveness on mobile and desktop screen sizes by resizing the window or switching to mobile view and verify UI adapts correctly with no loss of functionality.
@@ -124,15 +102,10 @@ async def run_test():
         await expect(frame.locator('text=Pendente').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Novo Procedimento').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Relatórios').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        if session:
+            await session.close()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,89 +1,63 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from support.browser import StandaloneSession
+from support.waits import click, fill, goto
+
+async def run_test(context=None):
+    session = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Reuse the runner's browser context, or start a standalone session
+        if context is None:
+            session = await StandaloneSession.start()
+            context = session.context
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Navigate to the app and wait for it to settle
+        await goto(page, "http://localhost:3000")
         
         # Interact with the page elements to simulate user flow
         # -> Attempt to access anesthesiologist dashboard as unauthenticated user by clicking login or navigating to dashboard.
         frame = context.pages[-1]
         # Click on 'Entrar Login' button to go to login page or attempt access.
         elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Attempt to login as secretary using provided credentials and test access to anesthesiologist-only pages.
         frame = context.pages[-1]
         # Input email for login
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+        await fill(elem, 'felipemakermoney@gmail.com')
         
 
         frame = context.pages[-1]
         # Input password for login
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click on 'Entrar' button to submit login form
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click on 'Procedimentos' link to try accessing anesthesiologist-only page as secretary.
         frame = context.pages[-1]
         # Click on 'Procedimentos' link to access procedure management page
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[2]/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Log out from current session to prepare for anesthesiologist login.
         frame = context.pages[-1]
         # Click on 'Configurações' to find logout option
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[2]/a[7]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # --> Assertions to verify final state
@@ -92,15 +66,10 @@ async def run_test():
             await expect(frame.locator('text=Access Granted to Anesthesiologist Dashboard').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError('Test failed: The test plan execution failed because routes are not properly protected. Access to anesthesiologist dashboard or secretary-only pages was not correctly restricted for unauthorized users.')
-        await asyncio.sleep(5)
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        if session:
+            await session.close()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,89 +1,67 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from support.browser import StandaloneSession, resume_session
+from support.waits import click, fill, goto
+
+REUSE_SESSION = True
+
+async def run_test(context=None):
+    session = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Reuse the runner's browser context, or start a standalone session
+        if context is None:
+            session = await StandaloneSession.start()
+            context = session.context
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Navigate to the app and wait for it to settle
+        await goto(page, "http://localhost:3000")
         
         # Interact with the page elements to simulate user flow
-        # -> Click on the 'Entrar Login' button to go to the login page.
-        frame = context.pages[-1]
-        # Click on the 'Entrar Login' button to go to the login page.
-        elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Reuse the runner's signed-in session; otherwise log in through the UI
+        if not await resume_session(page):
+            # -> Click on the 'Entrar Login' button to go to the login page.
+            frame = context.pages[-1]
+            # Click on the 'Entrar Login' button to go to the login page.
+            elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a[2]/button').nth(0)
+            await click(elem)
         
 
-        # -> Input email and password, then click 'Entrar' to log in.
-        frame = context.pages[-1]
-        # Input email for anesthesiologist login
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+            # -> Input email and password, then click 'Entrar' to log in.
+            frame = context.pages[-1]
+            # Input email for anesthesiologist login
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
+            await fill(elem, 'felipemakermoney@gmail.com')
         
 
-        frame = context.pages[-1]
-        # Input password for anesthesiologist login
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+            frame = context.pages[-1]
+            # Input password for anesthesiologist login
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/div/input').nth(0)
+            await fill(elem, '123456')
         
 
-        frame = context.pages[-1]
-        # Click 'Entrar' button to submit login form
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+            frame = context.pages[-1]
+            # Click 'Entrar' button to submit login form
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
+            await click(elem)
         
 
         # -> Trigger a notification event such as a payment status update to verify real-time notification reception.
         frame = context.pages[-1]
         # Click 'Novo Procedimento' button to simulate or trigger a new procedure or payment event for notification testing.
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/div[2]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Scroll down or interact with the date of birth field to reveal the date picker calendar UI, then select a valid date. After that, continue filling other required fields and submit to trigger notification event.
         frame = context.pages[-1]
         # Click on the date of birth input field to open date picker
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         await page.mouse.wheel(0, 200)
@@ -92,96 +70,96 @@ async def run_test():
         frame = context.pages[-1]
         # Click again on date of birth input field to ensure date picker is open
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Click 'Próximo' button to proceed if date picker cannot be interacted with
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Fill in procedure data fields (select radio buttons and add observations), then submit the procedure form to trigger notification event.
         frame = context.pages[-1]
         # Select 'Sim' for Sangramento?
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div/div/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Select 'Não' for Náuseas e Vômitos?
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[2]/div/label[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Select 'Sim' for Dor?
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[3]/div/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Input observations about the procedure
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[4]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Procedimento realizado sem intercorrências.')
+        await fill(elem, 'Procedimento realizado sem intercorrências.')
         
 
         frame = context.pages[-1]
         # Select 'Não' for Enviar relatório para Cirurgião?
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[5]/div/div/label[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Click 'Próximo' button to proceed and submit procedure to trigger notification event
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Input payment amount, select payment method, add financial observations, and click 'Próximo' to submit the procedure and trigger notification event.
         frame = context.pages[-1]
         # Input '3500,00' as Valor do Procedimento Anestésico
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[3]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('3500,00')
+        await fill(elem, '3500,00')
         
 
         frame = context.pages[-1]
         # Click Forma de Pagamento dropdown to select payment method
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[3]/div[2]/div/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Input financial observations
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[4]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Pagamento realizado conforme esperado.')
+        await fill(elem, 'Pagamento realizado conforme esperado.')
         
 
         frame = context.pages[-1]
         # Click 'Próximo' button to submit the procedure and trigger notification event
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click the 'Finalizar e Salvar' button to submit the procedure and trigger the real-time notification event.
         frame = context.pages[-1]
         # Click 'Finalizar e Salvar' button to submit the new procedure and trigger notification event
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Navigate back to the first step of the procedure form to fill in the missing required fields: Date of Birth, Procedure Type, and Anesthetic Technique, then proceed to submit the form again.
         frame = context.pages[-1]
         # Click 'Anterior' button to go back to previous step to fill missing required fields
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[3]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click 'Voltar' button to navigate back to the first step of the procedure form to fill missing required fields: Date of Birth, Procedure Type, and Anesthetic Technique.
         frame = context.pages[-1]
         # Click 'Voltar' button to go back to first step of procedure form
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/div/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # --> Assertions to verify final state
@@ -190,15 +168,10 @@ async def run_test():
             await expect(frame.locator('text=Dashboard Metrics Updated Successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The anesthesiologist dashboard did not display the correct and updated metrics, graphs, or real-time notifications as required by the test plan.")
-        await asyncio.sleep(5)
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        if session:
+            await session.close()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,194 +1,172 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from support.browser import StandaloneSession, resume_session
+from support.waits import click, fill, goto
+
+REUSE_SESSION = True
+
+async def run_test(context=None):
+    session = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Reuse the runner's browser context, or start a standalone session
+        if context is None:
+            session = await StandaloneSession.start()
+            context = session.context
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Navigate to the app and wait for it to settle
+        await goto(page, "http://localhost:3000")
         
         # Interact with the page elements to simulate user flow
-        # -> Click on the 'Entrar Login' button to proceed to login.
-        frame = context.pages[-1]
-        # Click on the 'Entrar Login' button to go to login page
-        elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Reuse the runner's signed-in session; otherwise log in through the UI
+        if not await resume_session(page):
+            # -> Click on the 'Entrar Login' button to proceed to login.
+            frame = context.pages[-1]
+            # Click on the 'Entrar Login' button to go to login page
+            elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a[2]/button').nth(0)
+            await click(elem)
         
 
-        # -> Input email and password, then click 'Entrar' to login.
-        frame = context.pages[-1]
-        # Input email address
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+            # -> Input email and password, then click 'Entrar' to login.
+            frame = context.pages[-1]
+            # Input email address
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
+            await fill(elem, 'felipemakermoney@gmail.com')
         
 
-        frame = context.pages[-1]
-        # Input password
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+            frame = context.pages[-1]
+            # Input password
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/div/input').nth(0)
+            await fill(elem, '123456')
         
 
-        frame = context.pages[-1]
-        # Click 'Entrar' button to login
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+            frame = context.pages[-1]
+            # Click 'Entrar' button to login
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
+            await click(elem)
         
 
         # -> Click on 'Procedimentos' menu to view procedure list.
         frame = context.pages[-1]
         # Click on 'Procedimentos' menu to view procedure list
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[2]/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click on the first procedure entry (index 16) to open it for editing.
         frame = context.pages[-1]
         # Click on the first procedure entry 'Maria da Silva Teste' to open it for editing
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[6]/div/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click the 'Editar Procedimento' button to enable editing of the procedure fields.
         frame = context.pages[-1]
         # Click 'Editar Procedimento' button to enable editing
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Modify the 'Data do Procedimento' field to a new date and change the 'Técnica Anestésica' field, then save changes.
         frame = context.pages[-1]
         # Change 'Data do Procedimento' to 2025-11-17
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[2]/div[2]/div/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2025-11-17')
+        await fill(elem, '2025-11-17')
         
 
         frame = context.pages[-1]
         # Change 'Técnica Anestésica' to 'Anestesia Geral'
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[2]/div[2]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Anestesia Geral')
+        await fill(elem, 'Anestesia Geral')
         
 
         frame = context.pages[-1]
         # Click 'Salvar' button to save changes
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Close the procedure details modal and perform a search on procedure history using filters like date range and procedure type to verify search functionality.
         frame = context.pages[-1]
         # Click 'Fechar' button to close the procedure details modal
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Set date range filter from 2025-11-01 to 2025-11-30 and select procedure type 'Cesariana', then perform search.
         frame = context.pages[-1]
         # Click 'Filtros' button to open filters panel
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[5]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Set date range filter from 2025-11-01 to 2025-11-30, apply filters, select procedure type 'Cesariana', and perform search.
         frame = context.pages[-1]
         # Click on date input to set start date
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[3]/div/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Set start date filter to 2025-11-01
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[3]/div/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2025-11-01')
+        await fill(elem, '2025-11-01')
         
 
         frame = context.pages[-1]
         # Click on date input to set end date
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[3]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Input '2025-11-01' into 'Data Inicial' and '2025-11-30' into 'Data Final', then apply the filter.
         frame = context.pages[-1]
         # Input start date '2025-11-01' into 'Data Inicial'
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2025-11-01')
+        await fill(elem, '2025-11-01')
         
 
         frame = context.pages[-1]
         # Input end date '2025-11-30' into 'Data Final'
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[2]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2025-11-30')
+        await fill(elem, '2025-11-30')
         
 
         frame = context.pages[-1]
         # Click 'Aplicar Filtro' button to apply date range filter
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[3]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Clear filters and perform a search with a broader or different filter to verify search functionality returns accurate results.
         frame = context.pages[-1]
         # Click 'Limpar Filtros' button to clear all filters
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[5]/div/div[2]/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Use the search input to search for 'Maria da Silva' and verify the search results.
         frame = context.pages[-1]
         # Input 'Maria da Silva' in the search box to filter procedures by name
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[3]/div/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Maria da Silva')
+        await fill(elem, 'Maria da Silva')
         
 
         frame = context.pages[-1]
         # Click 'Aplicar' button to perform search
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[5]/div/div[2]/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Open the updated procedure from the list to verify if the changes were saved correctly in detail view.
         frame = context.pages[-1]
         # Click on the first procedure entry 'Maria da Silva Teste' dated 17/11/2025 to open details and verify updated fields
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[6]/div/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # --> Assertions to verify final state
@@ -200,15 +178,10 @@ async def run_test():
         await expect(frame.locator('text=Pago').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=R$ 3.500,00').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=17/11/2025').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        if session:
+            await session.close()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,106 +1,83 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from support.browser import StandaloneSession, resume_session
+from support.waits import click, fill, goto
+
+REUSE_SESSION = True
+
+async def run_test(context=None):
+    session = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Reuse the runner's browser context, or start a standalone session
+        if context is None:
+            session = await StandaloneSession.start()
+            context = session.context
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Navigate to the app and wait for it to settle
+        await goto(page, "http://localhost:3000")
         
         # Interact with the page elements to simulate user flow
-        # -> Click on the 'Entrar' button to go to the login page
-        frame = context.pages[-1]
-        # Click on the 'Entrar' button to navigate to login page
-        elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Reuse the runner's signed-in session; otherwise log in through the UI
+        if not await resume_session(page):
+            # -> Click on the 'Entrar' button to go to the login page
+            frame = context.pages[-1]
+            # Click on the 'Entrar' button to navigate to login page
+            elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a/button').nth(0)
+            await click(elem)
         
 
-        # -> Input email and password, then click 'Entrar' to login
-        frame = context.pages[-1]
-        # Input email address
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+            # -> Input email and password, then click 'Entrar' to login
+            frame = context.pages[-1]
+            # Input email address
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
+            await fill(elem, 'felipemakermoney@gmail.com')
         
 
-        frame = context.pages[-1]
-        # Input password
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+            frame = context.pages[-1]
+            # Input password
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/input').nth(0)
+            await fill(elem, '123456')
         
 
-        frame = context.pages[-1]
-        # Click 'Entrar' button to login
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+            frame = context.pages[-1]
+            # Click 'Entrar' button to login
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
+            await click(elem)
         
 
         # -> Click on 'Relatórios' menu item to navigate to reports page
         frame = context.pages[-1]
         # Click on 'Relatórios' menu item to navigate to reports page
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[2]/a[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Try to navigate to the reports page by directly entering the URL or report the issue if no direct navigation is possible.
-        await page.goto('http://localhost:3000/relatorios', timeout=10000)
-        await asyncio.sleep(3)
+        await goto(page, 'http://localhost:3000/relatorios')
         
 
         # -> Apply filters for date range and generate the 'Relatório de Procedimentos' report
         frame = context.pages[-1]
         # Set start date filter to 2025-11-01
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[2]/div[2]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2025-11-01')
+        await fill(elem, '2025-11-01')
         
 
         frame = context.pages[-1]
         # Set end date filter to 2025-11-13
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[2]/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2025-11-13')
+        await fill(elem, '2025-11-13')
         
 
         frame = context.pages[-1]
         # Click 'Gerar' button for 'Relatório de Procedimentos' to generate filtered report
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[4]/div[2]/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Check for alternative export options or buttons for PDF and CSV export on the reports page
@@ -108,20 +85,18 @@ async def run_test():
         
 
         # -> Return to the main reports page tab to continue testing export functionality for CSV and empty filter export.
-        await page.goto('http://localhost:3000/relatorios', timeout=10000)
-        await asyncio.sleep(3)
+        await goto(page, 'http://localhost:3000/relatorios')
         
 
         # -> Click the 'Exportar PDF' button to export the filtered report as PDF
         frame = context.pages[-1]
         # Click 'Exportar PDF' button to export the filtered report as PDF
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Navigate back to the reports page and test export as CSV with empty filter criteria to get full report data.
-        await page.goto('http://localhost:3000/relatorios', timeout=10000)
-        await asyncio.sleep(3)
+        await goto(page, 'http://localhost:3000/relatorios')
         
 
         # --> Assertions to verify final state
@@ -130,15 +105,10 @@ async def run_test():
             await expect(frame.locator('text=Relatório de Procedimentos Completo').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test plan execution failed: Validation of customizable filters, report generation, and export functionality (PDF and CSV) did not pass as expected.")
-        await asyncio.sleep(5)
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        if session:
+            await session.close()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
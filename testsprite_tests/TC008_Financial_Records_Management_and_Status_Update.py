@@ -1,217 +1,195 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from support.browser import StandaloneSession, resume_session
+from support.waits import click, fill, goto
+
+REUSE_SESSION = True
+
+async def run_test(context=None):
+    session = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Reuse the runner's browser context, or start a standalone session
+        if context is None:
+            session = await StandaloneSession.start()
+            context = session.context
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Navigate to the app and wait for it to settle
+        await goto(page, "http://localhost:3000")
         
         # Interact with the page elements to simulate user flow
-        # -> Click on 'Entrar Login' button to proceed to login page.
-        frame = context.pages[-1]
-        # Click on 'Entrar Login' button to go to login page
-        elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Reuse the runner's signed-in session; otherwise log in through the UI
+        if not await resume_session(page):
+            # -> Click on 'Entrar Login' button to proceed to login page.
+            frame = context.pages[-1]
+            # Click on 'Entrar Login' button to go to login page
+            elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a[2]/button').nth(0)
+            await click(elem)
         
 
-        # -> Input email and password, then click 'Entrar' button to login.
-        frame = context.pages[-1]
-        # Input email address
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+            # -> Input email and password, then click 'Entrar' button to login.
+            frame = context.pages[-1]
+            # Input email address
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
+            await fill(elem, 'felipemakermoney@gmail.com')
         
 
-        frame = context.pages[-1]
-        # Input password
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+            frame = context.pages[-1]
+            # Input password
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/div/input').nth(0)
+            await fill(elem, '123456')
         
 
-        frame = context.pages[-1]
-        # Click 'Entrar' button to login
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+            frame = context.pages[-1]
+            # Click 'Entrar' button to login
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
+            await click(elem)
         
 
         # -> Click on 'Financeiro' menu item to navigate to financial module.
         frame = context.pages[-1]
         # Click on 'Financeiro' menu item to navigate to financial module
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[2]/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click on 'Registrar Pagamento' button to add a new revenue record with amount, date, and client details.
         frame = context.pages[-1]
         # Click on 'Registrar Pagamento' button to add new revenue record
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click on 'Novo Procedimento' button to start adding a new revenue record with amount, date, and client details.
         frame = context.pages[-1]
         # Click on 'Novo Procedimento' button to add new revenue record
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/div[2]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Fill in mandatory fields: patient name, birth date, procedure type, anesthetic technique, and then click 'Próximo' to proceed.
         frame = context.pages[-1]
         # Input patient full name
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Maria Silva')
+        await fill(elem, 'Maria Silva')
         
 
         frame = context.pages[-1]
         # Input patient birth date
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1985-06-15')
+        await fill(elem, '1985-06-15')
         
 
         frame = context.pages[-1]
         # Input procedure type
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Cirurgia de Apêndice')
+        await fill(elem, 'Cirurgia de Apêndice')
         
 
         frame = context.pages[-1]
         # Input anesthetic technique
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[2]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Anestesia Geral')
+        await fill(elem, 'Anestesia Geral')
         
 
         # -> Click 'Próximo' button at index 33 to proceed to the next step of the form.
         frame = context.pages[-1]
         # Click 'Próximo' button to proceed to next step
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Fill in procedure details: select 'Sim' for bleeding, 'Não' for nausea, 'Sim' for pain, add observations, select 'Não' for sending report, then click 'Próximo' to proceed.
         frame = context.pages[-1]
         # Select 'Sim' for Sangramento (bleeding)
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div/div/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Select 'Não' for Náuseas e Vômitos (nausea and vomiting)
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[2]/div/label[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Select 'Sim' for Dor (pain)
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[3]/div/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Add observations about procedure
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[4]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Paciente apresentou sangramento moderado e dor intensa.')
+        await fill(elem, 'Paciente apresentou sangramento moderado e dor intensa.')
         
 
         frame = context.pages[-1]
         # Select 'Não' for Enviar relatório para Cirurgião (send report)
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[5]/div/div/label[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Click 'Próximo' button to proceed to next step
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Select secretary, update payment status, enter procedure value, select payment method, add financial observations, then click 'Próximo' to proceed.
         frame = context.pages[-1]
         # Open dropdown to select secretary
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Open dropdown to update payment status
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[2]/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Input procedure value, select payment method, add financial observations, then click 'Próximo' to proceed.
         frame = context.pages[-1]
         # Input value for procedure anestésico
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[3]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1500,00')
+        await fill(elem, '1500,00')
         
 
         frame = context.pages[-1]
         # Open dropdown to select payment method
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[3]/div[2]/div/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Add financial observations
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[4]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Pagamento realizado com sucesso.')
+        await fill(elem, 'Pagamento realizado com sucesso.')
         
 
         frame = context.pages[-1]
         # Click 'Próximo' button to proceed to next step
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click 'Finalizar e Salvar' button to save the new procedure and revenue record.
         frame = context.pages[-1]
         # Click 'Finalizar e Salvar' button to save new procedure and revenue record
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Locate and interact with the payment date field using an alternative method, such as clicking to open a date picker and selecting the current date, then retry saving the procedure.
         frame = context.pages[-1]
         # Click on payment date field to open date picker
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[2]/div[2]/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # --> Assertions to verify final state
@@ -220,15 +198,10 @@ async def run_test():
             await expect(frame.locator('text=Revenue and Expense Record Successfully Created').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The test plan execution for creating, editing, and deleting revenue and expense records, including status of payments and goals tracking, did not complete successfully.")
-        await asyncio.sleep(5)
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        if session:
+            await session.close()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,230 +1,208 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from support.browser import StandaloneSession, resume_session
+from support.waits import click, fill, goto
+
+REUSE_SESSION = True
+
+async def run_test(context=None):
+    session = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Reuse the runner's browser context, or start a standalone session
+        if context is None:
+            session = await StandaloneSession.start()
+            context = session.context
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Navigate to the app and wait for it to settle
+        await goto(page, "http://localhost:3000")
         
         # Interact with the page elements to simulate user flow
-        # -> Click on 'Entrar' button to go to login page
-        frame = context.pages[-1]
-        # Click on 'Entrar' button to open login form
-        elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Reuse the runner's signed-in session; otherwise log in through the UI
+        if not await resume_session(page):
+            # -> Click on 'Entrar' button to go to login page
+            frame = context.pages[-1]
+            # Click on 'Entrar' button to open login form
+            elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a/button').nth(0)
+            await click(elem)
         
 
-        # -> Input email and password, then click 'Entrar' to login
-        frame = context.pages[-1]
-        # Input email for login
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+            # -> Input email and password, then click 'Entrar' to login
+            frame = context.pages[-1]
+            # Input email for login
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
+            await fill(elem, 'felipemakermoney@gmail.com')
         
 
-        frame = context.pages[-1]
-        # Input password for login
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+            frame = context.pages[-1]
+            # Input password for login
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/input').nth(0)
+            await fill(elem, '123456')
         
 
-        frame = context.pages[-1]
-        # Click 'Entrar' button to submit login form
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+            frame = context.pages[-1]
+            # Click 'Entrar' button to submit login form
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
+            await click(elem)
         
 
         # -> Click on the notification bell icon to open the notifications panel
         frame = context.pages[-1]
         # Click on the notification bell icon to open notifications panel
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Trigger a system notification such as adding a new procedure or updating a payment to test real-time notification reception
         frame = context.pages[-1]
         # Click 'Novo Procedimento' button to trigger a new procedure notification
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Re-login with provided credentials to restore session and continue testing notifications
         frame = context.pages[-1]
         # Input email for login
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+        await fill(elem, 'felipemakermoney@gmail.com')
         
 
         frame = context.pages[-1]
         # Input password for login
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click 'Entrar' button to login again
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click on the notification bell icon to open the notifications panel
         frame = context.pages[-1]
         # Click on the notification bell icon to open notifications panel
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Mark notifications as read and verify count updates
         frame = context.pages[-1]
         # Click on the first notification to mark it as read and verify count update
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[3]/div/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click on 'Novo Procedimento' button to trigger a new procedure notification and test real-time notification reception
         frame = context.pages[-1]
         # Click 'Novo Procedimento' button to trigger a new procedure notification
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/div[2]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Fill required fields in the new procedure form and submit to trigger a new procedure notification
         frame = context.pages[-1]
         # Input patient name
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Maria Silva')
+        await fill(elem, 'Maria Silva')
         
 
         frame = context.pages[-1]
         # Input patient birth date
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1990-01-01')
+        await fill(elem, '1990-01-01')
         
 
         frame = context.pages[-1]
         # Input type of procedure
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Cirurgia de Apêndice')
+        await fill(elem, 'Cirurgia de Apêndice')
         
 
         frame = context.pages[-1]
         # Input anesthetic technique
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[2]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Anestesia Geral')
+        await fill(elem, 'Anestesia Geral')
         
 
         # -> Click 'Próximo' button to submit the new procedure form and trigger notification
         frame = context.pages[-1]
         # Click 'Próximo' button to submit the new procedure form and trigger notification
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Fill required fields in 'Dados do Procedimento' form and submit to trigger notification
         frame = context.pages[-1]
         # Select 'Não' for Sangramento
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div/div/label[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Select 'Não' for Náuseas e Vômitos
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[2]/div/label[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Select 'Não' for Dor
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[3]/div/label[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Input observations
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[4]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Nenhuma observação adicional.')
+        await fill(elem, 'Nenhuma observação adicional.')
         
 
         frame = context.pages[-1]
         # Select 'Não' for Enviar relatório para Cirurgião
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[5]/div/div/label[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Click 'Próximo' button to submit 'Dados do Procedimento' form and complete procedure creation
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Fill remaining required fields: procedure value, payment date, payment method, financial observations, then submit the form
         frame = context.pages[-1]
         # Input procedure value
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[3]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1500,00')
+        await fill(elem, '1500,00')
         
 
         frame = context.pages[-1]
         # Input payment date
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[3]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2025-11-13')
+        await fill(elem, '2025-11-13')
         
 
         frame = context.pages[-1]
         # Input financial observations
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[4]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Pagamento realizado com sucesso.')
+        await fill(elem, 'Pagamento realizado com sucesso.')
         
 
         frame = context.pages[-1]
         # Click 'Próximo' button to submit 'Dados Administrativos' form and complete procedure creation
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click 'Finalizar e Salvar' button to complete procedure creation and trigger notification
         frame = context.pages[-1]
         # Click 'Finalizar e Salvar' button to complete procedure creation and trigger notification
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # --> Assertions to verify final state
@@ -233,15 +211,10 @@ async def run_test():
             await expect(frame.locator('text=Real-time notification received successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test plan failed: Real-time notifications and alerts for anesthesiologists and secretaries did not function as expected. Notification bell count did not update, or notification list did not display latest messages correctly.")
-        await asyncio.sleep(5)
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        if session:
+            await session.close()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,122 +1,100 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from support.browser import StandaloneSession, resume_session
+from support.waits import click, fill, goto
+
+REUSE_SESSION = True
+
+async def run_test(context=None):
+    session = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Reuse the runner's browser context, or start a standalone session
+        if context is None:
+            session = await StandaloneSession.start()
+            context = session.context
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Navigate to the app and wait for it to settle
+        await goto(page, "http://localhost:3000")
         
         # Interact with the page elements to simulate user flow
-        # -> Click on 'Entrar Login' button to proceed to login page.
-        frame = context.pages[-1]
-        # Click on 'Entrar Login' button to go to login page.
-        elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Reuse the runner's signed-in session; otherwise log in through the UI
+        if not await resume_session(page):
+            # -> Click on 'Entrar Login' button to proceed to login page.
+            frame = context.pages[-1]
+            # Click on 'Entrar Login' button to go to login page.
+            elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a[2]/button').nth(0)
+            await click(elem)
         
 
-        # -> Input anesthesiologist email and password, then click 'Entrar' to log in.
-        frame = context.pages[-1]
-        # Input anesthesiologist email
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+            # -> Input anesthesiologist email and password, then click 'Entrar' to log in.
+            frame = context.pages[-1]
+            # Input anesthesiologist email
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
+            await fill(elem, 'felipemakermoney@gmail.com')
         
 
-        frame = context.pages[-1]
-        # Input anesthesiologist password
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+            frame = context.pages[-1]
+            # Input anesthesiologist password
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/div/input').nth(0)
+            await fill(elem, '123456')
         
 
-        frame = context.pages[-1]
-        # Click 'Entrar' button to log in as anesthesiologist
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+            frame = context.pages[-1]
+            # Click 'Entrar' button to log in as anesthesiologist
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
+            await click(elem)
         
 
         # -> Click on 'Configurações' (Settings) to find secretary management options.
         frame = context.pages[-1]
         # Click on 'Configurações' (Settings) menu to access secretary management.
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[2]/a[6]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click on 'Configurações' tab to access secretary management options.
         frame = context.pages[-1]
         # Click on 'Configurações' tab to access secretary management.
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[2]/a[7]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click on 'Vincular Secretaria' button to start adding a new secretary.
         frame = context.pages[-1]
         # Click on 'Vincular Secretaria' button to add a new secretary.
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[2]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Input the secretary's email and click 'Vincular Secretaria' to send the invitation.
         frame = context.pages[-1]
         # Input secretary email to link
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[2]/div/div[2]/div[2]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('secretaria.teste@example.com')
+        await fill(elem, 'secretaria.teste@example.com')
         
 
         frame = context.pages[-1]
         # Click inside the email input to ensure focus
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[2]/div/div[2]/div[2]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Click 'Vincular Secretaria' button to send invitation to secretary
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[2]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click 'Vincular Secretaria' button to send invitation to secretary.
         frame = context.pages[-1]
         # Click 'Vincular Secretaria' button to send invitation to secretary.
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[2]/div/div[2]/div[2]/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # --> Assertions to verify final state
@@ -125,15 +103,10 @@ async def run_test():
             await expect(frame.locator('text=Unauthorized Secretary Access Detected').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: The test plan execution failed while validating anesthesiologist's ability to add secretaries, assign permissions, and ensure secretaries access only authorized features.")
-        await asyncio.sleep(5)
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        if session:
+            await session.close()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
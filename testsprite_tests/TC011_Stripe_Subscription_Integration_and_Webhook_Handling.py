@@ -1,186 +1,159 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from support.browser import StandaloneSession
+from support.waits import click, fill, goto
+
+async def run_test(context=None):
+    session = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Reuse the runner's browser context, or start a standalone session
+        if context is None:
+            session = await StandaloneSession.start()
+            context = session.context
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Navigate to the app and wait for it to settle
+        await goto(page, "http://localhost:3000")
         
         # Interact with the page elements to simulate user flow
         # -> Click on a subscription plan's 'Assinar Agora' button to proceed to checkout.
         frame = context.pages[-1]
         # Click 'Assinar Agora' button for the Plano Trimestral subscription plan to proceed to checkout.
         elem = frame.locator('xpath=html/body/div[2]/section[2]/div/div[2]/div/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click the 'Fazer Login' button to open the login form.
         frame = context.pages[-1]
         # Click 'Fazer Login' button to open login form.
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Input email and password, then click 'Entrar' to login.
         frame = context.pages[-1]
         # Input email for login.
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+        await fill(elem, 'felipemakermoney@gmail.com')
         
 
         frame = context.pages[-1]
         # Input password for login.
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click 'Entrar' button to submit login form.
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Navigate to the subscription plans page by clicking the 'Plano' menu link to continue subscription sign-up.
         frame = context.pages[-1]
         # Click 'Plano' menu link to navigate to subscription plans page.
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[2]/a[6]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click 'Ver Planos Disponíveis' button to view available subscription plans and select one to proceed to checkout.
         frame = context.pages[-1]
         # Click 'Ver Planos Disponíveis' button to view available subscription plans.
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/div[2]/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click 'Assinar Agora' button for the Plano Trimestral to proceed to Stripe checkout.
         frame = context.pages[-1]
         # Click 'Assinar Agora' button for the Plano Trimestral subscription plan.
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/div[3]/div[2]/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Fill in card number, expiry, CVC, cardholder name, billing address, and submit the payment form.
         frame = context.pages[-1]
         # Input valid test Visa card number.
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/main/div/form/div/div/div/div[2]/div/div/div/div/fieldset/div/div/div/div/span/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('4242 4242 4242 4242')
+        await fill(elem, '4242 4242 4242 4242')
         
 
         frame = context.pages[-1]
         # Input card expiry date.
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/main/div/form/div/div/div/div[2]/div/div/div/div/fieldset/div/div[2]/div/div/span/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('12/34')
+        await fill(elem, '12/34')
         
 
         frame = context.pages[-1]
         # Input card CVC.
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/main/div/form/div/div/div/div[2]/div/div/div/div/fieldset/div/div[3]/div/div/span/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123')
+        await fill(elem, '123')
         
 
         frame = context.pages[-1]
         # Input cardholder name.
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/main/div/form/div/div/div/div[2]/div/div/div[2]/div/div/div/div/div/div/div/div/div[2]/div/div/div/div/span/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Felipe Maker')
+        await fill(elem, 'Felipe Maker')
         
 
         frame = context.pages[-1]
         # Input billing address.
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/main/div/form/div/div/div/div[2]/div/div/div[2]/div/div/div/div/div/div/div[2]/div/fieldset/div/div[2]/div/div/span/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Rua Teste, 123')
+        await fill(elem, 'Rua Teste, 123')
         
 
         # -> Select the correct billing address suggestion from the dropdown to confirm the address and enable payment submission.
         frame = context.pages[-1]
         # Select the first address suggestion 'Rua do Teste, 123 Vila Alonso Costa, São José de Ribamar - State of Maranhão, Brazil' to confirm billing address.
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/main/div/form/div/div/div/div[2]/div/div/div[2]/div/div/div/div/div/div/div[2]/div/fieldset/div/div[2]/div/div/div[2]/ul/div[3]/li').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click the 'Subscribe' button to submit the payment and complete the checkout process.
         frame = context.pages[-1]
         # Click 'Subscribe' button to submit payment and complete checkout.
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/main/div/form/div/div/div/div[3]/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Navigate back to the subscription plans page to retry the subscription process or prepare for webhook simulation.
         frame = context.pages[-1]
         # Click 'Back' link to return to AnestEasy subscription plans page.
         elem = frame.locator('xpath=html/body/div/div/div/div/header/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click 'Fazer Login' button to open login form and proceed.
         frame = context.pages[-1]
         # Click 'Fazer Login' button to open login form.
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Input email and password, then click 'Entrar' to log in.
         frame = context.pages[-1]
         # Input email for login.
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+        await fill(elem, 'felipemakermoney@gmail.com')
         
 
         frame = context.pages[-1]
         # Input password for login.
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click 'Entrar' button to submit login form.
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Simulate Stripe webhook for payment succeeded event to verify webhook handling and subscription status update.
-        await page.goto('http://localhost:3000/simulate-webhook', timeout=10000)
-        await asyncio.sleep(3)
+        await goto(page, 'http://localhost:3000/simulate-webhook')
         
 
         # --> Assertions to verify final state
@@ -189,15 +162,10 @@ async def run_test():
             await expect(frame.locator('text=Subscription Activated Successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: Subscription sign-up, checkout flow, and webhook notifications did not complete successfully. The subscription status was not updated to active as expected after payment and webhook events.")
-        await asyncio.sleep(5)
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        if session:
+            await session.close()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,101 +1,79 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from support.browser import StandaloneSession, resume_session
+from support.waits import click, fill, goto
+
+REUSE_SESSION = True
+
+async def run_test(context=None):
+    session = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Reuse the runner's browser context, or start a standalone session
+        if context is None:
+            session = await StandaloneSession.start()
+            context = session.context
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Navigate to the app and wait for it to settle
+        await goto(page, "http://localhost:3000")
         
         # Interact with the page elements to simulate user flow
-        # -> Click on the 'Entrar' (Login) button to proceed to login page.
-        frame = context.pages[-1]
-        # Click on 'Entrar' button to go to login page
-        elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Reuse the runner's signed-in session; otherwise log in through the UI
+        if not await resume_session(page):
+            # -> Click on the 'Entrar' (Login) button to proceed to login page.
+            frame = context.pages[-1]
+            # Click on 'Entrar' button to go to login page
+            elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a/button').nth(0)
+            await click(elem)
         
 
-        # -> Input email and password, then click 'Entrar' to login.
-        frame = context.pages[-1]
-        # Input email address
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+            # -> Input email and password, then click 'Entrar' to login.
+            frame = context.pages[-1]
+            # Input email address
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
+            await fill(elem, 'felipemakermoney@gmail.com')
         
 
-        frame = context.pages[-1]
-        # Input password
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+            frame = context.pages[-1]
+            # Input password
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/input').nth(0)
+            await fill(elem, '123456')
         
 
-        frame = context.pages[-1]
-        # Click 'Entrar' button to submit login form
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+            frame = context.pages[-1]
+            # Click 'Entrar' button to submit login form
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
+            await click(elem)
         
 
         # -> Click on 'Configurações' (Settings) to navigate to user settings page.
         frame = context.pages[-1]
         # Click on 'Configurações' (Settings) in the top menu to go to user settings page
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[2]/a[7]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Update profile details such as name, contact info, and preferences, then click 'Salvar Alterações' to save.
         frame = context.pages[-1]
         # Update full name
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[2]/div[2]/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Felipe de Souza Batista Updated')
+        await fill(elem, 'Felipe de Souza Batista Updated')
         
 
         frame = context.pages[-1]
         # Update phone number
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[2]/div[2]/div[2]/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('34999999999')
+        await fill(elem, '34999999999')
         
 
         frame = context.pages[-1]
         # Click 'Salvar Alterações' to save profile updates
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[2]/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Scroll down if needed and click the 'Excluir Conta' button at index 21 to initiate account deletion process.
@@ -105,39 +83,39 @@ async def run_test():
         frame = context.pages[-1]
         # Click 'Excluir Conta' button to initiate account deletion
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[2]/div[5]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Type 'EXCLUIR' in the confirmation input and click 'Excluir Conta' button to confirm account deletion.
         frame = context.pages[-1]
         # Type EXCLUIR to confirm account deletion
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[3]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('EXCLUIR')
+        await fill(elem, 'EXCLUIR')
         
 
         frame = context.pages[-1]
         # Click 'Excluir Conta' button to confirm account deletion
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[4]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Verify that the deleted user cannot log in again with the same credentials.
         frame = context.pages[-1]
         # Input email to verify login after deletion
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+        await fill(elem, 'felipemakermoney@gmail.com')
         
 
         frame = context.pages[-1]
         # Input password to verify login after deletion
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click 'Entrar' to attempt login after account deletion
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # --> Assertions to verify final state
@@ -152,15 +130,10 @@ async def run_test():
         await expect(frame.locator('text=Esqueceu a senha?').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Entrar').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Não tem uma conta? Cadastre-se gratuitamente').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        if session:
+            await session.close()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,211 +1,189 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from support.browser import StandaloneSession, resume_session
+from support.waits import click, fill, goto
+
+REUSE_SESSION = True
+
+async def run_test(context=None):
+    session = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Reuse the runner's browser context, or start a standalone session
+        if context is None:
+            session = await StandaloneSession.start()
+            context = session.context
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Navigate to the app and wait for it to settle
+        await goto(page, "http://localhost:3000")
         
         # Interact with the page elements to simulate user flow
-        # -> Click on the 'Entrar Login' button to go to the login page.
-        frame = context.pages[-1]
-        # Click on 'Entrar Login' button to navigate to login page.
-        elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Reuse the runner's signed-in session; otherwise log in through the UI
+        if not await resume_session(page):
+            # -> Click on the 'Entrar Login' button to go to the login page.
+            frame = context.pages[-1]
+            # Click on 'Entrar Login' button to navigate to login page.
+            elem = frame.locator('xpath=html/body/div[2]/header/div/div/div[2]/a[2]/button').nth(0)
+            await click(elem)
         
 
-        # -> Input email and password, then click 'Entrar' button to login.
-        frame = context.pages[-1]
-        # Input email address
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('felipemakermoney@gmail.com')
+            # -> Input email and password, then click 'Entrar' button to login.
+            frame = context.pages[-1]
+            # Input email address
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div/div/input').nth(0)
+            await fill(elem, 'felipemakermoney@gmail.com')
         
 
-        frame = context.pages[-1]
-        # Input password
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+            frame = context.pages[-1]
+            # Input password
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/div[2]/div/div/div/input').nth(0)
+            await fill(elem, '123456')
         
 
-        frame = context.pages[-1]
-        # Click 'Entrar' button to submit login form
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+            frame = context.pages[-1]
+            # Click 'Entrar' button to submit login form
+            elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/form/button').nth(0)
+            await click(elem)
         
 
         # -> Trigger a notification event by clicking 'Novo Procedimento' button to simulate new procedure added notification.
         frame = context.pages[-1]
         # Click 'Novo Procedimento' button to trigger new procedure notification event.
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/div[2]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Input the date of birth using a supported format or alternative method for the date input field (index 18).
         frame = context.pages[-1]
         # Input date of birth in ISO format yyyy-mm-dd for date input field
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1980-01-01')
+        await fill(elem, '1980-01-01')
         
 
         # -> Continue filling the remaining required fields in the form to trigger the notification event.
         frame = context.pages[-1]
         # Input insurance provider
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Unimed')
+        await fill(elem, 'Unimed')
         
 
         frame = context.pages[-1]
         # Input patient card/prontuario number
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456789')
+        await fill(elem, '123456789')
         
 
         frame = context.pages[-1]
         # Input type of procedure
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Cirurgia de Hérnia')
+        await fill(elem, 'Cirurgia de Hérnia')
         
 
         frame = context.pages[-1]
         # Input anesthetic technique
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[2]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Anestesia Geral')
+        await fill(elem, 'Anestesia Geral')
         
 
         # -> Correct the input for 'Hospital / Clínica' field by inputting 'Hospital São Paulo' into the correct field (index 25) and fill remaining fields.
         frame = context.pages[-1]
         # Input hospital or clinic name into correct field
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[2]/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Hospital São Paulo')
+        await fill(elem, 'Hospital São Paulo')
         
 
         frame = context.pages[-1]
         # Input procedure time
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[3]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('14:30')
+        await fill(elem, '14:30')
         
 
         frame = context.pages[-1]
         # Input procedure duration in hours
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[3]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2')
+        await fill(elem, '2')
         
 
         frame = context.pages[-1]
         # Input observations
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div[4]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Nenhuma intercorrência inicial.')
+        await fill(elem, 'Nenhuma intercorrência inicial.')
         
 
         # -> Click the 'Próximo' button to submit the form and trigger the notification event.
         frame = context.pages[-1]
         # Click 'Próximo' button to submit the new procedure form and trigger notification event.
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Fill in the remaining procedure data fields (Sangramento, Náuseas e Vômitos, Dor, Observações, Enviar relatório para Cirurgião) and submit the form.
         frame = context.pages[-1]
         # Select 'Sim' for Sangramento
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div/div/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Select 'Não' for Náuseas e Vômitos
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[2]/div/label[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Select 'Sim' for Dor
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[3]/div/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Input additional observations
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[4]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Nenhuma intercorrência adicional.')
+        await fill(elem, 'Nenhuma intercorrência adicional.')
         
 
         frame = context.pages[-1]
         # Select 'Não' for Enviar relatório para Cirurgião
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div/div[2]/div/div[5]/div/div/label[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         frame = context.pages[-1]
         # Click 'Próximo' button to submit the form and trigger notification event
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click the 'Próximo' button to submit the new procedure form and trigger the notification event.
         frame = context.pages[-1]
         # Click 'Próximo' button to submit the new procedure form and trigger notification event.
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click the 'Finalizar e Salvar' button to submit the form and trigger the notification event.
         frame = context.pages[-1]
         # Click 'Finalizar e Salvar' button to submit the new procedure form and trigger notification event.
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Click on the notification bell icon to verify the new procedure notification appears instantly.
         frame = context.pages[-1]
         # Click on the notification bell icon to open the notification menu and verify new notification.
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # -> Investigate why the notification did not appear. Try refreshing the page and checking the notification bell again.
         frame = context.pages[-1]
         # Click 'Voltar' button to go back to the dashboard or main page.
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await click(elem)
         
 
         # --> Assertions to verify final state
@@ -214,15 +192,10 @@ async def run_test():
             await expect(frame.locator('text=Notification Received Successfully').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError("Test case failed: Notifications related to alerts, payment updates, and system events are not delivered and displayed in real-time as expected.")
-        await asyncio.sleep(5)
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+        if session:
+            await session.close()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
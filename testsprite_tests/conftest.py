@@ -0,0 +1,55 @@
+"""pytest fixtures for API tests that run against the local stand-in.
+
+The TC*.py TestSprite scripts are standalone and are not collected here;
+only test_*.py modules are.
+"""
+
+import os
+
+import pytest
+
+from standin import Stack, missing_binaries, seed, synthetic
+from support.config import TMP_DIR
+
+# load_test.py matches pytest's *_test.py pattern but is a CLI, not a test.
+collect_ignore = ["load_test.py"]
+
+
+@pytest.fixture(scope="session")
+def standin():
+    """The stand-in stack (database, API gateway and Next.js) for the session."""
+    missing = missing_binaries(extra=("npx",))
+    if missing:
+        pytest.skip(f"stand-in needs {', '.join(missing)} on PATH")
+    stack = Stack.start()
+    yield stack
+    stack.stop()
+
+
+@pytest.fixture(scope="session")
+def seeded():
+    return seed
+
+
+@pytest.fixture
+def user_session(standin):
+    """Sign in a seeded user by key ("ana", "bruno", "admin")."""
+    def sign_in(who="ana"):
+        user = seed.USERS[who]
+        return standin.sign_in(user["email"], user["password"])
+    return sign_in
+
+
+@pytest.fixture(scope="session")
+def synthetic_data(standin):
+    """Load the synthetic perf dataset (STANDIN_SCALE, default 0.1) once.
+
+    Returns the generated Dataset so tests can look up ids and counts.
+    """
+    scale = float(os.environ.get("STANDIN_SCALE", "0.1"))
+    dataset = synthetic.generate(scale, seed=int(os.environ.get("STANDIN_SEED", "42")))
+    path = TMP_DIR / f"synthetic_s{scale:g}_{dataset.seed}.sql"
+    with open(path, "w", encoding="utf-8") as fh:
+        synthetic.write_sql(dataset, fh)
+    standin.postgres.apply(path)
+    return dataset
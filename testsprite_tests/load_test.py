@@ -0,0 +1,106 @@
+"""Load-test the core API routes with concurrent, authenticated virtual users.
+
+Replaces the UI-click "load tests" (TC013/TC015 only navigate in a single
+browser) with real concurrent HTTP traffic:
+
+    python load_test.py --users 25 --duration 60
+    python load_test.py --accounts accounts.json --users 100
+
+``accounts.json`` is a list of {"email": ..., "password": ...}; without it
+the TestSprite login user is used. Requires NEXT_PUBLIC_SUPABASE_URL and
+NEXT_PUBLIC_SUPABASE_ANON_KEY to mint sessions; the secretary dashboard and
+/api/admin/stats routes are only exercised when ANESTEASY_SECRETARY_* and
+ANESTEASY_ADMIN_* credentials are set.
+
+Each run is checked against tmp/latency_baseline.json and exits non-zero
+when a route's p95 regresses past the tolerance; refresh the baseline with
+``--update-baseline`` after an intended change.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from support.baseline import (
+    BASELINE_PATH,
+    DEFAULT_SLACK_MS,
+    DEFAULT_TOLERANCE,
+    compare,
+    load_baseline,
+    save_baseline,
+)
+from support.config import LOGIN_EMAIL, LOGIN_PASSWORD, TMP_DIR
+from support.load import run_load
+
+REPORT_PATH = TMP_DIR / "load_report.json"
+
+
+def load_accounts(path):
+    if not path:
+        return [(LOGIN_EMAIL, LOGIN_PASSWORD)]
+    with open(path, encoding="utf-8") as fh:
+        return [(a["email"], a["password"]) for a in json.load(fh)]
+
+
+def print_report(report):
+    print(f"{report['users']} users, {report['duration_s']}s")
+    print(f"{'route':<34}{'reqs':>7}{'rps':>8}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, r in report["routes"].items():
+        err = (r["error_rate"] or 0) * 100
+        print(
+            f"{name:<34}{r['requests']:>7}{r['throughput_rps'] or 0:>8.1f}{err:>7.2f}"
+            f"{r['p50_ms'] or 0:>9.0f}{r['p95_ms'] or 0:>9.0f}{r['p99_ms'] or 0:>9.0f}"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users (default: 10)")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds (default: 30)")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds before the run (default: 5)")
+    parser.add_argument("--accounts", help="JSON file with the accounts virtual users sign in as")
+    parser.add_argument("--output", default=str(REPORT_PATH), help="where to write the JSON report")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="latency baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative p95 increase (default: %(default)s)")
+    parser.add_argument("--slack-ms", type=float, default=DEFAULT_SLACK_MS,
+                        help="allowed absolute p95 increase in ms (default: %(default)s)")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    args = parser.parse_args(argv)
+    if args.users < 1 or args.duration <= 0:
+        parser.error("--users and --duration must be positive")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(run_load(load_accounts(args.accounts), args.users, args.duration, args.warmup))
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print_report(report)
+
+    baseline_path = Path(args.baseline)
+    baseline = load_baseline(baseline_path)
+    if args.update_baseline:
+        save_baseline(report, baseline_path, previous=baseline)
+        print(f"\nBaseline written to {baseline_path}")
+        return 0
+    if baseline is None:
+        print(f"\nNo baseline at {baseline_path}; run with --update-baseline to create one.")
+        return 0
+
+    results = compare(report, baseline, args.tolerance, args.slack_ms)
+    print(f"\np95 vs baseline ({baseline['updated']}):")
+    for r in results:
+        if r["status"] == "new":
+            print(f"  {r['route']:<34} new route, not in baseline")
+        else:
+            print(f"  {r['route']:<34} {r['p95_ms']:>8.0f} ms (baseline {r['baseline_p95_ms']:.0f}, "
+                  f"budget {r['budget_ms']:.0f}) {r['status'].upper()}")
+    return 1 if any(r["status"] == "regressed" for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
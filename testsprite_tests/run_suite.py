@@ -0,0 +1,165 @@
+"""Run the Playwright TC scripts from a shared browser pool.
+
+Each worker launches one Chromium and drains a shared queue of TC files,
+running up to ``--contexts`` of them at a time in separate browser contexts.
+Scripts that declare ``REUSE_SESSION = True`` get a context created from a
+storage_state captured by a single UI login at the start of the run.
+
+    python run_suite.py --workers 2 --contexts 4
+    python run_suite.py -k Dashboard -k Financial
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import re
+import sys
+import time
+import traceback
+from pathlib import Path
+
+from playwright import async_api
+
+from support.browser import create_storage_state, launch_browser, new_context
+from support.config import STORAGE_STATE_PATH, SUITE_DIR, TMP_DIR
+from support.waits import start_recording
+
+RESULTS_PATH = TMP_DIR / "runner_results.json"
+
+
+def discover(patterns):
+    """Return the browser TC scripts, optionally filtered by substrings."""
+    scripts = []
+    for path in sorted(SUITE_DIR.glob("TC*.py")):
+        # The requests-based scripts run at import time and have no run_test
+        # coroutine, so they are left to be executed directly.
+        if "async def run_test(" not in path.read_text(encoding="utf-8"):
+            continue
+        if patterns and not any(p.lower() in path.name.lower() for p in patterns):
+            continue
+        scripts.append(path)
+    return scripts
+
+
+def load_script(path):
+    name = "tc_" + re.sub(r"\W", "_", path.stem)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def run_one(browser, path, storage_state, timeout):
+    started = time.perf_counter()
+    result = {"script": path.name, "status": "PASSED", "error": None}
+    context = None
+    actions = start_recording()
+    try:
+        module = load_script(path)
+        reuse = getattr(module, "REUSE_SESSION", False) and storage_state is not None
+        result["session"] = "reused" if reuse else "fresh"
+        context = await new_context(browser, storage_state=str(storage_state) if reuse else None)
+        await asyncio.wait_for(module.run_test(context), timeout=timeout)
+    except asyncio.TimeoutError:
+        result["status"] = "FAILED"
+        result["error"] = f"Timed out after {timeout}s"
+    except Exception as exc:
+        result["status"] = "FAILED"
+        result["error"] = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+    finally:
+        if context:
+            await context.close()
+    result["duration_s"] = round(time.perf_counter() - started, 3)
+    # Time spent between actions and a settled page, i.e. app latency as
+    # seen by the script (fixed sleeps used to hide this).
+    result["action_ms"] = round(sum(a["ms"] for a in actions), 1)
+    result["actions"] = actions
+    return result
+
+
+async def worker(pw, queue, args, storage_state, results):
+    browser = await launch_browser(pw)
+
+    async def drain():
+        while True:
+            try:
+                path = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            result = await run_one(browser, path, storage_state, args.timeout)
+            results.append(result)
+            print(
+                f"[{result['status']}] {result['script']} "
+                f"({result['duration_s']}s, {result['action_ms'] / 1000:.1f}s in actions)",
+                flush=True,
+            )
+
+    try:
+        await asyncio.gather(*(drain() for _ in range(args.contexts)))
+    finally:
+        await browser.close()
+
+
+async def run_suite(args):
+    scripts = discover(args.k)
+    if not scripts:
+        print("No TC scripts matched.")
+        return []
+
+    queue = asyncio.Queue()
+    for path in scripts:
+        queue.put_nowait(path)
+
+    results = []
+    async with async_api.async_playwright() as pw:
+        storage_state = None
+        if not args.no_session:
+            storage_state = Path(args.storage_state)
+            if args.fresh_login or not storage_state.exists():
+                login_browser = await launch_browser(pw)
+                try:
+                    await create_storage_state(login_browser, path=storage_state)
+                finally:
+                    await login_browser.close()
+
+        workers = min(args.workers, len(scripts))
+        await asyncio.gather(*(worker(pw, queue, args, storage_state, results) for _ in range(workers)))
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=1, help="browsers to launch (default: 1)")
+    parser.add_argument("--contexts", type=int, default=4, help="concurrent contexts per browser (default: 4)")
+    parser.add_argument("--timeout", type=float, default=600, help="per-script timeout in seconds")
+    parser.add_argument("-k", action="append", default=[], help="only run scripts whose name contains this")
+    parser.add_argument("--storage-state", default=str(STORAGE_STATE_PATH), help="session file to reuse/write")
+    parser.add_argument("--fresh-login", action="store_true", help="log in again even if the session file exists")
+    parser.add_argument("--no-session", action="store_true", help="give every script an unauthenticated context")
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.contexts < 1:
+        parser.error("--workers and --contexts must be at least 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    results = asyncio.run(run_suite(args))
+    results.sort(key=lambda r: r["script"])
+
+    TMP_DIR.mkdir(parents=True, exist_ok=True)
+    with open(RESULTS_PATH, "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=2)
+
+    failed = [r for r in results if r["status"] != "PASSED"]
+    elapsed = time.perf_counter() - started
+    print(f"\n{len(results) - len(failed)} passed, {len(failed)} failed in {elapsed:.1f}s")
+    for r in failed:
+        print(f"  {r['script']}: {r['error']}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Generate the synthetic perf dataset and optionally load it into Postgres.
+
+    python seed_data.py --scale 1 --seed 42                # writes tmp/synthetic_s1_42.sql
+    python seed_data.py --scale 2.5 --dsn postgresql://postgres@127.0.0.1:54322/postgres
+
+Same scale and seed, same bytes: see standin/synthetic.py for what is
+generated. Loading needs ``psql`` and a database with the stand-in schema
+(or a real Supabase project's, for that matter).
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+
+from standin import synthetic
+from support.config import TMP_DIR
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="volume multiplier; 1 = 20k procedures per group")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed (default: %(default)s)")
+    parser.add_argument("--output", help="SQL file to write (default: tmp/synthetic_s<scale>_<seed>.sql)")
+    parser.add_argument("--dsn", help="load the script into this database with psql")
+    args = parser.parse_args(argv)
+    if args.scale <= 0:
+        parser.error("--scale must be positive")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    output = args.output or str(TMP_DIR / f"synthetic_s{args.scale:g}_{args.seed}.sql")
+
+    started = time.perf_counter()
+    dataset = synthetic.generate(args.scale, args.seed)
+    with open(output, "w", encoding="utf-8") as fh:
+        synthetic.write_sql(dataset, fh)
+    print(f"Wrote {output} in {time.perf_counter() - started:.1f}s")
+    for table, count in dataset.counts().items():
+        print(f"  {table:<20}{count:>9}")
+
+    if args.dsn:
+        result = subprocess.run(["psql", args.dsn, "-v", "ON_ERROR_STOP=1", "--single-transaction", "-q", "-f", output])
+        return result.returncode
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+"""Local, offline stand-in for the Supabase project behind the API tests.
+
+Runs a throwaway Postgres with the schema from supabase/migrations (plus
+the tables that predate them, see sql/01_base_schema.sql), PostgREST, a
+small GoTrue-compatible gateway and the Next.js app, all on loopback. The
+``standin`` pytest fixture in conftest.py starts it once per session.
+
+Needs ``initdb``/``pg_ctl``/``psql`` (PostgreSQL 15+) and ``postgrest`` on
+PATH, plus ``npx`` for the app; without them the fixture skips.
+"""
+
+from .processes import StandinError, missing_binaries
+from .stack import Stack
+
+__all__ = ["Stack", "StandinError", "missing_binaries"]
@@ -0,0 +1,205 @@
+"""Single-origin gateway that looks like a Supabase project URL.
+
+supabase-js talks to ``/rest/v1`` (PostgREST) and ``/auth/v1`` (GoTrue) on
+the same host. This gateway forwards ``/rest/v1`` to the local PostgREST
+and answers the handful of GoTrue endpoints the app uses (password and
+refresh-token grants, ``/user``, ``/logout``) by checking passwords in
+Postgres through ``standin.sign_in`` and minting JWTs with tokens.py.
+Anything else (storage, admin user management) answers 501 so a test
+that needs it fails loudly instead of silently passing.
+"""
+
+import json
+import secrets
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from . import tokens
+
+# Hop-by-hop headers that must not be forwarded (RFC 9110 section 7.6.1).
+_HOP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "upgrade", "host", "content-length"}
+
+
+class Gateway:
+    def __init__(self, postgrest_url, host="127.0.0.1", port=54321):
+        self.postgrest_url = postgrest_url.rstrip("/")
+        self.service_key = tokens.role_key("service_role")
+        self._refresh_tokens = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin-gateway", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # -- auth ---------------------------------------------------------------
+
+    def rpc(self, name, body):
+        """Call a ``standin`` schema function through PostgREST as service_role."""
+        req = urllib.request.Request(
+            f"{self.postgrest_url}/rpc/{name}",
+            data=json.dumps(body).encode(),
+            method="POST",
+            headers={
+                "Authorization": f"Bearer {self.service_key}",
+                "Content-Type": "application/json",
+                "Content-Profile": "standin",
+            },
+        )
+        with urllib.request.urlopen(req) as resp:
+            return json.loads(resp.read() or b"null")
+
+    def issue_session(self, user):
+        refresh_token = secrets.token_urlsafe(24)
+        with self._lock:
+            self._refresh_tokens[refresh_token] = user["id"]
+        return {
+            "access_token": tokens.access_token(user),
+            "token_type": "bearer",
+            "expires_in": tokens.ACCESS_TOKEN_TTL_S,
+            "refresh_token": refresh_token,
+            "user": user,
+        }
+
+    def refresh(self, refresh_token):
+        with self._lock:
+            user_id = self._refresh_tokens.pop(refresh_token, None)
+        if not user_id:
+            return None
+        user = self.rpc("get_user", {"id": user_id})
+        return self.issue_session(user) if user else None
+
+    def revoke(self, user_id):
+        with self._lock:
+            for token in [t for t, uid in self._refresh_tokens.items() if uid == user_id]:
+                del self._refresh_tokens[token]
+
+    def _handler_class(self):
+        gateway = self
+
+        class Handler(_Handler):
+            pass
+
+        Handler.gateway = gateway
+        return Handler
+
+
+class _Handler(BaseHTTPRequestHandler):
+    gateway = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _bearer_claims(self):
+        auth = self.headers.get("Authorization", "")
+        if not auth.lower().startswith("bearer "):
+            return None
+        return tokens.decode(auth[7:])
+
+    def _dispatch(self):
+        parts = urlsplit(self.path)
+        if parts.path.startswith("/rest/v1/"):
+            return self._proxy(parts)
+        if parts.path.startswith("/auth/v1/"):
+            return self._auth(parts)
+        self._send_json(501, {"message": f"{parts.path} is not provided by the stand-in"})
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = do_HEAD = _dispatch
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Headers", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, PATCH, PUT, DELETE, OPTIONS")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _proxy(self, parts):
+        target = self.gateway.postgrest_url + parts.path[len("/rest/v1"):]
+        if parts.query:
+            target += "?" + parts.query
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in _HOP_HEADERS}
+        # supabase-js sends only the apikey when no user is signed in.
+        if "Authorization" not in headers and self.headers.get("apikey"):
+            headers["Authorization"] = f"Bearer {self.headers['apikey']}"
+        body = self._body() if self.command in ("POST", "PATCH", "PUT", "DELETE") else None
+        req = urllib.request.Request(target, data=body, method=self.command, headers=headers)
+        try:
+            resp = urllib.request.urlopen(req)
+        except urllib.error.HTTPError as err:
+            resp = err
+        data = resp.read()
+        self.send_response(resp.status)
+        for key, value in resp.headers.items():
+            if key.lower() not in _HOP_HEADERS:
+                self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def _auth(self, parts):
+        endpoint = parts.path[len("/auth/v1"):]
+        query = parse_qs(parts.query)
+
+        if endpoint == "/token" and self.command == "POST":
+            body = json.loads(self._body() or b"{}")
+            grant = query.get("grant_type", [""])[0]
+            if grant == "password":
+                user = self.gateway.rpc("sign_in", {"email": body.get("email"), "password": body.get("password")})
+                if not user:
+                    return self._send_json(400, {"error": "invalid_grant", "error_description": "Invalid login credentials"})
+                return self._send_json(200, self.gateway.issue_session(user))
+            if grant == "refresh_token":
+                session = self.gateway.refresh(body.get("refresh_token"))
+                if not session:
+                    return self._send_json(400, {"error": "invalid_grant", "error_description": "Invalid Refresh Token"})
+                return self._send_json(200, session)
+            return self._send_json(400, {"error": "unsupported_grant_type"})
+
+        if endpoint == "/user" and self.command == "GET":
+            claims = self._bearer_claims()
+            user = claims and claims.get("sub") and self.gateway.rpc("get_user", {"id": claims["sub"]})
+            if not user:
+                return self._send_json(401, {"message": "invalid JWT"})
+            return self._send_json(200, user)
+
+        if endpoint == "/logout" and self.command == "POST":
+            self._body()
+            claims = self._bearer_claims()
+            if claims and claims.get("sub"):
+                self.gateway.revoke(claims["sub"])
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+
+        self._send_json(501, {"message": f"auth{endpoint} is not provided by the stand-in"})
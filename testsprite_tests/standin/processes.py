@@ -0,0 +1,187 @@
+"""Throwaway Postgres cluster, PostgREST and Next.js processes.
+
+Everything lives under one temporary directory and listens on loopback
+only; ``Stack.stop`` kills the processes and removes the directory.
+"""
+
+import os
+import shutil
+import signal
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from . import tokens
+
+STANDIN_DIR = Path(__file__).resolve().parent
+SQL_DIR = STANDIN_DIR / "sql"
+REPO_ROOT = STANDIN_DIR.parents[1]
+MIGRATIONS_DIR = REPO_ROOT / "supabase" / "migrations"
+
+REQUIRED_BINARIES = ("initdb", "pg_ctl", "psql", "postgrest")
+
+
+class StandinError(RuntimeError):
+    pass
+
+
+def missing_binaries(extra=()):
+    return [name for name in (*REQUIRED_BINARIES, *extra) if shutil.which(name) is None]
+
+
+def migration_files():
+    """supabase/migrations in apply order; rollback scripts are not migrations."""
+    return [p for p in sorted(MIGRATIONS_DIR.glob("*.sql")) if "rollback" not in p.name]
+
+
+def sql_files():
+    """Every script applied to a fresh cluster, in order.
+
+    sql/before/<migration name> holds schema drift a migration depends on
+    but that no earlier migration creates; it runs right before it.
+    """
+    files = [SQL_DIR / "00_supabase.sql", SQL_DIR / "01_base_schema.sql"]
+    for migration in migration_files():
+        patch = SQL_DIR / "before" / migration.name
+        if patch.exists():
+            files.append(patch)
+        files.append(migration)
+    files.append(SQL_DIR / "99_seed.sql")
+    return files
+
+
+def wait_for(check, timeout_s, what):
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if check():
+            return
+        time.sleep(0.2)
+    raise StandinError(f"timed out after {timeout_s}s waiting for {what}")
+
+
+def http_ok(url):
+    try:
+        with urllib.request.urlopen(url, timeout=2) as resp:
+            return resp.status < 500
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+class Postgres:
+    def __init__(self, root, port=54322):
+        self.data_dir = Path(root) / "pgdata"
+        self.port = port
+        self.log_path = Path(root) / "postgres.log"
+
+    @property
+    def dsn(self):
+        return f"postgresql://postgres@127.0.0.1:{self.port}/postgres"
+
+    def start(self):
+        _run(["initdb", "-D", str(self.data_dir), "-U", "postgres", "--auth=trust", "-E", "UTF8", "--no-sync"])
+        _run([
+            "pg_ctl", "-D", str(self.data_dir), "-l", str(self.log_path), "-w",
+            "-o", f"-p {self.port} -k {self.data_dir} -c listen_addresses=127.0.0.1 -c fsync=off",
+            "start",
+        ])
+        return self
+
+    def apply(self, path):
+        """Run one script in a single transaction, stopping at the first error."""
+        result = subprocess.run(
+            ["psql", self.dsn, "-v", "ON_ERROR_STOP=1", "--single-transaction", "-q", "-f", str(path)],
+            capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise StandinError(f"{path.name} failed to apply:\n{result.stderr.strip()}")
+
+    def stop(self):
+        if (self.data_dir / "postmaster.pid").exists():
+            subprocess.run(["pg_ctl", "-D", str(self.data_dir), "-m", "immediate", "stop"], capture_output=True)
+
+
+class Postgrest:
+    def __init__(self, root, db_dsn, port=54323):
+        self.port = port
+        self.config_path = Path(root) / "postgrest.conf"
+        self.log_path = Path(root) / "postgrest.log"
+        self.db_dsn = db_dsn.replace("postgres@", "authenticator@")
+        self.process = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout_s=30):
+        self.config_path.write_text(
+            f'db-uri = "{self.db_dsn}"\n'
+            'db-schemas = "public,standin"\n'
+            'db-anon-role = "anon"\n'
+            f'jwt-secret = "{tokens.JWT_SECRET}"\n'
+            'server-host = "127.0.0.1"\n'
+            f"server-port = {self.port}\n"
+        )
+        self.process = _spawn(["postgrest", str(self.config_path)], self.log_path)
+        wait_for(lambda: http_ok(self.url + "/"), timeout_s, "PostgREST")
+        return self
+
+    def stop(self):
+        _terminate(self.process)
+
+
+class NextApp:
+    """``next dev`` (or ``next start`` on an existing build) against the stand-in."""
+
+    def __init__(self, root, env, port=3100, mode="dev"):
+        self.port = port
+        self.mode = mode
+        self.env = env
+        self.log_path = Path(root) / "next.log"
+        self.process = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout_s=180):
+        npx = shutil.which("npx")
+        if npx is None:
+            raise StandinError("npx is required to run the Next.js app")
+        env = {**os.environ, **self.env, "PORT": str(self.port), "NEXT_TELEMETRY_DISABLED": "1"}
+        self.process = _spawn([npx, "next", self.mode, "-p", str(self.port)], self.log_path, cwd=REPO_ROOT, env=env)
+
+        def ready():
+            if self.process.poll() is not None:
+                raise StandinError(f"next {self.mode} exited early; see {self.log_path}")
+            return http_ok(self.url + "/api/healthz")
+
+        wait_for(ready, timeout_s, f"next {self.mode} on port {self.port}")
+        return self
+
+    def stop(self):
+        _terminate(self.process)
+
+
+def _run(cmd):
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise StandinError(f"{cmd[0]} failed:\n{result.stderr.strip()}")
+
+
+def _spawn(cmd, log_path, **kwargs):
+    log = open(log_path, "ab")
+    # Own process group so the whole tree (next spawns workers) can be killed.
+    return subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT, start_new_session=True, **kwargs)
+
+
+def _terminate(process, grace_s=10):
+    if process is None or process.poll() is not None:
+        return
+    os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(grace_s)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
@@ -0,0 +1,42 @@
+"""Accounts and rows created by sql/99_seed.sql, for tests to refer to."""
+
+ANA = {
+    "id": "00000000-0000-4000-a000-000000000001",
+    "email": "ana@anesteasy.test",
+    "password": "Anestesia123!",
+}
+BRUNO = {
+    "id": "00000000-0000-4000-a000-000000000002",
+    "email": "bruno@anesteasy.test",
+    "password": "Anestesia123!",
+}
+ADMIN = {
+    "id": "00000000-0000-4000-a000-000000000003",
+    "email": "admin@anesteasy.test",
+    "password": "Admin123!",
+}
+SECRETARY = {
+    "id": "00000000-0000-4000-d000-000000000001",
+    "email": "carla@anesteasy.test",
+    "password": "Secretaria123!",
+}
+
+USERS = {"ana": ANA, "bruno": BRUNO, "admin": ADMIN}
+
+# ANA (admin) and BRUNO are active members; ADMIN has a pending invite.
+GROUP_ID = "00000000-0000-4000-c000-000000000001"
+
+# procedure id -> owner, as seeded
+PROCEDURES = {
+    "00000000-0000-4000-e000-000000000001": ANA["id"],
+    "00000000-0000-4000-e000-000000000002": ANA["id"],
+    "00000000-0000-4000-e000-000000000003": ANA["id"],
+    "00000000-0000-4000-e000-000000000004": BRUNO["id"],
+    "00000000-0000-4000-e000-000000000005": BRUNO["id"],
+}
+
+# Plain 32-character key, so lib/security.ts encrypt/decrypt work for real.
+ENCRYPTION_KEY = "standin-encryption-key-32-bytes!"
+
+# HMAC secret for the bulk-import dedupe keys (lib/procedure-import.ts).
+IMPORT_KEY_SECRET = "standin-import-key-secret"
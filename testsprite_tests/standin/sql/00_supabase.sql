@@ -0,0 +1,121 @@
+-- Minimal stand-in for the parts of a Supabase project the migrations and
+-- the API rely on: the anon/authenticated/service_role roles, the auth
+-- schema (users + uid()/role()/jwt()/email() helpers reading PostgREST's
+-- request.jwt.claims) and the storage tables referenced by policies.
+
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'anon') THEN
+    CREATE ROLE anon NOLOGIN NOINHERIT;
+  END IF;
+  IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'authenticated') THEN
+    CREATE ROLE authenticated NOLOGIN NOINHERIT;
+  END IF;
+  IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+    CREATE ROLE service_role NOLOGIN NOINHERIT BYPASSRLS;
+  END IF;
+  IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'authenticator') THEN
+    CREATE ROLE authenticator LOGIN NOINHERIT;
+  END IF;
+END $$;
+
+GRANT anon, authenticated, service_role TO authenticator;
+
+CREATE SCHEMA IF NOT EXISTS auth;
+
+CREATE TABLE IF NOT EXISTS auth.users (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  email TEXT UNIQUE,
+  encrypted_password TEXT,
+  email_confirmed_at TIMESTAMPTZ DEFAULT now(),
+  raw_user_meta_data JSONB DEFAULT '{}'::jsonb,
+  raw_app_meta_data JSONB DEFAULT '{"provider": "email"}'::jsonb,
+  last_sign_in_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION auth.jwt() RETURNS JSONB
+LANGUAGE sql STABLE AS $$
+  SELECT COALESCE(NULLIF(current_setting('request.jwt.claims', true), ''), '{}')::jsonb
+$$;
+
+CREATE OR REPLACE FUNCTION auth.uid() RETURNS UUID
+LANGUAGE sql STABLE AS $$
+  SELECT NULLIF(auth.jwt() ->> 'sub', '')::uuid
+$$;
+
+CREATE OR REPLACE FUNCTION auth.role() RETURNS TEXT
+LANGUAGE sql STABLE AS $$
+  SELECT auth.jwt() ->> 'role'
+$$;
+
+CREATE OR REPLACE FUNCTION auth.email() RETURNS TEXT
+LANGUAGE sql STABLE AS $$
+  SELECT auth.jwt() ->> 'email'
+$$;
+
+CREATE SCHEMA IF NOT EXISTS storage;
+
+CREATE TABLE IF NOT EXISTS storage.buckets (
+  id TEXT PRIMARY KEY,
+  name TEXT NOT NULL UNIQUE,
+  public BOOLEAN DEFAULT false,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS storage.objects (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  bucket_id TEXT REFERENCES storage.buckets(id),
+  name TEXT,
+  owner UUID,
+  metadata JSONB,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+ALTER TABLE storage.objects ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION storage.foldername(name TEXT) RETURNS TEXT[]
+LANGUAGE sql IMMUTABLE AS $$
+  SELECT (string_to_array(name, '/'))[1:array_length(string_to_array(name, '/'), 1) - 1]
+$$;
+
+GRANT USAGE ON SCHEMA auth, storage, public TO anon, authenticated, service_role;
+GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA auth TO anon, authenticated, service_role;
+
+-- Objects created later by the migrations inherit the same grants Supabase
+-- gives them; RLS policies still decide what anon/authenticated can see.
+ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT ALL ON TABLES TO anon, authenticated, service_role;
+ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT ALL ON SEQUENCES TO anon, authenticated, service_role;
+ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT EXECUTE ON FUNCTIONS TO anon, authenticated, service_role;
+
+-- Endpoints the auth gateway (standin/gateway.py) calls through PostgREST.
+CREATE SCHEMA IF NOT EXISTS standin;
+GRANT USAGE ON SCHEMA standin TO service_role;
+
+CREATE OR REPLACE FUNCTION standin.sign_in(email TEXT, password TEXT) RETURNS JSONB
+LANGUAGE sql SECURITY DEFINER AS $$
+  UPDATE auth.users u SET last_sign_in_at = now()
+  WHERE u.email = sign_in.email
+    AND u.encrypted_password = crypt(sign_in.password, u.encrypted_password)
+  RETURNING jsonb_build_object(
+    'id', u.id, 'email', u.email, 'aud', 'authenticated', 'role', 'authenticated',
+    'email_confirmed_at', u.email_confirmed_at, 'user_metadata', u.raw_user_meta_data,
+    'app_metadata', u.raw_app_meta_data, 'created_at', u.created_at
+  )
+$$;
+
+CREATE OR REPLACE FUNCTION standin.get_user(id UUID) RETURNS JSONB
+LANGUAGE sql STABLE SECURITY DEFINER AS $$
+  SELECT jsonb_build_object(
+    'id', u.id, 'email', u.email, 'aud', 'authenticated', 'role', 'authenticated',
+    'email_confirmed_at', u.email_confirmed_at, 'user_metadata', u.raw_user_meta_data,
+    'app_metadata', u.raw_app_meta_data, 'created_at', u.created_at
+  )
+  FROM auth.users u WHERE u.id = get_user.id
+$$;
+
+REVOKE ALL ON ALL FUNCTIONS IN SCHEMA standin FROM PUBLIC;
+GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA standin TO service_role;
@@ -0,0 +1,369 @@
+-- Tables that exist in the production project but predate
+-- supabase/migrations (they were created from the dashboard). Shapes follow
+-- the generated types in lib/supabase.ts; columns that a migration adds
+-- later are left out here so the migrations apply unchanged.
+
+CREATE TABLE IF NOT EXISTS public.users (
+  id UUID PRIMARY KEY REFERENCES auth.users(id) ON DELETE CASCADE,
+  email TEXT NOT NULL UNIQUE,
+  name TEXT NOT NULL,
+  specialty TEXT NOT NULL DEFAULT 'Anestesiologia',
+  crm TEXT,
+  phone TEXT,
+  gender TEXT,
+  avatar_url TEXT,
+  password_hash TEXT,
+  subscription_plan TEXT,
+  subscription_status TEXT,
+  last_login_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.secretarias (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id UUID REFERENCES auth.users(id) ON DELETE SET NULL,
+  nome TEXT NOT NULL,
+  email TEXT NOT NULL,
+  telefone TEXT,
+  cpf TEXT,
+  status TEXT DEFAULT 'ativo',
+  data_cadastro TIMESTAMPTZ DEFAULT now(),
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.anestesista_secretaria (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  anestesista_id UUID NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+  secretaria_id UUID NOT NULL REFERENCES public.secretarias(id) ON DELETE CASCADE,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.procedures (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id UUID NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+  secretaria_id UUID REFERENCES public.secretarias(id) ON DELETE SET NULL,
+  procedure_name TEXT NOT NULL,
+  procedure_type TEXT NOT NULL,
+  procedure_date DATE NOT NULL,
+  procedure_time TEXT,
+  procedure_value NUMERIC(12, 2) NOT NULL DEFAULT 0,
+  patient_name TEXT,
+  patient_id TEXT,
+  patient_age INTEGER,
+  patient_gender TEXT,
+  patient_phone TEXT,
+  patient_email TEXT,
+  patient_notes TEXT,
+  patient_companion TEXT,
+  patient_companion_phone TEXT,
+  data_nascimento TEXT,
+  convenio TEXT,
+  carteirinha TEXT,
+  anesthesiologist_name TEXT,
+  anesthesiologist_phone TEXT,
+  anesthesiologist_email TEXT,
+  anesthesiologist_notes TEXT,
+  nome_cirurgiao TEXT,
+  surgeon_name TEXT,
+  especialidade_cirurgiao TEXT,
+  email_cirurgiao TEXT,
+  telefone_cirurgiao TEXT,
+  nome_equipe TEXT,
+  hospital_clinic TEXT,
+  room_number TEXT,
+  horario TEXT,
+  hora_inicio TEXT,
+  hora_termino TEXT,
+  data_cirurgia TEXT,
+  duracao_minutos INTEGER,
+  duration_minutes INTEGER,
+  tecnica_anestesica TEXT,
+  tipo_anestesia TEXT,
+  codigo_tssu TEXT,
+  grupo_anestesico TEXT,
+  sangramento TEXT,
+  nausea_vomito TEXT,
+  dor TEXT,
+  tipo_parto TEXT,
+  tipo_cesariana TEXT,
+  indicacao_cesariana TEXT,
+  descricao_indicacao_cesariana TEXT,
+  acompanhamento_antes TEXT,
+  retencao_placenta TEXT,
+  laceracao_presente TEXT,
+  grau_laceracao TEXT,
+  hemorragia_puerperal TEXT,
+  transfusao_realizada TEXT,
+  notes TEXT,
+  observacoes_procedimento TEXT,
+  observacoes_financeiras TEXT,
+  fichas_anestesicas JSONB,
+  feedback_solicitado BOOLEAN DEFAULT false,
+  show_to_secretary BOOLEAN DEFAULT true,
+  payment_status TEXT DEFAULT 'pending',
+  payment_date DATE,
+  payment_method TEXT,
+  forma_pagamento TEXT,
+  expected_payment_date DATE,
+  numero_parcelas INTEGER DEFAULT 1,
+  parcelas_recebidas INTEGER DEFAULT 0,
+  paid_at TIMESTAMPTZ,
+  sent_at TIMESTAMPTZ,
+  updated_by UUID,
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.parcelas (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  procedure_id UUID NOT NULL REFERENCES public.procedures(id) ON DELETE CASCADE,
+  numero_parcela INTEGER NOT NULL,
+  valor_parcela NUMERIC(12, 2) NOT NULL,
+  recebida BOOLEAN DEFAULT false,
+  data_recebimento DATE,
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.procedure_logs (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  procedure_id UUID NOT NULL REFERENCES public.procedures(id) ON DELETE CASCADE,
+  changed_by_id UUID NOT NULL,
+  changed_by_name TEXT NOT NULL,
+  changed_by_type TEXT NOT NULL,
+  field_name TEXT NOT NULL,
+  old_value TEXT,
+  new_value TEXT,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.procedure_attachments (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  procedure_id UUID NOT NULL REFERENCES public.procedures(id) ON DELETE CASCADE,
+  file_name TEXT NOT NULL,
+  file_size INTEGER NOT NULL,
+  file_type TEXT NOT NULL,
+  file_url TEXT NOT NULL,
+  uploaded_at TIMESTAMPTZ DEFAULT now(),
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.shifts (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id UUID NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+  title TEXT NOT NULL,
+  description TEXT,
+  hospital_name TEXT,
+  shift_type TEXT NOT NULL,
+  start_date TIMESTAMPTZ NOT NULL,
+  end_date TIMESTAMPTZ NOT NULL,
+  is_recurring BOOLEAN DEFAULT false,
+  recurrence_type TEXT,
+  recurrence_end_date DATE,
+  parent_shift_id UUID REFERENCES public.shifts(id) ON DELETE CASCADE,
+  is_generated BOOLEAN DEFAULT false,
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.notifications (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id UUID NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+  procedure_id UUID REFERENCES public.procedures(id) ON DELETE CASCADE,
+  title TEXT NOT NULL,
+  message TEXT NOT NULL,
+  type TEXT,
+  is_read BOOLEAN DEFAULT false,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.goals (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id UUID NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+  target_value NUMERIC(12, 2) NOT NULL,
+  reset_day INTEGER NOT NULL DEFAULT 1,
+  is_enabled BOOLEAN DEFAULT true,
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.payments (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id UUID NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+  procedure_id UUID REFERENCES public.procedures(id) ON DELETE SET NULL,
+  amount NUMERIC(12, 2) NOT NULL,
+  description TEXT,
+  due_date DATE,
+  payment_date DATE,
+  payment_method TEXT NOT NULL,
+  payment_status TEXT DEFAULT 'pending',
+  payment_type TEXT NOT NULL,
+  external_payment_id TEXT,
+  transaction_id TEXT,
+  metadata JSONB,
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.feedback_links (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  procedure_id UUID REFERENCES public.procedures(id) ON DELETE CASCADE,
+  token TEXT NOT NULL UNIQUE,
+  email_cirurgiao TEXT NOT NULL,
+  telefone_cirurgiao TEXT,
+  expires_at TIMESTAMPTZ NOT NULL,
+  responded_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.feedback_responses (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  feedback_link_id UUID REFERENCES public.feedback_links(id) ON DELETE CASCADE,
+  nausea_vomito BOOLEAN NOT NULL DEFAULT false,
+  cefaleia BOOLEAN NOT NULL DEFAULT false,
+  dor_lombar BOOLEAN NOT NULL DEFAULT false,
+  anemia_transfusao BOOLEAN NOT NULL DEFAULT false,
+  satisfacao INTEGER,
+  comentarios TEXT,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.reports (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id UUID NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+  report_name TEXT NOT NULL,
+  report_type TEXT NOT NULL,
+  start_date DATE NOT NULL,
+  end_date DATE NOT NULL,
+  report_data JSONB,
+  total_procedures INTEGER,
+  total_revenue NUMERIC(12, 2),
+  total_paid NUMERIC(12, 2),
+  total_pending NUMERIC(12, 2),
+  average_procedure_value NUMERIC(12, 2),
+  most_common_procedure TEXT,
+  generated_at TIMESTAMPTZ DEFAULT now(),
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.user_settings (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id UUID NOT NULL UNIQUE REFERENCES public.users(id) ON DELETE CASCADE,
+  theme TEXT,
+  language TEXT,
+  currency TEXT,
+  date_format TEXT,
+  time_format TEXT,
+  default_procedure_duration INTEGER,
+  notifications_email BOOLEAN DEFAULT true,
+  notifications_push BOOLEAN DEFAULT true,
+  notifications_sms BOOLEAN DEFAULT false,
+  auto_backup BOOLEAN DEFAULT false,
+  backup_frequency TEXT,
+  dashboard_layout JSONB,
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.shared_links (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id UUID NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+  token TEXT,
+  token_hash TEXT NOT NULL,
+  permissions JSONB,
+  expires_at TIMESTAMPTZ NOT NULL,
+  revoked BOOLEAN DEFAULT false,
+  last_used_at TIMESTAMPTZ,
+  last_used_ip TEXT,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.admin_messages (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  admin_user_id UUID NOT NULL,
+  target_user_id UUID NOT NULL,
+  target_phone TEXT NOT NULL,
+  message_text TEXT NOT NULL,
+  channel TEXT,
+  status TEXT,
+  whatsapp_message_id TEXT,
+  error_message TEXT,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.ocr_messages (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  phone TEXT NOT NULL,
+  media_id TEXT,
+  status TEXT NOT NULL DEFAULT 'received',
+  doc_type TEXT,
+  raw_text TEXT,
+  structured_data JSONB,
+  cost_ocr NUMERIC(10, 6),
+  cost_llm NUMERIC(10, 6),
+  error_log TEXT,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.processed_webhooks (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  event_id TEXT NOT NULL UNIQUE,
+  status TEXT NOT NULL,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.webhook_logs (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  payload JSONB,
+  error_msg TEXT,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.whatsapp_accounts (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id UUID NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+  phone_number TEXT NOT NULL UNIQUE,
+  verified BOOLEAN DEFAULT false,
+  verification_code TEXT,
+  verification_expires_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.whatsapp_messages (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id UUID REFERENCES public.users(id) ON DELETE SET NULL,
+  wamid TEXT NOT NULL UNIQUE,
+  phone_number TEXT NOT NULL,
+  direction TEXT,
+  message_type TEXT NOT NULL,
+  text_content TEXT,
+  media_id TEXT,
+  media_url TEXT,
+  status TEXT,
+  error_message TEXT,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.whatsapp_extractions (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id UUID REFERENCES public.users(id) ON DELETE SET NULL,
+  message_id UUID REFERENCES public.whatsapp_messages(id) ON DELETE SET NULL,
+  procedure_id UUID REFERENCES public.procedures(id) ON DELETE SET NULL,
+  status TEXT,
+  image_storage_path TEXT,
+  raw_ocr_text TEXT,
+  extracted_fields JSONB,
+  field_confidences JSONB,
+  missing_required TEXT[],
+  ocr_confidence NUMERIC,
+  overall_confidence NUMERIC,
+  expires_at TIMESTAMPTZ,
+  confirmed_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
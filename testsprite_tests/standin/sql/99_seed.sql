@@ -0,0 +1,82 @@
+-- Deterministic seed for API tests against the stand-in. IDs are fixed so
+-- tests can reference them; standin/seed.py mirrors the credentials.
+-- Patient fields are stored in plain text: decrypt() passes values without
+-- the "enc:" prefix through unchanged.
+
+-- Users (the on_auth_user_created trigger fills public.users)
+INSERT INTO auth.users (id, email, encrypted_password, raw_user_meta_data) VALUES
+  ('00000000-0000-4000-a000-000000000001', 'ana@anesteasy.test', crypt('Anestesia123!', gen_salt('bf')),
+   '{"name": "Dra. Ana Souza", "crm": "123456-SP", "specialty": "Anestesiologia"}'),
+  ('00000000-0000-4000-a000-000000000002', 'bruno@anesteasy.test', crypt('Anestesia123!', gen_salt('bf')),
+   '{"name": "Dr. Bruno Lima", "crm": "654321-SP", "specialty": "Anestesiologia"}'),
+  ('00000000-0000-4000-a000-000000000003', 'admin@anesteasy.test', crypt('Admin123!', gen_salt('bf')),
+   '{"name": "Admin AnestEasy"}');
+
+UPDATE public.users SET role = 'admin', is_system_admin = true
+WHERE id = '00000000-0000-4000-a000-000000000003';
+
+INSERT INTO public.subscriptions (id, user_id, plan_type, amount, status, current_period_start, current_period_end) VALUES
+  ('00000000-0000-4000-b000-000000000001', '00000000-0000-4000-a000-000000000001', 'monthly', 79.90, 'active',
+   now() - interval '10 days', now() + interval '20 days'),
+  ('00000000-0000-4000-b000-000000000002', '00000000-0000-4000-a000-000000000002', 'annual', 799.00, 'active',
+   now() - interval '100 days', now() + interval '265 days');
+
+-- Group with both anesthesiologists and a group secretary
+INSERT INTO public.groups (id, name, color, created_by, type) VALUES
+  ('00000000-0000-4000-c000-000000000001', 'Grupo Teste', '#2563eb', '00000000-0000-4000-a000-000000000001', 'sem_cotas');
+
+INSERT INTO public.group_members (group_id, user_id, role, status) VALUES
+  ('00000000-0000-4000-c000-000000000001', '00000000-0000-4000-a000-000000000001', 'admin', 'active'),
+  ('00000000-0000-4000-c000-000000000001', '00000000-0000-4000-a000-000000000002', 'member', 'active'),
+  -- Convite ainda não aceito: não é membro para nenhum fim
+  ('00000000-0000-4000-c000-000000000001', '00000000-0000-4000-a000-000000000003', 'member', 'pending');
+
+-- Password "Secretaria123!" hashed with lib/security.ts hashPassword (scrypt)
+INSERT INTO public.secretarias (id, nome, email, status, type, group_id, role, password_hash) VALUES
+  ('00000000-0000-4000-d000-000000000001', 'Carla Secretária', 'carla@anesteasy.test', 'ativo', 'grupo',
+   '00000000-0000-4000-c000-000000000001', 'coord',
+   '5f0c2a8e9b7d4c1e3a6f8b2d0e4c7a91:b0383f875009a2d3a1b74604da2994f49314b175f1b0b98cac43d166e686722bd50f2a55a771fc36ceacfcb187cf9b8566e227ef090dedaff475033a30304ac2');
+
+INSERT INTO public.group_secretary_permissions (secretary_id, module) VALUES
+  ('00000000-0000-4000-d000-000000000001', 'agenda'),
+  ('00000000-0000-4000-d000-000000000001', 'financeiro'),
+  ('00000000-0000-4000-d000-000000000001', 'relatorios');
+
+-- Procedures: a fixed mix of types, hospitals, statuses and insurers
+INSERT INTO public.procedures (
+  id, user_id, group_id, procedure_name, procedure_type, procedure_date, procedure_value,
+  patient_name, patient_phone, convenio, hospital_clinic, nome_cirurgiao,
+  payment_status, payment_date, numero_parcelas, tipo_parto, billing_entity_type
+) VALUES
+  ('00000000-0000-4000-e000-000000000001', '00000000-0000-4000-a000-000000000001', NULL,
+   'Colecistectomia', 'Anestesia Geral', '2026-01-10', 1800.00,
+   'Maria Oliveira', '11999990001', 'Unimed', 'Hospital São Luiz', 'Dr. Paulo Mendes',
+   'paid', '2026-02-10', 1, NULL, NULL),
+  ('00000000-0000-4000-e000-000000000002', '00000000-0000-4000-a000-000000000001', NULL,
+   'Cesariana', 'Raquianestesia', '2026-01-18', 2200.00,
+   'Juliana Costa', '11999990002', 'Bradesco Saúde', 'Maternidade Santa Joana', 'Dra. Helena Prado',
+   'pending', NULL, 2, 'Cesariana', NULL),
+  ('00000000-0000-4000-e000-000000000003', '00000000-0000-4000-a000-000000000001', '00000000-0000-4000-c000-000000000001',
+   'Artroplastia de joelho', 'Bloqueio Periférico', '2026-02-03', 2500.00,
+   'José Pereira', '11999990003', 'SulAmérica', 'Hospital Albert Einstein', 'Dr. Ricardo Alves',
+   'sent', NULL, 1, NULL, 'cnpj_grupo'),
+  ('00000000-0000-4000-e000-000000000004', '00000000-0000-4000-a000-000000000002', '00000000-0000-4000-c000-000000000001',
+   'Parto normal', 'Peridural', '2026-02-11', 1500.00,
+   'Fernanda Rocha', '11999990004', 'Particular', 'Maternidade Santa Joana', 'Dra. Helena Prado',
+   'paid', '2026-02-11', 1, 'Vaginal', 'cnpj_anestesista'),
+  ('00000000-0000-4000-e000-000000000005', '00000000-0000-4000-a000-000000000002', NULL,
+   'Endoscopia', 'Sedação', '2026-03-02', 600.00,
+   'Ricardo Santos', '11999990005', 'Amil', 'Hospital São Luiz', 'Dr. Paulo Mendes',
+   'pending', NULL, 1, NULL, NULL);
+
+INSERT INTO public.parcelas (procedure_id, numero_parcela, valor_parcela, recebida, data_recebimento) VALUES
+  ('00000000-0000-4000-e000-000000000002', 1, 1100.00, true, '2026-02-18'),
+  ('00000000-0000-4000-e000-000000000002', 2, 1100.00, false, NULL);
+
+INSERT INTO public.shifts (user_id, title, hospital_name, shift_type, start_date, end_date, shift_value, payment_status) VALUES
+  ('00000000-0000-4000-a000-000000000001', 'Plantão noturno', 'Hospital São Luiz', 'hospital_fixo',
+   '2026-02-20 19:00:00+00', '2026-02-21 07:00:00+00', 1200.00, 'pending');
+
+INSERT INTO public.notifications (user_id, procedure_id, title, message, type, is_read) VALUES
+  ('00000000-0000-4000-a000-000000000001', '00000000-0000-4000-e000-000000000002',
+   'Pagamento pendente', 'Cesariana de 18/01 aguarda pagamento.', 'payment_pending', false);
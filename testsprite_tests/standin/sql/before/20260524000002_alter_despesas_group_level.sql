@@ -0,0 +1,4 @@
+-- group_members.status exists in production (lib/supabase.ts, lib/groups.ts
+-- invites) but no migration adds it; this migration's policies need it.
+ALTER TABLE public.group_members ADD COLUMN IF NOT EXISTS status TEXT NOT NULL DEFAULT 'active'
+  CHECK (status IN ('pending', 'active'));
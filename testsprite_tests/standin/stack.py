@@ -0,0 +1,93 @@
+"""Boot the whole stand-in: Postgres -> schema -> PostgREST -> gateway -> Next.js."""
+
+import os
+import shutil
+import tempfile
+
+import httpx
+
+from . import seed, tokens
+from .gateway import Gateway
+from .processes import NextApp, Postgres, Postgrest, sql_files
+
+
+class Stack:
+    """A running stand-in; use ``Stack.start()`` and always ``stop()``.
+
+    Ports default to the Supabase CLI's (54321 API, 54322 database) and can
+    be moved with STANDIN_API_PORT / STANDIN_DB_PORT / STANDIN_APP_PORT when
+    those are taken. STANDIN_NEXT_MODE=start serves an existing ``next
+    build`` instead of ``next dev``.
+    """
+
+    def __init__(self):
+        self.root = tempfile.mkdtemp(prefix="anesteasy-standin-")
+        self.postgres = None
+        self.postgrest = None
+        self.gateway = None
+        self.app = None
+        self.anon_key = tokens.role_key("anon")
+        self.service_key = tokens.role_key("service_role")
+
+    @classmethod
+    def start(cls, with_app=True):
+        stack = cls()
+        try:
+            stack._start(with_app)
+        except BaseException:
+            stack.stop()
+            raise
+        return stack
+
+    def _start(self, with_app):
+        self.postgres = Postgres(self.root, port=int(os.environ.get("STANDIN_DB_PORT", 54322))).start()
+        for path in sql_files():
+            self.postgres.apply(path)
+        self.postgrest = Postgrest(self.root, self.postgres.dsn).start()
+        self.gateway = Gateway(self.postgrest.url, port=int(os.environ.get("STANDIN_API_PORT", 54321))).start()
+        if with_app:
+            self.app = NextApp(
+                self.root,
+                self.app_env(),
+                port=int(os.environ.get("STANDIN_APP_PORT", 3100)),
+                mode=os.environ.get("STANDIN_NEXT_MODE", "dev"),
+            ).start()
+
+    def app_env(self):
+        """Environment the Next.js process needs to talk to the stand-in."""
+        return {
+            "NEXT_PUBLIC_SUPABASE_URL": self.supabase_url,
+            "SUPABASE_URL": self.supabase_url,
+            "NEXT_PUBLIC_SUPABASE_ANON_KEY": self.anon_key,
+            "SUPABASE_SERVICE_ROLE_KEY": self.service_key,
+            "SUPABASE_JWT_SECRET": tokens.JWT_SECRET,
+            "ENCRYPTION_KEY": seed.ENCRYPTION_KEY,
+            "IMPORT_KEY_SECRET": seed.IMPORT_KEY_SECRET,
+            "NEXT_PUBLIC_APP_URL": f"http://127.0.0.1:{os.environ.get('STANDIN_APP_PORT', 3100)}",
+        }
+
+    @property
+    def supabase_url(self):
+        return self.gateway.url
+
+    @property
+    def base_url(self):
+        return self.app.url if self.app else None
+
+    def sign_in(self, email, password):
+        """Password grant through the gateway; returns the session JSON."""
+        resp = httpx.post(
+            f"{self.supabase_url}/auth/v1/token",
+            params={"grant_type": "password"},
+            headers={"apikey": self.anon_key},
+            json={"email": email, "password": password},
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def stop(self):
+        for part in (self.app, self.gateway, self.postgrest, self.postgres):
+            if part is not None:
+                part.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+
@@ -0,0 +1,354 @@
+"""Deterministic, production-sized datasets for performance tests.
+
+``generate(scale, seed)`` builds the rows in memory and ``write_sql`` turns
+them into a psql script (COPY blocks, so loading 50k procedures takes
+seconds). The same scale and seed always yield byte-identical output, IVs
+included, so every perf run starts from the same dataset.
+
+Sensitive procedure fields are encrypted the way lib/security.ts does it
+(AES-256-GCM, ``enc:<iv hex>:<tag hex>:<data hex>``) with the stand-in's
+ENCRYPTION_KEY, so the app decrypts them like real rows.
+
+At scale 1 there are two groups (one com_cotas, one sem_cotas) of eight
+anesthesiologists with 20k procedures each, plus shifts with recurring
+children, despesas and feedback links/responses.
+"""
+
+import json
+import random
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from . import seed as standin_seed
+
+IV_LENGTH = 12
+
+GROUPS = 2
+MEMBERS_PER_GROUP = 8
+PROCEDURES_PER_GROUP = 20_000
+SOLO_SHARE = 0.15            # of a member's procedures kept outside the group
+RECURRING_SHIFTS_PER_MEMBER = 6
+ONE_OFF_SHIFTS_PER_MEMBER = 30
+DESPESAS_PER_GROUP = 1_500
+FEEDBACK_SHARE = 0.10
+RESPONSE_SHARE = 0.60
+
+# Last day of the generated history; procedures span the 24 months before it.
+END_DATE = date(2026, 6, 30)
+HISTORY_DAYS = 730
+
+PASSWORD = "Synthetic123!"
+
+FIRST_NAMES = (
+    "Ana", "Beatriz", "Camila", "Daniela", "Eduarda", "Fernanda", "Gabriela", "Helena", "Isabela", "Juliana",
+    "Larissa", "Mariana", "Natália", "Patrícia", "Renata", "Sofia", "André", "Bruno", "Carlos", "Diego",
+    "Eduardo", "Felipe", "Gustavo", "Henrique", "Igor", "João", "Lucas", "Marcelo", "Pedro", "Rafael",
+)
+LAST_NAMES = (
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa",
+)
+# Deliberately spelled inconsistently: report code normalizes these.
+HOSPITALS = (
+    "Hospital São Luiz", "Hosp. São Luiz", "HOSPITAL SAO LUIZ", "Hospital Albert Einstein", "H. Albert Einstein",
+    "Maternidade Santa Joana", "Mat. Santa Joana", "Hospital Sírio-Libanês", "Hospital Sirio Libanes",
+    "Hospital Santa Catarina", "Hospital Nove de Julho", "Hospital Oswaldo Cruz",
+)
+SURGEONS = (
+    "Dr. Paulo Mendes", "Dr Paulo Mendes", "Dra. Helena Prado", "Dra Helena Prado", "Dr. Ricardo Alves",
+    "Dr. Marcos Teixeira", "Dra. Luiza Campos", "Dr. Fábio Nunes", "Dra. Tatiana Moura", "Dr. Sérgio Pires",
+)
+CONVENIOS = (
+    ("Unimed", 30), ("Particular", 18), ("Bradesco Saúde", 12), ("SulAmérica", 10), ("AMIL", 9),
+    ("unimed paulistana", 5), ("Porto Seguro Saúde", 4), ("NotreDame Intermédica", 4), ("Hapvida", 3),
+    ("Prevent Senior", 3), ("sul america", 2),
+)
+PROCEDURES = (
+    # name, anesthesia type, value range, weight
+    ("Colecistectomia videolaparoscópica", "Anestesia Geral", (1400, 2400), 12),
+    ("Cesariana", "Raquianestesia", (1500, 2600), 14),
+    ("Parto normal", "Peridural", (1200, 2000), 8),
+    ("Artroplastia de joelho", "Bloqueio Periférico", (2200, 3800), 6),
+    ("Artroplastia de quadril", "Raquianestesia", (2400, 4000), 4),
+    ("Endoscopia digestiva alta", "Sedação", (400, 900), 14),
+    ("Colonoscopia", "Sedação", (500, 1000), 12),
+    ("Herniorrafia inguinal", "Raquianestesia", (900, 1600), 8),
+    ("Histerectomia", "Anestesia Geral", (1800, 3000), 5),
+    ("Tireoidectomia", "Anestesia Geral", (1800, 2800), 3),
+    ("Rinoplastia", "Anestesia Geral", (2000, 3500), 4),
+    ("Catarata", "Bloqueio Peribulbar", (600, 1100), 10),
+)
+PAYMENT_STATUSES = (("paid", 55), ("pending", 25), ("sent", 15), ("cancelled", 5))
+SHIFT_TYPES = ("hospital_fixo", "sobreaviso", "cirurgia_eletiva")
+DESPESA_CATEGORIES = (
+    "imposto", "alimentacao", "transporte", "equipamento", "software", "material_medico", "pessoal", "outros",
+)
+
+# Column order for every table written; rows are tuples in this order.
+COLUMNS = {
+    "auth.users": ("id", "email", "raw_user_meta_data"),
+    "groups": ("id", "name", "color", "created_by", "type", "billing_type", "created_at"),
+    "group_members": ("group_id", "user_id", "role", "status", "quota_percent", "quota_since", "joined_at"),
+    "procedures": (
+        "id", "user_id", "group_id", "anesthesiologist_user_id", "billing_entity_type",
+        "procedure_name", "procedure_type", "procedure_date", "procedure_time", "procedure_value",
+        "patient_name", "patient_phone", "patient_email", "patient_age", "patient_gender",
+        "convenio", "hospital_clinic", "nome_cirurgiao", "duracao_minutos", "tipo_parto",
+        "payment_status", "payment_date", "numero_parcelas", "parcelas_recebidas", "created_at",
+    ),
+    "parcelas": ("id", "procedure_id", "numero_parcela", "valor_parcela", "recebida", "data_recebimento"),
+    "shifts": (
+        "id", "user_id", "group_id", "assigned_user_id", "title", "hospital_name", "shift_type",
+        "start_date", "end_date", "is_recurring", "recurrence_type", "recurrence_end_date",
+        "parent_shift_id", "is_generated", "shift_value", "payment_status",
+    ),
+    "despesas": (
+        "id", "user_id", "group_id", "anesthesiologist_id", "procedure_id",
+        "descricao", "categoria", "valor", "data_despesa", "created_at",
+    ),
+    "feedback_links": ("id", "procedure_id", "token", "email_cirurgiao", "expires_at", "responded_at", "created_at"),
+    "feedback_responses": (
+        "id", "feedback_link_id", "nausea_vomito", "cefaleia", "dor_lombar", "anemia_transfusao",
+        "satisfacao", "comentarios", "created_at",
+    ),
+}
+
+
+class Encryptor:
+    """lib/security.ts ``encrypt`` with IVs drawn from the dataset's RNG."""
+
+    def __init__(self, key, rng):
+        if len(key) != 32:
+            raise ValueError("ENCRYPTION_KEY must be 32 characters")
+        self._aead = AESGCM(key.encode("utf-8"))
+        self._rng = rng
+
+    def __call__(self, text):
+        if not text:
+            return text
+        iv = self._rng.randbytes(IV_LENGTH)
+        sealed = self._aead.encrypt(iv, text.encode("utf-8"), None)
+        data, tag = sealed[:-16], sealed[-16:]
+        return f"enc:{iv.hex()}:{tag.hex()}:{data.hex()}"
+
+
+def _weighted(rng, options):
+    values, weights = zip(*options)
+    return rng.choices(values, weights)[0]
+
+
+class Dataset:
+    def __init__(self, scale, seed):
+        self.scale = scale
+        self.seed = seed
+        self.rows = {table: [] for table in COLUMNS}
+        self.users = []
+
+    def counts(self):
+        return {table: len(rows) for table, rows in self.rows.items()}
+
+
+def generate(scale=1.0, seed=42, encryption_key=standin_seed.ENCRYPTION_KEY):
+    """Build a dataset; ``scale`` multiplies every per-group volume.
+
+    The number of groups and members stays fixed, since the code under test
+    is per group; scale 2.5 means 50k procedures in each.
+    """
+    if scale <= 0:
+        raise ValueError("scale must be positive")
+    rng = random.Random(seed)
+    encrypt = Encryptor(encryption_key, random.Random(seed + 1))
+    ds = Dataset(scale, seed)
+
+    def new_id():
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    for g in range(GROUPS):
+        group_id = new_id()
+        members = []
+        for m in range(MEMBERS_PER_GROUP):
+            user_id = new_id()
+            email = f"anest{g:02d}{m:02d}@synthetic.test"
+            name = f"Dr(a). {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            ds.rows["auth.users"].append((user_id, email, _json({"name": name, "crm": f"{100000 + g * 100 + m}-SP"})))
+            ds.users.append({"id": user_id, "email": email, "password": PASSWORD, "group_id": group_id})
+            members.append(user_id)
+
+        com_cotas = g % 2 == 0
+        created = _ts(END_DATE - timedelta(days=HISTORY_DAYS + 30), time(12))
+        ds.rows["groups"].append((
+            group_id, f"Grupo Sintético {g + 1}", "#%06x" % rng.getrandbits(24), members[0],
+            "com_cotas" if com_cotas else "sem_cotas", "centralized" if g % 2 else "individual", created,
+        ))
+        quota = round(100 / len(members), 2)
+        for i, user_id in enumerate(members):
+            ds.rows["group_members"].append((
+                group_id, user_id, "admin" if i == 0 else "member", "active",
+                quota if com_cotas else None, END_DATE - timedelta(days=HISTORY_DAYS) if com_cotas else None, created,
+            ))
+
+        procedure_ids = _procedures(ds, rng, encrypt, new_id, group_id, members, int(PROCEDURES_PER_GROUP * scale))
+        _shifts(ds, rng, new_id, group_id, members, scale)
+        _despesas(ds, rng, new_id, group_id, members, procedure_ids, int(DESPESAS_PER_GROUP * scale))
+        _feedback(ds, rng, new_id, procedure_ids)
+    return ds
+
+
+def _procedures(ds, rng, encrypt, new_id, group_id, members, count):
+    ids = []
+    for _ in range(count):
+        proc_id = new_id()
+        owner = rng.choice(members)
+        in_group = rng.random() >= SOLO_SHARE
+        name, anesthesia, (low, high), _w = rng.choices(PROCEDURES, [p[3] for p in PROCEDURES])[0]
+        when = END_DATE - timedelta(days=rng.randrange(HISTORY_DAYS))
+        value = round(rng.uniform(low, high) / 10) * 10
+        status = _weighted(rng, PAYMENT_STATUSES)
+        installments = rng.choices((1, 2, 3, 4), (70, 15, 10, 5))[0] if status != "cancelled" else 1
+        received = installments if status == "paid" else (rng.randrange(installments) if installments > 1 else 0)
+        paid_on = when + timedelta(days=rng.randint(15, 75)) if status == "paid" else None
+        patient = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}"
+        phone = f"119{rng.randrange(10**7, 10**8)}"
+        tipo_parto = {"Cesariana": "Cesariana", "Parto normal": "Vaginal"}.get(name)
+
+        # procedure_name and patient_* are encrypted, as procedureService does.
+        ds.rows["procedures"].append((
+            proc_id, owner, group_id if in_group else None, owner,
+            rng.choice(("cnpj_anestesista", "cnpj_grupo")) if in_group else None,
+            encrypt(name), anesthesia, when, f"{rng.randint(7, 19):02d}:{rng.choice((0, 15, 30, 45)):02d}", value,
+            encrypt(patient), encrypt(phone),
+            encrypt(f"{patient.split()[0].lower()}{rng.randrange(1000)}@example.com") if rng.random() < 0.4 else None,
+            rng.randint(18, 85), rng.choice(("Masculino", "Feminino")) if tipo_parto is None else "Feminino",
+            _weighted(rng, CONVENIOS), rng.choice(HOSPITALS), rng.choice(SURGEONS), rng.randint(20, 240), tipo_parto,
+            status, paid_on, installments, received, _ts(when, time(20)),
+        ))
+        if installments > 1:
+            share = round(value / installments, 2)
+            for n in range(1, installments + 1):
+                got = n <= received
+                ds.rows["parcelas"].append((
+                    new_id(), proc_id, n, share, got, when + timedelta(days=30 * n) if got else None,
+                ))
+        ids.append((proc_id, owner, when))
+    return ids
+
+
+def _shifts(ds, rng, new_id, group_id, members, scale):
+    for user_id in members:
+        for _ in range(max(1, round(RECURRING_SHIFTS_PER_MEMBER * scale))):
+            parent = new_id()
+            recurrence = rng.choice(("weekly", "monthly"))
+            start = _ts(END_DATE - timedelta(days=rng.randrange(HISTORY_DAYS // 2, HISTORY_DAYS)), time(rng.choice((7, 19))))
+            hours = 12
+            until = END_DATE
+            shift_type = rng.choice(SHIFT_TYPES)
+            hospital = rng.choice(HOSPITALS)
+            value = rng.choice((900, 1200, 1500, 1800))
+            ds.rows["shifts"].append((
+                parent, user_id, group_id, user_id, f"Plantão {hospital}", hospital, shift_type,
+                start, start + timedelta(hours=hours), True, recurrence, until, None, False, value, "paid",
+            ))
+            # Children as generateRecurringShifts creates them, one per occurrence.
+            occurrence = _next(start, recurrence)
+            while occurrence.date() <= until:
+                ds.rows["shifts"].append((
+                    new_id(), user_id, group_id, user_id, f"Plantão {hospital}", hospital, shift_type,
+                    occurrence, occurrence + timedelta(hours=hours), False, None, None, parent, True, value,
+                    "paid" if occurrence.date() < END_DATE - timedelta(days=45) else "pending",
+                ))
+                occurrence = _next(occurrence, recurrence)
+
+        for _ in range(max(1, round(ONE_OFF_SHIFTS_PER_MEMBER * scale))):
+            start = _ts(END_DATE - timedelta(days=rng.randrange(HISTORY_DAYS)), time(rng.choice((7, 13, 19))))
+            hospital = rng.choice(HOSPITALS)
+            ds.rows["shifts"].append((
+                new_id(), user_id, group_id, user_id, f"Plantão {hospital}", hospital, rng.choice(SHIFT_TYPES),
+                start, start + timedelta(hours=rng.choice((6, 12, 24))), False, None, None, None, False,
+                rng.choice((600, 900, 1200)), rng.choice(("paid", "pending")),
+            ))
+
+
+def _despesas(ds, rng, new_id, group_id, members, procedure_ids, count):
+    for _ in range(count):
+        category = rng.choice(DESPESA_CATEGORIES)
+        when = END_DATE - timedelta(days=rng.randrange(HISTORY_DAYS))
+        linked = rng.choice(procedure_ids)[0] if procedure_ids and rng.random() < 0.2 else None
+        ds.rows["despesas"].append((
+            new_id(), members[0], group_id, rng.choice(members) if rng.random() < 0.5 else None, linked,
+            f"Despesa {category.replace('_', ' ')}", category, round(rng.uniform(30, 2500), 2), when,
+            _ts(when, time(18)),
+        ))
+
+
+def _feedback(ds, rng, new_id, procedure_ids):
+    for proc_id, _owner, when in procedure_ids:
+        if rng.random() >= FEEDBACK_SHARE:
+            continue
+        link_id = new_id()
+        created = _ts(when, time(21))
+        responded = created + timedelta(hours=rng.randint(2, 96)) if rng.random() < RESPONSE_SHARE else None
+        ds.rows["feedback_links"].append((
+            link_id, proc_id, "%032x" % rng.getrandbits(128), f"cirurgiao{rng.randrange(50)}@example.com",
+            created + timedelta(days=7), responded, created,
+        ))
+        if responded:
+            ds.rows["feedback_responses"].append((
+                new_id(), link_id, rng.random() < 0.08, rng.random() < 0.03, rng.random() < 0.05, rng.random() < 0.01,
+                rng.choices((1, 2, 3, 4, 5), (2, 3, 10, 35, 50))[0], None, responded,
+            ))
+
+
+def _next(when, recurrence):
+    if recurrence == "weekly":
+        return when + timedelta(days=7)
+    month = when.month % 12 + 1
+    year = when.year + (when.month == 12)
+    return when.replace(year=year, month=month, day=min(when.day, 28))
+
+
+def _ts(day, at):
+    return datetime.combine(day, at, tzinfo=timezone.utc)
+
+
+def _json(value):
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+
+def _copy_value(value):
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    text = str(value)
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def write_sql(ds, fh):
+    """Write the dataset as a psql script; run it with --single-transaction.
+
+    Users go through ``auth.users`` (so the signup trigger creates
+    public.users) with a bcrypt password set by pgcrypto; everything else is
+    COPY.
+    """
+    fh.write(f"-- Synthetic dataset: scale={ds.scale} seed={ds.seed}\n")
+    table, cols = "auth.users", COLUMNS["auth.users"]
+    fh.write(f"COPY {table} ({', '.join(cols)}) FROM stdin;\n")
+    for row in ds.rows[table]:
+        fh.write("\t".join(_copy_value(v) for v in row) + "\n")
+    fh.write("\\.\n")
+    ids = ", ".join(f"'{u['id']}'" for u in ds.users)
+    fh.write(
+        f"UPDATE auth.users SET encrypted_password = crypt('{PASSWORD}', gen_salt('bf', 4)) WHERE id IN ({ids});\n"
+    )
+    for table, cols in COLUMNS.items():
+        if table == "auth.users" or not ds.rows[table]:
+            continue
+        fh.write(f"COPY public.{table} ({', '.join(cols)}) FROM stdin;\n")
+        for row in ds.rows[table]:
+            fh.write("\t".join(_copy_value(v) for v in row) + "\n")
+        fh.write("\\.\n")
+    fh.write("ANALYZE;\n")
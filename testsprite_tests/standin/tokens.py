@@ -0,0 +1,70 @@
+"""HS256 JWTs in the shape Supabase issues them.
+
+PostgREST and middleware.ts (``SUPABASE_JWT_SECRET``) both verify these with
+the shared secret, so the stand-in can mint anon, service-role and user
+tokens without a GoTrue server.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+# Fixed so the Next.js process and PostgREST agree across runs; never used
+# outside the stand-in.
+JWT_SECRET = "standin-jwt-secret-not-for-production-use-0000"
+ISSUER = "standin"
+ACCESS_TOKEN_TTL_S = 3600
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def encode(claims, secret=JWT_SECRET):
+    header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+    payload = _b64(json.dumps(claims, separators=(",", ":")).encode())
+    signing_input = f"{header}.{payload}".encode("ascii")
+    signature = hmac.new(secret.encode(), signing_input, hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64(signature)}"
+
+
+def decode(token, secret=JWT_SECRET):
+    """Return the claims of a valid, unexpired token, or None."""
+    try:
+        header, payload, signature = token.split(".")
+    except (AttributeError, ValueError):
+        return None
+    expected = hmac.new(secret.encode(), f"{header}.{payload}".encode("ascii"), hashlib.sha256).digest()
+    if not hmac.compare_digest(_b64(expected), signature):
+        return None
+    claims = json.loads(_unb64(payload))
+    if claims.get("exp") and claims["exp"] < time.time():
+        return None
+    return claims
+
+
+def role_key(role):
+    """Long-lived key for the ``anon`` or ``service_role`` database role."""
+    now = int(time.time())
+    return encode({"iss": ISSUER, "role": role, "iat": now, "exp": now + 10 * 365 * 86400})
+
+
+def access_token(user, ttl_s=ACCESS_TOKEN_TTL_S):
+    now = int(time.time())
+    return encode({
+        "iss": ISSUER,
+        "aud": "authenticated",
+        "role": "authenticated",
+        "sub": user["id"],
+        "email": user["email"],
+        "user_metadata": user.get("user_metadata") or {},
+        "app_metadata": {"provider": "email", "providers": ["email"]},
+        "iat": now,
+        "exp": now + ttl_s,
+    })
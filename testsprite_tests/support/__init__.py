@@ -0,0 +1,5 @@
+"""Shared helpers for the testsprite_tests suite.
+
+The TC scripts stay runnable on their own (``python TC0xx_*.py``); the
+modules here let ``run_suite.py`` drive them from a shared browser pool.
+"""
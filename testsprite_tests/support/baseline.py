@@ -0,0 +1,79 @@
+"""Per-route latency baseline kept next to tmp/test_results.json.
+
+A load report (see support.load) is compared against the stored baseline;
+a route regresses when its p95 exceeds the baseline p95 by more than the
+relative tolerance *and* by more than an absolute slack, so a 4 ms -> 6 ms
+wobble on a cheap route does not fail the run.
+"""
+
+import json
+from datetime import datetime, timezone
+
+from .config import TMP_DIR
+
+BASELINE_PATH = TMP_DIR / "latency_baseline.json"
+DEFAULT_TOLERANCE = 0.20
+DEFAULT_SLACK_MS = 25.0
+
+_KEPT_FIELDS = ("p50_ms", "p95_ms", "p99_ms", "requests", "error_rate")
+
+
+def load_baseline(path=BASELINE_PATH):
+    """Return the stored baseline, or None when there is none yet."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(report, path=BASELINE_PATH, previous=None):
+    """Store the report's percentiles as the new baseline.
+
+    Per-route ``tolerance`` overrides from the previous baseline are kept,
+    so hand-tuned budgets survive a refresh.
+    """
+    previous_routes = (previous or {}).get("routes", {})
+    routes = {}
+    for name, stats in report["routes"].items():
+        entry = {k: stats[k] for k in _KEPT_FIELDS}
+        if "tolerance" in previous_routes.get(name, {}):
+            entry["tolerance"] = previous_routes[name]["tolerance"]
+        routes[name] = entry
+
+    baseline = {
+        "updated": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "users": report["users"],
+        "duration_s": report["duration_s"],
+        "routes": routes,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(baseline, fh, indent=2)
+    return baseline
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE, slack_ms=DEFAULT_SLACK_MS):
+    """Compare a report to the baseline route by route.
+
+    Returns a list of dicts with ``route``, ``status`` ("ok", "regressed" or
+    "new"), the two p95 values and the allowed budget.
+    """
+    results = []
+    for name, stats in report["routes"].items():
+        base = baseline.get("routes", {}).get(name)
+        current = stats.get("p95_ms")
+        if not base or base.get("p95_ms") is None or current is None:
+            results.append({"route": name, "status": "new", "p95_ms": current, "baseline_p95_ms": None, "budget_ms": None})
+            continue
+
+        route_tolerance = base.get("tolerance", tolerance)
+        budget = max(base["p95_ms"] * (1 + route_tolerance), base["p95_ms"] + slack_ms)
+        results.append({
+            "route": name,
+            "status": "regressed" if current > budget else "ok",
+            "p95_ms": current,
+            "baseline_p95_ms": base["p95_ms"],
+            "budget_ms": round(budget, 1),
+        })
+    return results
@@ -0,0 +1,112 @@
+from playwright import async_api
+
+from .config import BASE_URL, LOGIN_EMAIL, LOGIN_PASSWORD, STORAGE_STATE_PATH
+from .waits import goto
+
+# Chromium arguments shared by the standalone scripts and the runner pool.
+# "--single-process" is intentionally absent: several contexts share one
+# browser in the pool, and Chromium is unstable with that flag once more than
+# one renderer is alive.
+LAUNCH_ARGS = [
+    "--window-size=1280,720",         # Set the browser window size
+    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+    "--ipc=host",                     # Use host-level IPC for better stability
+]
+
+DEFAULT_TIMEOUT_MS = 5000
+
+
+async def launch_browser(pw):
+    """Launch headless Chromium with the suite's arguments."""
+    return await pw.chromium.launch(headless=True, args=LAUNCH_ARGS)
+
+
+async def new_context(browser, storage_state=None):
+    """Create a context (like an incognito window) with the suite defaults."""
+    context = await browser.new_context(storage_state=storage_state)
+    context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+    return context
+
+
+class StandaloneSession:
+    """Playwright + browser + context owned by a single script run.
+
+    Used when a TC script is executed directly instead of through the
+    runner, so each script keeps working on its own.
+    """
+
+    def __init__(self, pw, browser, context):
+        self.pw = pw
+        self.browser = browser
+        self.context = context
+
+    @classmethod
+    async def start(cls):
+        pw = await async_api.async_playwright().start()
+        browser = None
+        try:
+            browser = await launch_browser(pw)
+            context = await new_context(browser)
+        except Exception:
+            if browser:
+                await browser.close()
+            await pw.stop()
+            raise
+        return cls(pw, browser, context)
+
+    async def close(self):
+        try:
+            await self.context.close()
+            await self.browser.close()
+        finally:
+            await self.pw.stop()
+
+
+def _is_auth_cookie(cookie):
+    # @supabase/ssr stores the session as sb-<project>-auth-token, split into
+    # ".0", ".1", ... chunks when it does not fit a single cookie.
+    name = cookie.get("name", "")
+    return name.startswith("sb-") and "-auth-token" in name
+
+
+async def has_session(context):
+    """Return True if the context carries a Supabase auth cookie."""
+    return any(_is_auth_cookie(c) for c in await context.cookies())
+
+
+async def resume_session(page, path="/dashboard"):
+    """Skip the UI login when the runner handed over a signed-in context.
+
+    Returns False (and leaves the page untouched) when there is no session,
+    so the caller falls back to logging in through the UI.
+    """
+    if not await has_session(page.context):
+        return False
+    await goto(page, f"{BASE_URL}{path}")
+    return True
+
+
+async def create_storage_state(browser, email=LOGIN_EMAIL, password=LOGIN_PASSWORD, path=STORAGE_STATE_PATH):
+    """Log in once through /login and persist the session for reuse.
+
+    The saved state holds the Supabase cookies set by the browser client, so
+    every context created from it starts already authenticated.
+    """
+    if not email or not password:
+        raise RuntimeError("Login credentials missing: set ANESTEASY_LOGIN_EMAIL/ANESTEASY_LOGIN_PASSWORD")
+
+    context = await new_context(browser)
+    try:
+        page = await context.new_page()
+        await page.goto(f"{BASE_URL}/login", wait_until="domcontentloaded")
+        await page.locator('input[type="email"]').fill(email)
+        await page.locator('input[type="password"]').fill(password)
+        await page.locator('button[type="submit"]').click()
+        await page.wait_for_url("**/dashboard**", timeout=30000)
+        if not await has_session(context):
+            raise RuntimeError("Login finished without a Supabase session cookie")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        await context.storage_state(path=str(path))
+    finally:
+        await context.close()
+    return path
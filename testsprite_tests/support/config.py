@@ -0,0 +1,37 @@
+import json
+import os
+from pathlib import Path
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+TMP_DIR = SUITE_DIR / "tmp"
+
+
+def _load_testsprite_config():
+    """Read tmp/config.json written by TestSprite, if present."""
+    try:
+        with open(TMP_DIR / "config.json", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+_config = _load_testsprite_config()
+
+# Environment variables win over the TestSprite config so CI can point the
+# suite at another deployment without touching tmp/config.json.
+BASE_URL = os.environ.get("ANESTEASY_BASE_URL", _config.get("localEndpoint", "http://localhost:3000")).rstrip("/")
+LOGIN_EMAIL = os.environ.get("ANESTEASY_LOGIN_EMAIL", _config.get("loginUser", ""))
+LOGIN_PASSWORD = os.environ.get("ANESTEASY_LOGIN_PASSWORD", _config.get("loginPassword", ""))
+
+STORAGE_STATE_PATH = Path(os.environ.get("ANESTEASY_STORAGE_STATE", TMP_DIR / "storage_state.json"))
+
+# Supabase project used to mint real sessions for API-level tests; same
+# variables the Next.js app reads.
+SUPABASE_URL = os.environ.get("NEXT_PUBLIC_SUPABASE_URL", "").rstrip("/")
+SUPABASE_ANON_KEY = os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY", "")
+
+SECRETARY_EMAIL = os.environ.get("ANESTEASY_SECRETARY_EMAIL", "")
+SECRETARY_PASSWORD = os.environ.get("ANESTEASY_SECRETARY_PASSWORD", "")
+
+ADMIN_EMAIL = os.environ.get("ANESTEASY_ADMIN_EMAIL", "")
+ADMIN_PASSWORD = os.environ.get("ANESTEASY_ADMIN_PASSWORD", "")
@@ -0,0 +1,205 @@
+"""Concurrent HTTP load generator for the core API routes.
+
+Virtual users share an ``httpx.AsyncClient`` and loop over the routes until
+the deadline, each request carrying a real Supabase session (Bearer token)
+or a real secretary session cookie. Latencies are collected per route and
+summarized as p50/p95/p99, throughput and error rate.
+"""
+
+import asyncio
+import math
+import time
+
+import httpx
+
+from .config import (
+    ADMIN_EMAIL,
+    ADMIN_PASSWORD,
+    BASE_URL,
+    SECRETARY_EMAIL,
+    SECRETARY_PASSWORD,
+    SUPABASE_ANON_KEY,
+    SUPABASE_URL,
+)
+
+REQUEST_TIMEOUT_S = 30
+
+
+class Session:
+    """Credentials one virtual user sends with every request."""
+
+    def __init__(self, access_token=None, user_id=None, cookies=None):
+        self.access_token = access_token
+        self.user_id = user_id
+        self.cookies = cookies or {}
+
+    @property
+    def headers(self):
+        if not self.access_token:
+            return {}
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+async def sign_in(client, email, password):
+    """Password grant against Supabase Auth, as the login page does."""
+    if not SUPABASE_URL or not SUPABASE_ANON_KEY:
+        raise RuntimeError("NEXT_PUBLIC_SUPABASE_URL/NEXT_PUBLIC_SUPABASE_ANON_KEY are required to sign in")
+    resp = await client.post(
+        f"{SUPABASE_URL}/auth/v1/token",
+        params={"grant_type": "password"},
+        headers={"apikey": SUPABASE_ANON_KEY},
+        json={"email": email, "password": password},
+    )
+    resp.raise_for_status()
+    data = resp.json()
+    return Session(access_token=data["access_token"], user_id=data["user"]["id"])
+
+
+async def sign_in_secretary(client, email=SECRETARY_EMAIL, password=SECRETARY_PASSWORD):
+    """Log in through /api/secretary/auth and keep its HttpOnly cookie."""
+    resp = await client.post(f"{BASE_URL}/api/secretary/auth", json={"email": email, "password": password})
+    resp.raise_for_status()
+    return Session(cookies={"secretary_session_id": resp.cookies["secretary_session_id"]})
+
+
+class Route:
+    """A named request template; ``build`` returns (path, params) for a session.
+
+    ``role`` picks which session the request is sent with: "user" (the
+    virtual user's own), "secretary" or "admin".
+    """
+
+    def __init__(self, name, build, role="user"):
+        self.name = name
+        self.build = build
+        self.role = role
+
+
+def core_routes(procedure_ids):
+    """The routes hit on almost every navigation of the app."""
+    def procedure_get(session, i):
+        return "/api/procedures/get", {"id": procedure_ids[i % len(procedure_ids)]}
+
+    routes = [
+        Route("/api/procedures/list", lambda s, i: ("/api/procedures/list", {"userId": s.user_id})),
+        Route("/api/procedures/list?cursor", lambda s, i: (
+            "/api/procedures/list", {"userId": s.user_id, "fields": "list", "cursor": "", "limit": 50},
+        )),
+        Route("/api/subscription/check", lambda s, i: ("/api/subscription/check", None)),
+        Route("/api/auth/status", lambda s, i: ("/api/auth/status", None)),
+        Route("/api/secretary/dashboard/data", lambda s, i: ("/api/secretary/dashboard/data", None), role="secretary"),
+        Route("/api/admin/stats", lambda s, i: ("/api/admin/stats", None), role="admin"),
+    ]
+    if procedure_ids:
+        routes.insert(1, Route("/api/procedures/get", procedure_get))
+    return routes
+
+
+def percentile(sorted_values, q):
+    """Linear-interpolated percentile of an already sorted list (q in 0..100)."""
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * q / 100
+    lo, hi = math.floor(k), math.ceil(k)
+    if lo == hi:
+        return sorted_values[lo]
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+class RouteStats:
+    def __init__(self):
+        self.latencies_ms = []
+        self.errors = 0
+
+    def add(self, ms, ok):
+        self.latencies_ms.append(ms)
+        if not ok:
+            self.errors += 1
+
+    def summary(self, elapsed_s):
+        values = sorted(self.latencies_ms)
+        count = len(values)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else None,
+            "throughput_rps": round(count / elapsed_s, 2) if elapsed_s else None,
+            "p50_ms": _round(percentile(values, 50)),
+            "p95_ms": _round(percentile(values, 95)),
+            "p99_ms": _round(percentile(values, 99)),
+            "max_ms": _round(values[-1] if values else None),
+        }
+
+
+def _round(value):
+    return None if value is None else round(value, 1)
+
+
+async def _virtual_user(client, routes, session, shared, stats, deadline, offset):
+    i = offset
+    while time.perf_counter() < deadline:
+        route = routes[i % len(routes)]
+        who = session if route.role == "user" else shared[route.role]
+        path, params = route.build(who, i)
+        started = time.perf_counter()
+        try:
+            resp = await client.get(f"{BASE_URL}{path}", params=params, headers=who.headers, cookies=who.cookies)
+            ok = resp.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        stats[route.name].add((time.perf_counter() - started) * 1000, ok)
+        i += 1
+
+
+async def _sample_procedure_ids(client, session, limit=50):
+    resp = await client.get(
+        f"{BASE_URL}/api/procedures/list",
+        params={"userId": session.user_id, "limit": limit},
+        headers=session.headers,
+    )
+    resp.raise_for_status()
+    return [row["id"] for row in resp.json()]
+
+
+async def run_load(accounts, users=10, duration_s=30, warmup_s=0):
+    """Run ``users`` virtual users for ``duration_s`` seconds.
+
+    ``accounts`` is a list of (email, password); virtual users are spread
+    over them round-robin. Returns a dict of per-route summaries.
+    """
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT_S, limits=limits) as client:
+        sessions = [await sign_in(client, email, password) for email, password in accounts]
+        # Secretary and admin routes run under one shared session each, and
+        # are skipped when their credentials are not configured.
+        shared = {}
+        if SECRETARY_EMAIL and SECRETARY_PASSWORD:
+            shared["secretary"] = await sign_in_secretary(client)
+        if ADMIN_EMAIL and ADMIN_PASSWORD:
+            shared["admin"] = await sign_in(client, ADMIN_EMAIL, ADMIN_PASSWORD)
+
+        procedure_ids = await _sample_procedure_ids(client, sessions[0])
+        routes = [r for r in core_routes(procedure_ids) if r.role == "user" or r.role in shared]
+
+        if warmup_s:
+            warm = {r.name: RouteStats() for r in routes}
+            deadline = time.perf_counter() + warmup_s
+            await asyncio.gather(*(
+                _virtual_user(client, routes, sessions[n % len(sessions)], shared, warm, deadline, n)
+                for n in range(users)
+            ))
+
+        stats = {r.name: RouteStats() for r in routes}
+        started = time.perf_counter()
+        deadline = started + duration_s
+        await asyncio.gather(*(
+            _virtual_user(client, routes, sessions[n % len(sessions)], shared, stats, deadline, n)
+            for n in range(users)
+        ))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "users": users,
+        "duration_s": round(elapsed, 2),
+        "routes": {name: s.summary(elapsed) for name, s in stats.items()},
+    }
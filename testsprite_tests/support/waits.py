@@ -0,0 +1,83 @@
+"""Event-driven replacements for the fixed sleeps in the TC scripts.
+
+Instead of ``wait_for_timeout(3000)`` before every interaction, the helpers
+let Playwright auto-wait for the locator, perform the action, then wait for
+the page to settle (load + network idle, bounded). The time from the action
+to the settled state is recorded so the suite reports app latency.
+"""
+
+import contextvars
+import re
+import time
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+ACTION_TIMEOUT_MS = 5000
+NAVIGATION_TIMEOUT_MS = 10000
+# Upper bound for network idle: pages with polling never go fully idle, and
+# the cap keeps them from stalling the flow.
+SETTLE_TIMEOUT_MS = 3000
+
+_timings = contextvars.ContextVar("action_timings", default=None)
+
+
+def start_recording():
+    """Collect action timings for the current task; returns the list."""
+    timings = []
+    _timings.set(timings)
+    return timings
+
+
+def _record(action, target, started, settled):
+    timings = _timings.get()
+    if timings is None:
+        return
+    timings.append({
+        "action": action,
+        "target": target,
+        "ms": round((time.perf_counter() - started) * 1000, 1),
+        "settled": settled,
+    })
+
+
+def _describe(locator):
+    match = re.search(r"selector='([^']*)'", repr(locator))
+    return match.group(1) if match else repr(locator)
+
+
+async def settle(page, timeout=SETTLE_TIMEOUT_MS):
+    """Wait for navigation to finish and the network to go idle.
+
+    Returns False if the page was still busy when the timeout expired.
+    """
+    try:
+        await page.wait_for_load_state("domcontentloaded", timeout=timeout)
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+    except PlaywrightTimeoutError:
+        return False
+    return True
+
+
+async def goto(page, url, timeout=NAVIGATION_TIMEOUT_MS):
+    """Navigate and wait for the page to settle."""
+    started = time.perf_counter()
+    await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+    settled = await settle(page)
+    _record("goto", url, started, settled)
+
+
+async def click(locator, timeout=ACTION_TIMEOUT_MS):
+    """Click once the element is visible, then wait for the page to settle."""
+    await locator.wait_for(state="visible", timeout=timeout)
+    started = time.perf_counter()
+    await locator.click(timeout=timeout)
+    settled = await settle(locator.page)
+    _record("click", _describe(locator), started, settled)
+
+
+async def fill(locator, value, timeout=ACTION_TIMEOUT_MS):
+    """Fill once the element is visible; typing does not need a settle."""
+    await locator.wait_for(state="visible", timeout=timeout)
+    started = time.perf_counter()
+    await locator.fill(value, timeout=timeout)
+    _record("fill", _describe(locator), started, True)
@@ -0,0 +1,470 @@
+"""Smoke tests for the API routes against the seeded stand-in."""
+
+import base64
+import json
+from datetime import date
+from urllib.parse import urlparse
+
+import httpx
+
+
+def session_cookies(standin, session):
+    """The @supabase/ssr session cookie the Next.js server client reads."""
+    ref = urlparse(standin.supabase_url).hostname.split(".")[0]
+    value = base64.urlsafe_b64encode(json.dumps(session).encode()).decode().rstrip("=")
+    return {f"sb-{ref}-auth-token": f"base64-{value}"}
+
+
+def test_healthz(standin):
+    resp = httpx.get(f"{standin.base_url}/api/healthz")
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "ok"
+
+
+def test_procedures_list_returns_seeded_rows(standin, seeded):
+    resp = httpx.get(f"{standin.base_url}/api/procedures/list", params={"userId": seeded.ANA["id"]}, timeout=30)
+    assert resp.status_code == 200
+    rows = resp.json()
+    expected = {pid for pid, owner in seeded.PROCEDURES.items() if owner == seeded.ANA["id"]}
+    assert {row["id"] for row in rows} == expected
+    assert [row["procedure_date"] for row in rows] == sorted((r["procedure_date"] for r in rows), reverse=True)
+
+
+def test_auth_status_accepts_gateway_token(standin, user_session):
+    session = user_session("ana")
+    resp = httpx.get(
+        f"{standin.base_url}/api/auth/status",
+        headers={"Authorization": f"Bearer {session['access_token']}"},
+        timeout=30,
+    )
+    assert resp.status_code == 200
+
+
+def test_procedures_list_cursor_pages_cover_all_rows(standin, seeded):
+    params = {"userId": seeded.ANA["id"], "limit": 2, "fields": "list", "cursor": ""}
+    seen = []
+    while True:
+        resp = httpx.get(f"{standin.base_url}/api/procedures/list", params=params, timeout=30)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert all("patient_notes" not in row for row in body["data"])
+        seen += [row["id"] for row in body["data"]]
+        if not body["nextCursor"]:
+            break
+        params["cursor"] = body["nextCursor"]
+    expected = {pid for pid, owner in seeded.PROCEDURES.items() if owner == seeded.ANA["id"]}
+    assert len(seen) == len(set(seen)) and set(seen) == expected
+
+
+def test_report_aggregates_rpc_matches_seed(standin, seeded, user_session):
+    session = user_session("ana")
+    resp = httpx.post(
+        f"{standin.supabase_url}/rest/v1/rpc/get_report_aggregates",
+        headers={"apikey": standin.anon_key, "Authorization": f"Bearer {session['access_token']}"},
+        json={"p_user_id": seeded.ANA["id"], "p_start": "2026-01-01", "p_end": "2026-01-31"},
+        timeout=30,
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    # stats cobre o histórico todo; os demais agregados só o período
+    assert body["stats"]["total"] == 3
+    assert body["stats"]["completedValue"] == 1800
+    assert body["stats"]["pendingValue"] == 4700
+    assert body["months"] == [{"key": "2026-01", "count": 2, "total_value": 4000}]
+    assert {row["key"] for row in body["hospitals"]} == {"Hospital São Luiz", "Maternidade Santa Joana"}
+
+
+def test_group_financial_rollup_matches_seed(standin, seeded, user_session):
+    session = user_session("ana")
+    resp = httpx.get(
+        f"{standin.supabase_url}/rest/v1/group_financial_monthly",
+        headers={"apikey": standin.anon_key, "Authorization": f"Bearer {session['access_token']}"},
+        params={"group_id": f"eq.{seeded.GROUP_ID}", "order": "month"},
+        timeout=30,
+    )
+    assert resp.status_code == 200
+    rows = resp.json()
+    # Só fevereiro tem procedimentos do grupo: 2500 (cnpj_grupo, enviado) + 1500 (cnpj_anestesista, pago)
+    assert [row["month"] for row in rows] == ["2026-02-01"]
+    fevereiro = rows[0]
+    assert fevereiro["procedures_count"] == 2
+    assert fevereiro["revenue"] == 4000
+    assert fevereiro["receivable"] == 2500
+    assert fevereiro["revenue_cnpj"] == 2500
+    assert fevereiro["revenue_cpf"] == 1500
+    assert fevereiro["payment_methods"] == {"Não informado": 4000}
+
+
+def test_group_financial_rollups_hidden_from_pending_invite(standin, seeded, user_session):
+    session = user_session("admin")
+    headers = {"apikey": standin.anon_key, "Authorization": f"Bearer {session['access_token']}"}
+    for table in ("group_financial_monthly", "group_member_financial_monthly"):
+        resp = httpx.get(
+            f"{standin.supabase_url}/rest/v1/{table}",
+            headers=headers,
+            params={"group_id": f"eq.{seeded.GROUP_ID}"},
+            timeout=30,
+        )
+        assert resp.status_code == 200
+        assert resp.json() == [], table
+
+
+def test_weekly_summary_batches_resume_from_checkpoint(standin, seeded):
+    headers = {"apikey": standin.service_key, "Authorization": f"Bearer {standin.service_key}"}
+    resp = httpx.patch(
+        f"{standin.supabase_url}/rest/v1/users",
+        headers=headers,
+        params={"id": f"in.({seeded.ANA['id']},{seeded.BRUNO['id']})"},
+        json={"subscription_status": "active"},
+        timeout=30,
+    )
+    assert resp.status_code in (200, 204)
+
+    def batch():
+        resp = httpx.post(
+            f"{standin.supabase_url}/rest/v1/rpc/run_weekly_summary_batch",
+            headers=headers,
+            json={"p_week_start": "2000-01-03", "p_since": "2000-01-01T00:00:00Z", "p_limit": 1},
+            timeout=30,
+        )
+        assert resp.status_code == 200
+        return resp.json()
+
+    # Um usuário por chamada; cada chamada continua do checkpoint
+    assert batch() == {"notified": 1, "total": 1, "done": False}
+    assert batch() == {"notified": 1, "total": 2, "done": False}
+    assert batch() == {"notified": 0, "total": 2, "done": True}
+    assert batch() == {"notified": 0, "total": 2, "done": True}
+
+    resp = httpx.get(
+        f"{standin.supabase_url}/rest/v1/notifications",
+        headers=headers,
+        params={"user_id": f"eq.{seeded.ANA['id']}", "type": "eq.weekly_summary", "select": "message"},
+        timeout=30,
+    )
+    assert [row["message"] for row in resp.json()] == [
+        "💰 Produzido: R$ 6500.00\n💵 Recebido: R$ 1800.00\n⚠️ Pendente: R$ 4700.00"
+    ]
+
+
+def test_financial_notifications_dedupe_within_24h(standin, seeded, user_session):
+    session = user_session("ana")
+    headers = {"apikey": standin.anon_key, "Authorization": f"Bearer {session['access_token']}"}
+
+    def generate(user_id):
+        return httpx.post(
+            f"{standin.supabase_url}/rest/v1/rpc/generate_financial_notifications",
+            headers=headers,
+            json={"p_user_id": user_id},
+            timeout=30,
+        )
+
+    # Ana tem um procedimento pendente recente: uma notificação pending_send
+    first = generate(seeded.ANA["id"])
+    assert first.status_code == 200
+    assert first.json()["written"] == 1
+    # Mesma mensagem dentro de 24h: nada a gravar
+    assert generate(seeded.ANA["id"]).json()["written"] == 0
+    # Só as próprias notificações
+    assert generate(seeded.BRUNO["id"]).status_code == 403
+
+    resp = httpx.get(
+        f"{standin.supabase_url}/rest/v1/notifications",
+        headers=headers,
+        params={"type": "eq.pending_send", "select": "message,dedupe_key"},
+        timeout=30,
+    )
+    assert resp.json() == [{
+        "message": "Você possui 1 procedimentos aguardando envio para cobrança há mais de uma semana.",
+        "dedupe_key": "pending_send",
+    }]
+
+
+def test_whatsapp_job_queue_claim_retry_and_dead_letter(standin):
+    headers = {"apikey": standin.service_key, "Authorization": f"Bearer {standin.service_key}"}
+
+    def rpc(name, **args):
+        resp = httpx.post(f"{standin.supabase_url}/rest/v1/rpc/{name}", headers=headers, json=args, timeout=30)
+        assert resp.status_code == 200, resp.text
+        return resp.json()
+
+    resp = httpx.post(
+        f"{standin.supabase_url}/rest/v1/whatsapp_jobs",
+        headers={**headers, "Prefer": "return=representation"},
+        json={"event_id": "wamid.queue-test", "payload": {"id": "wamid.queue-test"}, "max_attempts": 2},
+        timeout=30,
+    )
+    assert resp.status_code == 201
+    job_id = resp.json()[0]["id"]
+
+    # SKIP LOCKED: o segundo worker não recebe o job já reservado
+    claimed = rpc("claim_whatsapp_jobs", p_worker="w1", p_limit=5)
+    assert [job["id"] for job in claimed] == [job_id]
+    assert claimed[0]["attempts"] == 1
+    assert rpc("claim_whatsapp_jobs", p_worker="w2", p_limit=5) == []
+
+    # Só quem detém a reserva registra o resultado
+    assert rpc("fail_whatsapp_job", p_id=job_id, p_worker="w2", p_error="x") is None
+    assert rpc("fail_whatsapp_job", p_id=job_id, p_worker="w1", p_error="timeout", p_base_seconds=0) == "queued"
+
+    # Nova tentativa; na última falha vai para dead-letter
+    claimed = rpc("claim_whatsapp_jobs", p_worker="w2", p_limit=5)
+    assert claimed[0]["attempts"] == 2
+    assert rpc("fail_whatsapp_job", p_id=job_id, p_worker="w2", p_error="timeout") == "dead"
+    assert rpc("claim_whatsapp_jobs", p_worker="w1", p_limit=5) == []
+
+
+def test_whatsapp_job_steps_survive_retries(standin):
+    headers = {"apikey": standin.service_key, "Authorization": f"Bearer {standin.service_key}"}
+
+    def rpc(name, **args):
+        resp = httpx.post(f"{standin.supabase_url}/rest/v1/rpc/{name}", headers=headers, json=args, timeout=30)
+        assert resp.status_code == 200, resp.text
+        return resp.json()
+
+    resp = httpx.post(
+        f"{standin.supabase_url}/rest/v1/whatsapp_jobs",
+        headers={**headers, "Prefer": "return=representation"},
+        json={"event_id": "wamid.steps-test", "payload": {"id": "wamid.steps-test"}},
+        timeout=30,
+    )
+    assert resp.status_code == 201
+    job_id = resp.json()[0]["id"]
+
+    claimed = rpc("claim_whatsapp_jobs", p_worker="w1", p_limit=5)
+    assert claimed[0]["completed_steps"] == []
+    assert rpc("mark_whatsapp_job_step", p_id=job_id, p_worker="w1", p_step="ocr_message") is True
+    assert rpc("mark_whatsapp_job_step", p_id=job_id, p_worker="w1", p_step="ocr_message") is True
+    # Sem a reserva não registra
+    assert rpc("mark_whatsapp_job_step", p_id=job_id, p_worker="w2", p_step="whatsapp_send") is False
+
+    # A nova tentativa recebe as etapas já concluídas
+    assert rpc("fail_whatsapp_job", p_id=job_id, p_worker="w1", p_error="timeout", p_base_seconds=0) == "queued"
+    claimed = rpc("claim_whatsapp_jobs", p_worker="w2", p_limit=5)
+    assert claimed[0]["completed_steps"] == ["ocr_message"]
+    assert rpc("complete_whatsapp_job", p_id=job_id, p_worker="w2") is True
+    assert rpc("complete_whatsapp_job", p_id=job_id, p_worker="w2") is False
+
+def test_vision_cache_hits_ttl_and_size_cap(standin):
+    headers = {"apikey": standin.service_key, "Authorization": f"Bearer {standin.service_key}"}
+
+    def rpc(name, **args):
+        resp = httpx.post(f"{standin.supabase_url}/rest/v1/rpc/{name}", headers=headers, json=args, timeout=30)
+        assert resp.status_code == 200, resp.text
+        return resp.json()
+
+    rows = [
+        {"cache_key": "k-old", "extractor": "ficha_web", "result": "e2:old", "size_bytes": 6, "expires_at": "2100-01-01T00:00:00Z",
+         "created_at": "2026-01-01T00:00:00Z"},
+        {"cache_key": "k-new", "extractor": "ficha_web", "result": "e2:new", "size_bytes": 6, "expires_at": "2100-01-01T00:00:00Z",
+         "created_at": "2026-06-01T00:00:00Z"},
+        {"cache_key": "k-expired", "extractor": "ficha_web", "result": "e2:exp", "size_bytes": 6, "expires_at": "2000-01-01T00:00:00Z",
+         "created_at": "2026-06-01T00:00:00Z"},
+    ]
+    resp = httpx.post(f"{standin.supabase_url}/rest/v1/vision_cache", headers=headers, json=rows, timeout=30)
+    assert resp.status_code == 201
+
+    assert rpc("vision_cache_get", p_key="k-new") == "e2:new"
+    assert rpc("vision_cache_get", p_key="k-expired") is None
+    assert rpc("vision_cache_get", p_key="missing") is None
+
+    # Remove a expirada e, acima do limite, a usada há mais tempo
+    assert rpc("prune_vision_cache", p_max_entries=1) == 2
+    resp = httpx.get(
+        f"{standin.supabase_url}/rest/v1/vision_cache",
+        headers=headers,
+        params={"select": "cache_key,hits"},
+        timeout=30,
+    )
+    assert resp.json() == [{"cache_key": "k-new", "hits": 1}]
+
+
+def test_pipeline_stage_percentiles(standin):
+    headers = {"apikey": standin.service_key, "Authorization": f"Bearer {standin.service_key}"}
+
+    rows = [
+        {"pipeline": "whatsapp_ocr", "message_id": f"wamid.{i}", "stage": "vision", "duration_ms": ms, "ok": i != 10}
+        for i, ms in enumerate(range(100, 2100, 100), start=1)
+    ] + [
+        {"pipeline": "whatsapp_ocr", "message_id": "wamid.1", "stage": "download", "duration_ms": 50, "ok": True},
+        {"pipeline": "whatsapp_ocr", "message_id": "wamid.old", "stage": "download", "duration_ms": 9000, "ok": True},
+    ]
+    resp = httpx.post(f"{standin.supabase_url}/rest/v1/pipeline_timings", headers=headers, json=rows, timeout=30)
+    assert resp.status_code == 201
+
+    # Medição antiga: fora da janela e removida pela limpeza
+    resp = httpx.patch(
+        f"{standin.supabase_url}/rest/v1/pipeline_timings",
+        headers=headers,
+        params={"message_id": "eq.wamid.old"},
+        json={"created_at": "2020-01-01T00:00:00Z"},
+        timeout=30,
+    )
+    assert resp.status_code == 204
+
+    resp = httpx.post(
+        f"{standin.supabase_url}/rest/v1/rpc/pipeline_stage_percentiles",
+        headers=headers,
+        json={"p_since": "2026-01-01T00:00:00Z"},
+        timeout=30,
+    )
+    assert resp.status_code == 200, resp.text
+    stats = {row["stage"]: row for row in resp.json()}
+
+    # Ordenado pelo p95: Vision primeiro
+    assert resp.json()[0]["stage"] == "vision"
+    assert stats["vision"]["samples"] == 20
+    assert stats["vision"]["failures"] == 1
+    assert float(stats["vision"]["p50_ms"]) == 1050
+    assert float(stats["vision"]["p95_ms"]) == 1905
+    assert stats["vision"]["max_ms"] == 2000
+    assert stats["download"]["samples"] == 1
+
+    resp = httpx.post(
+        f"{standin.supabase_url}/rest/v1/rpc/prune_pipeline_timings",
+        headers=headers,
+        json={"p_keep_days": 30},
+        timeout=30,
+    )
+    assert resp.json() == 1
+
+    # Sem acesso para usuários autenticados
+    resp = httpx.post(
+        f"{standin.supabase_url}/rest/v1/rpc/pipeline_stage_percentiles",
+        headers={"apikey": standin.anon_key, "Authorization": f"Bearer {standin.anon_key}"},
+        json={"p_since": "2026-01-01T00:00:00Z"},
+        timeout=30,
+    )
+    assert resp.status_code in (401, 403, 404)
+
+
+def test_procedures_import_key_upsert_skips_reimported_rows(standin, seeded):
+    headers = {
+        "apikey": standin.service_key,
+        "Authorization": f"Bearer {standin.service_key}",
+        "Prefer": "resolution=ignore-duplicates,return=representation",
+    }
+
+    def row(key, patient):
+        return {
+            "user_id": seeded.ANA["id"], "import_key": key, "procedure_date": "2025-03-10",
+            "procedure_name": "Colecistectomia", "procedure_type": "Outro", "patient_name": patient,
+            "hospital_clinic": "Hospital Central", "procedure_value": 1500, "payment_status": "pending",
+        }
+
+    def upsert(rows):
+        resp = httpx.post(
+            f"{standin.supabase_url}/rest/v1/procedures",
+            headers=headers,
+            params={"on_conflict": "user_id,import_key", "select": "id"},
+            json=rows,
+            timeout=30,
+        )
+        assert resp.status_code in (200, 201), resp.text
+        return resp.json()
+
+    assert len(upsert([row("imp-1", "Maria"), row("imp-2", "Joana")])) == 2
+    # Reimportação: só a linha nova é inserida
+    assert len(upsert([row("imp-1", "Maria"), row("imp-2", "Joana"), row("imp-3", "Carla")])) == 1
+
+    resp = httpx.get(
+        f"{standin.supabase_url}/rest/v1/procedures",
+        headers={"apikey": standin.service_key, "Authorization": f"Bearer {standin.service_key}"},
+        params={"select": "import_key", "import_key": "like.imp-*", "order": "import_key"},
+        timeout=30,
+    )
+    assert [r["import_key"] for r in resp.json()] == ["imp-1", "imp-2", "imp-3"]
+
+
+def test_group_export_requires_active_membership_and_streams_csv(standin, seeded, user_session):
+    url = f"{standin.base_url}/api/groups/{seeded.GROUP_ID}/export"
+
+    resp = httpx.get(url, timeout=30)
+    assert resp.status_code == 401
+
+    # Admin só tem um convite pendente no grupo
+    resp = httpx.get(url, cookies=session_cookies(standin, user_session("admin")), timeout=30)
+    assert resp.status_code == 403
+
+    resp = httpx.get(
+        url,
+        cookies=session_cookies(standin, user_session("ana")),
+        headers={"Accept-Encoding": "gzip"},
+        timeout=30,
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-encoding"] == "gzip"
+    # httpx já descompacta o corpo
+    lines = resp.text.split("\n")
+    assert lines[0] == "Data,Horário,Procedimento,Paciente,Hospital/Clínica,Anestesista,Valor"
+    # Só os dois procedimentos do grupo, do mais recente para o mais antigo
+    assert lines[1:] == [
+        '"11/02/2026",,"Parto normal","Fernanda Rocha","Maternidade Santa Joana",,1500',
+        '"03/02/2026",,"Artroplastia de joelho","José Pereira","Hospital Albert Einstein",,2500',
+    ]
+
+
+def test_group_relatorio_contador_requires_active_membership(standin, seeded, user_session):
+    url = f"{standin.base_url}/api/groups/{seeded.GROUP_ID}/relatorio-contador"
+    # Ano corrente: ainda aberto, então o XLSX é gerado sem passar pelo Storage
+    params = {"ano": date.today().year}
+
+    resp = httpx.get(url, params=params, timeout=30)
+    assert resp.status_code == 401
+
+    # Convite pendente não dá acesso ao relatório (nem gera o cache)
+    resp = httpx.get(url, params=params, cookies=session_cookies(standin, user_session("admin")), timeout=30)
+    assert resp.status_code == 403
+
+    resp = httpx.get(url, params=params, cookies=session_cookies(standin, user_session("bruno")), timeout=30)
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith(
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    assert resp.content[:2] == b"PK"
+
+
+def test_procedures_import_reads_brazilian_csv_and_dedupes(standin, seeded, user_session):
+    url = f"{standin.base_url}/api/procedures/import"
+    cookies = session_cookies(standin, user_session("bruno"))
+    # "03/04/2025" é 3 de abril (dd/mm), não 4 de março; "1.500" é mil e quinhentos
+    csv = (
+        "Data,Paciente,Procedimento,Hospital,Valor\n"
+        "03/04/2025,Paula Import,Apendicectomia,Hospital Central,1.500\n"
+        '13/04/2025,Paula Import,Apendicectomia,Hospital Central,"R$ 2.000,50"\n'
+        "03/04/2025,Paula Import,Apendicectomia,Hospital Central,1.500\n"
+    )
+
+    def upload():
+        resp = httpx.post(
+            url,
+            cookies=cookies,
+            files={"file": ("historico.csv", csv.encode(), "text/csv")},
+            timeout=60,
+        )
+        assert resp.status_code == 200, resp.text
+        events = [json.loads(line) for line in resp.text.splitlines()]
+        assert events[-1]["type"] == "done", events
+        return events[-1]
+
+    done = upload()
+    assert (done["inserted"], done["duplicates"], done["invalid"]) == (2, 1, 0)
+    # Reimportação: nada novo
+    done = upload()
+    assert (done["inserted"], done["skipped"]) == (0, 2)
+
+    resp = httpx.get(
+        f"{standin.supabase_url}/rest/v1/procedures",
+        headers={"apikey": standin.service_key, "Authorization": f"Bearer {standin.service_key}"},
+        params={
+            "select": "procedure_date,procedure_value",
+            "user_id": f"eq.{seeded.BRUNO['id']}",
+            "import_key": "not.is.null",
+            "order": "procedure_date",
+        },
+        timeout=30,
+    )
+    assert resp.json() == [
+        {"procedure_date": "2025-04-03", "procedure_value": 1500},
+        {"procedure_date": "2025-04-13", "procedure_value": 2000.5},
+    ]
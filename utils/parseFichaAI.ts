@@ -4,6 +4,7 @@
  */
 
 import { FichaParsed } from './parseFicha';
+import { withVisionCache, type VisionCacheScope } from '@/lib/ai/vision-cache';
 
 // Lista de tipos de procedimento válidos
 const TIPOS_PROCEDIMENTO = [
@@ -154,30 +155,7 @@ export async function parseFichaWithAI(textoOCR: string): Promise<FichaParsed |
   }
 }
 
-/**
- * Parseia imagem da ficha usando OpenAI GPT-4o-mini Vision
- * Recebe a imagem em Base64 e retorna dados estruturados
- */
-export async function parseFichaWithVision(base64Image: string): Promise<FichaParsed | null> {
-  const apiKey = process.env.OPENAI_API_KEY;
-  if (!apiKey) {
-    console.warn('[AI Vision] OPENAI_API_KEY não configurada');
-    return null;
-  }
-
-  try {
-    const response = await fetch('https://api.openai.com/v1/chat/completions', {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        'Authorization': `Bearer ${apiKey}`,
-      },
-      body: JSON.stringify({
-        model: 'gpt-4o-mini',
-        messages: [
-          {
-            role: 'system',
-            content: `Você é um perito em faturamento médico e OCR de fichas anestésicas brasileiras.
+const VISION_SYSTEM_PROMPT = `Você é um perito em faturamento médico e OCR de fichas anestésicas brasileiras.
 Sua tarefa é extrair dados de etiquetas hospitalares e fichas de anestesia com precisão de 100%.
 
 REGRAS DE VALIDAÇÃO:
@@ -202,57 +180,96 @@ RETORNE APENAS UM JSON COM ESTAS CHAVES:
   "tecnica": "string",
   "sexo": "M" | "F",
   "horario": "string"
-}`
-          },
-          {
-            role: 'user',
-            content: [
-              { type: 'text', text: 'Analise esta imagem médica com rigor. Se um campo não for encontrado, deixe-o vazio. Verifique se os dados fazem sentido semanticamente.' },
-              {
-                type: 'image_url',
-                image_url: {
-                  url: `data:image/jpeg;base64,${base64Image}`,
-                },
-              },
-            ],
-          },
-        ],
-        response_format: { type: 'json_object' },
-        temperature: 0,
-      }),
-    });
+}`;
 
-    if (!response.ok) {
-      const errorData = await response.json();
-      throw new Error(`OpenAI API Error: ${errorData.error?.message || response.statusText}`);
-    }
+const VISION_USER_PROMPT = 'Analise esta imagem médica com rigor. Se um campo não for encontrado, deixe-o vazio. Verifique se os dados fazem sentido semanticamente.';
 
-    const data = await response.json();
-    const content = data.choices[0]?.message?.content;
-    if (!content) return null;
+const VISION_CACHE_SCOPE: VisionCacheScope = {
+  extractor: 'ficha_web',
+  model: 'gpt-4o-mini',
+  prompt: `${VISION_SYSTEM_PROMPT}\n${VISION_USER_PROMPT}`
+};
 
-    const parsed = JSON.parse(content);
-
-    return {
-      nome: parsed.nome || '',
-      nascimento: parsed.nascimento || '',
-      entrada: parsed.dataProcedimento || '',
-      dataProcedimento: parsed.dataProcedimento || '',
-      procedimento: parsed.tipoProcedimento || '',
-      tipoProcedimento: parsed.tipoProcedimento || '',
-      tecnica: parsed.tecnica || '',
-      sexo: (parsed.sexo === 'M' || parsed.sexo === 'F') ? parsed.sexo : '',
-      convenio: parsed.convenio || '',
-      carteirinha: parsed.carteirinha || '',
-      cirurgiao: parsed.nomeCirurgiao || '',
-      nomeCirurgiao: parsed.nomeCirurgiao || '',
-      especialidadeCirurgiao: '',
-      hospital: parsed.hospital || '',
-      horario: parsed.horario || '',
-    };
+/**
+ * Parseia imagem da ficha usando OpenAI GPT-4o-mini Vision
+ * Recebe a imagem em Base64 e retorna dados estruturados
+ * (imagens repetidas saem do cache de lib/ai/vision-cache.ts)
+ */
+export async function parseFichaWithVision(base64Image: string): Promise<FichaParsed | null> {
+  const apiKey = process.env.OPENAI_API_KEY;
+  if (!apiKey) {
+    console.warn('[AI Vision] OPENAI_API_KEY não configurada');
+    return null;
+  }
 
+  try {
+    const image = Buffer.from(base64Image, 'base64');
+    const { value } = await withVisionCache(VISION_CACHE_SCOPE, image, () => callFichaVision(apiKey, base64Image));
+    return value;
   } catch (error) {
     console.error('[AI Vision] Erro:', error);
     return null;
   }
 }
+
+async function callFichaVision(apiKey: string, base64Image: string): Promise<FichaParsed | null> {
+  const response = await fetch('https://api.openai.com/v1/chat/completions', {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      'Authorization': `Bearer ${apiKey}`,
+    },
+    body: JSON.stringify({
+      model: VISION_CACHE_SCOPE.model,
+      messages: [
+        {
+          role: 'system',
+          content: VISION_SYSTEM_PROMPT
+        },
+        {
+          role: 'user',
+          content: [
+            { type: 'text', text: VISION_USER_PROMPT },
+            {
+              type: 'image_url',
+              image_url: {
+                url: `data:image/jpeg;base64,${base64Image}`,
+              },
+            },
+          ],
+        },
+      ],
+      response_format: { type: 'json_object' },
+      temperature: 0,
+    }),
+  });
+
+  if (!response.ok) {
+    const errorData = await response.json();
+    throw new Error(`OpenAI API Error: ${errorData.error?.message || response.statusText}`);
+  }
+
+  const data = await response.json();
+  const content = data.choices[0]?.message?.content;
+  if (!content) return null;
+
+  const parsed = JSON.parse(content);
+
+  return {
+    nome: parsed.nome || '',
+    nascimento: parsed.nascimento || '',
+    entrada: parsed.dataProcedimento || '',
+    dataProcedimento: parsed.dataProcedimento || '',
+    procedimento: parsed.tipoProcedimento || '',
+    tipoProcedimento: parsed.tipoProcedimento || '',
+    tecnica: parsed.tecnica || '',
+    sexo: (parsed.sexo === 'M' || parsed.sexo === 'F') ? parsed.sexo : '',
+    convenio: parsed.convenio || '',
+    carteirinha: parsed.carteirinha || '',
+    cirurgiao: parsed.nomeCirurgiao || '',
+    nomeCirurgiao: parsed.nomeCirurgiao || '',
+    especialidadeCirurgiao: '',
+    hospital: parsed.hospital || '',
+    horario: parsed.horario || '',
+  };
+}